@@ -9,11 +9,11 @@ API 测试 Fixtures 模块
 """
 
 import pytest
-import allure
 from typing import Optional, Dict
 
 from base.api.services.base_service import BaseService
 from config import env_manager
+from core.allure.allure_helper import AllureHelper
 from core.log.logger import TestLogger
 from core.cache.data_cache import DataCache
 from config.settings import Settings
@@ -211,7 +211,7 @@ def log_api_test_info(request, api_logger):
     api_logger.info(f"Test Location: {test_location}")
     
     # 添加 Allure 步骤
-    with allure.step(f"Starting API test: {test_name}"):
+    with AllureHelper.step(f"Starting API test: {test_name}"):
         pass
     
     yield
@@ -219,7 +219,7 @@ def log_api_test_info(request, api_logger):
     api_logger.info(f"API Test Finished: {test_name}")
     
     # 添加 Allure 步骤
-    with allure.step(f"Finished API test: {test_name}"):
+    with AllureHelper.step(f"Finished API test: {test_name}"):
         pass
 
 
@@ -244,6 +244,10 @@ def attach_request_response_to_allure(api_logger):
             response: requests.Response 对象
             request_name: 请求名称（用于 Allure 报告）
         """
+        # 未启用 Allure 时不格式化请求/响应，也不解析响应体
+        if not AllureHelper.is_enabled():
+            return
+        
         # 附加请求信息
         request_info = f"""
 Method: {response.request.method}
@@ -251,11 +255,7 @@ URL: {response.request.url}
 Headers: {dict(response.request.headers)}
 Body: {response.request.body or 'None'}
 """
-        allure.attach(
-            request_info,
-            name=f"{request_name} - Request",
-            attachment_type=allure.attachment_type.TEXT
-        )
+        AllureHelper.attach_text(request_info, f"{request_name} - Request")
         
         # 附加响应信息
         response_info = f"""
@@ -263,26 +263,15 @@ Status Code: {response.status_code}
 Headers: {dict(response.headers)}
 Response Time: {response.elapsed.total_seconds()}s
 """
-        allure.attach(
-            response_info,
-            name=f"{request_name} - Response Info",
-            attachment_type=allure.attachment_type.TEXT
-        )
+        AllureHelper.attach_text(response_info, f"{request_name} - Response Info")
         
-        # 附加响应体
+        # 附加响应体（受附件大小预算限制，超出时截断）
         try:
             response_body = response.json()
-            allure.attach(
-                str(response_body),
-                name=f"{request_name} - Response Body",
-                attachment_type=allure.attachment_type.JSON
-            )
         except Exception:
-            allure.attach(
-                response.text,
-                name=f"{request_name} - Response Body",
-                attachment_type=allure.attachment_type.TEXT
-            )
+            AllureHelper.attach_text(response.text, f"{request_name} - Response Body")
+        else:
+            AllureHelper.attach_json(response_body, f"{request_name} - Response Body")
         
         api_logger.info(f"Attached request/response to Allure: {request_name}")
     
@@ -346,11 +335,7 @@ def setup_api_test_environment():
     # 清理
     logger.info("Cleaning up API test environment")
     
-    # 清理数据缓存
-    cache = DataCache.get_instance()
-    cache_size = cache.size()
-    cache.clear()
-    logger.info(f"Cleared {cache_size} items from data cache")
+    # 数据缓存由根目录 conftest 的 session_setup_teardown fixture 在保存快照后清空（在本 fixture 之后清理）
     
     # 附加日志到 Allure
     TestLogger.attach_log_to_allure()
@@ -12,7 +12,7 @@ API 测试基础服务类模块
 import logging
 import time
 from typing import Any, Optional, Dict, Union
-from urllib.parse import urljoin
+from urllib.parse import urljoin, urlparse
 import requests
 from requests.auth import HTTPBasicAuth
 from requests.exceptions import (
@@ -24,6 +24,7 @@ from requests.exceptions import (
 
 from config.settings import Settings
 from core.cache.data_cache import DataCache
+from core.log.log_context import request_context
 from core.log.logger import TestLogger
 from utils.internet_utils import get_random_pc_ua
 
@@ -219,72 +220,74 @@ class BaseService:
         
         last_exception = None
         
-        for attempt in range(max_retries + 1):
-            try:
+        # 同一逻辑请求（含重试）的日志共享同一个 request_id
+        with request_context(f"{method.upper()} {urlparse(url).path}"):
+            for attempt in range(max_retries + 1):
+                try:
 
-                if "headers" in kwargs:
-                    # 合并会话头和请求头
-                    headers = kwargs['headers']
-                    headers['Content-Type'] = 'application/json'
-                    headers['User-Agent'] = get_random_pc_ua()
-                    kwargs['headers'] = headers
-                else:
-                    headers = {'Content-Type': 'application/json', 'User-Agent': get_random_pc_ua()}
-                    kwargs['headers'] = headers
+                    if "headers" in kwargs:
+                        # 合并会话头和请求头
+                        headers = kwargs['headers']
+                        headers['Content-Type'] = 'application/json'
+                        headers['User-Agent'] = get_random_pc_ua()
+                        kwargs['headers'] = headers
+                    else:
+                        headers = {'Content-Type': 'application/json', 'User-Agent': get_random_pc_ua()}
+                        kwargs['headers'] = headers
 
-                # 记录请求信息
-                self._log_request(method, url, **kwargs)
-                
-                # 发送请求
-                response = self.session.request(
-                    method=method,
-                    url=url,
-                    timeout=self.timeout,
-                    **kwargs
-                )
-                
-                # 记录响应信息
-                self._log_response(response)
-                
-                # 检查 HTTP 错误
-                response.raise_for_status()
-                
-                return response
-            
-            except (ConnectionError, Timeout) as e:
-                # 网络错误，可以重试
-                last_exception = e
-                self.logger.warning(
-                    f"Network error on attempt {attempt + 1}/{max_retries + 1}: {str(e)}"
-                )
-                
-                if attempt < max_retries:
-                    time.sleep(retry_delay)
-                    retry_delay *= 2  # 指数退避
-                else:
-                    self.logger.error(
-                        f"Request failed after {max_retries + 1} attempts: {str(e)}"
+                    # 记录请求信息
+                    self._log_request(method, url, **kwargs)
+
+                    # 发送请求
+                    response = self.session.request(
+                        method=method,
+                        url=url,
+                        timeout=self.timeout,
+                        **kwargs
                     )
-            
-            except HTTPError as e:
-                # HTTP 错误（4xx, 5xx）
-                self.logger.error(f"HTTP error: {e.response.status_code} - {str(e)}")
-                # 对于 5xx 错误可以重试，4xx 错误不重试
-                if e.response.status_code >= 500 and attempt < max_retries:
+
+                    # 记录响应信息
+                    self._log_response(response)
+
+                    # 检查 HTTP 错误
+                    response.raise_for_status()
+
+                    return response
+
+                except (ConnectionError, Timeout) as e:
+                    # 网络错误，可以重试
                     last_exception = e
-                    time.sleep(retry_delay)
-                    retry_delay *= 2
-                else:
+                    self.logger.warning(
+                        f"Network error on attempt {attempt + 1}/{max_retries + 1}: {str(e)}"
+                    )
+
+                    if attempt < max_retries:
+                        time.sleep(retry_delay)
+                        retry_delay *= 2  # 指数退避
+                    else:
+                        self.logger.error(
+                            f"Request failed after {max_retries + 1} attempts: {str(e)}"
+                        )
+
+                except HTTPError as e:
+                    # HTTP 错误（4xx, 5xx）
+                    self.logger.error(f"HTTP error: {e.response.status_code} - {str(e)}")
+                    # 对于 5xx 错误可以重试，4xx 错误不重试
+                    if e.response.status_code >= 500 and attempt < max_retries:
+                        last_exception = e
+                        time.sleep(retry_delay)
+                        retry_delay *= 2
+                    else:
+                        raise
+
+                except RequestException as e:
+                    # 其他请求异常
+                    self.logger.error(f"Request exception: {str(e)}")
                     raise
-            
-            except RequestException as e:
-                # 其他请求异常
-                self.logger.error(f"Request exception: {str(e)}")
-                raise
-        
-        # 如果所有重试都失败，抛出最后一个异常
-        if last_exception:
-            raise last_exception
+
+            # 如果所有重试都失败，抛出最后一个异常
+            if last_exception:
+                raise last_exception
     
     def get(self, endpoint: str, **kwargs) -> requests.Response:
         """
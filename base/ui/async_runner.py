@@ -0,0 +1,96 @@
+"""
+异步测试运行器模块
+
+在同步的 pytest 测试中运行 Playwright 异步 API 的协程，不依赖 pytest-asyncio。
+每个进程（pytest-xdist 下即每个 worker）一个事件循环，由 session 级 async_runner fixture 创建，
+异步浏览器和上下文都绑定在这个事件循环上，因此测试之间共享同一个循环。
+
+Playwright 同步 API（page 等 fixture）在第一次调用后会把它自己的事件循环一直登记为
+测试线程正在运行的循环，在测试线程上 run_until_complete 会报错
+"Cannot run the event loop while another loop is running"。
+因此运行器在单独的线程中运行事件循环，测试线程等待其完成，
+同一 worker 中先运行同步 UI 测试再运行异步 UI 测试也能正常工作。
+
+每次 run 使用一个新线程：Allure 按线程记录当前测试，新线程从测试线程继承当前测试/步骤，
+协程中的附件和步骤会记录到正确的测试下；调用方的 contextvars（如请求日志上下文）同样传递给协程。
+事件循环同一时间只在一个线程中运行，异步浏览器和上下文可以在多次 run 之间继续使用。
+"""
+
+import asyncio
+import contextvars
+import threading
+from typing import Any, Awaitable, Callable, Optional, TypeVar
+
+
+T = TypeVar("T")
+
+
+class AsyncRunner:
+    """
+    在单独线程中运行协程的事件循环
+    """
+
+    def __init__(self, loop: Optional[asyncio.AbstractEventLoop] = None):
+        """
+        初始化运行器
+
+        Args:
+            loop: 事件循环，如果为 None 则新建
+        """
+        self.loop = loop or asyncio.new_event_loop()
+
+    def run(self, awaitable: Awaitable[T]) -> T:
+        """
+        运行协程直到完成并返回结果
+
+        Args:
+            awaitable: 协程或其他可等待对象
+
+        Returns:
+            T: 协程的返回值
+
+        使用示例:
+            titles = async_runner.run(gather_pages(check(url) for url in urls))
+        """
+        return self._run_in_thread(self.loop.run_until_complete, awaitable)
+
+    def _run_in_thread(self, func: Callable[..., T], *args: Any) -> T:
+        """
+        在新线程中以调用方的 contextvars 执行函数，等待完成并返回结果或重新抛出异常（内部方法）
+        """
+        context = contextvars.copy_context()
+        outcome = {}
+
+        def target() -> None:
+            try:
+                outcome["result"] = context.run(func, *args)
+            except BaseException as e:
+                outcome["error"] = e
+
+        thread = threading.Thread(target=target, name="AsyncRunner", daemon=True)
+        thread.start()
+        thread.join()
+
+        if "error" in outcome:
+            raise outcome["error"]
+        return outcome["result"]
+
+    def close(self) -> None:
+        """
+        取消未完成的任务并关闭事件循环，在会话结束时调用
+        """
+        if self.loop.is_closed():
+            return
+        self._run_in_thread(self._shutdown)
+        self.loop.close()
+
+    def _shutdown(self) -> None:
+        """
+        取消未完成的任务并关闭异步生成器（内部方法）
+        """
+        pending = [task for task in asyncio.all_tasks(self.loop) if not task.done()]
+        for task in pending:
+            task.cancel()
+        if pending:
+            self.loop.run_until_complete(asyncio.gather(*pending, return_exceptions=True))
+        self.loop.run_until_complete(self.loop.shutdown_asyncgens())
@@ -0,0 +1,135 @@
+"""
+登录状态缓存模块
+
+需要登录的 UI 测试每次都通过登录页面完成登录，耗时数秒。
+该模块按用户角色缓存 Playwright 的 storage state（cookies 和 localStorage）：
+- 每个角色只登录一次，登录后的状态保存到 AUTH_STATE_DIR 目录
+- 之后的测试直接使用保存的状态创建已登录的浏览器上下文
+- 文件超过 AUTH_STATE_TTL 或其中的 cookie 已过期时重新登录
+- 并行执行时通过锁文件保证多个 worker 中只有一个执行登录，其他 worker 等待后直接使用
+"""
+
+import json
+import os
+import time
+from pathlib import Path
+from typing import Callable, Dict, Optional
+
+from config.settings import Settings
+from core.log.logger import TestLogger
+from utils.file_lock import file_lock
+
+
+# 登录函数：接收角色名，返回 storage state 字典（BrowserContext.storage_state() 的返回值）
+LoginFunction = Callable[[str], Dict]
+
+# cookie 在该时间（秒）内过期时视为已过期，避免测试执行过程中登录失效
+_EXPIRY_MARGIN = 60
+
+
+class AuthStateCache:
+    """
+    按角色缓存登录状态
+
+    每个进程一个实例（由 session 级 auth_state fixture 创建），状态文件在进程之间共享。
+    """
+
+    def __init__(self, login: LoginFunction, state_dir: Optional[str] = None, ttl: Optional[int] = None):
+        """
+        初始化登录状态缓存
+
+        Args:
+            login: 登录函数，接收角色名，返回登录后的 storage state
+            state_dir: 状态文件目录，如果为 None 则使用配置文件中的设置
+            ttl: 状态文件有效期（秒），如果为 None 则使用配置文件中的设置，0 表示只按 cookie 过期时间判断
+        """
+        self.login = login
+        self.state_dir = Path(state_dir or Settings.AUTH_STATE_DIR)
+        self.ttl = Settings.AUTH_STATE_TTL if ttl is None else ttl
+        self.logger = TestLogger.get_logger("AuthStateCache")
+        self.logins = 0
+
+    def state_path(self, role: str) -> Path:
+        """
+        获取角色的状态文件路径
+
+        Args:
+            role: 角色名
+
+        Returns:
+            Path: 状态文件路径（不同环境分开保存）
+        """
+        return self.state_dir / f"{Settings.TEST_ENV}_{role}.json"
+
+    def is_valid(self, role: str) -> bool:
+        """
+        检查角色的状态文件是否仍然有效
+
+        Args:
+            role: 角色名
+
+        Returns:
+            bool: 文件存在、未超过有效期且其中的 cookie 都未过期时返回 True
+        """
+        path = self.state_path(role)
+        try:
+            if self.ttl > 0 and time.time() - path.stat().st_mtime > self.ttl:
+                return False
+            with open(path, "r", encoding="utf-8") as f:
+                state = json.load(f)
+        except (OSError, ValueError):
+            return False
+
+        # expires 为 -1 的会话 cookie 不过期
+        expires_before = time.time() + _EXPIRY_MARGIN
+        return all(
+            cookie.get("expires", -1) < 0 or cookie["expires"] > expires_before
+            for cookie in state.get("cookies", [])
+        )
+
+    def get(self, role: str) -> str:
+        """
+        获取角色的状态文件，无效时登录并保存
+
+        Args:
+            role: 角色名
+
+        Returns:
+            str: 状态文件路径，可直接作为 browser.new_context 的 storage_state 参数
+        """
+        path = self.state_path(role)
+        if self.is_valid(role):
+            return str(path)
+
+        self.state_dir.mkdir(parents=True, exist_ok=True)
+        with file_lock(path.with_suffix(".lock"), timeout=Settings.AUTH_STATE_LOCK_TIMEOUT):
+            # 等待锁期间其他 worker 可能已经完成登录
+            if self.is_valid(role):
+                self.logger.debug(f"Reusing storage state saved by another worker for role: {role}")
+                return str(path)
+
+            self.logger.info(f"Logging in to create storage state for role: {role}")
+            start = time.perf_counter()
+            state = self.login(role)
+            self.logins += 1
+
+            tmp_path = path.with_suffix(f".{os.getpid()}.tmp")
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(state, f, ensure_ascii=False)
+            os.replace(tmp_path, path)
+            self.logger.info(f"Storage state saved for role {role} in {time.perf_counter() - start:.2f}s: {path}")
+
+        return str(path)
+
+    def invalidate(self, role: str) -> None:
+        """
+        删除角色的状态文件（例如检测到登录已失效时），下次获取时重新登录
+
+        Args:
+            role: 角色名
+        """
+        try:
+            self.state_path(role).unlink()
+            self.logger.info(f"Storage state invalidated for role: {role}")
+        except FileNotFoundError:
+            pass
@@ -0,0 +1,309 @@
+"""
+浏览器上下文池模块
+
+每个测试新建浏览器上下文和页面需要数百毫秒。启用 BROWSER_POOL_ENABLED 后，
+每个进程（pytest-xdist 下即每个 worker）维护 BROWSER_POOL_SIZE 个预先创建好的上下文（各带一个页面）：
+- 会话开始时预热，测试开始时直接取出一个已就绪的上下文
+- 测试结束后重置上下文（关闭测试使用的所有页面，移除测试注册的上下文事件监听器，清除 cookies、
+  localStorage/sessionStorage、权限、路由等），为下一个测试新建一个页面后放回池中；
+  页面不在测试之间重用，页面上的监听器、init script 和 binding 随页面一起关闭
+- 测试失败、重置失败、重置后仍有残留状态，或测试在上下文上调用了无法撤销的
+  add_init_script、expose_binding、expose_function 时关闭该上下文，并立即补充一个新的上下文
+补充和重置都在测试清理阶段完成，不占用下一个测试的准备时间。
+
+Playwright 同步 API 不是线程安全的，上下文只能在测试线程中创建，因此没有使用后台线程预热。
+使用 @pytest.mark.fresh_context 标记的测试使用独立创建的上下文，不从池中取出
+（例如每次都会修改上下文的测试，避免每次都丢弃池中的上下文）。
+"""
+
+import threading
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from playwright.sync_api import Browser, BrowserContext, Page
+
+from config.settings import Settings
+from core.log.logger import TestLogger
+
+
+# 重置时清除当前页面所在源的 Web Storage（其他源的存储在之后的 storage_state 检查中发现）
+_CLEAR_STORAGE_SCRIPT = """() => {
+    try { window.localStorage.clear(); } catch (e) {}
+    try { window.sessionStorage.clear(); } catch (e) {}
+}"""
+
+# 注册事件监听器的方法，测试中注册的监听器在重置时移除
+_LISTENER_METHODS = ("on", "once")
+
+# 无法通过公开 API 撤销的上下文修改，测试中调用后该上下文不再重用
+_IRREVERSIBLE_METHODS = ("add_init_script", "expose_binding", "expose_function")
+
+
+@dataclass
+class PooledContext:
+    """
+    池中的浏览器上下文及其预先创建的页面
+    """
+
+    context: BrowserContext
+    page: Page
+    uses: int = 0
+    listeners: List[Tuple[str, Callable]] = field(default_factory=list)  # 测试注册的上下文事件监听器
+    modified: bool = False  # 测试是否对上下文做了无法撤销的修改
+
+
+def build_context_options() -> Dict[str, Any]:
+    """
+    根据配置生成创建浏览器上下文的参数
+
+    Returns:
+        Dict[str, Any]: browser.new_context 的参数
+    """
+    return {
+        "viewport": {
+            "width": Settings.VIEWPORT_WIDTH,
+            "height": Settings.VIEWPORT_HEIGHT
+        },
+        "ignore_https_errors": not Settings.VERIFY_SSL,
+    }
+
+
+def apply_default_timeouts(context: BrowserContext) -> None:
+    """
+    为浏览器上下文设置默认超时
+
+    Args:
+        context: 浏览器上下文
+    """
+    context.set_default_timeout(Settings.BROWSER_TIMEOUT)
+    context.set_default_navigation_timeout(Settings.PAGE_LOAD_TIMEOUT)
+
+
+class ContextPool:
+    """
+    浏览器上下文池
+
+    每个进程一个实例（由 session 级 context_pool fixture 创建），只在测试线程中使用。
+    """
+
+    def __init__(self, browser: Browser, size: int, context_options: Optional[Dict[str, Any]] = None):
+        """
+        初始化上下文池
+
+        Args:
+            browser: 浏览器实例
+            size: 池中保持就绪的上下文数量
+            context_options: browser.new_context 的参数，如果为 None 则使用配置文件中的设置
+        """
+        self.browser = browser
+        self.size = size
+        self.context_options = context_options or build_context_options()
+        self.logger = TestLogger.get_logger("ContextPool")
+        self._idle: deque = deque()
+        self._in_use: Dict[int, PooledContext] = {}
+        self._lock = threading.Lock()
+        self._closed = False
+        self.created = 0
+        self.reused = 0
+        self.discarded = 0
+
+    def _create(self) -> PooledContext:
+        """
+        创建一个新的上下文和页面（内部方法）
+        """
+        context = self.browser.new_context(**self.context_options)
+        apply_default_timeouts(context)
+        page = context.new_page()
+        self.created += 1
+        return PooledContext(context, page)
+
+    def warm_up(self) -> None:
+        """
+        预先创建上下文，直到池中有 size 个就绪的上下文
+        """
+        while len(self._idle) < self.size:
+            self._idle.append(self._create())
+        self.logger.info(f"Context pool warmed up with {len(self._idle)} context(s)")
+
+    def acquire(self) -> PooledContext:
+        """
+        取出一个就绪的上下文，池为空时新建
+
+        Returns:
+            PooledContext: 上下文及其页面
+        """
+        with self._lock:
+            entry = self._idle.popleft() if self._idle else None
+        if entry is None:
+            entry = self._create()
+        elif entry.uses:
+            self.reused += 1
+
+        entry.uses += 1
+        self._track(entry)
+        with self._lock:
+            self._in_use[id(entry.context)] = entry
+        return entry
+
+    @staticmethod
+    def _track(entry: PooledContext) -> None:
+        """
+        在测试使用期间记录对上下文的修改（内部方法）
+
+        在上下文实例上包装注册监听器和无法撤销修改的方法，归还时由 _untrack 恢复。
+        """
+        context = entry.context
+
+        def track_listener(method: Callable) -> Callable:
+            def wrapper(event: str, f: Callable) -> None:
+                entry.listeners.append((event, f))
+                return method(event, f)
+            return wrapper
+
+        def track_modification(method: Callable) -> Callable:
+            def wrapper(*args: Any, **kwargs: Any) -> Any:
+                entry.modified = True
+                return method(*args, **kwargs)
+            return wrapper
+
+        for name in _LISTENER_METHODS:
+            setattr(context, name, track_listener(getattr(context, name)))
+        for name in _IRREVERSIBLE_METHODS:
+            setattr(context, name, track_modification(getattr(context, name)))
+
+    @staticmethod
+    def _untrack(entry: PooledContext) -> None:
+        """
+        恢复 _track 包装的方法（内部方法）
+        """
+        for name in _LISTENER_METHODS + _IRREVERSIBLE_METHODS:
+            vars(entry.context).pop(name, None)
+
+    def page_for(self, context: BrowserContext) -> Optional[Page]:
+        """
+        获取池中上下文预先创建的页面
+
+        Args:
+            context: 浏览器上下文
+
+        Returns:
+            Optional[Page]: 上下文不是从池中取出的时返回 None
+        """
+        entry = self._in_use.get(id(context))
+        if entry is None or entry.page.is_closed():
+            return None
+        return entry.page
+
+    def release(self, entry: PooledContext, reusable: bool = True) -> None:
+        """
+        归还上下文：重置后放回池中，无法安全重用时关闭并补充新的上下文
+
+        Args:
+            entry: acquire 返回的上下文
+            reusable: 是否允许重用（测试失败时传 False）
+        """
+        with self._lock:
+            self._in_use.pop(id(entry.context), None)
+        self._untrack(entry)
+
+        if self._closed:
+            self._close_entry(entry)
+            return
+
+        if reusable and Settings.BROWSER_POOL_MAX_USES > 0 and entry.uses >= Settings.BROWSER_POOL_MAX_USES:
+            reusable = False
+        if reusable and self._reset(entry):
+            with self._lock:
+                self._idle.append(entry)
+            return
+
+        self.discarded += 1
+        self._close_entry(entry)
+        try:
+            with self._lock:
+                replenish = len(self._idle) < self.size
+            if replenish:
+                new_entry = self._create()
+                with self._lock:
+                    self._idle.append(new_entry)
+        except Exception as e:
+            self.logger.warning(f"Failed to replenish context pool: {e}")
+
+    def _reset(self, entry: PooledContext) -> bool:
+        """
+        重置上下文状态（内部方法）
+
+        Returns:
+            bool: 重置后没有残留状态时返回 True
+        """
+        context = entry.context
+        try:
+            if entry.modified:
+                self.logger.debug("Pooled context has init scripts or bindings added by the test, discarding it")
+                return False
+
+            listeners, entry.listeners = entry.listeners, []
+            for event, handler in listeners:
+                try:
+                    context.remove_listener(event, handler)
+                except Exception:
+                    # 测试已自行移除，或 once 监听器已触发
+                    pass
+
+            # 页面不重用：页面上的监听器、init script、binding、路由和视口随页面关闭
+            for page in list(context.pages):
+                if not page.is_closed() and not page.url.startswith("about:"):
+                    page.evaluate(_CLEAR_STORAGE_SCRIPT)
+                page.close()
+            context.unroute_all(behavior="ignoreErrors")
+
+            context.clear_cookies()
+            context.clear_permissions()
+            context.set_extra_http_headers({})
+            context.set_offline(False)
+            context.set_geolocation(None)
+            apply_default_timeouts(context)
+            entry.page = context.new_page()
+
+            # 其他源（如 iframe、测试中访问过的其他页面）的存储无法在当前页面清除
+            state = context.storage_state()
+            return not state.get("cookies") and not state.get("origins")
+        except Exception as e:
+            self.logger.debug(f"Failed to reset pooled context, discarding it: {e}")
+            return False
+
+    def _close_entry(self, entry: PooledContext) -> None:
+        """
+        关闭上下文（内部方法）
+        """
+        try:
+            entry.context.close()
+        except Exception as e:
+            self.logger.debug(f"Failed to close pooled context: {e}")
+
+    def close(self) -> None:
+        """
+        关闭池中所有上下文，在会话结束时调用
+        """
+        self._closed = True
+        with self._lock:
+            entries = list(self._idle) + list(self._in_use.values())
+            self._idle.clear()
+            self._in_use.clear()
+        for entry in entries:
+            self._close_entry(entry)
+
+    def get_stats(self) -> dict:
+        """
+        获取上下文池统计
+
+        Returns:
+            dict: created（创建的上下文数量）、reused（重用次数）、discarded（无法重用而关闭的数量）、idle（就绪数量）
+        """
+        return {
+            "created": self.created,
+            "reused": self.reused,
+            "discarded": self.discarded,
+            "idle": len(self._idle),
+        }
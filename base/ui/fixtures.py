@@ -4,13 +4,21 @@ UI 测试 Fixtures 模块
 该模块定义 Playwright UI 测试所需的 fixtures，包括：
 - 浏览器初始化 fixture
 - 页面 fixture
+- 浏览器上下文池（可选，见 base/ui/context_pool.py）
+- 按角色缓存的登录状态（见 base/ui/auth_state.py）
+- 网络资源拦截配置（见 base/ui/network_profiles.py）
+- HAR 录制与回放（见 base/ui/har_replay.py）
+- Playwright 异步 API 的浏览器、上下文和页面（见 base/ui/pages/async_base_page.py）
+- 同一测试中操作的多个页面（见 base/ui/multi_page.py）
+- 失败时保存 Playwright trace（见 base/ui/trace_recorder.py）
 - 失败时自动截图的 fixture
 - 资源清理逻辑
 """
 
 import pytest
 from datetime import datetime
-from typing import Generator
+from pathlib import Path
+from typing import Callable, Dict, Generator, List, Optional, Tuple
 from playwright.sync_api import (
     sync_playwright, 
     Playwright,
@@ -18,11 +26,51 @@ from playwright.sync_api import (
     BrowserContext, 
     Page
 )
+from playwright.async_api import (
+    async_playwright,
+    Browser as AsyncBrowser,
+    BrowserContext as AsyncBrowserContext,
+    Page as AsyncPage
+)
 
 from config import env_manager
 from config.settings import Settings
 from core.log.logger import TestLogger
 from core.allure.allure_helper import AllureHelper
+from base.ui.screenshot_encoder import ScreenshotEncoder
+from base.ui.screenshot_writer import ScreenshotWriter
+from base.ui.screenshot_coordinator import ScreenshotCoordinator
+from base.ui.async_runner import AsyncRunner
+from base.ui.auth_state import AuthStateCache, LoginFunction
+from base.ui.context_pool import ContextPool, apply_default_timeouts, build_context_options
+from base.ui.multi_page import run_on_pages
+from base.ui.wait_strategy import WaitStats
+from base.ui.trace_recorder import TraceRecorder
+from base.ui.page_metrics import PageMetrics
+from base.ui.selector_profiler import SelectorProfiler
+from base.ui.har_replay import apply_har, har_path_for, resolve_har_mode
+from base.ui.network_profiles import NetworkProfileRouter, get_network_profile
+from base.ui.pages.panji.login_page import LoginPage
+
+
+def _build_launch_options() -> Dict:
+    """
+    根据配置生成浏览器启动参数（内部函数，同步和异步浏览器共用）
+    """
+    launch_options = {
+        "headless": Settings.HEADLESS,
+        "timeout": Settings.BROWSER_TIMEOUT,
+    }
+    
+    # 添加浏览器启动参数
+    if Settings.BROWSER_ARGS:
+        launch_options["args"] = Settings.BROWSER_ARGS
+    
+    # 添加开发者工具选项
+    if Settings.DEVTOOLS:
+        launch_options["devtools"] = Settings.DEVTOOLS
+    
+    return launch_options
 
 
 @pytest.fixture(scope="session")
@@ -66,22 +114,8 @@ def browser(playwright_instance: Playwright) -> Generator[Browser, None, None]:
     
     logger.info(f"Launching {Settings.BROWSER_TYPE} browser (headless={Settings.HEADLESS})")
     
-    # 准备浏览器启动参数
-    launch_options = {
-        "headless": Settings.HEADLESS,
-        "timeout": Settings.BROWSER_TIMEOUT,
-    }
-    
-    # 添加浏览器启动参数
-    if Settings.BROWSER_ARGS:
-        launch_options["args"] = Settings.BROWSER_ARGS
-    
-    # 添加开发者工具选项
-    if Settings.DEVTOOLS:
-        launch_options["devtools"] = Settings.DEVTOOLS
-    
     # 启动浏览器
-    browser = browser_type.launch(**launch_options)
+    browser = browser_type.launch(**_build_launch_options())
     
     logger.info(f"Browser launched successfully: {Settings.BROWSER_TYPE}")
     
@@ -99,40 +133,271 @@ def ui_env():
     return env
 
 
+@pytest.fixture(scope="session")
+def context_pool(browser: Browser) -> Generator[Optional[ContextPool], None, None]:
+    """
+    Session-scoped 浏览器上下文池 fixture
+    
+    启用 BROWSER_POOL_ENABLED 时在会话开始时预热上下文池（pytest-xdist 下每个 worker 各自一个池），
+    未启用时返回 None。
+    
+    Args:
+        browser: 浏览器实例
+        
+    Yields:
+        Optional[ContextPool]: 上下文池，未启用时为 None
+    """
+    if not Settings.BROWSER_POOL_ENABLED:
+        yield None
+        return
+    
+    logger = TestLogger.get_logger("ContextPoolFixture")
+    pool = ContextPool(browser, Settings.BROWSER_POOL_SIZE)
+    pool.warm_up()
+    
+    yield pool
+    
+    stats = pool.get_stats()
+    logger.info(
+        f"Context pool: {stats['created']} created, {stats['reused']} reused, "
+        f"{stats['discarded']} discarded"
+    )
+    pool.close()
+
+
+def _get_role_credentials(ui_env, role: str) -> Tuple[str, str]:
+    """
+    获取角色的登录账号（内部函数）
+
+    角色账号配置在环境配置文件的 ui_roles 中（{"admin": {"username": ..., "password": ...}}），
+    default 角色未配置时使用 ui_username / ui_password。
+    """
+    roles = ui_env.get("ui_roles") or {}
+    if role in roles:
+        return roles[role]["username"], roles[role]["password"]
+    if role == "default" and ui_env.get("ui_username"):
+        return ui_env.get("ui_username"), ui_env.get("ui_password")
+    raise ValueError(f"No credentials configured for UI role '{role}' (add it to ui_roles in the env config)")
+
+
+@pytest.fixture(scope="session")
+def auth_login(browser: Browser, ui_env) -> LoginFunction:
+    """
+    Session-scoped 登录函数 fixture
+    
+    通过登录页面登录指定角色并返回登录后的 storage state。
+    登录流程不同的项目可以在 conftest.py 中覆盖此 fixture。
+    
+    Args:
+        browser: 浏览器实例
+        ui_env: 环境配置
+        
+    Returns:
+        LoginFunction: 登录函数，接收角色名，返回 storage state
+    """
+    def login(role: str) -> Dict:
+        username, password = _get_role_credentials(ui_env, role)
+        login_context = browser.new_context(**build_context_options())
+        apply_default_timeouts(login_context)
+        try:
+            login_page = LoginPage(login_context.new_page())
+            login_page.open(ui_env.get("ui_base_url"))
+            login_page.login(username, password)
+            return login_context.storage_state()
+        finally:
+            login_context.close()
+    
+    return login
+
+
+@pytest.fixture(scope="session")
+def auth_state(auth_login: LoginFunction) -> AuthStateCache:
+    """
+    Session-scoped 登录状态缓存 fixture
+    
+    每个角色只登录一次，登录状态保存到 AUTH_STATE_DIR，在会话之间和 worker 之间共享。
+    
+    Args:
+        auth_login: 登录函数
+        
+    Returns:
+        AuthStateCache: 登录状态缓存
+    """
+    return AuthStateCache(auth_login)
+
+
+def _apply_network_profile(context: BrowserContext, request: pytest.FixtureRequest) -> Optional[NetworkProfileRouter]:
+    """
+    按 @pytest.mark.network_profile 标记或 NETWORK_PROFILE 配置拦截网络资源（内部函数）
+
+    Returns:
+        Optional[NetworkProfileRouter]: 使用 off 配置时返回 None
+    """
+    marker = request.node.get_closest_marker("network_profile")
+    name = marker.args[0] if marker is not None and marker.args else Settings.NETWORK_PROFILE
+    if name == "off":
+        return None
+    
+    ui_env = request.getfixturevalue("ui_env")
+    router = NetworkProfileRouter(get_network_profile(name, ui_env.get("network_profiles")))
+    router.apply(context)
+    return router
+
+
+def _log_network_profile(router: Optional[NetworkProfileRouter], logger) -> None:
+    """
+    记录网络资源拦截统计（内部函数）
+    """
+    if router is not None:
+        logger.debug(
+            f"Network profile '{router.profile.name}': "
+            f"{router.blocked} request(s) blocked, {router.allowed} allowed"
+        )
+
+
+def _resolve_har(request: pytest.FixtureRequest) -> Tuple[Path, str, Optional[str]]:
+    """
+    按 @pytest.mark.har 标记和 HAR_MODE 配置确定 HAR 文件、模式和范围（内部函数）
+
+    @pytest.mark.har("login_page", mode="replay", scope="api")：名称用于多个测试共享同一页面的 HAR，
+    mode 和 scope 覆盖配置文件中的设置。
+
+    Returns:
+        Tuple[Path, str, Optional[str]]: (HAR 文件路径, off/record/replay, 范围)
+    """
+    marker = request.node.get_closest_marker("har")
+    name = marker.args[0] if marker is not None and marker.args else None
+    mode = marker.kwargs.get("mode") if marker is not None else None
+    scope = marker.kwargs.get("scope") if marker is not None else None
+    if marker is None and Settings.HAR_MODE == "off":
+        return Path(), "off", None
+    
+    har_path = har_path_for(request.node.nodeid, name)
+    return har_path, resolve_har_mode(har_path, mode), scope
+
+
+def _start_trace(context: BrowserContext, request: pytest.FixtureRequest) -> Optional[TraceRecorder]:
+    """
+    TRACE_MODE 不为 off 时开始录制当前测试的 trace 分块（内部函数）
+    """
+    if Settings.TRACE_MODE == "off":
+        return None
+    recorder = TraceRecorder.for_context(context)
+    recorder.start_chunk(request.node.nodeid)
+    return recorder
+
+
+def _finish_trace(
+    recorder: Optional[TraceRecorder],
+    request: pytest.FixtureRequest,
+    failed: bool,
+    close: bool
+) -> None:
+    """
+    结束当前测试的 trace 分块，测试失败时将保存的 trace 附加到 Allure（内部函数）
+    
+    Args:
+        recorder: trace 录制实例，未录制时为 None
+        request: Pytest 请求对象
+        failed: 测试是否失败
+        close: 上下文是否即将关闭（关闭时停止 tracing）
+    """
+    if recorder is None:
+        return
+    try:
+        saved = recorder.stop_chunk(failed)
+        if failed:
+            for path in saved:
+                AllureHelper.attach_trace(str(path), f"Trace - {path.stem}")
+    except Exception as e:
+        TestLogger.get_logger("ContextFixture").warning(f"Failed to save trace for {request.node.nodeid}: {e}")
+    finally:
+        if close:
+            recorder.close()
+
+
 @pytest.fixture(scope="function")
-def context(browser: Browser) -> Generator[BrowserContext, None, None]:
+def context(
+    browser: Browser,
+    context_pool: Optional[ContextPool],
+    request: pytest.FixtureRequest
+) -> Generator[BrowserContext, None, None]:
     """
     Function-scoped 浏览器上下文 fixture
     
     为每个测试创建独立的浏览器上下文，确保测试之间的隔离。
     上下文包含独立的 cookies、localStorage 等状态。
+    启用上下文池时从池中取出已重置的上下文，测试结束后归还（测试失败时不重用）；
+    使用 @pytest.mark.fresh_context 标记的测试始终使用新建的上下文。
+    使用 @pytest.mark.auth_role("admin") 标记的测试使用该角色缓存的登录状态创建已登录的上下文
+    （不使用上下文池；不指定角色时为 default）。
+    使用 @pytest.mark.network_profile("lean") 标记的测试按该配置拦截网络资源（默认使用 NETWORK_PROFILE）。
+    HAR_MODE 不为 off（或 @pytest.mark.har 指定了 mode）时录制或回放 HAR（录制时不使用上下文池，
+    HAR 文件在上下文关闭时写入）。
+    TRACE_MODE 不为 off 时每个测试录制一个 trace 分块，测试失败时保存并附加到 Allure。
     
     Args:
         browser: 浏览器实例
+        context_pool: 上下文池，未启用时为 None
+        request: Pytest 请求对象
         
     Yields:
         BrowserContext: 浏览器上下文
     """
     logger = TestLogger.get_logger("ContextFixture")
+    auth_marker = request.node.get_closest_marker("auth_role")
+    har_path, har_mode, har_scope = _resolve_har(request)
+    
+    if (
+        context_pool is not None
+        and auth_marker is None
+        and har_mode != "record"
+        and request.node.get_closest_marker("fresh_context") is None
+    ):
+        entry = context_pool.acquire()
+        logger.debug(f"Acquired browser context from pool (use #{entry.uses})")
+        router = _apply_network_profile(entry.context, request)
+        if har_mode == "replay":
+            apply_har(entry.context, har_path, har_mode, har_scope)
+            logger.debug(f"Replaying HAR: {har_path}")
+        
+        recorder = _start_trace(entry.context, request)
+        
+        yield entry.context
+        
+        _log_network_profile(router, logger)
+        failed = hasattr(request.node, 'rep_call') and request.node.rep_call.failed
+        _finish_trace(recorder, request, failed, close=failed)
+        context_pool.release(entry, reusable=not failed)
+        logger.debug("Browser context returned to pool")
+        return
+    
     logger.debug("Creating new browser context")
     
     # 创建浏览器上下文，配置视口大小
-    context = browser.new_context(
-        viewport={
-            "width": Settings.VIEWPORT_WIDTH,
-            "height": Settings.VIEWPORT_HEIGHT
-        },
-        ignore_https_errors=not Settings.VERIFY_SSL,
-    )
+    context_options = build_context_options()
+    if auth_marker is not None:
+        role = auth_marker.args[0] if auth_marker.args else "default"
+        context_options["storage_state"] = request.getfixturevalue("auth_state").get(role)
+        logger.debug(f"Using cached storage state for role: {role}")
+    context = browser.new_context(**context_options)
     
     # 设置默认超时
-    context.set_default_timeout(Settings.BROWSER_TIMEOUT)
-    context.set_default_navigation_timeout(Settings.PAGE_LOAD_TIMEOUT)
+    apply_default_timeouts(context)
+    router = _apply_network_profile(context, request)
+    if har_mode != "off":
+        apply_har(context, har_path, har_mode, har_scope)
+        logger.debug(f"{'Recording' if har_mode == 'record' else 'Replaying'} HAR: {har_path}")
     
     logger.debug(f"Browser context created with viewport {Settings.VIEWPORT_WIDTH}x{Settings.VIEWPORT_HEIGHT}")
+    recorder = _start_trace(context, request)
     
     yield context
     
+    _log_network_profile(router, logger)
+    failed = hasattr(request.node, 'rep_call') and request.node.rep_call.failed
+    _finish_trace(recorder, request, failed, close=True)
+    
     # 清理：关闭上下文
     logger.debug("Closing browser context")
     context.close()
@@ -140,15 +405,20 @@ def context(browser: Browser) -> Generator[BrowserContext, None, None]:
 
 
 @pytest.fixture(scope="function")
-def page(context: BrowserContext, request: pytest.FixtureRequest) -> Generator[Page, None, None]:
+def page(
+    context: BrowserContext,
+    context_pool: Optional[ContextPool],
+    request: pytest.FixtureRequest
+) -> Generator[Page, None, None]:
     """
     Function-scoped 页面 fixture
     
-    为每个测试创建新的页面实例。
+    为每个测试创建新的页面实例（上下文来自上下文池时使用池中预先创建的页面）。
     测试失败或异常时自动截图并附加到 Allure 报告。
     
     Args:
         context: 浏览器上下文
+        context_pool: 上下文池，未启用时为 None
         request: Pytest 请求对象，用于获取测试信息
         
     Yields:
@@ -159,8 +429,9 @@ def page(context: BrowserContext, request: pytest.FixtureRequest) -> Generator[P
     
     logger.debug(f"Creating new page for test: {test_name}")
     
-    # 创建新页面
-    page = context.new_page()
+    # 创建新页面（池中的上下文已有就绪的页面，由上下文池负责重置）
+    pooled_page = context_pool.page_for(context) if context_pool is not None else None
+    page = pooled_page or context.new_page()
     
     logger.debug(f"Page created for test: {test_name}")
     
@@ -177,34 +448,97 @@ def page(context: BrowserContext, request: pytest.FixtureRequest) -> Generator[P
         logger.error(f"Error in page fixture teardown: {e}")
     finally:
         # 清理：关闭页面
-        logger.debug(f"Closing page for test: {test_name}")
-        page.close()
-        logger.debug(f"Page closed for test: {test_name}")
+        if pooled_page is None:
+            logger.debug(f"Closing page for test: {test_name}")
+            page.close()
+            logger.debug(f"Page closed for test: {test_name}")
+
+
+@pytest.fixture(scope="function")
+def multi_pages(
+    browser: Browser,
+    context: BrowserContext
+) -> Generator[Callable[..., List[Page]], None, None]:
+    """
+    Function-scoped 多页面 fixture
+    
+    返回一个打开多个页面的函数，配合 run_on_pages 在这些页面上执行操作：
+        pages = multi_pages(5)                  # 在测试的上下文中打开 5 个页面
+        pages = multi_pages(5, isolated=True)   # 每个页面使用独立的上下文（不共享 cookies 和存储）
+    测试结束后关闭所有页面和独立上下文。需要并发驱动多个页面时使用 async_context fixture。
+    
+    Args:
+        browser: 浏览器实例
+        context: 浏览器上下文
+        
+    Yields:
+        Callable[..., List[Page]]: 打开页面的函数
+    """
+    logger = TestLogger.get_logger("MultiPageFixture")
+    opened_pages: List[Page] = []
+    opened_contexts: List[BrowserContext] = []
+    
+    def new_isolated_page(_: Browser) -> Page:
+        isolated_context = browser.new_context(**build_context_options())
+        apply_default_timeouts(isolated_context)
+        opened_contexts.append(isolated_context)
+        return isolated_context.new_page()
+    
+    def open_pages(count: int, isolated: bool = False) -> List[Page]:
+        if isolated:
+            results = run_on_pages([browser] * count, new_isolated_page)
+        else:
+            results = run_on_pages([context] * count, lambda ctx: ctx.new_page())
+        opened_pages.extend(result.value for result in results if result.ok)
+        for result in results:
+            if not result.ok:
+                raise result.error
+        pages = [result.value for result in results]
+        logger.debug(f"Opened {count} page(s) ({'isolated contexts' if isolated else 'shared context'})")
+        return pages
+    
+    yield open_pages
+    
+    for opened_page in opened_pages:
+        try:
+            opened_page.close()
+        except Exception as e:
+            logger.debug(f"Failed to close page: {e}")
+    for opened_context in opened_contexts:
+        try:
+            opened_context.close()
+        except Exception as e:
+            logger.debug(f"Failed to close isolated context: {e}")
 
 
 @pytest.fixture(scope="function", autouse=True)
-def auto_screenshot_on_failure(request: pytest.FixtureRequest, page: Page) -> Generator[None, None, None]:
+def auto_screenshot_on_failure(request: pytest.FixtureRequest) -> Generator[None, None, None]:
     """
     自动截图 fixture（失败时）
     
     当测试失败或抛出异常时，自动捕获截图并附加到 Allure 报告。
-    此 fixture 自动应用于所有使用 page fixture 的测试。
+    此 fixture 自动应用于所有使用 page fixture 的测试；不使用 page 的测试（如只使用 async_page 的异步测试）
+    不会因此启动同步浏览器。
     
     Args:
         request: Pytest 请求对象
-        page: 页面实例
         
     Yields:
         None
     """
+    if "page" not in request.fixturenames:
+        yield
+        return
+    
     logger = TestLogger.get_logger("AutoScreenshot")
     test_name = request.node.name
+    page = request.getfixturevalue("page")
     
     # 测试执行前不做任何操作
     yield
     
-    # 测试执行后检查是否需要截图
-    if not Settings.SCREENSHOT_ON_FAILURE:
+    # 测试执行后检查是否需要截图（截图只用于附加到 Allure，未启用 Allure 时跳过）
+    if not Settings.SCREENSHOT_ON_FAILURE or not AllureHelper.is_enabled():
         return
     
     try:
@@ -240,6 +574,25 @@ def pytest_runtest_makereport(item, call):
     setattr(item, f"rep_{rep.when}", rep)
 
 
+@pytest.hookimpl(hookwrapper=True)
+def pytest_runtest_teardown(item, nextitem):
+    """
+    Pytest hook: 测试清理阶段结束后等待后台写入的截图全部写出，并清空当前测试的失败截图缓存
+    
+    失败截图在 fixture 清理阶段产生，所有 fixture 清理完成后再等待，截图写入与其他清理操作重叠。
+    
+    Args:
+        item: 测试项
+        nextitem: 下一个测试项
+    """
+    yield
+    ScreenshotCoordinator.end_test()
+    if not ScreenshotWriter.flush(timeout=Settings.BROWSER_TIMEOUT / 1000):
+        TestLogger.get_logger("ScreenshotWriter").warning(
+            f"Timed out waiting for screenshots of {item.nodeid} to be written"
+        )
+
+
 def _capture_failure_screenshot(page: Page, test_name: str, failure_type: str) -> None:
     """
     捕获失败截图的辅助函数
@@ -261,16 +614,18 @@ def _capture_failure_screenshot(page: Page, test_name: str, failure_type: str) -
         
         logger.info(f"Capturing screenshot: {screenshot_name}")
         
-        # 捕获截图
-        screenshot_bytes = page.screenshot(
-            type=Settings.SCREENSHOT_FORMAT,
-            full_page=False
-        )
+        # 捕获截图并按配置编码；当前测试中同一页面状态已截图时（如 BasePage 操作失败时）不再重复截图和附加
+        failure_screenshot = ScreenshotCoordinator.capture(page)
+        if failure_screenshot.reused:
+            logger.info(f"Page unchanged since last failure screenshot, skipping: {screenshot_name}")
+            return
+        screenshot = failure_screenshot.screenshot
         
-        # 附加到 Allure 报告
+        # 附加到 Allure 报告（启用 SCREENSHOT_ASYNC_WRITE 时附件文件在后台写入）
         AllureHelper.attach_screenshot(
-            screenshot_bytes,
-            name=f"Failure Screenshot - {test_name}"
+            screenshot.data,
+            name=f"Failure Screenshot - {test_name}",
+            background=ScreenshotWriter.is_async() or None
         )
         
         logger.info(f"Screenshot captured and attached to Allure: {screenshot_name}")
@@ -279,6 +634,128 @@ def _capture_failure_screenshot(page: Page, test_name: str, failure_type: str) -
         logger.error(f"Failed to capture failure screenshot for {test_name}: {e}")
 
 
+@pytest.fixture(scope="session")
+def async_runner() -> Generator[AsyncRunner, None, None]:
+    """
+    Session-scoped 事件循环 fixture
+    
+    异步浏览器、上下文和页面都绑定在这个事件循环上，测试通过 async_runner.run(...) 运行协程。
+    
+    Yields:
+        AsyncRunner: 运行器
+    """
+    runner = AsyncRunner()
+    yield runner
+    runner.close()
+
+
+@pytest.fixture(scope="session")
+def async_browser(async_runner: AsyncRunner) -> Generator[AsyncBrowser, None, None]:
+    """
+    Session-scoped 异步浏览器 fixture
+    
+    使用 Playwright 异步 API 启动浏览器，启动参数与 browser fixture 相同。
+    
+    Args:
+        async_runner: 事件循环
+        
+    Yields:
+        AsyncBrowser: 异步 API 的浏览器实例
+    """
+    logger = TestLogger.get_logger("AsyncBrowserFixture")
+    logger.info(f"Launching async {Settings.BROWSER_TYPE} browser (headless={Settings.HEADLESS})")
+    
+    playwright = async_runner.run(async_playwright().start())
+    browser_type = getattr(playwright, Settings.BROWSER_TYPE)
+    browser = async_runner.run(browser_type.launch(**_build_launch_options()))
+    
+    logger.info(f"Async browser launched successfully: {Settings.BROWSER_TYPE}")
+    
+    yield browser
+    
+    logger.info("Closing async browser")
+    async_runner.run(browser.close())
+    async_runner.run(playwright.stop())
+    logger.info("Async browser closed successfully")
+
+
+@pytest.fixture(scope="function")
+def async_context(
+    async_browser: AsyncBrowser,
+    async_runner: AsyncRunner
+) -> Generator[AsyncBrowserContext, None, None]:
+    """
+    Function-scoped 异步浏览器上下文 fixture
+    
+    为每个测试创建独立的上下文，测试可以在其中并发打开多个页面（见 gather_pages）。
+    上下文池、登录状态缓存、网络资源拦截和 HAR 只作用于同步的 context fixture。
+    
+    Args:
+        async_browser: 异步浏览器实例
+        async_runner: 事件循环
+        
+    Yields:
+        AsyncBrowserContext: 异步 API 的浏览器上下文
+    """
+    context = async_runner.run(async_browser.new_context(**build_context_options()))
+    apply_default_timeouts(context)
+    
+    yield context
+    
+    async_runner.run(context.close())
+
+
+@pytest.fixture(scope="function")
+def async_page(
+    async_context: AsyncBrowserContext,
+    async_runner: AsyncRunner,
+    request: pytest.FixtureRequest
+) -> Generator[AsyncPage, None, None]:
+    """
+    Function-scoped 异步页面 fixture
+    
+    测试失败时自动截图并附加到 Allure 报告。
+    
+    Args:
+        async_context: 异步浏览器上下文
+        async_runner: 事件循环
+        request: Pytest 请求对象
+        
+    Yields:
+        AsyncPage: 异步 API 的页面实例
+    """
+    page = async_runner.run(async_context.new_page())
+    
+    yield page
+    
+    failed = hasattr(request.node, 'rep_call') and request.node.rep_call.failed
+    if failed and Settings.SCREENSHOT_ON_FAILURE and AllureHelper.is_enabled():
+        async_runner.run(_capture_failure_screenshot_async(page, request.node.name, "failure"))
+    async_runner.run(page.close())
+
+
+async def _capture_failure_screenshot_async(page: AsyncPage, test_name: str, failure_type: str) -> None:
+    """
+    _capture_failure_screenshot 的异步版本（内部函数）
+    """
+    logger = TestLogger.get_logger("ScreenshotCapture")
+    
+    try:
+        failure_screenshot = await ScreenshotCoordinator.capture_async(page)
+        if failure_screenshot.reused:
+            logger.info(f"Page unchanged since last failure screenshot, skipping: {test_name}_{failure_type}")
+            return
+        screenshot = failure_screenshot.screenshot
+        AllureHelper.attach_screenshot(
+            screenshot.data,
+            name=f"Failure Screenshot - {test_name}",
+            background=ScreenshotWriter.is_async() or None
+        )
+        logger.info(f"Screenshot captured and attached to Allure: {test_name}_{failure_type}")
+    except Exception as e:
+        logger.error(f"Failed to capture failure screenshot for {test_name}: {e}")
+
+
 @pytest.fixture(scope="function")
 def ui_logger(request: pytest.FixtureRequest) -> TestLogger:
     """
@@ -297,7 +774,7 @@ def ui_logger(request: pytest.FixtureRequest) -> TestLogger:
 
 
 @pytest.fixture(scope="session", autouse=True)
-def setup_test_environment():
+def setup_test_environment(request: pytest.FixtureRequest):
     """
     测试环境设置 fixture
     
@@ -336,6 +813,43 @@ def setup_test_environment():
     # 测试会话结束时的清理
     logger.info("Test session completed")
     
+    # 输出失败截图的复用情况
+    screenshot_stats = ScreenshotCoordinator.get_stats()
+    if screenshot_stats["captured"] or screenshot_stats["reused"]:
+        logger.info(
+            f"Failure screenshots: {screenshot_stats['captured']} captured, "
+            f"{screenshot_stats['reused']} duplicate(s) skipped"
+        )
+    
+    # 停止截图编码线程池，写入剩余截图
+    ScreenshotEncoder.shutdown()
+    ScreenshotWriter.shutdown()
+    
+    # 输出总耗时最长的等待
+    wait_report = WaitStats.format_report()
+    if wait_report:
+        logger.info(f"Slowest waits:\n{wait_report}")
+    
+    # 输出最慢和结构有问题的选择器
+    selector_report = SelectorProfiler.format_report()
+    if selector_report:
+        logger.info(f"Slowest selectors:\n{selector_report}")
+    
+    # 输出页面性能指标报告，与基线对比；xdist worker 将样本交给控制进程合并后统一输出
+    if hasattr(request.config, 'workerinput'):
+        request.config.workeroutput['page_metrics'] = PageMetrics.export_samples()
+    else:
+        PageMetrics.log_report(logger)
+    
+    # 输出 trace 统计并删除环形缓冲区中的分块
+    if Settings.TRACE_MODE != "off":
+        trace_stats = TraceRecorder.get_stats()
+        logger.info(
+            f"Trace: {trace_stats['chunks']} chunk(s) recorded, {trace_stats['saved']} saved, "
+            f"overhead {trace_stats['overhead']:.2f}s"
+        )
+        TraceRecorder.cleanup()
+    
     # 附加日志到 Allure
     try:
         TestLogger.attach_log_to_allure()
@@ -0,0 +1,87 @@
+"""
+HAR 录制与回放模块
+
+依赖真实后端的 UI 测试既慢又不稳定。该模块基于 Playwright 的 route_from_har，
+按测试（或按页面，见 @pytest.mark.har）录制 HAR 文件，之后从本地 HAR 文件回放网络请求：
+- HAR_MODE=record: 访问真实后端并录制 HAR（上下文关闭时写入文件）
+- HAR_MODE=replay: 从 HAR 文件回放，HAR 文件不存在时测试失败
+- HAR_MODE=auto: HAR 文件存在时回放，否则录制
+- HAR_SCOPE=full: 录制/回放所有请求，测试完全离线运行
+- HAR_SCOPE=api: 只录制/回放匹配 HAR_API_URL_PATTERN 的接口请求（XHR/fetch），
+  前端资源仍从真实服务器加载
+回放时 HAR 中没有的请求按 HAR_NOT_FOUND 处理：abort（中止，保证离线）或 fallback（访问真实网络）。
+"""
+
+import re
+from pathlib import Path
+from typing import Optional
+
+from playwright.sync_api import BrowserContext
+
+from config.settings import Settings
+
+
+HAR_MODES = ("off", "record", "replay", "auto")
+HAR_SCOPES = ("full", "api")
+
+
+def har_path_for(nodeid: str, name: Optional[str] = None) -> Path:
+    """
+    获取测试的 HAR 文件路径
+
+    Args:
+        nodeid: 测试的 nodeid（如 tests/ui/test_login_page.py::TestLoginPage::test_login）
+        name: HAR 名称（来自 @pytest.mark.har，多个测试共享同一页面的 HAR），为 None 时按测试命名
+
+    Returns:
+        Path: HAR 文件路径（HAR_DIR/<测试模块>/<名称>.har）
+    """
+    module, _, test = nodeid.partition("::")
+    module_dir = Path(module).with_suffix("")
+    file_name = re.sub(r"[^\w.-]+", "_", name or test or module)
+    return Path(Settings.HAR_DIR) / module_dir / f"{file_name}.har"
+
+
+def resolve_har_mode(har_path: Path, mode: Optional[str] = None) -> str:
+    """
+    确定实际使用的 HAR 模式
+
+    Args:
+        har_path: HAR 文件路径
+        mode: HAR 模式，如果为 None 则使用配置文件中的设置
+
+    Returns:
+        str: off, record 或 replay（auto 按 HAR 文件是否存在解析为 replay 或 record）
+    """
+    mode = mode or Settings.HAR_MODE
+    if mode == "auto":
+        return "replay" if har_path.exists() else "record"
+    return mode
+
+
+def apply_har(context: BrowserContext, har_path: Path, mode: str, scope: Optional[str] = None) -> None:
+    """
+    在浏览器上下文上录制或回放 HAR
+
+    录制模式下 HAR 文件在上下文关闭时写入。
+
+    Args:
+        context: 浏览器上下文
+        har_path: HAR 文件路径
+        mode: record 或 replay
+        scope: full 或 api，如果为 None 则使用配置文件中的设置
+
+    Raises:
+        FileNotFoundError: 回放模式下 HAR 文件不存在
+    """
+    scope = scope or Settings.HAR_SCOPE
+    url = Settings.HAR_API_URL_PATTERN if scope == "api" else None
+
+    if mode == "record":
+        har_path.parent.mkdir(parents=True, exist_ok=True)
+        # minimal 只记录回放需要的信息，HAR 文件更小、回放时解析更快
+        context.route_from_har(har_path, url=url, update=True, update_content="embed", update_mode="minimal")
+    elif mode == "replay":
+        if not har_path.exists():
+            raise FileNotFoundError(f"HAR file not found: {har_path} (record it first with HAR_MODE=record or auto)")
+        context.route_from_har(har_path, url=url, not_found=Settings.HAR_NOT_FOUND)
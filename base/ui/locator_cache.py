@@ -0,0 +1,88 @@
+"""
+定位器缓存模块
+
+BasePage 的每个操作都通过 page.locator(selector) 重新创建 Locator 对象，同一个页面对象反复操作同一批元素，
+每次都要重新创建对象并记录到 Playwright 的对象映射中。Locator 本身是惰性的（每次操作时才在页面中查找元素），
+与页面是否重新导航无关，因此可以按页面和选择器缓存，整个页面生命周期内复用。
+
+缓存保存在 Page 对象的属性上（Locator 引用所属的页面，不能以页面为弱引用键保存在全局字典中，否则页面永远不会被回收），
+页面关闭并被回收后缓存随之释放；同一页面上的多个页面对象共享同一份缓存。
+"""
+
+import threading
+from typing import Dict
+
+from playwright.sync_api import Locator, Page
+
+
+# 页面上保存缓存的属性名
+_CACHE_ATTRIBUTE = "_base_page_locator_cache"
+
+
+class LocatorCache:
+    """
+    按页面和选择器缓存 Locator
+
+    所有方法都是类方法，缓存保存在各个页面上，统计在同一进程内共享。
+    """
+
+    _lock = threading.Lock()
+    _stats = {"hits": 0, "misses": 0}
+
+    @classmethod
+    def get(cls, page: Page, selector: str) -> Locator:
+        """
+        获取页面上选择器对应的 Locator，不存在时创建并缓存
+
+        Args:
+            page: Playwright Page 对象
+            selector: 元素选择器（CSS、XPath 等）
+
+        Returns:
+            Locator: 定位器
+        """
+        with cls._lock:
+            locators: Dict[str, Locator] = getattr(page, _CACHE_ATTRIBUTE, None)
+            if locators is None:
+                locators = {}
+                setattr(page, _CACHE_ATTRIBUTE, locators)
+            locator = locators.get(selector)
+            if locator is not None:
+                cls._stats["hits"] += 1
+                return locator
+            cls._stats["misses"] += 1
+
+        locator = page.locator(selector)
+        with cls._lock:
+            return locators.setdefault(selector, locator)
+
+    @classmethod
+    def clear(cls, page: Page) -> None:
+        """
+        清空页面的缓存
+
+        Args:
+            page: Playwright Page 对象
+        """
+        with cls._lock:
+            if hasattr(page, _CACHE_ATTRIBUTE):
+                delattr(page, _CACHE_ATTRIBUTE)
+
+    @classmethod
+    def get_stats(cls) -> dict:
+        """
+        获取缓存统计
+
+        Returns:
+            dict: hits（命中次数）、misses（创建次数）
+        """
+        with cls._lock:
+            return dict(cls._stats)
+
+    @classmethod
+    def reset_stats(cls) -> None:
+        """
+        清空缓存统计
+        """
+        with cls._lock:
+            cls._stats.update(hits=0, misses=0)
@@ -0,0 +1,89 @@
+"""
+多页面执行模块
+
+同步 API 的测试需要检查多个独立页面时，run_on_pages 在每个页面上执行同一个页面对象操作，
+收集每个页面的结果、异常和耗时：一个页面失败不会中断其他页面，所有页面执行完后再统一断言或抛出。
+
+同步 API 的调用会阻塞测试线程，多个页面只能逐个执行，总耗时是每个页面耗时之和。
+需要并发驱动多个页面时使用异步 API：AsyncBasePage 配合 async_context fixture 和 gather_pages
+（见 base/ui/pages/async_base_page.py），一个页面等待导航或元素时其他页面继续执行。
+"""
+
+import time
+from dataclasses import dataclass
+from typing import Any, Callable, Generic, List, Optional, Sequence, TypeVar
+
+from core.log.logger import TestLogger
+
+
+T = TypeVar("T")
+
+
+@dataclass
+class PageResult(Generic[T]):
+    """
+    单个页面的执行结果
+    """
+
+    index: int
+    target: Any
+    value: Optional[T] = None
+    error: Optional[BaseException] = None
+    duration: float = 0.0
+
+    @property
+    def ok(self) -> bool:
+        """
+        操作是否成功完成
+        """
+        return self.error is None
+
+
+def run_on_pages(
+    targets: Sequence[Any],
+    action: Callable[[Any], T],
+    raise_on_failure: bool = False
+) -> List[PageResult[T]]:
+    """
+    在多个页面上依次执行同一个操作
+
+    Args:
+        targets: 页面或页面对象
+        action: 页面操作，接收 targets 中的一项，返回该页面的结果
+        raise_on_failure: 为 True 时在所有操作结束后重新抛出第一个失败页面的异常
+
+    Returns:
+        List[PageResult[T]]: 按 targets 顺序排列的结果，失败的页面 error 不为 None
+
+    使用示例:
+        pages = [ExamplePage(page) for page in multi_pages(5)]
+        results = run_on_pages(pages, lambda p: (p.navigate(url), p.get_title())[1])
+        assert all(result.ok for result in results)
+    """
+    results = [PageResult(index, target) for index, target in enumerate(targets)]
+    if not results:
+        return results
+
+    logger = TestLogger.get_logger("MultiPage")
+    start_time = time.perf_counter()
+    for result in results:
+        start = time.perf_counter()
+        try:
+            result.value = action(result.target)
+        except Exception as e:
+            # KeyboardInterrupt、pytest 的超时等不属于页面失败，直接向上抛出
+            result.error = e
+        finally:
+            result.duration = time.perf_counter() - start
+
+    failures = [result for result in results if not result.ok]
+    logger.info(
+        f"Ran action on {len(results)} page(s) in {time.perf_counter() - start_time:.2f}s "
+        f"(slowest {max(result.duration for result in results):.2f}s, {len(failures)} failed)"
+    )
+    for result in failures:
+        logger.warning(f"Page #{result.index} failed: {result.error!r}")
+
+    if raise_on_failure and failures:
+        raise failures[0].error
+    return results
@@ -0,0 +1,210 @@
+"""
+网络资源拦截配置模块
+
+UI 测试加载的字体、图片、视频和统计脚本通常不会被任何断言使用，却占用了大部分页面加载时间和流量。
+该模块提供基于 Playwright 路由的网络配置（profile），按资源类型或 URL 模式拦截请求：
+- off: 不拦截（默认）
+- lean: 拦截图片、媒体、字体以及常见的统计/广告脚本
+- minimal: 在 lean 的基础上再拦截样式表（只适合不依赖布局和可见性的测试）
+
+自定义配置可以写在环境配置文件的 network_profiles 中，或通过 NETWORK_PROFILES 环境变量（JSON）提供：
+    {"no-video": {"block_resource_types": ["media"], "block_url_patterns": ["*youtube.com*"],
+                  "allow_url_patterns": []}}
+URL 模式使用 fnmatch 语法，allow_url_patterns 中的 URL 始终放行。
+"""
+
+import fnmatch
+import json
+import re
+import threading
+from dataclasses import dataclass, field
+from typing import Any, Dict, FrozenSet, Optional, Tuple
+
+from playwright.sync_api import BrowserContext, Route
+
+from config.settings import Settings
+
+
+# 常见的统计、广告和埋点服务
+ANALYTICS_URL_PATTERNS = (
+    "*google-analytics.com*",
+    "*googletagmanager.com*",
+    "*doubleclick.net*",
+    "*googlesyndication.com*",
+    "*hotjar.com*",
+    "*segment.io*",
+    "*sentry.io*",
+    "*hm.baidu.com*",
+    "*cnzz.com*",
+)
+
+
+@dataclass(frozen=True)
+class NetworkProfile:
+    """
+    网络资源拦截配置
+    """
+
+    name: str
+    block_resource_types: FrozenSet[str] = frozenset()
+    block_url_patterns: Tuple[str, ...] = ()
+    allow_url_patterns: Tuple[str, ...] = ()
+    _block_url_regex: Optional[re.Pattern] = field(default=None, init=False, repr=False, compare=False)
+    _allow_url_regex: Optional[re.Pattern] = field(default=None, init=False, repr=False, compare=False)
+
+    def __post_init__(self):
+        # 多个 fnmatch 模式合并为一个正则，每个请求只匹配一次
+        object.__setattr__(self, "_block_url_regex", compile_url_patterns(self.block_url_patterns))
+        object.__setattr__(self, "_allow_url_regex", compile_url_patterns(self.allow_url_patterns))
+
+    @property
+    def enabled(self) -> bool:
+        """
+        是否需要拦截任何请求
+        """
+        return bool(self.block_resource_types or self.block_url_patterns)
+
+    def should_block(self, resource_type: str, url: str) -> bool:
+        """
+        判断请求是否应被拦截
+
+        Args:
+            resource_type: 请求的资源类型（image, media, font, stylesheet, script, xhr 等）
+            url: 请求 URL
+
+        Returns:
+            bool: 需要拦截时返回 True
+        """
+        if self._allow_url_regex is not None and self._allow_url_regex.match(url):
+            return False
+        if resource_type in self.block_resource_types:
+            return True
+        return self._block_url_regex is not None and self._block_url_regex.match(url) is not None
+
+    @classmethod
+    def from_dict(cls, name: str, data: Dict[str, Any]) -> "NetworkProfile":
+        """
+        从字典创建网络配置
+
+        Args:
+            name: 配置名称
+            data: 包含 block_resource_types、block_url_patterns、allow_url_patterns 的字典
+
+        Returns:
+            NetworkProfile: 网络配置
+        """
+        return cls(
+            name=name,
+            block_resource_types=frozenset(data.get("block_resource_types", ())),
+            block_url_patterns=tuple(data.get("block_url_patterns", ())),
+            allow_url_patterns=tuple(data.get("allow_url_patterns", ())),
+        )
+
+
+def compile_url_patterns(patterns: Tuple[str, ...]) -> Optional[re.Pattern]:
+    """
+    将多个 fnmatch 模式合并为一个正则
+
+    Args:
+        patterns: fnmatch 模式
+
+    Returns:
+        Optional[re.Pattern]: 合并后的正则，没有模式时返回 None
+    """
+    if not patterns:
+        return None
+    return re.compile("|".join(f"(?:{fnmatch.translate(pattern)})" for pattern in patterns))
+
+
+BUILTIN_PROFILES: Dict[str, NetworkProfile] = {
+    "off": NetworkProfile("off"),
+    "lean": NetworkProfile(
+        "lean",
+        block_resource_types=frozenset({"image", "media", "font"}),
+        block_url_patterns=ANALYTICS_URL_PATTERNS,
+    ),
+    "minimal": NetworkProfile(
+        "minimal",
+        block_resource_types=frozenset({"image", "media", "font", "stylesheet"}),
+        block_url_patterns=ANALYTICS_URL_PATTERNS,
+    ),
+}
+
+
+def get_network_profile(name: str, env_profiles: Optional[Dict[str, Any]] = None) -> NetworkProfile:
+    """
+    获取网络配置
+
+    查找顺序：NETWORK_PROFILES 环境变量 -> 环境配置文件的 network_profiles -> 内置配置
+
+    Args:
+        name: 配置名称
+        env_profiles: 环境配置文件中的 network_profiles
+
+    Returns:
+        NetworkProfile: 网络配置
+
+    Raises:
+        ValueError: 配置不存在
+    """
+    custom = json.loads(Settings.NETWORK_PROFILES) if Settings.NETWORK_PROFILES else {}
+    for profiles in (custom, env_profiles or {}):
+        if name in profiles:
+            return NetworkProfile.from_dict(name, profiles[name])
+    if name in BUILTIN_PROFILES:
+        return BUILTIN_PROFILES[name]
+
+    available = sorted(set(BUILTIN_PROFILES) | set(custom) | set(env_profiles or {}))
+    raise ValueError(f"Unknown network profile '{name}'. Available: {', '.join(available)}")
+
+
+class NetworkProfileRouter:
+    """
+    将网络配置应用到浏览器上下文，并统计拦截的请求数量
+    """
+
+    def __init__(self, profile: NetworkProfile):
+        """
+        初始化路由
+
+        Args:
+            profile: 网络配置
+        """
+        self.profile = profile
+        self.blocked = 0
+        self.allowed = 0
+        self._lock = threading.Lock()
+
+    def apply(self, context: BrowserContext) -> None:
+        """
+        在浏览器上下文上注册路由（profile 不拦截任何请求时不注册，避免路由本身的开销）
+
+        Args:
+            context: 浏览器上下文
+        """
+        if self.profile.enabled:
+            context.route("**/*", self.handle)
+
+    def remove(self, context: BrowserContext) -> None:
+        """
+        移除浏览器上下文上的路由
+
+        Args:
+            context: 浏览器上下文
+        """
+        if self.profile.enabled:
+            context.unroute("**/*", self.handle)
+
+    def handle(self, route: Route) -> None:
+        """
+        路由处理函数：拦截或放行请求
+        """
+        request = route.request
+        if self.profile.should_block(request.resource_type, request.url):
+            with self._lock:
+                self.blocked += 1
+            route.abort("blockedbyclient")
+        else:
+            with self._lock:
+                self.allowed += 1
+            route.fallback()
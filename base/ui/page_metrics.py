@@ -0,0 +1,308 @@
+"""
+页面性能指标模块
+
+BasePage.navigate 只记录导航是否成功，无法看出页面加载性能的变化趋势。
+启用 PAGE_METRICS_ENABLED（或 navigate(..., collect_metrics=True)）后，每次导航结束时通过浏览器的性能 API 采集：
+- Navigation Timing: ttfb（首字节）、dom_content_loaded、load（相对导航开始的毫秒数）
+- Paint Timing: fcp（首次内容绘制）
+- lcp（最大内容绘制）、cls（累计布局偏移），目前只有 Chromium 支持，其他浏览器为空
+- resources（资源数量）、transfer_bytes（页面及资源的传输字节数，跨域资源未设置 Timing-Allow-Origin 时为 0）
+
+PageMetrics 按 URL（不含查询参数）聚合整个会话的指标，会话结束时在日志中输出分位数报告，
+并与基线文件（PAGE_METRICS_BASELINE_FILE）对比：p75 超过基线 PAGE_METRICS_REGRESSION_TOLERANCE 比例的指标视为性能退化。
+PAGE_METRICS_UPDATE_BASELINE=true 时用本次会话的结果更新基线文件。
+
+使用 pytest-xdist 并行执行时，各 worker 结束时将原始样本通过 workeroutput 传回控制进程，
+由控制进程合并所有 worker 的样本后统一计算分位数、对比基线和更新基线文件，
+因此报告基于整个会话的样本，基线文件也只由控制进程写入一次。
+"""
+
+import json
+import logging
+import math
+import threading
+from pathlib import Path
+from typing import Dict, List, Optional
+from urllib.parse import urlsplit, urlunsplit
+
+from playwright.sync_api import Page
+
+from config.settings import Settings
+
+
+# 采集的指标名称，按报告中的顺序排列
+METRIC_NAMES = ("ttfb", "dom_content_loaded", "load", "fcp", "lcp", "cls", "resources", "transfer_bytes")
+
+# 报告和基线使用的分位数
+PERCENTILES = (50, 75, 95)
+
+# buffered 的 PerformanceObserver 在 observe 时同步放入已产生的条目，takeRecords 可以直接读取，
+# 因此不需要在页面加载前注入脚本
+METRICS_SCRIPT = """() => {
+    const round = value => value > 0 ? Math.round(value * 1000) / 1000 : null;
+    const buffered = type => {
+        try {
+            const observer = new PerformanceObserver(() => {});
+            observer.observe({type, buffered: true});
+            const entries = observer.takeRecords();
+            observer.disconnect();
+            return entries;
+        } catch (e) {
+            return null;
+        }
+    };
+    const navigation = performance.getEntriesByType('navigation')[0];
+    const resources = performance.getEntriesByType('resource');
+    const fcp = performance.getEntriesByType('paint').find(entry => entry.name === 'first-contentful-paint');
+    const lcp = buffered('largest-contentful-paint');
+    const shifts = buffered('layout-shift');
+    return {
+        ttfb: navigation ? round(navigation.responseStart) : null,
+        dom_content_loaded: navigation ? round(navigation.domContentLoadedEventEnd) : null,
+        load: navigation ? round(navigation.loadEventEnd) : null,
+        fcp: fcp ? round(fcp.startTime) : null,
+        lcp: lcp && lcp.length ? round(lcp[lcp.length - 1].startTime) : null,
+        cls: shifts ? shifts.filter(entry => !entry.hadRecentInput).reduce((total, entry) => total + entry.value, 0) : null,
+        resources: resources.length,
+        transfer_bytes: resources.concat(navigation ? [navigation] : [])
+            .reduce((total, entry) => total + (entry.transferSize || 0), 0),
+    };
+}"""
+
+
+def normalize_url(url: str) -> str:
+    """
+    去掉 URL 中的查询参数和片段，作为指标的聚合键
+
+    Args:
+        url: 页面 URL
+
+    Returns:
+        str: 聚合键
+    """
+    parts = urlsplit(url)
+    return urlunsplit((parts.scheme, parts.netloc, parts.path, "", ""))
+
+
+def percentile(values: List[float], percent: float) -> Optional[float]:
+    """
+    计算分位数（最近秩法）
+
+    Args:
+        values: 数值列表
+        percent: 分位数（0-100）
+
+    Returns:
+        Optional[float]: 分位数，列表为空时为 None
+    """
+    if not values:
+        return None
+    ordered = sorted(values)
+    rank = max(math.ceil(percent / 100 * len(ordered)), 1)
+    return ordered[rank - 1]
+
+
+class PageMetrics:
+    """
+    页面性能指标采集和统计
+
+    所有方法都是类方法，同一进程内共享统计数据。
+    """
+
+    _samples: Dict[str, Dict[str, List[float]]] = {}
+    _lock = threading.Lock()
+
+    @classmethod
+    def collect(cls, page: Page, url: Optional[str] = None) -> Optional[Dict[str, Optional[float]]]:
+        """
+        采集页面当前导航的性能指标并记录
+
+        采集失败（页面已关闭、浏览器不支持等）时只输出警告，不影响测试。
+
+        Args:
+            page: Playwright Page 对象
+            url: 聚合使用的 URL，如果为 None 则使用页面当前 URL
+
+        Returns:
+            Optional[Dict[str, Optional[float]]]: 采集到的指标，失败时为 None
+        """
+        try:
+            metrics = page.evaluate(METRICS_SCRIPT)
+        except Exception as e:
+            logging.getLogger("PageMetrics").warning(f"Failed to collect page metrics for {url or page.url}: {e}")
+            return None
+        cls.record(url or page.url, metrics)
+        return metrics
+
+    @classmethod
+    def record(cls, url: str, metrics: Dict[str, Optional[float]]) -> None:
+        """
+        记录一次导航的指标，值为 None 的指标（浏览器不支持或事件未触发）不记录
+
+        Args:
+            url: 页面 URL
+            metrics: 指标名称到数值的映射
+        """
+        key = normalize_url(url)
+        with cls._lock:
+            samples = cls._samples.setdefault(key, {})
+            for name in METRIC_NAMES:
+                value = metrics.get(name)
+                if value is not None:
+                    samples.setdefault(name, []).append(value)
+
+    @classmethod
+    def export_samples(cls) -> Dict[str, Dict[str, List[float]]]:
+        """
+        导出原始样本，用于 pytest-xdist worker 将样本传回控制进程
+
+        Returns:
+            Dict: {url: {metric: [value, ...]}}
+        """
+        with cls._lock:
+            return {url: {name: list(values) for name, values in samples.items()} for url, samples in cls._samples.items()}
+
+    @classmethod
+    def merge_samples(cls, samples: Dict[str, Dict[str, List[float]]]) -> None:
+        """
+        合并其他进程导出的原始样本（控制进程在每个 worker 结束时调用）
+
+        Args:
+            samples: export_samples 导出的样本
+        """
+        with cls._lock:
+            for url, metrics in samples.items():
+                merged = cls._samples.setdefault(url, {})
+                for name, values in metrics.items():
+                    merged.setdefault(name, []).extend(values)
+
+    @classmethod
+    def get_summary(cls) -> Dict[str, Dict[str, Dict[str, float]]]:
+        """
+        获取每个 URL 每个指标的样本数和分位数
+
+        Returns:
+            Dict: {url: {metric: {"count": n, "p50": ..., "p75": ..., "p95": ...}}}
+        """
+        summary = {}
+        for url, samples in sorted(cls.export_samples().items()):
+            summary[url] = {}
+            for name in METRIC_NAMES:
+                values = samples.get(name)
+                if values:
+                    stats = {"count": len(values)}
+                    stats.update({f"p{p}": percentile(values, p) for p in PERCENTILES})
+                    summary[url][name] = stats
+        return summary
+
+    @classmethod
+    def format_report(cls) -> str:
+        """
+        生成分位数文本报告
+
+        Returns:
+            str: 每个 URL 一段，每个指标一行，没有记录时返回空字符串
+        """
+        lines = []
+        for url, metrics in cls.get_summary().items():
+            lines.append(url)
+            for name, stats in metrics.items():
+                values = "  ".join(f"p{p} {stats[f'p{p}']:>10.3f}" for p in PERCENTILES)
+                lines.append(f"  {name:<20}{stats['count']:>5}x  {values}")
+        return "\n".join(lines)
+
+    @classmethod
+    def check_regressions(
+        cls,
+        baseline: Dict[str, Dict[str, Dict[str, float]]],
+        tolerance: Optional[float] = None
+    ) -> List[str]:
+        """
+        将每个指标的 p75 与基线对比
+
+        Args:
+            baseline: 基线（格式与 get_summary 相同）
+            tolerance: 允许超过基线的比例，如果为 None 则使用配置文件中的 PAGE_METRICS_REGRESSION_TOLERANCE
+
+        Returns:
+            List[str]: 退化的指标描述，没有退化时为空列表
+        """
+        tolerance = Settings.PAGE_METRICS_REGRESSION_TOLERANCE if tolerance is None else tolerance
+        regressions = []
+        for url, metrics in cls.get_summary().items():
+            for name, stats in metrics.items():
+                expected = baseline.get(url, {}).get(name, {}).get("p75")
+                if not expected:
+                    continue
+                actual = stats["p75"]
+                if actual > expected * (1 + tolerance):
+                    regressions.append(
+                        f"{url} {name}: p75 {actual:.3f} > baseline {expected:.3f} "
+                        f"(+{(actual / expected - 1) * 100:.0f}%)"
+                    )
+        return regressions
+
+    @classmethod
+    def load_baseline(cls, path: Optional[str] = None) -> Dict[str, Dict[str, Dict[str, float]]]:
+        """
+        读取基线文件
+
+        Args:
+            path: 基线文件路径，如果为 None 则使用配置文件中的 PAGE_METRICS_BASELINE_FILE
+
+        Returns:
+            Dict: 基线，文件不存在或无法解析时为空字典
+        """
+        baseline_path = Path(path or Settings.PAGE_METRICS_BASELINE_FILE)
+        if not baseline_path.exists():
+            return {}
+        try:
+            return json.loads(baseline_path.read_text(encoding="utf-8"))
+        except (OSError, ValueError) as e:
+            logging.getLogger("PageMetrics").warning(f"Failed to load page metrics baseline {baseline_path}: {e}")
+            return {}
+
+    @classmethod
+    def save_baseline(cls, path: Optional[str] = None) -> Path:
+        """
+        将本次会话的统计合并到基线文件（本次会话没有采集的 URL 保留原来的基线）
+
+        Args:
+            path: 基线文件路径，如果为 None 则使用配置文件中的 PAGE_METRICS_BASELINE_FILE
+
+        Returns:
+            Path: 基线文件路径
+        """
+        baseline_path = Path(path or Settings.PAGE_METRICS_BASELINE_FILE)
+        baseline = cls.load_baseline(str(baseline_path))
+        baseline.update(cls.get_summary())
+        baseline_path.parent.mkdir(parents=True, exist_ok=True)
+        baseline_path.write_text(json.dumps(baseline, indent=2, ensure_ascii=False), encoding="utf-8")
+        return baseline_path
+
+    @classmethod
+    def log_report(cls, logger: logging.Logger) -> None:
+        """
+        在日志中输出分位数报告和性能退化，PAGE_METRICS_UPDATE_BASELINE=true 时更新基线文件
+
+        在会话结束时调用（pytest-xdist 下只在控制进程合并样本后调用）。
+
+        Args:
+            logger: 日志记录器
+        """
+        report = cls.format_report()
+        if not report:
+            return
+        logger.info(f"Page metrics:\n{report}")
+        for regression in cls.check_regressions(cls.load_baseline()):
+            logger.warning(f"Page performance regression: {regression}")
+        if Settings.PAGE_METRICS_UPDATE_BASELINE:
+            logger.info(f"Page metrics baseline updated: {cls.save_baseline()}")
+
+    @classmethod
+    def reset(cls) -> None:
+        """
+        清空统计
+        """
+        with cls._lock:
+            cls._samples.clear()
@@ -0,0 +1,482 @@
+"""
+UI 测试异步基础页面类
+
+BasePage 的 Playwright 异步 API 版本。同步 API 下一个 worker 同一时间只能操作一个页面，
+异步 API 下可以在同一个事件循环中同时驱动多个页面（例如并发检查 50 个页面的标题），
+等待页面加载的时间相互重叠。日志、截图编码和 Allure 附件与 BasePage 使用相同的实现。
+"""
+
+import asyncio
+import logging
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Awaitable, Iterable, List, Optional, TypeVar, Union
+from playwright.async_api import Page, Locator, TimeoutError as PlaywrightTimeoutError
+
+from config.settings import Settings
+from core.log.logger import TestLogger
+from core.allure.allure_helper import AllureHelper
+from base.ui.screenshot_encoder import EncodedScreenshot, ScreenshotEncoder
+from base.ui.screenshot_coordinator import ScreenshotCoordinator
+from base.ui.screenshot_writer import ScreenshotWriter
+
+
+T = TypeVar("T")
+
+
+async def gather_pages(
+    tasks: Iterable[Awaitable[T]],
+    limit: Optional[int] = None,
+    return_exceptions: bool = False
+) -> List[T]:
+    """
+    并发执行多个页面操作，同时执行的数量不超过 limit
+
+    Args:
+        tasks: 协程（如每个页面的检查函数）
+        limit: 同时执行的数量上限，如果为 None 则使用配置文件中的 ASYNC_UI_CONCURRENCY
+        return_exceptions: 为 True 时异常作为结果返回，不中断其他操作
+
+    Returns:
+        List[T]: 按 tasks 顺序排列的结果
+
+    使用示例:
+        titles = await gather_pages(check_title(context, url) for url in urls)
+    """
+    semaphore = asyncio.Semaphore(limit or Settings.ASYNC_UI_CONCURRENCY)
+
+    async def run(task: Awaitable[T]) -> T:
+        async with semaphore:
+            return await task
+
+    return await asyncio.gather(*(run(task) for task in tasks), return_exceptions=return_exceptions)
+
+
+class AsyncBasePage:
+    """
+    异步基础页面类
+
+    与 BasePage 提供相同的通用功能，所有页面操作都是协程。
+    多个页面对象并发执行时 Allure 步骤无法正确嵌套，因此页面操作只记录日志、不创建 Allure 步骤，
+    需要步骤时在并发部分之外使用 AllureHelper.step。
+
+    所有异步页面对象类都应该继承此类。
+    """
+
+    def __init__(self, page: Page, logger: Optional[logging.Logger] = None):
+        """
+        初始化异步基础页面对象
+
+        Args:
+            page: Playwright 异步 API 的 Page 对象
+            logger: 日志记录器，如果为 None 则创建默认日志记录器
+        """
+        self.page = page
+        self.logger = logger or TestLogger.get_logger(self.__class__.__name__)
+
+        # 设置默认超时时间
+        self.page.set_default_timeout(Settings.BROWSER_TIMEOUT)
+
+        self.logger.debug(f"Initialized {self.__class__.__name__}")
+
+    async def navigate(self, url: str, wait_until: str = "domcontentloaded") -> None:
+        """
+        导航到指定 URL
+
+        Args:
+            url: 目标 URL
+            wait_until: 等待条件（load, domcontentloaded, networkidle, commit）
+
+        使用示例:
+            await page.navigate("https://example.com")
+        """
+        try:
+            self.logger.info(f"Navigating to URL: {url}")
+            await self.page.goto(url, wait_until=wait_until, timeout=Settings.PAGE_LOAD_TIMEOUT)
+            self.logger.info(f"Successfully navigated to: {url}")
+
+        except PlaywrightTimeoutError as e:
+            self.logger.error(f"Timeout while navigating to {url}: {e}")
+            await self._capture_failure_screenshot(f"navigation_timeout_{self._get_timestamp()}")
+            raise
+        except Exception as e:
+            self.logger.error(f"Failed to navigate to {url}: {e}")
+            await self._capture_failure_screenshot(f"navigation_error_{self._get_timestamp()}")
+            raise
+
+    async def wait_for_element(
+        self,
+        selector: str,
+        timeout: Optional[int] = None,
+        state: str = "visible"
+    ) -> Locator:
+        """
+        等待元素出现并返回定位器
+
+        Args:
+            selector: 元素选择器（CSS、XPath 等）
+            timeout: 超时时间（毫秒），如果为 None 则使用默认超时
+            state: 元素状态（attached, detached, visible, hidden）
+
+        Returns:
+            Locator: Playwright 定位器对象
+
+        使用示例:
+            element = await page.wait_for_element("#login-button")
+        """
+        if timeout is None:
+            timeout = Settings.BROWSER_TIMEOUT
+
+        try:
+            self.logger.debug(f"Waiting for element: {selector} (state: {state}, timeout: {timeout}ms)")
+
+            locator = self.page.locator(selector)
+            await locator.wait_for(state=state, timeout=timeout)
+
+            self.logger.debug(f"Element found: {selector}")
+            return locator
+
+        except PlaywrightTimeoutError:
+            self.logger.error(f"Timeout waiting for element: {selector} (state: {state})")
+            await self._capture_failure_screenshot(f"element_timeout_{self._get_timestamp()}")
+            raise
+        except Exception as e:
+            self.logger.error(f"Error waiting for element {selector}: {e}")
+            await self._capture_failure_screenshot(f"element_error_{self._get_timestamp()}")
+            raise
+
+    async def click(
+        self,
+        selector: str,
+        timeout: Optional[int] = None,
+        force: bool = False,
+        wait_before_click: Optional[bool] = None
+    ) -> None:
+        """
+        点击元素
+
+        Args:
+            selector: 元素选择器
+            timeout: 超时时间（毫秒）
+            force: 是否强制点击（跳过可操作性检查）
+            wait_before_click: 是否在点击前显式等待元素可见，如果为 None 则使用配置文件中的 WAIT_EXPLICIT_BEFORE_ACTION
+
+        使用示例:
+            await page.click("#submit-button")
+        """
+        try:
+            self.logger.info(f"Clicking element: {selector}")
+
+            if wait_before_click is None:
+                wait_before_click = Settings.WAIT_EXPLICIT_BEFORE_ACTION
+            if wait_before_click:
+                locator = await self.wait_for_element(selector, timeout=timeout)
+            else:
+                locator = self.page.locator(selector)
+
+            await locator.click(force=force, timeout=timeout or Settings.BROWSER_TIMEOUT)
+
+            self.logger.info(f"Successfully clicked: {selector}")
+
+        except PlaywrightTimeoutError:
+            self.logger.error(f"Timeout while clicking element: {selector}")
+            await self._capture_failure_screenshot(f"click_timeout_{self._get_timestamp()}")
+            raise
+        except Exception as e:
+            self.logger.error(f"Failed to click element {selector}: {e}")
+            await self._capture_failure_screenshot(f"click_error_{self._get_timestamp()}")
+            raise
+
+    async def fill(
+        self,
+        selector: str,
+        text: str,
+        timeout: Optional[int] = None,
+        clear_first: bool = True,
+        wait_before_fill: Optional[bool] = None
+    ) -> None:
+        """
+        填充文本到输入框
+
+        Args:
+            selector: 元素选择器
+            text: 要填充的文本
+            timeout: 超时时间（毫秒）
+            clear_first: 是否先清空输入框（fill 始终替换已有内容，保留该参数以兼容已有调用）
+            wait_before_fill: 是否在填充前显式等待元素可见，如果为 None 则使用配置文件中的 WAIT_EXPLICIT_BEFORE_ACTION
+
+        使用示例:
+            await page.fill("#username", "testuser")
+        """
+        try:
+            self.logger.info(f"Filling element {selector} with text: {text}")
+
+            if wait_before_fill is None:
+                wait_before_fill = Settings.WAIT_EXPLICIT_BEFORE_ACTION
+            if wait_before_fill:
+                locator = await self.wait_for_element(selector, timeout=timeout)
+            else:
+                locator = self.page.locator(selector)
+            await locator.fill(text, timeout=timeout or Settings.BROWSER_TIMEOUT)
+
+            self.logger.info(f"Successfully filled {selector}")
+
+        except PlaywrightTimeoutError:
+            self.logger.error(f"Timeout while filling element: {selector}")
+            await self._capture_failure_screenshot(f"fill_timeout_{self._get_timestamp()}")
+            raise
+        except Exception as e:
+            self.logger.error(f"Failed to fill element {selector}: {e}")
+            await self._capture_failure_screenshot(f"fill_error_{self._get_timestamp()}")
+            raise
+
+    async def get_text(self, selector: str, timeout: Optional[int] = None) -> str:
+        """
+        获取元素的文本内容
+
+        Args:
+            selector: 元素选择器
+            timeout: 超时时间（毫秒）
+
+        Returns:
+            str: 元素的文本内容
+
+        使用示例:
+            text = await page.get_text("#welcome-message")
+        """
+        try:
+            self.logger.debug(f"Getting text from element: {selector}")
+
+            locator = await self.wait_for_element(selector, timeout=timeout)
+            text = await locator.inner_text(timeout=timeout or Settings.BROWSER_TIMEOUT)
+
+            self.logger.debug(f"Got text from {selector}: {text}")
+            return text
+
+        except PlaywrightTimeoutError:
+            self.logger.error(f"Timeout while getting text from element: {selector}")
+            await self._capture_failure_screenshot(f"get_text_timeout_{self._get_timestamp()}")
+            raise
+        except Exception as e:
+            self.logger.error(f"Failed to get text from element {selector}: {e}")
+            await self._capture_failure_screenshot(f"get_text_error_{self._get_timestamp()}")
+            raise
+
+    async def get_attribute(
+        self,
+        selector: str,
+        attribute: str,
+        timeout: Optional[int] = None
+    ) -> Optional[str]:
+        """
+        获取元素的属性值
+
+        Args:
+            selector: 元素选择器
+            attribute: 属性名称
+            timeout: 超时时间（毫秒）
+
+        Returns:
+            Optional[str]: 属性值，如果属性不存在则返回 None
+
+        使用示例:
+            href = await page.get_attribute("a.link", "href")
+        """
+        try:
+            self.logger.debug(f"Getting attribute '{attribute}' from element: {selector}")
+
+            locator = await self.wait_for_element(selector, timeout=timeout)
+            value = await locator.get_attribute(attribute, timeout=timeout or Settings.BROWSER_TIMEOUT)
+
+            self.logger.debug(f"Got attribute '{attribute}' from {selector}: {value}")
+            return value
+
+        except Exception as e:
+            self.logger.error(f"Failed to get attribute '{attribute}' from {selector}: {e}")
+            await self._capture_failure_screenshot(f"get_attribute_error_{self._get_timestamp()}")
+            raise
+
+    async def is_visible(self, selector: str, timeout: int = 1000) -> bool:
+        """
+        检查元素是否可见
+
+        Args:
+            selector: 元素选择器
+            timeout: 超时时间（毫秒），默认 1 秒
+
+        Returns:
+            bool: 元素是否可见
+        """
+        try:
+            return await self.page.locator(selector).is_visible(timeout=timeout)
+        except Exception:
+            return False
+
+    async def wait_for_url(self, url_pattern: Union[str, object], timeout: Optional[int] = None) -> None:
+        """
+        等待 URL 匹配指定模式
+
+        Args:
+            url_pattern: URL 模式（字符串或正则表达式）
+            timeout: 超时时间（毫秒）
+        """
+        try:
+            self.logger.info(f"Waiting for URL pattern: {url_pattern}")
+            await self.page.wait_for_url(url_pattern, timeout=timeout or Settings.BROWSER_TIMEOUT)
+            self.logger.info(f"URL matched pattern: {url_pattern}")
+        except PlaywrightTimeoutError:
+            self.logger.error(f"Timeout waiting for URL pattern: {url_pattern}")
+            await self._capture_failure_screenshot(f"url_timeout_{self._get_timestamp()}")
+            raise
+
+    async def wait_for_load_state(self, state: str = "load", timeout: Optional[int] = None) -> None:
+        """
+        等待页面加载到指定状态
+
+        Args:
+            state: 加载状态（load, domcontentloaded, networkidle）
+            timeout: 超时时间（毫秒）
+        """
+        try:
+            self.logger.debug(f"Waiting for load state: {state}")
+            await self.page.wait_for_load_state(state, timeout=timeout or Settings.PAGE_LOAD_TIMEOUT)
+            self.logger.debug(f"Page reached load state: {state}")
+        except Exception as e:
+            self.logger.error(f"Timeout waiting for load state {state}: {e}")
+            raise
+
+    async def take_screenshot(
+        self,
+        name: Optional[str] = None,
+        full_page: bool = False,
+        attach_to_allure: bool = True
+    ) -> bytes:
+        """
+        截取当前页面的截图
+
+        截图按 SCREENSHOT_FORMAT、SCREENSHOT_QUALITY 等配置编码（见 base/ui/screenshot_encoder.py）。
+
+        Args:
+            name: 截图名称，如果为 None 则自动生成
+            full_page: 是否截取整个页面（包括滚动区域）
+            attach_to_allure: 是否附加到 Allure 报告
+
+        Returns:
+            bytes: 编码后的截图字节数据
+        """
+        try:
+            if name is None:
+                name = f"screenshot_{self._get_timestamp()}"
+
+            self.logger.info(f"Taking screenshot: {name}")
+
+            screenshot = await ScreenshotEncoder.capture_async(self.page, full_page=full_page)
+            self._save_screenshot(name, screenshot, attach_to_allure)
+
+            return screenshot.data
+
+        except Exception as e:
+            self.logger.error(f"Failed to take screenshot: {e}")
+            raise
+
+    def _save_screenshot(self, name: str, screenshot: EncodedScreenshot, attach_to_allure: bool) -> None:
+        """
+        保存截图文件并附加到 Allure 报告（内部方法）
+
+        Args:
+            name: 截图名称
+            screenshot: 编码后的截图
+            attach_to_allure: 是否附加到 Allure 报告
+        """
+        screenshot_path = Path(Settings.SCREENSHOT_DIR) / f"{name}.{screenshot.extension}"
+        ScreenshotWriter.write(screenshot_path, screenshot.data)
+
+        self.logger.info(
+            f"Screenshot {'queued' if ScreenshotWriter.is_async() else 'saved'}: {screenshot_path}"
+        )
+
+        if attach_to_allure:
+            AllureHelper.attach_screenshot(screenshot.data, name, background=ScreenshotWriter.is_async() or None)
+
+    def get_current_url(self) -> str:
+        """
+        获取当前页面 URL
+
+        Returns:
+            str: 当前页面的 URL
+        """
+        url = self.page.url
+        self.logger.debug(f"Current URL: {url}")
+        return url
+
+    async def get_title(self) -> str:
+        """
+        获取当前页面标题
+
+        Returns:
+            str: 页面标题
+        """
+        title = await self.page.title()
+        self.logger.debug(f"Page title: {title}")
+        return title
+
+    async def reload(self, timeout: Optional[int] = None) -> None:
+        """
+        重新加载当前页面
+
+        Args:
+            timeout: 超时时间（毫秒）
+        """
+        try:
+            self.logger.info("Reloading page")
+            await self.page.reload(timeout=timeout or Settings.PAGE_LOAD_TIMEOUT)
+            self.logger.info("Page reloaded successfully")
+        except Exception as e:
+            self.logger.error(f"Failed to reload page: {e}")
+            raise
+
+    async def execute_script(self, script: str, *args) -> Any:
+        """
+        执行 JavaScript 代码
+
+        Args:
+            script: JavaScript 代码
+            *args: 传递给脚本的参数
+
+        Returns:
+            Any: 脚本执行结果
+        """
+        try:
+            self.logger.debug(f"Executing script: {script[:50]}...")
+            result = await self.page.evaluate(script, *args)
+            self.logger.debug("Script executed successfully")
+            return result
+        except Exception as e:
+            self.logger.error(f"Failed to execute script: {e}")
+            raise
+
+    async def _capture_failure_screenshot(self, name: str) -> None:
+        """
+        捕获失败时的截图（内部方法）
+
+        Args:
+            name: 截图名称
+        """
+        try:
+            failure_screenshot = await ScreenshotCoordinator.capture_async(self.page)
+            if failure_screenshot.reused:
+                self.logger.info(f"Page unchanged since last failure screenshot, skipping: {name}")
+                return
+            self._save_screenshot(name, failure_screenshot.screenshot, attach_to_allure=True)
+        except Exception as e:
+            self.logger.warning(f"Failed to capture failure screenshot: {e}")
+
+    @staticmethod
+    def _get_timestamp() -> str:
+        """
+        获取当前时间戳字符串（内部方法）
+
+        Returns:
+            str: 格式化的时间戳
+        """
+        return datetime.now().strftime("%Y%m%d_%H%M%S_%f")[:-3]
@@ -8,12 +8,20 @@ UI 测试基础页面类
 import logging
 from datetime import datetime
 from pathlib import Path
-from typing import Optional, Union
+from typing import List, Optional, Union
 from playwright.sync_api import Page, Locator, TimeoutError as PlaywrightTimeoutError
 
 from config.settings import Settings
 from core.log.logger import TestLogger
 from core.allure.allure_helper import AllureHelper
+from base.ui.screenshot_encoder import EncodedScreenshot, ScreenshotEncoder
+from base.ui.screenshot_coordinator import ScreenshotCoordinator
+from base.ui.screenshot_writer import ScreenshotWriter
+from base.ui.wait_strategy import NetworkQuietWaiter, WaitStats, wait_for_network_quiet
+from base.ui.page_metrics import PageMetrics
+from base.ui.locator_cache import LocatorCache
+from base.ui.selector_profiler import SelectorProfiler
+from base.ui.visual_regression import Region, VisualDiffResult, assert_screenshot
 
 
 class BasePage:
@@ -21,10 +29,11 @@ class BasePage:
     基础页面类
     
     实现 Page Object Model 模式，提供所有页面对象的通用功能：
-    - 页面导航
-    - 智能元素等待机制
+    - 页面导航（可选采集页面性能指标，见 base/ui/page_metrics.py）
+    - 智能元素等待机制（依赖 Playwright 的自动等待，并记录等待耗时，见 base/ui/wait_strategy.py）
+    - 按页面缓存定位器（见 base/ui/locator_cache.py），可选记录选择器解析耗时（见 base/ui/selector_profiler.py）
     - 常用页面操作（点击、填充、获取文本等）
-    - 自动截图功能
+    - 自动截图功能（失败截图同一页面状态只截取一次，见 base/ui/screenshot_coordinator.py），以及与基线截图比较（见 base/ui/visual_regression.py）
     - 集成日志记录
     
     所有具体的页面对象类都应该继承此类。
@@ -46,7 +55,12 @@ class BasePage:
         
         self.logger.debug(f"Initialized {self.__class__.__name__}")
     
-    def navigate(self, url: str, wait_until: str = "domcontentloaded") -> None:
+    def navigate(
+        self,
+        url: str,
+        wait_until: str = "domcontentloaded",
+        collect_metrics: Optional[bool] = None
+    ) -> None:
         """
         导航到指定 URL
         
@@ -56,7 +70,11 @@ class BasePage:
                 - 'load': 等待 load 事件触发
                 - 'domcontentloaded': 等待 DOMContentLoaded 事件触发（默认）
                 - 'networkidle': 等待网络空闲
+                - 'networkquiet': 等待 DOMContentLoaded 后，再等待忽略长轮询等请求后的网络安静
+                  （见 wait_for_network_quiet，页面有长轮询时用来代替 networkidle）
                 - 'commit': 等待网络响应接收完成
+            collect_metrics: 是否在导航结束后采集页面性能指标，如果为 None 则使用配置文件中的 PAGE_METRICS_ENABLED
+                （load 等指标需要页面已触发对应事件，wait_until 为 'commit' 或 'domcontentloaded' 时可能为空）
         
         使用示例:
             page.navigate("https://example.com")
@@ -66,10 +84,23 @@ class BasePage:
             self.logger.info(f"Navigating to URL: {url}")
             
             with AllureHelper.step(f"Navigate to {url}"):
-                self.page.goto(url, wait_until=wait_until, timeout=Settings.PAGE_LOAD_TIMEOUT)
+                if wait_until == "networkquiet":
+                    # 导航前开始监听，导航过程中发出的请求也会被等待
+                    with NetworkQuietWaiter(self.page) as waiter:
+                        with WaitStats.timed("navigate", url):
+                            self.page.goto(url, wait_until="domcontentloaded", timeout=Settings.PAGE_LOAD_TIMEOUT)
+                        waiter.wait()
+                else:
+                    with WaitStats.timed("navigate", url):
+                        self.page.goto(url, wait_until=wait_until, timeout=Settings.PAGE_LOAD_TIMEOUT)
             
             self.logger.info(f"Successfully navigated to: {url}")
             
+            if Settings.PAGE_METRICS_ENABLED if collect_metrics is None else collect_metrics:
+                metrics = PageMetrics.collect(self.page, url)
+                if metrics is not None:
+                    self.logger.debug(f"Page metrics for {url}: {metrics}")
+            
         except PlaywrightTimeoutError as e:
             self.logger.error(f"Timeout while navigating to {url}: {e}")
             self._capture_failure_screenshot(f"navigation_timeout_{self._get_timestamp()}")
@@ -112,8 +143,9 @@ class BasePage:
         try:
             self.logger.debug(f"Waiting for element: {selector} (state: {state}, timeout: {timeout}ms)")
             
-            locator = self.page.locator(selector)
-            locator.wait_for(state=state, timeout=timeout)
+            locator = self._locator(selector)
+            with WaitStats.timed("element", selector):
+                locator.wait_for(state=state, timeout=timeout)
             
             self.logger.debug(f"Element found: {selector}")
             return locator
@@ -132,16 +164,18 @@ class BasePage:
         selector: str, 
         timeout: Optional[int] = None,
         force: bool = False,
-        wait_before_click: bool = True
+        wait_before_click: Optional[bool] = None
     ) -> None:
         """
         点击元素
         
+        Playwright 的点击本身会等待元素可见、稳定、可用并能接收事件，默认不再额外显式等待。
+        
         Args:
             selector: 元素选择器
             timeout: 超时时间（毫秒）
             force: 是否强制点击（跳过可操作性检查）
-            wait_before_click: 是否在点击前等待元素可见
+            wait_before_click: 是否在点击前显式等待元素可见，如果为 None 则使用配置文件中的 WAIT_EXPLICIT_BEFORE_ACTION
         
         使用示例:
             page.click("#submit-button")
@@ -150,13 +184,17 @@ class BasePage:
         try:
             self.logger.info(f"Clicking element: {selector}")
             
+            if wait_before_click is None:
+                wait_before_click = Settings.WAIT_EXPLICIT_BEFORE_ACTION
+            
             with AllureHelper.step(f"Click element: {selector}"):
                 if wait_before_click:
                     locator = self.wait_for_element(selector, timeout=timeout)
                 else:
-                    locator = self.page.locator(selector)
+                    locator = self._locator(selector)
                 
-                locator.click(force=force, timeout=timeout or Settings.BROWSER_TIMEOUT)
+                with WaitStats.timed("click", selector):
+                    locator.click(force=force, timeout=timeout or Settings.BROWSER_TIMEOUT)
             
             self.logger.info(f"Successfully clicked: {selector}")
             
@@ -174,16 +212,21 @@ class BasePage:
         selector: str, 
         text: str, 
         timeout: Optional[int] = None,
-        clear_first: bool = True
+        clear_first: bool = True,
+        wait_before_fill: Optional[bool] = None
     ) -> None:
         """
         填充文本到输入框
         
+        Playwright 的 fill 本身会等待元素可见、可用、可编辑，并替换输入框中已有的内容，
+        默认不再额外显式等待和清空。
+        
         Args:
             selector: 元素选择器
             text: 要填充的文本
             timeout: 超时时间（毫秒）
-            clear_first: 是否先清空输入框
+            clear_first: 是否先清空输入框（fill 始终替换已有内容，保留该参数以兼容已有调用）
+            wait_before_fill: 是否在填充前显式等待元素可见，如果为 None 则使用配置文件中的 WAIT_EXPLICIT_BEFORE_ACTION
         
         使用示例:
             page.fill("#username", "testuser")
@@ -192,13 +235,17 @@ class BasePage:
         try:
             self.logger.info(f"Filling element {selector} with text: {text}")
             
+            if wait_before_fill is None:
+                wait_before_fill = Settings.WAIT_EXPLICIT_BEFORE_ACTION
+            
             with AllureHelper.step(f"Fill '{selector}' with '{text}'"):
-                locator = self.wait_for_element(selector, timeout=timeout)
-                
-                if clear_first:
-                    locator.clear(timeout=timeout or Settings.BROWSER_TIMEOUT)
+                if wait_before_fill:
+                    locator = self.wait_for_element(selector, timeout=timeout)
+                else:
+                    locator = self._locator(selector)
                 
-                locator.fill(text, timeout=timeout or Settings.BROWSER_TIMEOUT)
+                with WaitStats.timed("fill", selector):
+                    locator.fill(text, timeout=timeout or Settings.BROWSER_TIMEOUT)
             
             self.logger.info(f"Successfully filled {selector}")
             
@@ -299,7 +346,7 @@ class BasePage:
                 print("Error message is displayed")
         """
         try:
-            locator = self.page.locator(selector)
+            locator = self._locator(selector)
             return locator.is_visible(timeout=timeout)
         except Exception:
             return False
@@ -343,7 +390,8 @@ class BasePage:
         """
         try:
             self.logger.info(f"Waiting for URL pattern: {url_pattern}")
-            self.page.wait_for_url(url_pattern, timeout=timeout or Settings.BROWSER_TIMEOUT)
+            with WaitStats.timed("url", str(url_pattern)):
+                self.page.wait_for_url(url_pattern, timeout=timeout or Settings.BROWSER_TIMEOUT)
             self.logger.info(f"URL matched pattern: {url_pattern}")
         except PlaywrightTimeoutError as e:
             self.logger.error(f"Timeout waiting for URL pattern: {url_pattern}")
@@ -359,13 +407,15 @@ class BasePage:
         """
         截取当前页面的截图
         
+        截图按 SCREENSHOT_FORMAT、SCREENSHOT_QUALITY 等配置编码（见 base/ui/screenshot_encoder.py）。
+        
         Args:
             name: 截图名称，如果为 None 则自动生成
             full_page: 是否截取整个页面（包括滚动区域）
             attach_to_allure: 是否附加到 Allure 报告
             
         Returns:
-            bytes: 截图的字节数据
+            bytes: 编码后的截图字节数据
         
         使用示例:
             screenshot = page.take_screenshot("login_page")
@@ -378,34 +428,84 @@ class BasePage:
             
             self.logger.info(f"Taking screenshot: {name}")
             
-            # 截取截图
-            screenshot_bytes = self.page.screenshot(
-                full_page=full_page,
-                type=Settings.SCREENSHOT_FORMAT
-            )
-            
-            # 保存到文件
-            screenshot_dir = Path(Settings.SCREENSHOT_DIR)
-            screenshot_dir.mkdir(parents=True, exist_ok=True)
-            
-            screenshot_filename = f"{name}.{Settings.SCREENSHOT_FORMAT}"
-            screenshot_path = screenshot_dir / screenshot_filename
-            
-            with open(screenshot_path, 'wb') as f:
-                f.write(screenshot_bytes)
-            
-            self.logger.info(f"Screenshot saved: {screenshot_path}")
+            # 截取截图并按配置编码
+            screenshot = ScreenshotEncoder.capture(self.page, full_page=full_page)
+            self._save_screenshot(name, screenshot, attach_to_allure)
             
-            # 附加到 Allure 报告
-            if attach_to_allure:
-                AllureHelper.attach_screenshot(screenshot_bytes, name)
-            
-            return screenshot_bytes
+            return screenshot.data
             
         except Exception as e:
             self.logger.error(f"Failed to take screenshot: {e}")
             raise
     
+    def _save_screenshot(self, name: str, screenshot: EncodedScreenshot, attach_to_allure: bool) -> None:
+        """
+        保存截图文件并附加到 Allure 报告（内部方法）
+        
+        Args:
+            name: 截图名称
+            screenshot: 编码后的截图
+            attach_to_allure: 是否附加到 Allure 报告
+        """
+        # 保存到文件（启用 SCREENSHOT_ASYNC_WRITE 时在后台写入）
+        screenshot_path = Path(Settings.SCREENSHOT_DIR) / f"{name}.{screenshot.extension}"
+        ScreenshotWriter.write(screenshot_path, screenshot.data)
+        
+        self.logger.info(
+            f"Screenshot {'queued' if ScreenshotWriter.is_async() else 'saved'}: {screenshot_path}"
+        )
+        
+        # 附加到 Allure 报告
+        if attach_to_allure:
+            AllureHelper.attach_screenshot(screenshot.data, name, background=ScreenshotWriter.is_async() or None)
+    
+    def assert_screenshot(
+        self,
+        name: str,
+        full_page: bool = False,
+        mask: Optional[List[str]] = None,
+        mask_regions: Optional[List[Region]] = None,
+        threshold: Optional[float] = None,
+        max_diff_ratio: Optional[float] = None
+    ) -> VisualDiffResult:
+        """
+        截取当前页面并与基线截图比较（视觉回归）
+        
+        基线不存在时保存当前截图作为基线；不匹配时基线、实际截图和差异图附加到 Allure。
+        
+        Args:
+            name: 页面/状态名称，如 "login_page/empty"
+            full_page: 是否截取整个页面（包括滚动区域）
+            mask: 截图时遮挡的元素选择器（时间、验证码等动态内容）
+            mask_regions: 比较时忽略的矩形区域 (x, y, width, height)
+            threshold: 单个像素的容差（0-1），如果为 None 则使用配置文件中的 VISUAL_THRESHOLD
+            max_diff_ratio: 允许不同的像素比例，如果为 None 则使用配置文件中的 VISUAL_MAX_DIFF_RATIO
+            
+        Returns:
+            VisualDiffResult: 比较结果
+            
+        Raises:
+            AssertionError: 截图与基线不匹配
+        
+        使用示例:
+            page.assert_screenshot("login_page/empty", mask=[".captcha"])
+        """
+        with AllureHelper.step(f"Compare screenshot: {name}"):
+            result = assert_screenshot(
+                self.page,
+                name,
+                full_page=full_page,
+                mask=[self._locator(selector) for selector in mask or []],
+                mask_regions=mask_regions or (),
+                threshold=threshold,
+                max_diff_ratio=max_diff_ratio
+            )
+            self.logger.info(
+                f"Screenshot '{name}' {'saved as baseline' if result.created else 'matches baseline'} "
+                f"({result.duration * 1000:.0f}ms)"
+            )
+            return result
+    
     def scroll_to_element(self, selector: str, timeout: Optional[int] = None) -> None:
         """
         滚动到指定元素
@@ -614,11 +714,42 @@ class BasePage:
         """
         try:
             self.logger.debug(f"Waiting for load state: {state}")
-            self.page.wait_for_load_state(state, timeout=timeout or Settings.PAGE_LOAD_TIMEOUT)
+            with WaitStats.timed("load_state", state):
+                self.page.wait_for_load_state(state, timeout=timeout or Settings.PAGE_LOAD_TIMEOUT)
             self.logger.debug(f"Page reached load state: {state}")
         except Exception as e:
             self.logger.error(f"Timeout waiting for load state {state}: {e}")
             raise
+    
+    def wait_for_network_quiet(
+        self,
+        quiet_ms: Optional[int] = None,
+        ignore_patterns: Optional[List[str]] = None,
+        timeout: Optional[int] = None
+    ) -> None:
+        """
+        等待网络安静：没有进行中的请求持续 quiet_ms 毫秒
+        
+        与 networkidle 不同，匹配 ignore_patterns 的请求（长轮询、心跳、统计等）和长连接不会阻止等待结束。
+        只等待调用之后发出的请求；需要等待某个操作触发的请求时，在操作之前使用 NetworkQuietWaiter。
+        
+        Args:
+            quiet_ms: 安静时间（毫秒），如果为 None 则使用配置文件中的 WAIT_NETWORK_QUIET_MS
+            ignore_patterns: 忽略的请求 URL 模式（fnmatch 语法），如果为 None 则使用 WAIT_NETWORK_IGNORE_PATTERNS
+            timeout: 超时时间（毫秒）
+            
+        使用示例:
+            page.wait_for_network_quiet()
+            page.wait_for_network_quiet(quiet_ms=300, ignore_patterns=["*/api/poll*"])
+        """
+        try:
+            self.logger.debug("Waiting for network quiet")
+            wait_for_network_quiet(self.page, quiet_ms, ignore_patterns, timeout)
+            self.logger.debug("Network is quiet")
+        except PlaywrightTimeoutError as e:
+            self.logger.error(f"Timeout waiting for network quiet: {e}")
+            self._capture_failure_screenshot(f"network_quiet_timeout_{self._get_timestamp()}")
+            raise
 
     def post_add_locator_handler(self, selector):
         """
@@ -654,6 +785,21 @@ class BasePage:
             self.logger.error(f"Failed to execute script: {e}")
             raise
     
+    def _locator(self, selector: str) -> Locator:
+        """
+        获取选择器对应的定位器（按页面缓存），启用 SELECTOR_PROFILE_ENABLED 时记录解析耗时
+        
+        Args:
+            selector: 元素选择器
+            
+        Returns:
+            Locator: 定位器
+        """
+        locator = LocatorCache.get(self.page, selector)
+        if SelectorProfiler.is_enabled():
+            SelectorProfiler.measure(locator, selector)
+        return locator
+    
     def _capture_failure_screenshot(self, name: str) -> None:
         """
         捕获失败时的截图（内部方法）
@@ -662,7 +808,12 @@ class BasePage:
             name: 截图名称
         """
         try:
-            self.take_screenshot(name, full_page=False, attach_to_allure=True)
+            # 当前测试中同一页面状态已截图时（如 fixture 清理阶段）不再重复截图和附加
+            failure_screenshot = ScreenshotCoordinator.capture(self.page)
+            if failure_screenshot.reused:
+                self.logger.info(f"Page unchanged since last failure screenshot, skipping: {name}")
+                return
+            self._save_screenshot(name, failure_screenshot.screenshot, attach_to_allure=True)
         except Exception as e:
             self.logger.warning(f"Failed to capture failure screenshot: {e}")
     
@@ -50,7 +50,7 @@ class ExamplePage(BasePage):
         Returns:
             ExamplePage: 当前页面对象（支持链式调用）
         """
-        self.navigate(self.PAGE_URL)
+        self.navigate(self.PAGE_URL, wait_until="networkquiet")
         self.wait_for_page_load()
         return self
     
@@ -59,7 +59,6 @@ class ExamplePage(BasePage):
         等待页面完全加载
         """
         self.wait_for_element(self.HEADING)
-        self.wait_for_load_state("networkidle")
         self.logger.info("Example page loaded successfully")
     
     def get_heading_text(self) -> str:
@@ -42,16 +42,16 @@ class LoginPage(BasePage):
         Returns:
             Page: 当前页面对象（支持链式调用）
         """
-        self.navigate(base_url or self.PAGE_URL)
+        # networkidle 在页面有长轮询、心跳请求时会一直等到超时，改为等待忽略这些请求后的网络安静
+        self.navigate(base_url or self.PAGE_URL, wait_until="networkquiet")
         self.wait_for_page_load()
         return self
 
     def wait_for_page_load(self) -> None:
         """
-        等待页面完全加载
+        等待页面完全加载（网络请求由 open 中的导航等待）
         """
         self.wait_for_element(self.WELCOME)
-        self.wait_for_load_state("networkidle")
         self.logger.info("Panji login page loaded successfully")
 
     def login(self,username: str, password: str):
@@ -63,8 +63,7 @@ class LoginPage(BasePage):
         self.input_password.fill(password)
         self.btn_login.click()
 
-        self.page.wait_for_load_state(state="load")
-        # 登录后等待直到期望的首页出现
+        # 登录后等待直到期望的首页出现（expect 会自动重试，不需要先等待 load 事件）
         expect(self.page).to_have_title("运营视图", timeout=30000)
         self.page.wait_for_selector("//p[contains(text(),'平台运营概览')]")
 
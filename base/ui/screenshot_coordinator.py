@@ -0,0 +1,151 @@
+"""
+失败截图协调模块
+
+一个失败的 UI 测试可能截取三次相同的截图：BasePage 操作失败时（_capture_failure_screenshot）、
+page fixture 清理时、auto_screenshot_on_failure fixture 清理时，每次都是完整的渲染和编码。
+
+ScreenshotCoordinator 在当前测试内按页面和页面状态缓存失败截图：
+- 页面状态由 URL、文档（performance.timeOrigin，每次导航或刷新都不同）和 DOM 版本组成，
+  DOM 版本由第一次截图时在页面中安装的 MutationObserver 计数
+- 同一页面状态只截图一次，之后的调用直接复用截图数据，并标记为已复用（调用方不再重复保存和附加）
+- 无法获取页面状态时（页面已关闭、不支持 evaluate 等）直接截图，不缓存
+
+只有 DOM 变化才视为新状态，滚动、悬停、动画等只改变渲染结果的变化不会触发重新截图。
+缓存在每个测试的清理阶段结束后清空。
+"""
+
+import threading
+from dataclasses import dataclass
+from typing import Any, Dict, Optional, Tuple
+
+from base.ui.screenshot_encoder import EncodedScreenshot, ScreenshotEncoder
+
+
+# 返回页面状态标识；第一次调用时安装 DOM 变化计数器
+STATE_SCRIPT = """() => {
+    if (!window.__failureScreenshotDom) {
+        const state = window.__failureScreenshotDom = {version: 0};
+        new MutationObserver(() => { state.version += 1; }).observe(document, {
+            subtree: true, childList: true, attributes: true, characterData: true
+        });
+    }
+    return [location.href, performance.timeOrigin, window.__failureScreenshotDom.version].join('|');
+}"""
+
+
+@dataclass(frozen=True)
+class FailureScreenshot:
+    """
+    失败截图
+    """
+
+    screenshot: EncodedScreenshot
+    reused: bool  # 是否复用了当前测试中同一页面状态已截取的截图
+
+
+class ScreenshotCoordinator:
+    """
+    当前测试内的失败截图缓存
+
+    所有方法都是类方法，同一进程内共享缓存。
+    """
+
+    _cache: Dict[Tuple[int, bool, str], EncodedScreenshot] = {}
+    _lock = threading.Lock()
+    _stats = {"captured": 0, "reused": 0}
+
+    @classmethod
+    def _lookup(cls, key: Optional[Tuple[int, bool, str]]) -> Optional[FailureScreenshot]:
+        """
+        查找缓存的截图（内部方法）
+        """
+        if key is None:
+            return None
+        with cls._lock:
+            screenshot = cls._cache.get(key)
+            if screenshot is None:
+                return None
+            cls._stats["reused"] += 1
+        return FailureScreenshot(screenshot, reused=True)
+
+    @classmethod
+    def _store(cls, key: Optional[Tuple[int, bool, str]], screenshot: EncodedScreenshot) -> FailureScreenshot:
+        """
+        缓存新截取的截图（内部方法）
+        """
+        with cls._lock:
+            if key is not None:
+                cls._cache[key] = screenshot
+            cls._stats["captured"] += 1
+        return FailureScreenshot(screenshot, reused=False)
+
+    @classmethod
+    def capture(cls, page: Any, full_page: bool = False) -> FailureScreenshot:
+        """
+        截取失败截图，当前测试中同一页面状态已截取过时直接复用
+
+        Args:
+            page: Playwright Page 对象
+            full_page: 是否截取整个页面（包括滚动区域）
+
+        Returns:
+            FailureScreenshot: 截图和是否复用
+        """
+        try:
+            key = (id(page), full_page, page.evaluate(STATE_SCRIPT))
+        except Exception:
+            key = None
+
+        cached = cls._lookup(key)
+        if cached is not None:
+            return cached
+        return cls._store(key, ScreenshotEncoder.capture(page, full_page=full_page))
+
+    @classmethod
+    async def capture_async(cls, page: Any, full_page: bool = False) -> FailureScreenshot:
+        """
+        capture 的异步版本，用于 Playwright 异步 API 的页面
+
+        Args:
+            page: Playwright 异步 API 的 Page 对象
+            full_page: 是否截取整个页面（包括滚动区域）
+
+        Returns:
+            FailureScreenshot: 截图和是否复用
+        """
+        try:
+            key = (id(page), full_page, await page.evaluate(STATE_SCRIPT))
+        except Exception:
+            key = None
+
+        cached = cls._lookup(key)
+        if cached is not None:
+            return cached
+        return cls._store(key, await ScreenshotEncoder.capture_async(page, full_page=full_page))
+
+    @classmethod
+    def end_test(cls) -> None:
+        """
+        清空当前测试的截图缓存，在每个测试的清理阶段结束后调用
+        """
+        with cls._lock:
+            cls._cache.clear()
+
+    @classmethod
+    def get_stats(cls) -> dict:
+        """
+        获取统计
+
+        Returns:
+            dict: captured（实际截图次数）、reused（复用次数）
+        """
+        with cls._lock:
+            return dict(cls._stats)
+
+    @classmethod
+    def reset_stats(cls) -> None:
+        """
+        清空统计
+        """
+        with cls._lock:
+            cls._stats.update(captured=0, reused=0)
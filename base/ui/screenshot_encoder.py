@@ -0,0 +1,213 @@
+"""
+截图编码模块
+
+Playwright 原生只能输出 png 和 jpeg，且不能缩放或转换为灰度，1920x1080 的 PNG 截图通常有 1-3 MB。
+该模块提供可配置的截图编码流水线：
+- 格式：SCREENSHOT_FORMAT（png, jpeg, webp）
+- 质量：SCREENSHOT_QUALITY（jpeg 和 webp）
+- 最大尺寸：SCREENSHOT_MAX_WIDTH / SCREENSHOT_MAX_HEIGHT（等比缩小）
+- 灰度：SCREENSHOT_GRAYSCALE
+
+不需要后处理（png/jpeg、不缩放、不转灰度）时直接由 Playwright 在浏览器进程中编码，不经过 Pillow；
+需要后处理时 Playwright 输出无损 PNG，再在后台编码线程中使用 Pillow 重新编码（Pillow 编码时释放 GIL）。
+未安装 Pillow 时退化为 Playwright 原生编码（webp 回退到 jpeg），并输出一次警告。
+"""
+
+import asyncio
+import io
+import logging
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Any, Dict, Optional
+
+from config.settings import Settings
+
+try:
+    from PIL import Image
+except ImportError:  # Pillow 为可选依赖
+    Image = None
+
+
+@dataclass(frozen=True)
+class EncodedScreenshot:
+    """
+    编码后的截图
+    """
+
+    data: bytes
+    format: str  # png, jpeg, webp
+    width: Optional[int] = None
+    height: Optional[int] = None
+
+    @property
+    def extension(self) -> str:
+        """
+        截图文件扩展名
+        """
+        return "jpg" if self.format == "jpeg" else self.format
+
+
+class ScreenshotEncoder:
+    """
+    截图编码器
+
+    所有方法都是类方法，同一进程内共享一个编码线程池。
+    """
+
+    _executor: Optional[ThreadPoolExecutor] = None
+    _lock = threading.Lock()
+    _warned = False
+
+    @classmethod
+    def _warn_once(cls, message: str) -> None:
+        """
+        只输出一次警告（内部方法）
+        """
+        if not cls._warned:
+            cls._warned = True
+            logging.warning(message)
+
+    @classmethod
+    def needs_post_processing(cls) -> bool:
+        """
+        检查当前配置是否需要使用 Pillow 后处理
+
+        Returns:
+            bool: 需要 webp、缩放或灰度且已安装 Pillow 时返回 True
+        """
+        required = (
+            Settings.SCREENSHOT_FORMAT == "webp"
+            or Settings.SCREENSHOT_MAX_WIDTH > 0
+            or Settings.SCREENSHOT_MAX_HEIGHT > 0
+            or Settings.SCREENSHOT_GRAYSCALE
+        )
+        if required and Image is None:
+            cls._warn_once(
+                "Pillow is not installed, ignoring screenshot resize/grayscale settings "
+                "and falling back to jpeg for webp screenshots"
+            )
+            return False
+        return required
+
+    @classmethod
+    def playwright_options(cls) -> Dict[str, Any]:
+        """
+        获取传给 page.screenshot 的编码参数
+
+        Returns:
+            Dict[str, Any]: type 和 quality 参数；需要后处理时为无损 png
+        """
+        if Settings.SCREENSHOT_FORMAT == "png" or cls.needs_post_processing():
+            return {"type": "png"}
+        return {"type": "jpeg", "quality": Settings.SCREENSHOT_QUALITY}
+
+    @classmethod
+    def encode(cls, png_bytes: bytes) -> EncodedScreenshot:
+        """
+        按配置重新编码 PNG 截图（在调用线程中执行）
+
+        Args:
+            png_bytes: Playwright 输出的 PNG 截图
+
+        Returns:
+            EncodedScreenshot: 编码后的截图
+        """
+        if Image is None:
+            return EncodedScreenshot(png_bytes, "png")
+
+        image = Image.open(io.BytesIO(png_bytes))
+        max_width = Settings.SCREENSHOT_MAX_WIDTH or image.width
+        max_height = Settings.SCREENSHOT_MAX_HEIGHT or image.height
+        if image.width > max_width or image.height > max_height:
+            # BILINEAR + reducing_gap 在缩小截图时比 LANCZOS 快得多，文字仍清晰可读
+            image.thumbnail((max_width, max_height), Image.BILINEAR, reducing_gap=2.0)
+
+        image_format = Settings.SCREENSHOT_FORMAT
+        if Settings.SCREENSHOT_GRAYSCALE:
+            image = image.convert("L")
+        elif image_format == "jpeg" and image.mode not in ("RGB", "L"):
+            image = image.convert("RGB")
+
+        output = io.BytesIO()
+        if image_format == "jpeg":
+            image.save(output, "JPEG", quality=Settings.SCREENSHOT_QUALITY)
+        elif image_format == "webp":
+            image.save(output, "WEBP", quality=Settings.SCREENSHOT_QUALITY, method=4)
+        else:
+            image.save(output, "PNG", compress_level=6)
+
+        return EncodedScreenshot(output.getvalue(), image_format, image.width, image.height)
+
+    @classmethod
+    def submit(cls, png_bytes: bytes) -> "Future[EncodedScreenshot]":
+        """
+        在后台编码线程中重新编码 PNG 截图
+
+        Args:
+            png_bytes: Playwright 输出的 PNG 截图
+
+        Returns:
+            Future[EncodedScreenshot]: 编码结果
+        """
+        with cls._lock:
+            if cls._executor is None:
+                cls._executor = ThreadPoolExecutor(
+                    max_workers=Settings.SCREENSHOT_ENCODE_WORKERS,
+                    thread_name_prefix="ScreenshotEncoder"
+                )
+            return cls._executor.submit(cls.encode, png_bytes)
+
+    @classmethod
+    def capture(cls, page: Any, full_page: bool = False) -> EncodedScreenshot:
+        """
+        截取页面截图并按配置编码
+
+        截图本身在调用线程中完成（Playwright 同步 API 不是线程安全的），
+        需要后处理时在后台编码线程中编码。
+
+        Args:
+            page: Playwright Page 对象
+            full_page: 是否截取整个页面（包括滚动区域）
+
+        Returns:
+            EncodedScreenshot: 编码后的截图
+        """
+        if not cls.needs_post_processing():
+            options = cls.playwright_options()
+            return EncodedScreenshot(page.screenshot(full_page=full_page, **options), options["type"])
+
+        raw = page.screenshot(full_page=full_page, type="png")
+        return cls.submit(raw).result()
+
+    @classmethod
+    async def capture_async(cls, page: Any, full_page: bool = False) -> EncodedScreenshot:
+        """
+        capture 的异步版本，用于 Playwright 异步 API 的页面
+
+        需要后处理时在后台编码线程中编码，等待编码期间事件循环可以继续驱动其他页面。
+
+        Args:
+            page: Playwright 异步 API 的 Page 对象
+            full_page: 是否截取整个页面（包括滚动区域）
+
+        Returns:
+            EncodedScreenshot: 编码后的截图
+        """
+        if not cls.needs_post_processing():
+            options = cls.playwright_options()
+            return EncodedScreenshot(await page.screenshot(full_page=full_page, **options), options["type"])
+
+        raw = await page.screenshot(full_page=full_page, type="png")
+        return await asyncio.wrap_future(cls.submit(raw))
+
+    @classmethod
+    def shutdown(cls) -> None:
+        """
+        停止编码线程池，在会话结束时调用
+        """
+        with cls._lock:
+            executor = cls._executor
+            cls._executor = None
+        if executor is not None:
+            executor.shutdown(wait=True)
@@ -0,0 +1,173 @@
+"""
+截图后台写入模块
+
+BasePage.take_screenshot 在测试线程上截图后还要创建目录、同步写入文件、附加到 Allure，
+失败路径上（_capture_failure_screenshot）这些磁盘操作会进一步拖慢本来就慢的失败测试。
+启用 SCREENSHOT_ASYNC_WRITE 后：
+- 截图和编码仍在测试线程上完成（Playwright 同步 API 不是线程安全的）
+- 截图文件放入有界队列（SCREENSHOT_WRITE_QUEUE_SIZE），由后台线程写入 SCREENSHOT_DIR；
+  队列满时阻塞，避免大量截图占用内存
+- Allure 附件在测试线程上登记到当前测试，文件由 AllureAttachmentWriter 的后台线程写入
+- 每个测试的清理阶段结束后（base/ui/fixtures.py 中的 pytest_runtest_teardown 钩子）等待队列写完
+
+未启用时退化为同步写入。
+"""
+
+import atexit
+import logging
+import queue
+import threading
+from pathlib import Path
+from typing import Optional, Set, Union
+
+from config.settings import Settings
+
+
+_STOP = object()
+
+
+class ScreenshotWriter:
+    """
+    截图文件后台写入器
+
+    所有方法都是类方法，同一进程内共享一个后台写入线程。
+    """
+
+    _queue: Optional[queue.Queue] = None
+    _thread: Optional[threading.Thread] = None
+    _lock = threading.Lock()
+    _atexit_registered = False
+    _created_dirs: Set[Path] = set()
+    _written = 0
+    _failed = 0
+
+    @classmethod
+    def is_async(cls) -> bool:
+        """
+        是否在后台写入截图（SCREENSHOT_ASYNC_WRITE）
+        """
+        return Settings.SCREENSHOT_ASYNC_WRITE
+
+    @classmethod
+    def write(cls, path: Union[str, Path], data: bytes) -> None:
+        """
+        写入截图文件，启用 SCREENSHOT_ASYNC_WRITE 时放入后台队列后立即返回
+
+        Args:
+            path: 截图文件路径（目录不存在时自动创建）
+            data: 截图字节数据
+        """
+        path = Path(path)
+        if not cls.is_async():
+            cls._write(path, data)
+            return
+
+        # 队列满时阻塞，对截图过快的测试形成反压
+        cls._ensure_started().put((path, data))
+
+    @classmethod
+    def _ensure_started(cls) -> queue.Queue:
+        """
+        启动后台写入线程（内部方法）
+
+        Returns:
+            queue.Queue: 截图队列
+        """
+        with cls._lock:
+            if cls._thread is None or not cls._thread.is_alive():
+                cls._queue = queue.Queue(maxsize=Settings.SCREENSHOT_WRITE_QUEUE_SIZE)
+                cls._thread = threading.Thread(
+                    target=cls._run,
+                    args=(cls._queue,),
+                    name="ScreenshotWriter",
+                    daemon=True
+                )
+                cls._thread.start()
+
+                if not cls._atexit_registered:
+                    atexit.register(cls.shutdown)
+                    cls._atexit_registered = True
+            return cls._queue
+
+    @classmethod
+    def _run(cls, screenshot_queue: queue.Queue) -> None:
+        """
+        后台线程主循环（内部方法）
+        """
+        while True:
+            item = screenshot_queue.get()
+            try:
+                if item is _STOP:
+                    return
+                cls._write(*item)
+            finally:
+                screenshot_queue.task_done()
+
+    @classmethod
+    def _write(cls, path: Path, data: bytes) -> None:
+        """
+        写入单个截图文件（内部方法），同一目录只创建一次
+        """
+        try:
+            directory = path.parent
+            if directory not in cls._created_dirs:
+                directory.mkdir(parents=True, exist_ok=True)
+                cls._created_dirs.add(directory)
+            path.write_bytes(data)
+            cls._written += 1
+        except Exception as e:
+            cls._failed += 1
+            # 目录可能已被删除，下次写入时重新创建
+            cls._created_dirs.discard(path.parent)
+            logging.warning(f"Failed to write screenshot '{path}': {e}")
+
+    @classmethod
+    def flush(cls, timeout: Optional[float] = None) -> bool:
+        """
+        等待队列中的截图全部写入
+
+        Args:
+            timeout: 最长等待时间（秒），None 表示一直等待
+
+        Returns:
+            bool: 是否在超时前全部写入
+        """
+        screenshot_queue = cls._queue
+        if screenshot_queue is None or cls._thread is None or not cls._thread.is_alive():
+            return True
+
+        with screenshot_queue.all_tasks_done:
+            return screenshot_queue.all_tasks_done.wait_for(
+                lambda: screenshot_queue.unfinished_tasks == 0,
+                timeout
+            )
+
+    @classmethod
+    def shutdown(cls, timeout: Optional[float] = 30.0) -> None:
+        """
+        写入剩余截图并停止后台线程，在会话结束时调用
+        """
+        with cls._lock:
+            thread = cls._thread
+            screenshot_queue = cls._queue
+            cls._thread = None
+            cls._queue = None
+
+        if thread is not None and thread.is_alive():
+            screenshot_queue.put(_STOP)
+            thread.join(timeout)
+
+    @classmethod
+    def get_stats(cls) -> dict:
+        """
+        获取写入统计
+
+        Returns:
+            dict: written（已写入数量）、failed（失败数量）、pending（待写入数量）
+        """
+        screenshot_queue = cls._queue
+        return {
+            "written": cls._written,
+            "failed": cls._failed,
+            "pending": screenshot_queue.unfinished_tasks if screenshot_queue is not None else 0,
+        }
@@ -0,0 +1,205 @@
+"""
+选择器性能分析模块
+
+页面对象中的选择器大多是从浏览器开发者工具复制的，例如 "#app > div > div > ... > p:nth-child(2)"
+或 "/html/body/div[2]/div/div[3]/span"。这类选择器在页面中查找慢，页面结构稍有变化就会失效。
+
+启用 SELECTOR_PROFILE_ENABLED 后，BasePage 每次使用选择器前通过 locator.count() 在页面中解析一次并计时，
+解析耗时超过 SELECTOR_SLOW_THRESHOLD_MS 的选择器输出警告。会话结束时在日志中列出平均解析耗时最长的选择器，
+并标出结构上的问题（深层 XPath、绝对 XPath、按序号定位、nth-child 链、过长的 CSS 层级）。
+每次解析多一次往返，只在分析时启用。
+"""
+
+import logging
+import re
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+
+from playwright.sync_api import Locator
+
+from config.settings import Settings
+
+
+# 超过该层数的 XPath / CSS 层级视为过深
+_MAX_DEPTH = 5
+
+# 超过该数量的 nth-child / nth-of-type 视为按位置定位的链
+_MAX_NTH = 1
+
+
+def _is_xpath(selector: str) -> bool:
+    """
+    判断选择器是否为 XPath（内部函数）
+    """
+    return selector.startswith(("xpath=", "/", "(//", ".."))
+
+
+def analyze_selector(selector: str) -> List[str]:
+    """
+    检查选择器结构上的问题
+
+    Args:
+        selector: 元素选择器
+
+    Returns:
+        List[str]: 问题描述，没有问题时为空列表
+
+    使用示例:
+        analyze_selector("#app > div > div > div > div > div > p:nth-child(2)")
+        # ['deep CSS chain (7 levels)']
+    """
+    issues = []
+    if _is_xpath(selector):
+        xpath = selector[len("xpath="):] if selector.startswith("xpath=") else selector
+        steps = [step for step in re.split(r"/+", xpath) if step]
+        if xpath.startswith("/") and not xpath.startswith("//"):
+            issues.append("absolute XPath")
+        if len(steps) > _MAX_DEPTH:
+            issues.append(f"deep XPath ({len(steps)} steps)")
+        positional = len(re.findall(r"\[\d+\]", xpath))
+        if positional > _MAX_NTH:
+            issues.append(f"index-based XPath ({positional} positions)")
+        return issues
+
+    # Playwright 的 >> 链中每一段单独计算
+    for part in selector.split(">>"):
+        part = part.strip()
+        engine = re.match(r"([\w-]+)=", part)
+        if engine is not None:
+            if engine.group(1) != "css":
+                continue  # text=、role= 等 Playwright 选择器引擎
+            part = part[engine.end():]
+        nth = len(re.findall(r":nth-(?:child|of-type)\(", part))
+        # 引号、属性和伪类参数中的空格不是层级
+        part = re.sub(r'"[^"]*"|\'[^\']*\'|\([^)]*\)|\[[^\]]*\]', "", part).strip()
+        levels = len(re.findall(r"\s*[>+~]\s*|\s+", part)) + 1
+        if levels > _MAX_DEPTH:
+            issues.append(f"deep CSS chain ({levels} levels)")
+        if nth > _MAX_NTH:
+            issues.append(f"nth-child chain ({nth} positions)")
+    return issues
+
+
+@dataclass
+class SelectorRecord:
+    """
+    同一个选择器的解析耗时统计
+    """
+
+    selector: str
+    count: int = 0
+    total: float = 0.0
+    max: float = 0.0
+    matches: int = 0
+    issues: List[str] = field(default_factory=list)
+
+    @property
+    def average(self) -> float:
+        """
+        平均解析耗时（秒）
+        """
+        return self.total / self.count if self.count else 0.0
+
+
+class SelectorProfiler:
+    """
+    选择器解析耗时统计
+
+    所有方法都是类方法，同一进程内共享统计数据。
+    """
+
+    _records: Dict[str, SelectorRecord] = {}
+    _lock = threading.Lock()
+
+    @classmethod
+    def is_enabled(cls) -> bool:
+        """
+        是否启用选择器性能分析
+        """
+        return Settings.SELECTOR_PROFILE_ENABLED
+
+    @classmethod
+    def measure(cls, locator: Locator, selector: str) -> None:
+        """
+        在页面中解析一次选择器并记录耗时，解析失败（页面已关闭等）时不记录
+
+        Args:
+            locator: 选择器对应的定位器
+            selector: 元素选择器
+        """
+        start = time.perf_counter()
+        try:
+            matches = locator.count()
+        except Exception as e:
+            logging.getLogger("SelectorProfiler").debug(f"Failed to resolve selector '{selector}': {e}")
+            return
+        cls.record(selector, time.perf_counter() - start, matches)
+
+    @classmethod
+    def record(cls, selector: str, duration: float, matches: int = 0) -> None:
+        """
+        记录一次解析
+
+        Args:
+            selector: 元素选择器
+            duration: 解析耗时（秒）
+            matches: 匹配的元素数量
+        """
+        with cls._lock:
+            record = cls._records.get(selector)
+            if record is None:
+                record = cls._records[selector] = SelectorRecord(selector, issues=analyze_selector(selector))
+            record.count += 1
+            record.total += duration
+            record.max = max(record.max, duration)
+            record.matches = matches
+
+        threshold = Settings.SELECTOR_SLOW_THRESHOLD_MS
+        if threshold and duration * 1000 >= threshold:
+            logging.getLogger("SelectorProfiler").warning(
+                f"Slow selector: '{selector}' took {duration * 1000:.0f}ms to resolve"
+                f"{' (' + ', '.join(record.issues) + ')' if record.issues else ''}"
+            )
+
+    @classmethod
+    def get_slowest(cls, top: Optional[int] = None) -> List[SelectorRecord]:
+        """
+        获取平均解析耗时最长的选择器
+
+        Args:
+            top: 返回的数量，如果为 None 则使用配置文件中的 SELECTOR_PROFILE_TOP
+
+        Returns:
+            List[SelectorRecord]: 按平均耗时降序排列的统计
+        """
+        with cls._lock:
+            records = sorted(cls._records.values(), key=lambda record: record.average, reverse=True)
+        return records[:top or Settings.SELECTOR_PROFILE_TOP]
+
+    @classmethod
+    def format_report(cls, top: Optional[int] = None) -> str:
+        """
+        生成最慢选择器的文本报告，结构上有问题的选择器即使不慢也列出
+
+        Returns:
+            str: 每行一个选择器，没有记录时返回空字符串
+        """
+        slowest = cls.get_slowest(top)
+        listed = {record.selector for record in slowest}
+        with cls._lock:
+            flagged = [record for record in cls._records.values() if record.issues and record.selector not in listed]
+        return "\n".join(
+            f"avg {record.average * 1000:7.1f}ms  max {record.max * 1000:7.1f}ms  {record.count:5d}x  "
+            f"{record.selector}{'  [' + ', '.join(record.issues) + ']' if record.issues else ''}"
+            for record in slowest + flagged
+        )
+
+    @classmethod
+    def reset(cls) -> None:
+        """
+        清空统计
+        """
+        with cls._lock:
+            cls._records.clear()
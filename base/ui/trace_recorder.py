@@ -0,0 +1,204 @@
+"""
+Trace 录制模块
+
+UI 测试失败时只有一张截图，很难还原失败前发生了什么；一直录制并保存 Playwright trace 又太慢太大。
+该模块在每个浏览器上下文上只调用一次 tracing.start，之后每个测试录制一个分块（start_chunk / stop_chunk）：
+- TRACE_MODE=retain-on-failure: 测试通过时丢弃分块（不写入磁盘），测试失败时保存到 TRACE_DIR 并附加到 Allure
+- TRACE_MODE=on: 保存所有测试的分块
+- TRACE_RING_SIZE > 1: 每个上下文在磁盘上保留最近 N 个分块（环形缓冲区），测试失败时连同之前的分块一起保存，
+  用于排查上下文池中前一个测试遗留的状态
+
+TraceRecorder 统计每个分块的开始和结束耗时，会话结束时在日志中输出 trace 带来的额外耗时；
+与关闭 trace 的对比见 performance/benchmark_tracing.py。
+"""
+
+import os
+import re
+import shutil
+import threading
+import time
+import weakref
+from collections import deque
+from pathlib import Path
+from typing import Deque, List, Optional, Tuple
+
+from playwright.sync_api import BrowserContext
+
+from config.settings import Settings
+from core.log.logger import TestLogger
+
+
+def _safe_name(name: str) -> str:
+    """
+    将测试名称转换为文件名（内部函数）
+    """
+    return re.sub(r"[^\w.-]+", "_", name)[:150]
+
+
+class TraceRecorder:
+    """
+    按测试分块录制浏览器上下文的 trace
+
+    每个浏览器上下文一个实例（通过 for_context 获取），上下文池中的上下文在多个测试之间共享同一个实例。
+    """
+
+    _recorders: "weakref.WeakKeyDictionary[BrowserContext, TraceRecorder]" = weakref.WeakKeyDictionary()
+    _lock = threading.Lock()
+    _stats = {"chunks": 0, "saved": 0, "overhead": 0.0}
+
+    def __init__(self, context: BrowserContext, ring_size: Optional[int] = None, trace_dir: Optional[str] = None):
+        """
+        初始化 trace 录制
+
+        Args:
+            context: 浏览器上下文
+            ring_size: 保留的最近分块数量，如果为 None 则使用配置文件中的 TRACE_RING_SIZE
+            trace_dir: trace 文件目录，如果为 None 则使用配置文件中的 TRACE_DIR
+        """
+        self.context = context
+        self.ring_size = ring_size or Settings.TRACE_RING_SIZE
+        self.trace_dir = Path(trace_dir or Settings.TRACE_DIR)
+        self.logger = TestLogger.get_logger("TraceRecorder")
+        self._ring: Deque[Tuple[str, Path]] = deque()
+        self._ring_dir = self.trace_dir / ".ring" / str(os.getpid()) / str(id(self))
+        self._started = False
+        self._chunk_name: Optional[str] = None
+
+    @classmethod
+    def for_context(cls, context: BrowserContext) -> "TraceRecorder":
+        """
+        获取浏览器上下文的 trace 录制实例，不存在时创建
+
+        Args:
+            context: 浏览器上下文
+
+        Returns:
+            TraceRecorder: trace 录制实例
+        """
+        with cls._lock:
+            recorder = cls._recorders.get(context)
+            if recorder is None:
+                recorder = cls._recorders[context] = cls(context)
+            return recorder
+
+    def start_chunk(self, name: str) -> None:
+        """
+        开始录制一个测试的分块（第一次调用时在上下文上开始 tracing）
+
+        Args:
+            name: 测试名称
+        """
+        start = time.perf_counter()
+        if not self._started:
+            self.context.tracing.start(
+                screenshots=Settings.TRACE_SCREENSHOTS,
+                snapshots=Settings.TRACE_SNAPSHOTS,
+                sources=False
+            )
+            self._started = True
+        self.context.tracing.start_chunk(title=name)
+        self._chunk_name = name
+        self._add_overhead(time.perf_counter() - start)
+
+    def stop_chunk(self, failed: bool) -> List[Path]:
+        """
+        结束当前分块
+
+        Args:
+            failed: 测试是否失败
+
+        Returns:
+            List[Path]: 保存的 trace 文件（按时间顺序，最后一个是当前测试），没有保存时为空列表
+        """
+        if self._chunk_name is None:
+            return []
+
+        start = time.perf_counter()
+        name, self._chunk_name = self._chunk_name, None
+        keep = failed or Settings.TRACE_MODE == "on"
+        saved: List[Path] = []
+
+        if keep:
+            self.trace_dir.mkdir(parents=True, exist_ok=True)
+            path = self.trace_dir / f"{_safe_name(name)}.zip"
+            # 之前的分块在当前分块之前保存，文件名中带有当前测试的名称
+            if failed:
+                for index, (previous_name, previous_path) in enumerate(self._ring):
+                    target = self.trace_dir / f"{_safe_name(name)}.previous_{index + 1}_{_safe_name(previous_name)}.zip"
+                    try:
+                        shutil.copyfile(previous_path, target)
+                        saved.append(target)
+                    except OSError as e:
+                        self.logger.debug(f"Failed to keep previous trace chunk {previous_path}: {e}")
+            self.context.tracing.stop_chunk(path=path)
+            saved.append(path)
+        elif self.ring_size > 1:
+            self._ring_dir.mkdir(parents=True, exist_ok=True)
+            path = self._ring_dir / f"{len(self._ring)}_{time.monotonic_ns()}.zip"
+            self.context.tracing.stop_chunk(path=path)
+            self._ring.append((name, path))
+        else:
+            # 不指定 path 时 Playwright 直接丢弃分块，不写入磁盘
+            self.context.tracing.stop_chunk()
+
+        # 当前分块算在环形缓冲区中，只保留之前的 ring_size - 1 个
+        while len(self._ring) > max(self.ring_size - 1, 0):
+            _, old_path = self._ring.popleft()
+            old_path.unlink(missing_ok=True)
+
+        self._add_overhead(time.perf_counter() - start)
+        with self._lock:
+            self._stats["chunks"] += 1
+            self._stats["saved"] += len(saved)
+        if saved:
+            self.logger.info(f"Trace saved for {name}: {saved[-1]}")
+        return saved
+
+    def close(self) -> None:
+        """
+        停止 tracing 并删除环形缓冲区中的分块，在关闭上下文之前调用
+        """
+        if self._started:
+            try:
+                self.context.tracing.stop()
+            except Exception as e:
+                self.logger.debug(f"Failed to stop tracing: {e}")
+            self._started = False
+        self._ring.clear()
+        shutil.rmtree(self._ring_dir, ignore_errors=True)
+        with self._lock:
+            self._recorders.pop(self.context, None)
+
+    @classmethod
+    def cleanup(cls) -> None:
+        """
+        删除当前进程所有环形缓冲区中的分块，在测试会话结束时调用
+        """
+        shutil.rmtree(Path(Settings.TRACE_DIR) / ".ring" / str(os.getpid()), ignore_errors=True)
+
+    @classmethod
+    def _add_overhead(cls, duration: float) -> None:
+        """
+        累计 trace 额外耗时（内部方法）
+        """
+        with cls._lock:
+            cls._stats["overhead"] += duration
+
+    @classmethod
+    def get_stats(cls) -> dict:
+        """
+        获取 trace 统计
+
+        Returns:
+            dict: chunks（录制的分块数量）、saved（保存的 trace 文件数量）、overhead（开始和结束分块的总耗时，秒）
+        """
+        with cls._lock:
+            return dict(cls._stats)
+
+    @classmethod
+    def reset_stats(cls) -> None:
+        """
+        清空 trace 统计
+        """
+        with cls._lock:
+            cls._stats.update(chunks=0, saved=0, overhead=0.0)
@@ -0,0 +1,365 @@
+"""
+视觉回归模块
+
+测试中截取的截图只用于排查失败，从不与之前的结果比较。该模块为每个页面/状态保存一张基线截图，
+之后每次截图与基线比较：
+- 截图与基线字节完全相同时直接通过，不需要解码（同一浏览器下页面未变化时 PNG 输出是稳定的）
+- 否则逐像素比较：安装 NumPy 时按 YIQ 色彩空间的感知距离向量化计算（与 pixelmatch 相同的公式），
+  只安装 Pillow 时按通道最大差值计算；未安装 Pillow 时只能判断字节是否相同，任何字节差异都视为不匹配
+  （Pillow 和 NumPy 为可选依赖：pip install -r requirements-visual.txt）
+- VISUAL_THRESHOLD（0-1）控制单个像素的容差，VISUAL_MAX_DIFF_RATIO 控制允许不同的像素比例
+- 动态区域可以在截图时用定位器遮挡（mask，由 Playwright 涂色），也可以在比较时按矩形区域忽略（mask_regions）
+
+只有不匹配时才生成差异图（不同的像素标红），并与基线、实际截图一起写入 VISUAL_OUTPUT_DIR 和附加到 Allure。
+基线按浏览器类型分目录保存在 VISUAL_BASELINE_DIR，VISUAL_UPDATE_BASELINE=true 时写入当前截图。
+基线不存在时比较失败（避免 CI 上或基线被删除、改名后所有检查在没有比较的情况下通过），
+实际截图写入 VISUAL_OUTPUT_DIR，确认无误后用 VISUAL_UPDATE_BASELINE=true 重新执行生成基线。
+"""
+
+import io
+import logging
+import re
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Optional, Sequence, Tuple
+
+from playwright.sync_api import Locator, Page
+
+from config.settings import Settings
+from core.allure.allure_helper import AllureHelper
+
+try:
+    from PIL import Image, ImageChops
+except ImportError:  # Pillow 为可选依赖
+    Image = ImageChops = None
+
+try:
+    import numpy as np
+except ImportError:  # NumPy 为可选依赖
+    np = None
+
+
+# 矩形区域：(x, y, width, height)，单位为像素
+Region = Tuple[int, int, int, int]
+
+# YIQ 感知距离的最大值（黑色与白色之间）
+_MAX_YIQ_DELTA = 35215.0
+
+# 差异图中不同像素的颜色，以及基线淡化的比例
+_DIFF_COLOR = (255, 0, 0)
+_FADE = 0.7
+
+_warned = False
+
+
+@dataclass
+class VisualDiffResult:
+    """
+    一次截图比较的结果
+    """
+
+    name: str
+    matched: bool
+    diff_pixels: int = 0
+    total_pixels: int = 0
+    baseline_path: Optional[Path] = None
+    diff_path: Optional[Path] = None
+    created: bool = False
+    reason: str = ""
+    duration: float = 0.0
+
+    @property
+    def diff_ratio(self) -> float:
+        """
+        不同像素的比例
+        """
+        return self.diff_pixels / self.total_pixels if self.total_pixels else 0.0
+
+
+@dataclass
+class PixelComparison:
+    """
+    两张截图的像素比较结果
+    """
+
+    diff_pixels: int
+    total_pixels: int
+    reason: str = ""
+    diff_png: Optional[bytes] = None
+
+
+def _warn_once(message: str) -> None:
+    """
+    只输出一次警告（内部函数）
+    """
+    global _warned
+    if not _warned:
+        _warned = True
+        logging.warning(message)
+
+
+def _to_png(image) -> bytes:
+    """
+    将 Pillow 图片编码为 PNG（内部函数）
+    """
+    buffer = io.BytesIO()
+    image.save(buffer, format="PNG")
+    return buffer.getvalue()
+
+
+def _render_diff(expected, diff_mask) -> bytes:
+    """
+    生成差异图：淡化的灰度基线上将不同的像素标红（内部函数）
+
+    Args:
+        expected: 基线图片（RGB）
+        diff_mask: 不同像素为 255 的 L 模式图片
+    """
+    faded = Image.blend(expected.convert("L").convert("RGB"), Image.new("RGB", expected.size, (255, 255, 255)), _FADE)
+    return _to_png(Image.composite(Image.new("RGB", expected.size, _DIFF_COLOR), faded, diff_mask))
+
+
+def _diff_mask_numpy(expected, actual, threshold: float, regions: Sequence[Region]):
+    """
+    使用 NumPy 按 YIQ 感知距离计算不同的像素（内部函数）
+
+    Returns:
+        Tuple[int, Image]: 不同像素数量和差异掩码（L 模式）
+    """
+    expected_array = np.asarray(expected)
+    actual_array = np.asarray(actual)
+    # 只对有变化的像素计算感知距离（通常只占很小一部分）
+    changed = np.any(expected_array != actual_array, axis=2)
+    delta = expected_array[changed].astype(np.float32) - actual_array[changed].astype(np.float32)
+    r, g, b = delta[:, 0], delta[:, 1], delta[:, 2]
+    y = r * 0.29889531 + g * 0.58662247 + b * 0.11448223
+    i = r * 0.59597799 - g * 0.27417610 - b * 0.32180189
+    q = r * 0.21147017 - g * 0.52261711 + b * 0.31114694
+    distance = 0.5053 * y * y + 0.299 * i * i + 0.1957 * q * q
+    mask = np.zeros(changed.shape, dtype=bool)
+    mask[changed] = distance > _MAX_YIQ_DELTA * threshold * threshold
+    for x, top, width, height in regions:
+        mask[max(top, 0):top + height, max(x, 0):x + width] = False
+    return int(np.count_nonzero(mask)), Image.fromarray(mask.astype(np.uint8) * 255)
+
+
+def _diff_mask_pillow(expected, actual, threshold: float, regions: Sequence[Region]):
+    """
+    使用 Pillow 按通道最大差值计算不同的像素（内部函数）
+
+    Returns:
+        Tuple[int, Image]: 不同像素数量和差异掩码（L 模式）
+    """
+    red, green, blue = ImageChops.difference(expected, actual).split()
+    channel_max = ImageChops.lighter(ImageChops.lighter(red, green), blue)
+    cutoff = int(255 * threshold)
+    mask = channel_max.point(lambda value: 255 if value > cutoff else 0)
+    for x, top, width, height in regions:
+        mask.paste(0, (x, top, x + width, top + height))
+    return mask.histogram()[255], mask
+
+
+def compare_screenshots(
+    expected: bytes,
+    actual: bytes,
+    threshold: Optional[float] = None,
+    mask_regions: Sequence[Region] = (),
+    render_diff: bool = True
+) -> PixelComparison:
+    """
+    比较两张 PNG 截图
+
+    Args:
+        expected: 基线截图
+        actual: 实际截图
+        threshold: 单个像素的容差（0-1），如果为 None 则使用配置文件中的 VISUAL_THRESHOLD
+        mask_regions: 忽略的矩形区域 (x, y, width, height)
+        render_diff: 有不同的像素时是否生成差异图
+
+    Returns:
+        PixelComparison: 不同像素数量、总像素数量、无法逐像素比较的原因和差异图（字节相同时像素数量均为 0）
+    """
+    if expected == actual:
+        return PixelComparison(0, 0)
+
+    if Image is None:
+        _warn_once("Pillow is not installed, visual comparison only accepts byte-identical screenshots")
+        return PixelComparison(1, 1, reason="screenshots differ (Pillow is not installed, pixel diff unavailable)")
+
+    expected_image = Image.open(io.BytesIO(expected)).convert("RGB")
+    actual_image = Image.open(io.BytesIO(actual)).convert("RGB")
+    total = expected_image.width * expected_image.height
+    if expected_image.size != actual_image.size:
+        return PixelComparison(
+            total, total,
+            reason=f"size changed from {expected_image.width}x{expected_image.height} "
+                   f"to {actual_image.width}x{actual_image.height}"
+        )
+
+    threshold = Settings.VISUAL_THRESHOLD if threshold is None else threshold
+    if np is not None:
+        diff_pixels, diff_mask = _diff_mask_numpy(expected_image, actual_image, threshold, mask_regions)
+    else:
+        diff_pixels, diff_mask = _diff_mask_pillow(expected_image, actual_image, threshold, mask_regions)
+
+    diff_png = _render_diff(expected_image, diff_mask) if diff_pixels and render_diff else None
+    return PixelComparison(diff_pixels, total, diff_png=diff_png)
+
+
+def baseline_path_for(name: str) -> Path:
+    """
+    获取基线截图路径（按浏览器类型分目录，名称中的 / 作为子目录）
+
+    Args:
+        name: 页面/状态名称，如 "login_page/empty"
+
+    Returns:
+        Path: 基线截图路径
+    """
+    parts = [re.sub(r"[^\w.-]+", "_", part) for part in name.split("/") if part]
+    return Path(Settings.VISUAL_BASELINE_DIR, Settings.BROWSER_TYPE, *parts).with_suffix(".png")
+
+
+def capture_for_comparison(
+    page: Page,
+    full_page: bool = False,
+    mask: Optional[Sequence[Locator]] = None
+) -> bytes:
+    """
+    截取用于比较的 PNG 截图（不经过 ScreenshotEncoder 重新编码，禁用动画并隐藏光标以保证稳定）
+
+    Args:
+        page: Playwright Page 对象
+        full_page: 是否截取整个页面
+        mask: 遮挡的元素定位器
+
+    Returns:
+        bytes: PNG 截图
+    """
+    return page.screenshot(
+        type="png",
+        full_page=full_page,
+        animations="disabled",
+        caret="hide",
+        mask=list(mask or [])
+    )
+
+
+def check_screenshot(
+    name: str,
+    actual: bytes,
+    threshold: Optional[float] = None,
+    max_diff_ratio: Optional[float] = None,
+    mask_regions: Sequence[Region] = ()
+) -> VisualDiffResult:
+    """
+    将截图与基线比较，不匹配时写入并附加基线、实际截图和差异图
+
+    Args:
+        name: 页面/状态名称
+        actual: 实际 PNG 截图
+        threshold: 单个像素的容差（0-1），如果为 None 则使用配置文件中的 VISUAL_THRESHOLD
+        max_diff_ratio: 允许不同的像素比例，如果为 None 则使用配置文件中的 VISUAL_MAX_DIFF_RATIO
+        mask_regions: 忽略的矩形区域 (x, y, width, height)
+
+    Returns:
+        VisualDiffResult: 比较结果
+    """
+    start = time.perf_counter()
+    logger = logging.getLogger("VisualRegression")
+    baseline_path = baseline_path_for(name)
+
+    if Settings.VISUAL_UPDATE_BASELINE:
+        baseline_path.parent.mkdir(parents=True, exist_ok=True)
+        baseline_path.write_bytes(actual)
+        logger.info(f"Visual baseline written: {baseline_path}")
+        return VisualDiffResult(
+            name, True, baseline_path=baseline_path, created=True, duration=time.perf_counter() - start
+        )
+
+    output_dir = Path(Settings.VISUAL_OUTPUT_DIR) / baseline_path.parent.relative_to(Settings.VISUAL_BASELINE_DIR)
+    if not baseline_path.exists():
+        output_dir.mkdir(parents=True, exist_ok=True)
+        (output_dir / f"{baseline_path.stem}.actual.png").write_bytes(actual)
+        AllureHelper.attach_screenshot(actual, f"{name} - actual")
+        return VisualDiffResult(
+            name,
+            matched=False,
+            baseline_path=baseline_path,
+            reason="baseline is missing (run with VISUAL_UPDATE_BASELINE=true to create it)",
+            duration=time.perf_counter() - start
+        )
+
+    expected = baseline_path.read_bytes()
+    comparison = compare_screenshots(expected, actual, threshold, mask_regions)
+    max_diff_ratio = Settings.VISUAL_MAX_DIFF_RATIO if max_diff_ratio is None else max_diff_ratio
+    result = VisualDiffResult(
+        name,
+        matched=False,
+        diff_pixels=comparison.diff_pixels,
+        total_pixels=comparison.total_pixels,
+        baseline_path=baseline_path,
+        reason=comparison.reason
+    )
+    result.matched = not comparison.reason and result.diff_ratio <= max_diff_ratio
+
+    if not result.matched:
+        output_dir.mkdir(parents=True, exist_ok=True)
+        stem = baseline_path.stem
+        (output_dir / f"{stem}.actual.png").write_bytes(actual)
+        AllureHelper.attach_screenshot(expected, f"{name} - expected")
+        AllureHelper.attach_screenshot(actual, f"{name} - actual")
+        if comparison.diff_png is not None:
+            result.diff_path = output_dir / f"{stem}.diff.png"
+            result.diff_path.write_bytes(comparison.diff_png)
+            AllureHelper.attach_screenshot(comparison.diff_png, f"{name} - diff")
+        if not result.reason:
+            result.reason = (
+                f"{result.diff_pixels} of {result.total_pixels} pixels differ "
+                f"({result.diff_ratio:.4%} > {max_diff_ratio:.4%})"
+            )
+
+    result.duration = time.perf_counter() - start
+    logger.debug(f"Visual comparison '{name}' took {result.duration * 1000:.0f}ms: {result.reason or 'matched'}")
+    return result
+
+
+def assert_screenshot(
+    page: Page,
+    name: str,
+    full_page: bool = False,
+    mask: Optional[Sequence[Locator]] = None,
+    mask_regions: Sequence[Region] = (),
+    threshold: Optional[float] = None,
+    max_diff_ratio: Optional[float] = None
+) -> VisualDiffResult:
+    """
+    截取页面并与基线比较，不匹配时抛出 AssertionError
+
+    Args:
+        page: Playwright Page 对象
+        name: 页面/状态名称，如 "login_page/empty"
+        full_page: 是否截取整个页面
+        mask: 截图时遮挡的元素定位器（时间、验证码等动态内容）
+        mask_regions: 比较时忽略的矩形区域 (x, y, width, height)
+        threshold: 单个像素的容差（0-1），如果为 None 则使用配置文件中的 VISUAL_THRESHOLD
+        max_diff_ratio: 允许不同的像素比例，如果为 None 则使用配置文件中的 VISUAL_MAX_DIFF_RATIO
+
+    Returns:
+        VisualDiffResult: 比较结果（匹配时）
+
+    Raises:
+        AssertionError: 截图与基线不匹配
+
+    使用示例:
+        assert_screenshot(page, "login_page/empty", mask=[page.locator(".captcha")])
+    """
+    actual = capture_for_comparison(page, full_page=full_page, mask=mask)
+    result = check_screenshot(name, actual, threshold, max_diff_ratio, mask_regions)
+    if not result.matched:
+        raise AssertionError(
+            f"Screenshot '{name}' does not match baseline {result.baseline_path}: {result.reason}"
+            + (f" (diff: {result.diff_path})" if result.diff_path else "")
+        )
+    return result
@@ -0,0 +1,282 @@
+"""
+等待策略模块
+
+UI 测试中大部分等待是重复或过度的：
+- BasePage.click / fill 先用 locator.wait_for 显式等待元素可见，再由 Playwright 的操作本身等待元素可操作，
+  每次操作多一次往返。Playwright 的操作会自动等待元素可见、稳定、可用（actionability），
+  因此默认不再显式等待（WAIT_EXPLICIT_BEFORE_ACTION=true 可恢复）
+- wait_for_load_state("networkidle") 要求 500ms 内没有任何网络请求，页面有长轮询、心跳或统计请求时
+  会一直等到超时。wait_for_network_quiet 只统计未被忽略的请求（WAIT_NETWORK_IGNORE_PATTERNS），
+  长连接（websocket、eventsource）始终忽略
+
+所有等待通过 WaitStats 记录实际耗时：超过 WAIT_SLOW_THRESHOLD_MS 的等待输出警告，
+会话结束时在日志中列出总耗时最长的等待，用于找出拖慢测试的页面和元素。
+"""
+
+import logging
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Dict, Generator, Iterable, List, Optional, Tuple
+
+from playwright.sync_api import Page, Request, TimeoutError as PlaywrightTimeoutError
+
+from config.settings import Settings
+from base.ui.network_profiles import compile_url_patterns
+
+
+# 长连接请求不会结束，网络安静等待时始终忽略
+_LONG_LIVED_RESOURCE_TYPES = frozenset({"websocket", "eventsource"})
+
+# 网络安静等待中有请求进行时的轮询间隔（毫秒）
+_POLL_INTERVAL_MS = 50
+
+
+@dataclass
+class WaitRecord:
+    """
+    同一类等待（等待类型 + 目标）的耗时统计
+    """
+
+    kind: str
+    target: str
+    count: int = 0
+    total: float = 0.0
+    max: float = 0.0
+    timeouts: int = 0
+
+    @property
+    def average(self) -> float:
+        """
+        平均耗时（秒）
+        """
+        return self.total / self.count if self.count else 0.0
+
+
+class WaitStats:
+    """
+    等待耗时统计
+
+    所有方法都是类方法，同一进程内共享统计数据。
+    """
+
+    _records: Dict[Tuple[str, str], WaitRecord] = {}
+    _lock = threading.Lock()
+
+    @classmethod
+    def record(cls, kind: str, target: str, duration: float, timed_out: bool = False) -> None:
+        """
+        记录一次等待
+
+        Args:
+            kind: 等待类型（element, click, fill, load_state, url, network_quiet 等）
+            target: 等待目标（选择器、加载状态、URL 模式等）
+            duration: 实际耗时（秒）
+            timed_out: 是否超时
+        """
+        with cls._lock:
+            record = cls._records.get((kind, target))
+            if record is None:
+                record = cls._records[(kind, target)] = WaitRecord(kind, target)
+            record.count += 1
+            record.total += duration
+            record.max = max(record.max, duration)
+            if timed_out:
+                record.timeouts += 1
+
+        threshold = Settings.WAIT_SLOW_THRESHOLD_MS
+        if threshold and duration * 1000 >= threshold:
+            logging.getLogger("WaitStats").warning(
+                f"Slow wait: {kind} '{target}' took {duration * 1000:.0f}ms"
+                f"{' (timed out)' if timed_out else ''}"
+            )
+
+    @classmethod
+    @contextmanager
+    def timed(cls, kind: str, target: str) -> Generator[None, None, None]:
+        """
+        记录代码块耗时的上下文管理器，代码块抛出 Playwright 超时异常时记为超时
+
+        使用示例:
+            with WaitStats.timed("element", selector):
+                locator.wait_for(state="visible")
+        """
+        start = time.perf_counter()
+        timed_out = False
+        try:
+            yield
+        except PlaywrightTimeoutError:
+            timed_out = True
+            raise
+        finally:
+            cls.record(kind, target, time.perf_counter() - start, timed_out)
+
+    @classmethod
+    def get_slowest(cls, top: Optional[int] = None) -> List[WaitRecord]:
+        """
+        获取总耗时最长的等待
+
+        Args:
+            top: 返回的数量，如果为 None 则使用配置文件中的 WAIT_REPORT_TOP
+
+        Returns:
+            List[WaitRecord]: 按总耗时降序排列的统计
+        """
+        with cls._lock:
+            records = sorted(cls._records.values(), key=lambda record: record.total, reverse=True)
+        return records[:top or Settings.WAIT_REPORT_TOP]
+
+    @classmethod
+    def format_report(cls, top: Optional[int] = None) -> str:
+        """
+        生成最慢等待的文本报告
+
+        Returns:
+            str: 每行一类等待，没有记录时返回空字符串
+        """
+        return "\n".join(
+            f"{record.total:8.2f}s total  {record.count:5d}x  avg {record.average * 1000:7.0f}ms  "
+            f"max {record.max * 1000:7.0f}ms  timeouts {record.timeouts:3d}  {record.kind}: {record.target}"
+            for record in cls.get_slowest(top)
+        )
+
+    @classmethod
+    def reset(cls) -> None:
+        """
+        清空统计
+        """
+        with cls._lock:
+            cls._records.clear()
+
+
+class NetworkQuietWaiter:
+    """
+    网络安静等待：没有进行中的请求（忽略的请求除外）持续一段时间后视为页面已加载完成
+
+    开始监听之前已经发出的请求无法统计，因此应在触发页面加载的操作之前开始监听：
+        with NetworkQuietWaiter(page) as waiter:
+            page.click("#search")
+            waiter.wait()
+    """
+
+    def __init__(self, page: Page, ignore_patterns: Optional[Iterable[str]] = None):
+        """
+        初始化网络安静等待
+
+        Args:
+            page: Playwright Page 对象
+            ignore_patterns: 忽略的请求 URL 模式（fnmatch 语法），如果为 None 则使用 WAIT_NETWORK_IGNORE_PATTERNS
+        """
+        self.page = page
+        patterns = Settings.WAIT_NETWORK_IGNORE_PATTERNS if ignore_patterns is None else ignore_patterns
+        self._ignore_regex = compile_url_patterns(tuple(patterns))
+        self._in_flight = set()
+        self._last_activity = time.perf_counter()
+        self._listening = False
+
+    def _is_tracked(self, request: Request) -> bool:
+        """
+        判断请求是否需要等待（内部方法）
+        """
+        if request.resource_type in _LONG_LIVED_RESOURCE_TYPES:
+            return False
+        return self._ignore_regex is None or self._ignore_regex.match(request.url) is None
+
+    def _on_request(self, request: Request) -> None:
+        """
+        请求开始事件（内部方法）
+        """
+        if self._is_tracked(request):
+            self._in_flight.add(request)
+            self._last_activity = time.perf_counter()
+
+    def _on_request_done(self, request: Request) -> None:
+        """
+        请求结束或失败事件（内部方法）
+        """
+        if request in self._in_flight:
+            self._in_flight.discard(request)
+            self._last_activity = time.perf_counter()
+
+    def start(self) -> "NetworkQuietWaiter":
+        """
+        开始监听请求
+        """
+        if not self._listening:
+            self.page.on("request", self._on_request)
+            self.page.on("requestfinished", self._on_request_done)
+            self.page.on("requestfailed", self._on_request_done)
+            self._listening = True
+            self._last_activity = time.perf_counter()
+        return self
+
+    def stop(self) -> None:
+        """
+        停止监听请求
+        """
+        if self._listening:
+            self.page.remove_listener("request", self._on_request)
+            self.page.remove_listener("requestfinished", self._on_request_done)
+            self.page.remove_listener("requestfailed", self._on_request_done)
+            self._listening = False
+
+    def wait(self, quiet_ms: Optional[int] = None, timeout: Optional[int] = None) -> None:
+        """
+        等待网络安静
+
+        Args:
+            quiet_ms: 安静时间（毫秒），如果为 None 则使用配置文件中的 WAIT_NETWORK_QUIET_MS
+            timeout: 超时时间（毫秒），如果为 None 则使用 PAGE_LOAD_TIMEOUT
+
+        Raises:
+            PlaywrightTimeoutError: 超时仍未达到网络安静
+        """
+        quiet = (quiet_ms or Settings.WAIT_NETWORK_QUIET_MS) / 1000
+        timeout = timeout or Settings.PAGE_LOAD_TIMEOUT
+        self.start()
+
+        with WaitStats.timed("network_quiet", self.page.url):
+            deadline = time.perf_counter() + timeout / 1000
+            while True:
+                now = time.perf_counter()
+                idle = now - self._last_activity
+                if not self._in_flight and idle >= quiet:
+                    return
+                if now >= deadline:
+                    pending = ", ".join(sorted(request.url for request in self._in_flight)[:5])
+                    raise PlaywrightTimeoutError(
+                        f"Timeout {timeout}ms exceeded waiting for network quiet "
+                        f"({len(self._in_flight)} request(s) in flight: {pending})"
+                    )
+                # wait_for_timeout 期间 Playwright 继续分发请求事件
+                wait_ms = _POLL_INTERVAL_MS if self._in_flight else (quiet - idle) * 1000
+                self.page.wait_for_timeout(max(1, min(wait_ms, (deadline - now) * 1000)))
+
+    def __enter__(self) -> "NetworkQuietWaiter":
+        return self.start()
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.stop()
+
+
+def wait_for_network_quiet(
+    page: Page,
+    quiet_ms: Optional[int] = None,
+    ignore_patterns: Optional[Iterable[str]] = None,
+    timeout: Optional[int] = None
+) -> None:
+    """
+    从现在开始等待页面网络安静（之前已经发出、仍未结束的请求不会被等待）
+
+    Args:
+        page: Playwright Page 对象
+        quiet_ms: 安静时间（毫秒），如果为 None 则使用配置文件中的 WAIT_NETWORK_QUIET_MS
+        ignore_patterns: 忽略的请求 URL 模式（fnmatch 语法），如果为 None 则使用 WAIT_NETWORK_IGNORE_PATTERNS
+        timeout: 超时时间（毫秒），如果为 None 则使用 PAGE_LOAD_TIMEOUT
+
+    Raises:
+        PlaywrightTimeoutError: 超时仍未达到网络安静
+    """
+    with NetworkQuietWaiter(page, ignore_patterns) as waiter:
+        waiter.wait(quiet_ms, timeout)
@@ -5,6 +5,7 @@
 配置项包括浏览器设置、API设置、日志设置、并行执行设置等。
 """
 
+import json
 import os
 from typing import Optional, Literal
 from pathlib import Path
@@ -54,6 +55,30 @@ class Settings:
     # 环境变量：DEVTOOLS (true/false)
     DEVTOOLS: bool = os.getenv("DEVTOOLS", "false").lower() == "true"
     
+    # 是否启用浏览器上下文池（每个 worker 预先创建上下文，测试结束后重置并重用）
+    # 环境变量：BROWSER_POOL_ENABLED (true/false)
+    BROWSER_POOL_ENABLED: bool = os.getenv("BROWSER_POOL_ENABLED", "false").lower() == "true"
+    
+    # 上下文池中保持就绪的上下文数量
+    # 环境变量：BROWSER_POOL_SIZE
+    BROWSER_POOL_SIZE: int = int(os.getenv("BROWSER_POOL_SIZE", "2"))
+    
+    # 单个上下文最多重用的次数，达到后关闭并新建（避免长时间运行的上下文占用内存），0 表示不限制
+    # 环境变量：BROWSER_POOL_MAX_USES
+    BROWSER_POOL_MAX_USES: int = int(os.getenv("BROWSER_POOL_MAX_USES", "50"))
+    
+    # 默认的网络资源拦截配置：off（不拦截）, lean, minimal 或自定义配置名称（见 base/ui/network_profiles.py）
+    # 环境变量：NETWORK_PROFILE
+    NETWORK_PROFILE: str = os.getenv("NETWORK_PROFILE", "off")
+    
+    # 自定义网络资源拦截配置（JSON 对象，键为配置名称）
+    # 环境变量：NETWORK_PROFILES
+    NETWORK_PROFILES: str = os.getenv("NETWORK_PROFILES", "")
+    
+    # 异步 UI 测试中同时操作的页面数量上限（见 base/ui/pages/async_base_page.py 的 gather_pages）
+    # 环境变量：ASYNC_UI_CONCURRENCY
+    ASYNC_UI_CONCURRENCY: int = int(os.getenv("ASYNC_UI_CONCURRENCY", "10"))
+    
     # ==================== API 配置 ====================
     
     # API 基础 URL
@@ -114,6 +139,10 @@ class Settings:
     # 环境变量：LOG_FILE_FORMAT
     LOG_FILE_FORMAT: str = os.getenv("LOG_FILE_FORMAT", "test_{timestamp}.log")
     
+    # 并行执行（pytest-xdist）结束后是否将各 worker 的日志文件合并为一个按时间排序的会话日志
+    # 环境变量：LOG_MERGE_WORKER_LOGS (true/false)
+    LOG_MERGE_WORKER_LOGS: bool = os.getenv("LOG_MERGE_WORKER_LOGS", "true").lower() == "true"
+    
     # 是否在控制台输出日志
     # 环境变量：LOG_TO_CONSOLE (true/false)
     LOG_TO_CONSOLE: bool = os.getenv("LOG_TO_CONSOLE", "true").lower() == "true"
@@ -122,7 +151,7 @@ class Settings:
     # 环境变量：LOG_TO_FILE (true/false)
     LOG_TO_FILE: bool = os.getenv("LOG_TO_FILE", "true").lower() == "true"
     
-    # 日志格式
+    # 日志格式（可使用上下文字段 %(worker_id)s, %(test_nodeid)s, %(request_id)s, %(endpoint)s, %(elapsed_ms)s）
     # 环境变量：LOG_FORMAT
     LOG_FORMAT: str = os.getenv(
         "LOG_FORMAT",
@@ -133,6 +162,67 @@ class Settings:
     # 环境变量：LOG_DATE_FORMAT
     LOG_DATE_FORMAT: str = os.getenv("LOG_DATE_FORMAT", "%Y-%m-%d %H:%M:%S")
     
+    # 是否将文件日志输出为 JSON Lines 结构化格式（文件扩展名为 .jsonl，控制台仍为文本格式）
+    # 环境变量：LOG_JSON (true/false)
+    LOG_JSON: bool = os.getenv("LOG_JSON", "false").lower() == "true"
+    
+    # 是否启用异步日志输出（日志先进入有界队列，由后台线程批量写入控制台和文件）
+    # 环境变量：LOG_ASYNC (true/false)
+    LOG_ASYNC: bool = os.getenv("LOG_ASYNC", "false").lower() == "true"
+    
+    # 异步日志队列容量（条）
+    # 环境变量：LOG_QUEUE_SIZE
+    LOG_QUEUE_SIZE: int = int(os.getenv("LOG_QUEUE_SIZE", "10000"))
+    
+    # 异步日志队列满时的策略：block（阻塞等待，不丢日志）, drop（丢弃 WARNING 以下级别的日志）
+    # 环境变量：LOG_QUEUE_FULL_POLICY
+    LOG_QUEUE_FULL_POLICY: Literal["block", "drop"] = os.getenv("LOG_QUEUE_FULL_POLICY", "block")
+    
+    # 异步日志每批处理的最大条数（每批结束后统一刷新一次）
+    # 环境变量：LOG_BATCH_SIZE
+    LOG_BATCH_SIZE: int = int(os.getenv("LOG_BATCH_SIZE", "200"))
+    
+    # 日志文件按大小轮转的阈值（字节），0 表示不按大小轮转
+    # 环境变量：LOG_ROTATE_MAX_BYTES
+    LOG_ROTATE_MAX_BYTES: int = int(os.getenv("LOG_ROTATE_MAX_BYTES", "0"))
+    
+    # 日志文件按时间轮转的周期单位：S, M, H, D, midnight, W0-W6，为空表示不按时间轮转（按大小轮转优先）
+    # 环境变量：LOG_ROTATE_WHEN
+    LOG_ROTATE_WHEN: str = os.getenv("LOG_ROTATE_WHEN", "")
+    
+    # 日志文件按时间轮转的周期
+    # 环境变量：LOG_ROTATE_INTERVAL
+    LOG_ROTATE_INTERVAL: int = int(os.getenv("LOG_ROTATE_INTERVAL", "1"))
+    
+    # 轮转后保留的日志段数量
+    # 环境变量：LOG_ROTATE_BACKUP_COUNT
+    LOG_ROTATE_BACKUP_COUNT: int = int(os.getenv("LOG_ROTATE_BACKUP_COUNT", "10"))
+    
+    # 轮转出的日志段的压缩方式：gzip, zstd（需要安装 zstandard）, none
+    # 环境变量：LOG_ROTATE_COMPRESSION
+    LOG_ROTATE_COMPRESSION: Literal["gzip", "zstd", "none"] = os.getenv("LOG_ROTATE_COMPRESSION", "gzip")
+    
+    # 会话日志附加到 Allure 时最多读取的字节数（从文件末尾开始），0 表示附加整个文件
+    # 环境变量：LOG_ATTACH_MAX_BYTES
+    LOG_ATTACH_MAX_BYTES: int = int(os.getenv("LOG_ATTACH_MAX_BYTES", str(5 * 1024 * 1024)))
+    
+    # 日志采样规则：逗号分隔的 "记录器名称模式=N"，匹配的记录器 WARNING 以下的日志每 N 条保留 1 条
+    # （同一 API 请求的日志整体保留或丢弃），如 "*Service=10,*Page=5"，为空表示不采样
+    # 环境变量：LOG_SAMPLING_RULES
+    LOG_SAMPLING_RULES: str = os.getenv("LOG_SAMPLING_RULES", "")
+    
+    # 重复警告去重时间窗口（秒）：窗口内相同的警告只输出一次，之后输出被抑制的次数，0 表示不去重
+    # 环境变量：LOG_DEDUP_WINDOW
+    LOG_DEDUP_WINDOW: float = float(os.getenv("LOG_DEDUP_WINDOW", "0"))
+    
+    # 单个测试日志捕获（附加到 Allure）保留的最大条数，0 表示不限制
+    # 环境变量：LOG_CAPTURE_MAX_RECORDS
+    LOG_CAPTURE_MAX_RECORDS: int = int(os.getenv("LOG_CAPTURE_MAX_RECORDS", "5000"))
+    
+    # 单个测试日志捕获保留的最大字节数，0 表示不限制
+    # 环境变量：LOG_CAPTURE_MAX_BYTES
+    LOG_CAPTURE_MAX_BYTES: int = int(os.getenv("LOG_CAPTURE_MAX_BYTES", str(1024 * 1024)))
+    
     # ==================== 并行执行配置 ====================
     
     # 并行 worker 数量：auto 表示自动检测 CPU 核心数，或指定具体数字
@@ -177,6 +267,30 @@ class Settings:
     # 环境变量：ALLURE_CLEAN_RESULTS (true/false)
     ALLURE_CLEAN_RESULTS: bool = os.getenv("ALLURE_CLEAN_RESULTS", "true").lower() == "true"
     
+    # 是否在后台线程中写入 Allure 附件（附件在测试线程上登记，测试结束时等待写入完成）
+    # 环境变量：ALLURE_ASYNC_ATTACHMENTS (true/false)
+    ALLURE_ASYNC_ATTACHMENTS: bool = os.getenv("ALLURE_ASYNC_ATTACHMENTS", "false").lower() == "true"
+    
+    # 是否按内容对 Allure 附件去重（相同内容的附件只保存一份文件，所有测试引用同一个文件）
+    # 环境变量：ALLURE_DEDUP_ATTACHMENTS (true/false)
+    ALLURE_DEDUP_ATTACHMENTS: bool = os.getenv("ALLURE_DEDUP_ATTACHMENTS", "false").lower() == "true"
+    
+    # 单个 Allure 附件的最大字节数，超出时文本保留首尾、JSON 紧凑输出并省略长数组，二进制附件以说明文本代替，0 表示不限制
+    # 环境变量：ALLURE_ATTACHMENT_MAX_BYTES
+    ALLURE_ATTACHMENT_MAX_BYTES: int = int(os.getenv("ALLURE_ATTACHMENT_MAX_BYTES", str(2 * 1024 * 1024)))
+    
+    # 单个测试的 Allure 附件总字节数预算（不含测试日志），超出后的附件被截断或以说明文本代替，0 表示不限制
+    # 环境变量：ALLURE_TEST_ATTACHMENT_BUDGET
+    ALLURE_TEST_ATTACHMENT_BUDGET: int = int(os.getenv("ALLURE_TEST_ATTACHMENT_BUDGET", str(20 * 1024 * 1024)))
+    
+    # JSON 附件超出预算时数组最多保留的元素数量（保留开头和结尾）
+    # 环境变量：ALLURE_JSON_MAX_ARRAY_ITEMS
+    ALLURE_JSON_MAX_ARRAY_ITEMS: int = int(os.getenv("ALLURE_JSON_MAX_ARRAY_ITEMS", "20"))
+    
+    # 后台附件写入队列容量（个），队列满时附加附件的线程等待
+    # 环境变量：ALLURE_ATTACHMENT_QUEUE_SIZE
+    ALLURE_ATTACHMENT_QUEUE_SIZE: int = int(os.getenv("ALLURE_ATTACHMENT_QUEUE_SIZE", "1000"))
+    
     # ==================== 截图配置 ====================
     
     # 截图保存目录
@@ -187,14 +301,195 @@ class Settings:
     # 环境变量：SCREENSHOT_ON_FAILURE (true/false)
     SCREENSHOT_ON_FAILURE: bool = os.getenv("SCREENSHOT_ON_FAILURE", "true").lower() == "true"
     
-    # 截图格式：png, jpeg
+    # 截图格式：png, jpeg, webp（webp 需要安装 Pillow，未安装时回退到 jpeg）
     # 环境变量：SCREENSHOT_FORMAT
-    SCREENSHOT_FORMAT: Literal["png", "jpeg"] = os.getenv("SCREENSHOT_FORMAT", "png")
+    SCREENSHOT_FORMAT: Literal["png", "jpeg", "webp"] = os.getenv("SCREENSHOT_FORMAT", "png")
     
-    # 截图质量（仅对 jpeg 有效，1-100）
+    # 截图质量（仅对 jpeg 和 webp 有效，1-100）
     # 环境变量：SCREENSHOT_QUALITY
     SCREENSHOT_QUALITY: int = int(os.getenv("SCREENSHOT_QUALITY", "80"))
     
+    # 截图最大宽度（像素），超出时等比缩小（需要安装 Pillow），0 表示不限制
+    # 环境变量：SCREENSHOT_MAX_WIDTH
+    SCREENSHOT_MAX_WIDTH: int = int(os.getenv("SCREENSHOT_MAX_WIDTH", "0"))
+    
+    # 截图最大高度（像素），超出时等比缩小（需要安装 Pillow），0 表示不限制
+    # 环境变量：SCREENSHOT_MAX_HEIGHT
+    SCREENSHOT_MAX_HEIGHT: int = int(os.getenv("SCREENSHOT_MAX_HEIGHT", "0"))
+    
+    # 是否将截图转换为灰度（需要安装 Pillow）
+    # 环境变量：SCREENSHOT_GRAYSCALE (true/false)
+    SCREENSHOT_GRAYSCALE: bool = os.getenv("SCREENSHOT_GRAYSCALE", "false").lower() == "true"
+    
+    # 截图后台编码线程数（仅在需要 Pillow 后处理时使用）
+    # 环境变量：SCREENSHOT_ENCODE_WORKERS
+    SCREENSHOT_ENCODE_WORKERS: int = int(os.getenv("SCREENSHOT_ENCODE_WORKERS", "2"))
+    
+    # 是否在后台线程写入截图文件和截图的 Allure 附件（截图本身仍在测试线程上完成，测试结束时等待写完）
+    # 环境变量：SCREENSHOT_ASYNC_WRITE (true/false)
+    SCREENSHOT_ASYNC_WRITE: bool = os.getenv("SCREENSHOT_ASYNC_WRITE", "false").lower() == "true"
+    
+    # 后台写入队列的最大截图数量，队列满时截图阻塞等待（限制截图占用的内存）
+    # 环境变量：SCREENSHOT_WRITE_QUEUE_SIZE
+    SCREENSHOT_WRITE_QUEUE_SIZE: int = int(os.getenv("SCREENSHOT_WRITE_QUEUE_SIZE", "16"))
+    
+    # ==================== 视觉回归配置 ====================
+    
+    # 基线截图目录（按浏览器类型分子目录）
+    # 环境变量：VISUAL_BASELINE_DIR
+    VISUAL_BASELINE_DIR: str = os.getenv("VISUAL_BASELINE_DIR", "visual_baselines")
+    
+    # 不匹配时实际截图和差异图的输出目录
+    # 环境变量：VISUAL_OUTPUT_DIR
+    VISUAL_OUTPUT_DIR: str = os.getenv("VISUAL_OUTPUT_DIR", "visual_diffs")
+    
+    # 单个像素的颜色容差（0-1，越大越宽松；安装 NumPy 时按感知色差计算）
+    # 环境变量：VISUAL_THRESHOLD
+    VISUAL_THRESHOLD: float = float(os.getenv("VISUAL_THRESHOLD", "0.1"))
+    
+    # 允许不同的像素比例（0-1，0 表示不允许任何像素不同）
+    # 环境变量：VISUAL_MAX_DIFF_RATIO
+    VISUAL_MAX_DIFF_RATIO: float = float(os.getenv("VISUAL_MAX_DIFF_RATIO", "0"))
+    
+    # 是否用当前截图写入或覆盖基线（新增检查或页面有意修改后更新基线；为 false 时基线不存在视为不匹配）
+    # 环境变量：VISUAL_UPDATE_BASELINE (true/false)
+    VISUAL_UPDATE_BASELINE: bool = os.getenv("VISUAL_UPDATE_BASELINE", "false").lower() == "true"
+    
+    # ==================== Trace 配置 ====================
+    
+    # Trace 模式：off（不录制）, retain-on-failure（按测试分块录制，只保存失败测试的 trace）, on（保存所有测试的 trace）
+    # 环境变量：TRACE_MODE
+    TRACE_MODE: Literal["off", "retain-on-failure", "on"] = os.getenv("TRACE_MODE", "off")
+    
+    # Trace 文件目录
+    # 环境变量：TRACE_DIR
+    TRACE_DIR: str = os.getenv("TRACE_DIR", "traces")
+    
+    # 每个浏览器上下文保留的最近 trace 分块数量（包括当前测试），测试失败时一起保存。
+    # 大于 1 时每个分块都会写入磁盘（只保留最近的 N 个），用于排查上下文池中前一个测试遗留的状态
+    # 环境变量：TRACE_RING_SIZE
+    TRACE_RING_SIZE: int = int(os.getenv("TRACE_RING_SIZE", "1"))
+    
+    # Trace 中是否包含截图（用于时间线预览）
+    # 环境变量：TRACE_SCREENSHOTS (true/false)
+    TRACE_SCREENSHOTS: bool = os.getenv("TRACE_SCREENSHOTS", "true").lower() == "true"
+    
+    # Trace 中是否包含 DOM 快照（每个操作前后的页面状态）
+    # 环境变量：TRACE_SNAPSHOTS (true/false)
+    TRACE_SNAPSHOTS: bool = os.getenv("TRACE_SNAPSHOTS", "true").lower() == "true"
+    
+    # ==================== 登录状态配置 ====================
+    
+    # 登录状态（Playwright storage state）保存目录，按环境和角色分文件保存
+    # 环境变量：AUTH_STATE_DIR
+    AUTH_STATE_DIR: str = os.getenv("AUTH_STATE_DIR", ".auth")
+    
+    # 登录状态有效期（秒），超过后重新登录，0 表示只按 cookie 过期时间判断
+    # 环境变量：AUTH_STATE_TTL
+    AUTH_STATE_TTL: int = int(os.getenv("AUTH_STATE_TTL", "3600"))
+    
+    # 并行执行时等待其他 worker 完成登录的最长时间（秒）
+    # 环境变量：AUTH_STATE_LOCK_TIMEOUT
+    AUTH_STATE_LOCK_TIMEOUT: int = int(os.getenv("AUTH_STATE_LOCK_TIMEOUT", "120"))
+    
+    # ==================== HAR 录制与回放配置 ====================
+    
+    # HAR 模式：off, record（录制）, replay（回放）, auto（HAR 文件存在时回放，否则录制）
+    # 环境变量：HAR_MODE
+    HAR_MODE: Literal["off", "record", "replay", "auto"] = os.getenv("HAR_MODE", "off")
+    
+    # HAR 范围：full（所有请求）, api（只录制/回放接口请求，前端资源仍从真实服务器加载）
+    # 环境变量：HAR_SCOPE
+    HAR_SCOPE: Literal["full", "api"] = os.getenv("HAR_SCOPE", "full")
+    
+    # HAR 文件目录（按测试模块分目录保存）
+    # 环境变量：HAR_DIR
+    HAR_DIR: str = os.getenv("HAR_DIR", "data/har")
+    
+    # 接口请求的 URL 模式（HAR_SCOPE=api 时使用，glob 语法）
+    # 环境变量：HAR_API_URL_PATTERN
+    HAR_API_URL_PATTERN: str = os.getenv("HAR_API_URL_PATTERN", "**/api/**")
+    
+    # 回放时 HAR 中没有的请求的处理方式：abort（中止）, fallback（访问真实网络）
+    # 环境变量：HAR_NOT_FOUND
+    HAR_NOT_FOUND: Literal["abort", "fallback"] = os.getenv("HAR_NOT_FOUND", "abort")
+    
+    # ==================== 等待策略配置 ====================
+    
+    # 点击和填充前是否先显式等待元素可见（Playwright 的操作本身会等待元素可操作，默认不再重复等待）
+    # 环境变量：WAIT_EXPLICIT_BEFORE_ACTION (true/false)
+    WAIT_EXPLICIT_BEFORE_ACTION: bool = os.getenv("WAIT_EXPLICIT_BEFORE_ACTION", "false").lower() == "true"
+    
+    # 网络安静等待：没有进行中的请求持续该时间（毫秒）后视为页面已加载完成
+    # 环境变量：WAIT_NETWORK_QUIET_MS
+    WAIT_NETWORK_QUIET_MS: int = int(os.getenv("WAIT_NETWORK_QUIET_MS", "500"))
+    
+    # 网络安静等待时忽略的请求 URL 模式（长轮询、心跳、统计等，fnmatch 语法）
+    # 环境变量：WAIT_NETWORK_IGNORE_PATTERNS (逗号分隔)
+    WAIT_NETWORK_IGNORE_PATTERNS: list = [
+        pattern.strip() for pattern in os.getenv("WAIT_NETWORK_IGNORE_PATTERNS", "").split(",") if pattern.strip()
+    ]
+    
+    # 慢等待阈值（毫秒），超过时输出警告，0 表示不输出
+    # 环境变量：WAIT_SLOW_THRESHOLD_MS
+    WAIT_SLOW_THRESHOLD_MS: int = int(os.getenv("WAIT_SLOW_THRESHOLD_MS", "3000"))
+    
+    # 会话结束时在日志中列出的最慢等待数量
+    # 环境变量：WAIT_REPORT_TOP
+    WAIT_REPORT_TOP: int = int(os.getenv("WAIT_REPORT_TOP", "10"))
+    
+    # ==================== 选择器性能分析配置 ====================
+    
+    # 是否在每次使用选择器前解析一次并记录耗时，会话结束时列出最慢和结构有问题的选择器（每次操作多一次往返）
+    # 环境变量：SELECTOR_PROFILE_ENABLED (true/false)
+    SELECTOR_PROFILE_ENABLED: bool = os.getenv("SELECTOR_PROFILE_ENABLED", "false").lower() == "true"
+    
+    # 慢选择器阈值（毫秒），解析耗时超过该值时输出警告，0 表示不警告
+    # 环境变量：SELECTOR_SLOW_THRESHOLD_MS
+    SELECTOR_SLOW_THRESHOLD_MS: int = int(os.getenv("SELECTOR_SLOW_THRESHOLD_MS", "50"))
+    
+    # 会话结束时在日志中列出的最慢选择器数量
+    # 环境变量：SELECTOR_PROFILE_TOP
+    SELECTOR_PROFILE_TOP: int = int(os.getenv("SELECTOR_PROFILE_TOP", "10"))
+    
+    # ==================== 页面性能指标配置 ====================
+    
+    # BasePage.navigate 是否采集页面性能指标（Navigation Timing、FCP、LCP、CLS、资源数量和字节数）
+    # 环境变量：PAGE_METRICS_ENABLED (true/false)
+    PAGE_METRICS_ENABLED: bool = os.getenv("PAGE_METRICS_ENABLED", "false").lower() == "true"
+    
+    # 性能指标基线文件（JSON），会话结束时与基线对比
+    # 环境变量：PAGE_METRICS_BASELINE_FILE
+    PAGE_METRICS_BASELINE_FILE: str = os.getenv("PAGE_METRICS_BASELINE_FILE", "performance/page_metrics_baseline.json")
+    
+    # 指标 p75 超过基线的比例达到该值时视为性能退化（0.2 表示 20%）
+    # 环境变量：PAGE_METRICS_REGRESSION_TOLERANCE
+    PAGE_METRICS_REGRESSION_TOLERANCE: float = float(os.getenv("PAGE_METRICS_REGRESSION_TOLERANCE", "0.2"))
+    
+    # 是否在会话结束时用本次会话的结果更新基线文件
+    # 环境变量：PAGE_METRICS_UPDATE_BASELINE (true/false)
+    PAGE_METRICS_UPDATE_BASELINE: bool = os.getenv("PAGE_METRICS_UPDATE_BASELINE", "false").lower() == "true"
+    
+    # ==================== 数据缓存配置 ====================
+    
+    # 是否在会话结束时保存缓存快照，并在下次会话开始时预热加载
+    # 环境变量：CACHE_SNAPSHOT_ENABLED (true/false)
+    CACHE_SNAPSHOT_ENABLED: bool = os.getenv("CACHE_SNAPSHOT_ENABLED", "false").lower() == "true"
+    
+    # 缓存快照文件路径（gzip 压缩的 JSON）
+    # 环境变量：CACHE_SNAPSHOT_FILE
+    CACHE_SNAPSHOT_FILE: str = os.getenv("CACHE_SNAPSHOT_FILE", ".cache/data_cache.json.gz")
+    
+    # 需要持久化的缓存命名空间（键前缀，如 auth 匹配 auth.token），为空时持久化全部数据
+    # 环境变量：CACHE_SNAPSHOT_NAMESPACES (逗号分隔)
+    CACHE_SNAPSHOT_NAMESPACES: list = [
+        ns.strip() for ns in os.getenv("CACHE_SNAPSHOT_NAMESPACES", "").split(",") if ns.strip()
+    ]
+    
+    # 未设置过期时间的缓存项在快照中的有效期（秒），0 表示永不过期
+    # 环境变量：CACHE_SNAPSHOT_TTL
+    CACHE_SNAPSHOT_TTL: int = int(os.getenv("CACHE_SNAPSHOT_TTL", "3600"))
+    
     # ==================== 测试环境配置 ====================
     
     # 测试环境：dev, test, staging, prod
@@ -235,6 +530,43 @@ class Settings:
         if cls.LOG_LEVEL not in valid_log_levels:
             errors.append(f"Invalid LOG_LEVEL: {cls.LOG_LEVEL}. Must be one of: {', '.join(valid_log_levels)}")
         
+        # 验证异步日志配置
+        if cls.LOG_QUEUE_FULL_POLICY not in ["block", "drop"]:
+            errors.append(f"Invalid LOG_QUEUE_FULL_POLICY: {cls.LOG_QUEUE_FULL_POLICY}. Must be one of: block, drop")
+        
+        if cls.LOG_QUEUE_SIZE <= 0:
+            errors.append(f"LOG_QUEUE_SIZE must be positive, got: {cls.LOG_QUEUE_SIZE}")
+        
+        # 验证 Allure 附件配置
+        if cls.ALLURE_ATTACHMENT_QUEUE_SIZE <= 0:
+            errors.append(f"ALLURE_ATTACHMENT_QUEUE_SIZE must be positive, got: {cls.ALLURE_ATTACHMENT_QUEUE_SIZE}")
+        
+        if cls.ALLURE_ATTACHMENT_MAX_BYTES < 0 or cls.ALLURE_TEST_ATTACHMENT_BUDGET < 0:
+            errors.append("ALLURE_ATTACHMENT_MAX_BYTES and ALLURE_TEST_ATTACHMENT_BUDGET must be non-negative")
+        
+        if cls.ALLURE_JSON_MAX_ARRAY_ITEMS <= 0:
+            errors.append(f"ALLURE_JSON_MAX_ARRAY_ITEMS must be positive, got: {cls.ALLURE_JSON_MAX_ARRAY_ITEMS}")
+        
+        # 验证日志轮转配置
+        valid_rotate_when = ["S", "M", "H", "D", "MIDNIGHT"] + [f"W{day}" for day in range(7)]
+        if cls.LOG_ROTATE_WHEN and cls.LOG_ROTATE_WHEN.upper() not in valid_rotate_when:
+            errors.append(f"Invalid LOG_ROTATE_WHEN: {cls.LOG_ROTATE_WHEN}. Must be one of: S, M, H, D, midnight, W0-W6")
+        
+        if (cls.LOG_ROTATE_MAX_BYTES > 0 or cls.LOG_ROTATE_WHEN) and cls.LOG_ROTATE_BACKUP_COUNT <= 0:
+            errors.append(f"LOG_ROTATE_BACKUP_COUNT must be positive when rotation is enabled, got: {cls.LOG_ROTATE_BACKUP_COUNT}")
+        
+        if cls.LOG_ROTATE_COMPRESSION not in ["gzip", "zstd", "none"]:
+            errors.append(f"Invalid LOG_ROTATE_COMPRESSION: {cls.LOG_ROTATE_COMPRESSION}. Must be one of: gzip, zstd, none")
+        
+        # 验证日志采样配置
+        for rule in filter(None, (r.strip() for r in cls.LOG_SAMPLING_RULES.split(","))):
+            pattern, _, rate = rule.rpartition("=")
+            if not pattern.strip() or not rate.strip().isdigit() or int(rate) <= 0:
+                errors.append(f"Invalid LOG_SAMPLING_RULES entry: {rule}. Expected '<logger pattern>=<positive integer>'")
+        
+        if cls.LOG_DEDUP_WINDOW < 0:
+            errors.append(f"LOG_DEDUP_WINDOW must be non-negative, got: {cls.LOG_DEDUP_WINDOW}")
+        
         # 验证并行 worker 配置
         if cls.PARALLEL_WORKERS != "auto":
             try:
@@ -251,10 +583,100 @@ class Settings:
         if cls.RETRY_DELAY < 0:
             errors.append(f"RETRY_DELAY must be non-negative, got: {cls.RETRY_DELAY}")
         
+        # 验证截图格式
+        if cls.SCREENSHOT_FORMAT not in ["png", "jpeg", "webp"]:
+            errors.append(f"Invalid SCREENSHOT_FORMAT: {cls.SCREENSHOT_FORMAT}. Must be one of: png, jpeg, webp")
+        
         # 验证截图质量
         if not (1 <= cls.SCREENSHOT_QUALITY <= 100):
             errors.append(f"SCREENSHOT_QUALITY must be between 1 and 100, got: {cls.SCREENSHOT_QUALITY}")
         
+        # 验证截图尺寸和编码线程数
+        if cls.SCREENSHOT_MAX_WIDTH < 0 or cls.SCREENSHOT_MAX_HEIGHT < 0:
+            errors.append(
+                f"SCREENSHOT_MAX_WIDTH/SCREENSHOT_MAX_HEIGHT must be non-negative, "
+                f"got: {cls.SCREENSHOT_MAX_WIDTH}x{cls.SCREENSHOT_MAX_HEIGHT}"
+            )
+        
+        if cls.SCREENSHOT_ENCODE_WORKERS <= 0:
+            errors.append(f"SCREENSHOT_ENCODE_WORKERS must be positive, got: {cls.SCREENSHOT_ENCODE_WORKERS}")
+        
+        if cls.SCREENSHOT_WRITE_QUEUE_SIZE <= 0:
+            errors.append(f"SCREENSHOT_WRITE_QUEUE_SIZE must be positive, got: {cls.SCREENSHOT_WRITE_QUEUE_SIZE}")
+        
+        # 验证视觉回归容差
+        if not (0 <= cls.VISUAL_THRESHOLD <= 1):
+            errors.append(f"VISUAL_THRESHOLD must be between 0 and 1, got: {cls.VISUAL_THRESHOLD}")
+        
+        if not (0 <= cls.VISUAL_MAX_DIFF_RATIO <= 1):
+            errors.append(f"VISUAL_MAX_DIFF_RATIO must be between 0 and 1, got: {cls.VISUAL_MAX_DIFF_RATIO}")
+        
+        # 验证登录状态配置
+        if cls.AUTH_STATE_TTL < 0:
+            errors.append(f"AUTH_STATE_TTL must be non-negative, got: {cls.AUTH_STATE_TTL}")
+        
+        if cls.AUTH_STATE_LOCK_TIMEOUT <= 0:
+            errors.append(f"AUTH_STATE_LOCK_TIMEOUT must be positive, got: {cls.AUTH_STATE_LOCK_TIMEOUT}")
+        
+        # 验证 Trace 配置
+        if cls.TRACE_MODE not in ["off", "retain-on-failure", "on"]:
+            errors.append(f"Invalid TRACE_MODE: {cls.TRACE_MODE}. Must be one of: off, retain-on-failure, on")
+        
+        if cls.TRACE_RING_SIZE <= 0:
+            errors.append(f"TRACE_RING_SIZE must be positive, got: {cls.TRACE_RING_SIZE}")
+        
+        # 验证 HAR 配置
+        if cls.HAR_MODE not in ["off", "record", "replay", "auto"]:
+            errors.append(f"Invalid HAR_MODE: {cls.HAR_MODE}. Must be one of: off, record, replay, auto")
+        
+        if cls.HAR_SCOPE not in ["full", "api"]:
+            errors.append(f"Invalid HAR_SCOPE: {cls.HAR_SCOPE}. Must be one of: full, api")
+        
+        if cls.HAR_NOT_FOUND not in ["abort", "fallback"]:
+            errors.append(f"Invalid HAR_NOT_FOUND: {cls.HAR_NOT_FOUND}. Must be one of: abort, fallback")
+        
+        # 验证等待策略
+        if cls.WAIT_NETWORK_QUIET_MS <= 0:
+            errors.append(f"WAIT_NETWORK_QUIET_MS must be positive, got: {cls.WAIT_NETWORK_QUIET_MS}")
+        
+        if cls.WAIT_SLOW_THRESHOLD_MS < 0:
+            errors.append(f"WAIT_SLOW_THRESHOLD_MS must be non-negative, got: {cls.WAIT_SLOW_THRESHOLD_MS}")
+        
+        if cls.SELECTOR_SLOW_THRESHOLD_MS < 0:
+            errors.append(f"SELECTOR_SLOW_THRESHOLD_MS must be non-negative, got: {cls.SELECTOR_SLOW_THRESHOLD_MS}")
+        
+        if cls.SELECTOR_PROFILE_TOP <= 0:
+            errors.append(f"SELECTOR_PROFILE_TOP must be positive, got: {cls.SELECTOR_PROFILE_TOP}")
+        
+        # 验证页面性能指标
+        if cls.PAGE_METRICS_REGRESSION_TOLERANCE < 0:
+            errors.append(
+                f"PAGE_METRICS_REGRESSION_TOLERANCE must be non-negative, got: {cls.PAGE_METRICS_REGRESSION_TOLERANCE}"
+            )
+        
+        # 验证缓存快照有效期
+        if cls.CACHE_SNAPSHOT_TTL < 0:
+            errors.append(f"CACHE_SNAPSHOT_TTL must be non-negative, got: {cls.CACHE_SNAPSHOT_TTL}")
+        
+        # 验证浏览器上下文池
+        if cls.BROWSER_POOL_SIZE <= 0:
+            errors.append(f"BROWSER_POOL_SIZE must be positive, got: {cls.BROWSER_POOL_SIZE}")
+        
+        if cls.BROWSER_POOL_MAX_USES < 0:
+            errors.append(f"BROWSER_POOL_MAX_USES must be non-negative, got: {cls.BROWSER_POOL_MAX_USES}")
+        
+        # 验证自定义网络资源拦截配置
+        if cls.NETWORK_PROFILES:
+            try:
+                if not isinstance(json.loads(cls.NETWORK_PROFILES), dict):
+                    errors.append("NETWORK_PROFILES must be a JSON object keyed by profile name")
+            except ValueError as e:
+                errors.append(f"Invalid NETWORK_PROFILES JSON: {e}")
+        
+        # 验证异步 UI 并发数
+        if cls.ASYNC_UI_CONCURRENCY <= 0:
+            errors.append(f"ASYNC_UI_CONCURRENCY must be positive, got: {cls.ASYNC_UI_CONCURRENCY}")
+        
         # 验证视口大小
         if cls.VIEWPORT_WIDTH <= 0 or cls.VIEWPORT_HEIGHT <= 0:
             errors.append(f"Viewport dimensions must be positive, got: {cls.VIEWPORT_WIDTH}x{cls.VIEWPORT_HEIGHT}")
@@ -275,6 +697,11 @@ class Settings:
                 "headless": cls.HEADLESS,
                 "timeout": cls.BROWSER_TIMEOUT,
                 "viewport": f"{cls.VIEWPORT_WIDTH}x{cls.VIEWPORT_HEIGHT}",
+                "context_pool": cls.BROWSER_POOL_SIZE if cls.BROWSER_POOL_ENABLED else "off",
+                "network_profile": cls.NETWORK_PROFILE,
+                "har": cls.HAR_MODE if cls.HAR_MODE == "off" else f"{cls.HAR_MODE} ({cls.HAR_SCOPE})",
+                "trace": cls.TRACE_MODE,
+                "page_metrics": cls.PAGE_METRICS_ENABLED,
             },
             "api": {
                 "base_url": cls.API_BASE_URL or "Not configured",
@@ -286,6 +713,12 @@ class Settings:
                 "directory": cls.LOG_DIR,
                 "console": cls.LOG_TO_CONSOLE,
                 "file": cls.LOG_TO_FILE,
+                "async": cls.LOG_ASYNC,
+                "json": cls.LOG_JSON,
+                "rotation": (
+                    f"{cls.LOG_ROTATE_MAX_BYTES} bytes" if cls.LOG_ROTATE_MAX_BYTES > 0
+                    else cls.LOG_ROTATE_WHEN or "off"
+                ),
             },
             "parallel": {
                 "enabled": cls.ENABLE_PARALLEL,
@@ -300,6 +733,19 @@ class Settings:
             "allure": {
                 "results_dir": cls.ALLURE_RESULTS_DIR,
                 "report_dir": cls.ALLURE_REPORT_DIR,
+                "async_attachments": cls.ALLURE_ASYNC_ATTACHMENTS,
+                "dedup_attachments": cls.ALLURE_DEDUP_ATTACHMENTS,
+            },
+            "screenshot": {
+                "format": cls.SCREENSHOT_FORMAT,
+                "quality": cls.SCREENSHOT_QUALITY,
+                "max_size": f"{cls.SCREENSHOT_MAX_WIDTH or '-'}x{cls.SCREENSHOT_MAX_HEIGHT or '-'}",
+                "grayscale": cls.SCREENSHOT_GRAYSCALE,
+            },
+            "cache": {
+                "snapshot_enabled": cls.CACHE_SNAPSHOT_ENABLED,
+                "snapshot_file": cls.CACHE_SNAPSHOT_FILE,
+                "snapshot_namespaces": cls.CACHE_SNAPSHOT_NAMESPACES or "all",
             },
             "environment": cls.TEST_ENV,
         }
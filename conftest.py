@@ -6,6 +6,10 @@ import pytest
 
 from config import Settings
 from core import TestLogger, DataCache
+from core.allure.allure_helper import AllureHelper
+from core.allure.attachment_budget import AttachmentBudget
+from core.allure.attachment_writer import AllureAttachmentWriter
+from core.log.log_context import set_test_context, clear_test_context
 
 
 # ==================== Pytest Hooks for Parallel Execution ====================
@@ -20,7 +24,17 @@ def pytest_configure(config):
     - 配置验证
     - 设置 Allure 报告
     - Allure 的环境信息
+    - 并行执行时按 worker 分文件输出日志
     """
+    # 并行执行时每个进程写入各自的日志文件（worker 使用控制进程传来的会话时间戳）
+    if hasattr(config, 'workerinput'):
+        TestLogger.use_worker_log(
+            config.workerinput.get('workerid', 'unknown'),
+            config.workerinput.get('log_session_time')
+        )
+    elif config.getoption('numprocesses', default=None):
+        TestLogger.use_worker_log('master')
+    
     logger = TestLogger.get_logger("PytestConfigure")
     
     # 创建必要的目录
@@ -67,6 +81,29 @@ def pytest_configure(config):
     logger.info("Pytest configuration completed")
 
 
+@pytest.hookimpl(optionalhook=True)
+def pytest_configure_node(node):
+    """
+    pytest-xdist hook，在控制进程创建每个 worker 节点时调用。
+
+    将控制进程的会话时间戳传给 worker，使所有进程的日志文件名使用同一个时间戳。
+    """
+    node.workerinput['log_session_time'] = TestLogger.get_session_start_time()
+
+
+@pytest.hookimpl(optionalhook=True)
+def pytest_testnodedown(node, error):
+    """
+    pytest-xdist hook，在控制进程中每个 worker 结束时调用。
+
+    合并 worker 传回的页面性能指标样本，会话结束时由控制进程统一输出报告。
+    """
+    samples = getattr(node, 'workeroutput', {}).get('page_metrics')
+    if samples:
+        from base.ui.page_metrics import PageMetrics
+        PageMetrics.merge_samples(samples)
+
+
 def _create_allure_environment_properties():
     """
     为 Allure 报告创建 environment.properties 文件
@@ -107,9 +144,21 @@ def pytest_sessionstart(session):
     logger.info(f"Session ID: {session.sessionid if hasattr(session, 'sessionid') else 'N/A'}")
     logger.info(f"Start Time: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
     
+    # 所有插件的 pytest_configure 已执行完毕，检测并缓存 Allure 是否启用
+    if not AllureHelper.refresh_enabled():
+        logger.info("Allure reporting disabled (no --alluredir), skipping Allure steps and attachments")
+    
     # Create Allure environment properties file after directory is cleaned
     _create_allure_environment_properties()
     logger.info("Allure environment properties created")
+    
+    # 从上次会话的快照预热数据缓存
+    if Settings.CACHE_SNAPSHOT_ENABLED:
+        try:
+            loaded = DataCache.get_instance().load_snapshot()
+            logger.info(f"Warm-loaded {loaded} item(s) from data cache snapshot: {Settings.CACHE_SNAPSHOT_FILE}")
+        except Exception as e:
+            logger.warning(f"Failed to warm-load data cache snapshot: {e}")
 
 
 def pytest_sessionfinish(session, exitstatus):
@@ -149,6 +198,34 @@ def pytest_sessionfinish(session, exitstatus):
     cache = DataCache.get_instance()
     cache.clear()
     logger.info("Data cache cleared at session end")
+    
+    # 写出后台队列中剩余的 Allure 附件和日志（同步模式下无操作）
+    AllureAttachmentWriter.shutdown()
+    attachment_stats = AllureAttachmentWriter.get_stats()
+    if attachment_stats["dedup_hits"]:
+        logger.info(
+            f"Deduplicated {attachment_stats['dedup_hits']} Allure attachment(s), "
+            f"saved {attachment_stats['dedup_bytes_saved']} bytes"
+        )
+    budget_stats = AttachmentBudget.get_stats()
+    if budget_stats["bytes_saved"]:
+        logger.info(
+            f"Allure attachment budgets saved {budget_stats['bytes_saved']} bytes "
+            f"({budget_stats['truncated']} truncated, {budget_stats['omitted']} omitted)"
+        )
+    
+    # 所有 worker 结束后，在控制进程中输出合并后的页面性能指标报告
+    if not hasattr(session.config, 'workerinput') and session.config.getoption('numprocesses', default=None):
+        from base.ui.page_metrics import PageMetrics
+        PageMetrics.log_report(logger)
+    
+    TestLogger.shutdown()
+    
+    # 所有 worker 结束后，在控制进程中合并各 worker 的日志文件
+    if not hasattr(session.config, 'workerinput') and Settings.LOG_MERGE_WORKER_LOGS:
+        merged_log = TestLogger.merge_worker_logs()
+        if merged_log:
+            logger.info(f"Merged worker log files into: {merged_log}")
 
 
 
@@ -211,8 +288,17 @@ def session_setup_teardown():
     # Session teardown
     logger.info("Session fixture teardown starting")
     
-    # Clear data cache to prevent data leakage between test sessions
     cache = DataCache.get_instance()
+    
+    # 清空前保存快照，供下次会话预热（所有会话级 fixture 中只在这里保存一次）
+    if Settings.CACHE_SNAPSHOT_ENABLED:
+        try:
+            saved = cache.save_snapshot()
+            logger.info(f"Saved {saved} item(s) to data cache snapshot: {Settings.CACHE_SNAPSHOT_FILE}")
+        except Exception as e:
+            logger.warning(f"Failed to save data cache snapshot: {e}")
+    
+    # Clear data cache to prevent data leakage between test sessions
     cache.clear()
     logger.info("Data cache cleared in session fixture")
 
@@ -249,10 +335,18 @@ def test_logger(request):
     功能级日志记录器
 
     为每个测试提供日志记录器，并记录测试的开始/结束信息。
-    测试完成后，日志会自动附加到 Allure 报告中。
+    测试执行期间产生的日志（包括其他线程的日志）在内存中捕获，
+    测试完成后仅将这部分日志附加到 Allure 报告中。
+    测试执行期间的日志记录都会带上当前测试的 nodeid（见 core/log/log_context.py）。
+    未启用 Allure 时不捕获日志，也不附加任何内容。
 
     """
     logger = TestLogger.get_logger(f"Test.{request.node.name}")
+    set_test_context(request.node.nodeid)
+    allure_enabled = AllureHelper.is_enabled()
+    if allure_enabled:
+        AttachmentBudget.begin_test()
+        capture = TestLogger.start_capture()
 
     logger.info(f"Test started: {request.node.name}")
     logger.info(f"Test location: {request.node.nodeid}")
@@ -260,24 +354,23 @@ def test_logger(request):
     yield logger
 
     logger.info(f"Test finished: {request.node.name}")
+    if not allure_enabled:
+        clear_test_context()
+        return
+    
+    log_content = TestLogger.stop_capture(capture)
+    # 测试日志不占用测试的附件预算，只受单个附件大小限制
+    AttachmentBudget.end_test()
     
     # Attach test log to Allure report
     try:
-        from core.allure.allure_helper import AllureHelper
-        import logging
-        
-        # Get the log file path for this test
-        log_dir = Path(Settings.LOG_DIR)
-        if log_dir.exists():
-            # Find the most recent log file
-            log_files = sorted(log_dir.glob("test_*.log"), key=lambda p: p.stat().st_mtime, reverse=True)
-            if log_files:
-                log_file = log_files[0]
-                with open(log_file, 'r', encoding='utf-8') as f:
-                    log_content = f.read()
-                AllureHelper.attach_log(log_content, f"Test Log: {request.node.name}")
+        AllureHelper.attach_log(log_content, f"Test Log: {request.node.name}")
     except Exception as e:
         logger.warning(f"Failed to attach log to Allure: {e}")
+    finally:
+        # 等待后台写入的附件全部写出（同步模式下无操作）
+        AllureAttachmentWriter.flush()
+        clear_test_context()
 
 
 @pytest.fixture(scope="function")
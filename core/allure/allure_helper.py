@@ -3,13 +3,36 @@ Allure 辅助工具模块
 
 该模块封装 Allure 报告相关的辅助功能，提供便捷的方法来附加各种类型的数据到测试报告中。
 支持截图、日志、JSON 数据附件，以及测试步骤装饰器。
+附件通过 AllureAttachmentWriter 写入，启用 ALLURE_ASYNC_ATTACHMENTS 时在后台线程中写入文件。
+附件大小受 AttachmentBudget 限制（单个附件和单个测试的预算），超出时截断或以说明文本代替。
+未启用 Allure（未指定 --alluredir）时所有方法直接返回，不格式化、不序列化、不读写文件。
 """
 
-import json
-from contextlib import contextmanager
-from typing import Any, Optional, Generator
+from contextlib import nullcontext
+from typing import Any, ContextManager, Optional, Tuple
 import allure
 
+from core.allure.attachment_budget import AttachmentBudget
+from core.allure.attachment_writer import AllureAttachmentWriter
+
+
+# 未启用 Allure 时 step 返回的空上下文管理器（可重复使用）
+_NO_OP_STEP = nullcontext()
+
+
+def _detect_image_type(data: bytes) -> Tuple[Any, Optional[str]]:
+    """
+    根据文件头识别截图格式（内部函数）
+
+    Returns:
+        Tuple[Any, Optional[str]]: (附件类型, 扩展名)，无法识别时按 PNG 处理
+    """
+    if data[:3] == b"\xff\xd8\xff":
+        return allure.attachment_type.JPG, None
+    if data[:4] == b"RIFF" and data[8:12] == b"WEBP":
+        return "image/webp", "webp"
+    return allure.attachment_type.PNG, None
+
 
 class AllureHelper:
     """
@@ -22,26 +45,77 @@ class AllureHelper:
     - 测试步骤装饰器和上下文管理器
     
     所有方法都是静态方法，可以直接通过类名调用。
+    未启用 Allure 时所有方法都是空操作。
     """
     
+    _enabled: Optional[bool] = None  # 会话开始时缓存的检测结果，None 表示尚未检测
+    
+    @staticmethod
+    def is_enabled() -> bool:
+        """
+        检查 Allure 报告是否启用（是否有 Allure 监听器在收集结果）
+        
+        会话开始后（pytest_sessionstart 调用 refresh_enabled）使用缓存的结果，
+        在此之前每次调用都重新检测。
+        
+        Returns:
+            bool: 启用时返回 True
+        """
+        enabled = AllureHelper._enabled
+        if enabled is None:
+            return AllureAttachmentWriter._get_reporter() is not None
+        return enabled
+    
     @staticmethod
-    def attach_screenshot(screenshot_bytes: bytes, name: str = "Screenshot") -> None:
+    def refresh_enabled() -> bool:
+        """
+        重新检测 Allure 报告是否启用并缓存结果
+        
+        需要在所有插件的 pytest_configure 执行完毕后调用（Allure 监听器在其中注册）。
+        
+        Returns:
+            bool: 启用时返回 True
+        """
+        AllureHelper._enabled = AllureAttachmentWriter._get_reporter() is not None
+        return AllureHelper._enabled
+    
+    @staticmethod
+    def attach_screenshot(
+        screenshot_bytes: bytes,
+        name: str = "Screenshot",
+        background: Optional[bool] = None
+    ) -> None:
         """
         将截图附加到 Allure 报告
         
+        附件类型根据截图内容识别（png, jpeg, webp）。
+        
         Args:
             screenshot_bytes: 截图的字节数据
             name: 附件名称，默认为 "Screenshot"
+            background: 是否在后台线程写入附件文件，如果为 None 则使用配置文件中的 ALLURE_ASYNC_ATTACHMENTS
         
         使用示例：
             screenshot = page.screenshot()
             AllureHelper.attach_screenshot(screenshot, "Login Page")
         """
+        if not AllureHelper.is_enabled():
+            return
+        
         try:
-            allure.attach(
+            # 超出单个测试的剩余预算时以说明文本代替截图
+            note = AttachmentBudget.fit_binary(screenshot_bytes, name)
+            if note is not None:
+                AllureAttachmentWriter.attach(note, name=name, attachment_type=allure.attachment_type.TEXT)
+                return
+            
+            attachment_type, extension = _detect_image_type(screenshot_bytes)
+            AllureAttachmentWriter.attach(
                 screenshot_bytes,
                 name=name,
-                attachment_type=allure.attachment_type.PNG
+                attachment_type=attachment_type,
+                extension=extension,
+                background=background
             )
         except Exception as e:
             # 如果附加失败，记录警告但不中断测试
@@ -60,9 +134,12 @@ class AllureHelper:
         使用示例:
             AllureHelper.attach_log("Test execution log content", "Execution Log")
         """
+        if not AllureHelper.is_enabled():
+            return
+        
         try:
-            allure.attach(
-                log_content,
+            AllureAttachmentWriter.attach(
+                AttachmentBudget.fit_text(log_content, name),
                 name=name,
                 attachment_type=allure.attachment_type.TEXT
             )
@@ -83,13 +160,16 @@ class AllureHelper:
             response_data = {"status": "success", "user_id": 123}
             AllureHelper.attach_json(response_data, "API Response")
         """
+        if not AllureHelper.is_enabled():
+            return
+        
         try:
-            # 将字典转换为格式化的 JSON 字符串
-            json_string = json.dumps(json_data, indent=2, ensure_ascii=False)
-            allure.attach(
+            # 将字典转换为格式化的 JSON 字符串（超出预算时紧凑输出并省略长数组）
+            json_string, is_json = AttachmentBudget.fit_json(json_data, name)
+            AllureAttachmentWriter.attach(
                 json_string,
                 name=name,
-                attachment_type=allure.attachment_type.JSON
+                attachment_type=allure.attachment_type.JSON if is_json else allure.attachment_type.TEXT
             )
         except (TypeError, ValueError) as e:
             # JSON 序列化失败
@@ -111,9 +191,12 @@ class AllureHelper:
         使用示例:
             AllureHelper.attach_text("Additional information", "Notes")
         """
+        if not AllureHelper.is_enabled():
+            return
+        
         try:
-            allure.attach(
-                text_content,
+            AllureAttachmentWriter.attach(
+                AttachmentBudget.fit_text(text_content, name),
                 name=name,
                 attachment_type=allure.attachment_type.TEXT
             )
@@ -133,9 +216,12 @@ class AllureHelper:
         使用示例:
             AllureHelper.attach_html("<h1>Test Results</h1>", "Results")
         """
+        if not AllureHelper.is_enabled():
+            return
+        
         try:
-            allure.attach(
-                html_content,
+            AllureAttachmentWriter.attach(
+                AttachmentBudget.fit_text(html_content, name),
                 name=name,
                 attachment_type=allure.attachment_type.HTML
             )
@@ -157,6 +243,9 @@ class AllureHelper:
         使用示例:
             AllureHelper.attach_file("logs/test.log", "Test Log", allure.attachment_type.TEXT)
         """
+        if not AllureHelper.is_enabled():
+            return
+        
         import os
         
         if not os.path.exists(file_path):
@@ -171,7 +260,12 @@ class AllureHelper:
             with open(file_path, 'rb') as f:
                 file_content = f.read()
             
-            allure.attach(
+            note = AttachmentBudget.fit_binary(file_content, name)
+            if note is not None:
+                AllureAttachmentWriter.attach(note, name=name, attachment_type=allure.attachment_type.TEXT)
+                return
+            
+            AllureAttachmentWriter.attach(
                 file_content,
                 name=name,
                 attachment_type=attachment_type
@@ -181,8 +275,47 @@ class AllureHelper:
             logging.warning(f"Failed to attach file '{file_path}' to Allure: {e}")
     
     @staticmethod
-    @contextmanager
-    def step(step_name: str) -> Generator[None, None, None]:
+    def attach_trace(trace_path: str, name: str = "Trace") -> None:
+        """
+        将 Playwright trace 文件附加到 Allure 报告
+        
+        使用 Allure 的 Playwright trace 附件类型，报告中可以直接打开 Trace Viewer。
+        
+        Args:
+            trace_path: trace 文件路径（.zip）
+            name: 附件名称，默认为 "Trace"
+        
+        使用示例:
+            AllureHelper.attach_trace("traces/test_login.zip", "Trace - test_login")
+        """
+        if not AllureHelper.is_enabled():
+            return
+        
+        try:
+            with open(trace_path, 'rb') as f:
+                trace_content = f.read()
+            
+            note = AttachmentBudget.fit_binary(trace_content, name)
+            if note is not None:
+                AllureAttachmentWriter.attach(
+                    f"{note}\nTrace file: {trace_path}",
+                    name=name,
+                    attachment_type=allure.attachment_type.TEXT
+                )
+                return
+            
+            AllureAttachmentWriter.attach(
+                trace_content,
+                name=name,
+                attachment_type="application/vnd.allure.playwright-trace",
+                extension="zip"
+            )
+        except Exception as e:
+            import logging
+            logging.warning(f"Failed to attach trace '{trace_path}' to Allure: {e}")
+    
+    @staticmethod
+    def step(step_name: str) -> ContextManager[Any]:
         """
         测试步骤上下文管理器
         
@@ -191,8 +324,8 @@ class AllureHelper:
         Args:
             step_name: 步骤名称
             
-        Yields:
-            None
+        Returns:
+            ContextManager[Any]: 步骤上下文管理器，未启用 Allure 时为空操作
             
         使用示例:
             with AllureHelper.step("Login to application"):
@@ -201,8 +334,9 @@ class AllureHelper:
                 page.fill("#password", "pass")
                 page.click("#login-button")
         """
-        with allure.step(step_name):
-            yield
+        if not AllureHelper.is_enabled():
+            return _NO_OP_STEP
+        return allure.step(step_name)
     
     @staticmethod
     def add_description(description: str) -> None:
@@ -215,6 +349,9 @@ class AllureHelper:
         使用示例:
             AllureHelper.add_description("This test verifies the login functionality")
         """
+        if not AllureHelper.is_enabled():
+            return
+        
         try:
             allure.dynamic.description(description)
         except Exception as e:
@@ -232,6 +369,9 @@ class AllureHelper:
         使用示例:
             AllureHelper.add_title("User Login Test")
         """
+        if not AllureHelper.is_enabled():
+            return
+        
         try:
             allure.dynamic.title(title)
         except Exception as e:
@@ -249,6 +389,9 @@ class AllureHelper:
         使用示例:
             AllureHelper.add_severity("critical")
         """
+        if not AllureHelper.is_enabled():
+            return
+        
         try:
             allure.dynamic.severity(severity)
         except Exception as e:
@@ -266,6 +409,9 @@ class AllureHelper:
         使用示例:
             AllureHelper.add_tag("smoke")
         """
+        if not AllureHelper.is_enabled():
+            return
+        
         try:
             allure.dynamic.tag(tag)
         except Exception as e:
@@ -285,6 +431,9 @@ class AllureHelper:
         使用示例:
             AllureHelper.add_link("https://jira.example.com/ISSUE-123", "issue", "ISSUE-123")
         """
+        if not AllureHelper.is_enabled():
+            return
+        
         try:
             if name is None:
                 name = url
@@ -295,7 +444,7 @@ class AllureHelper:
 
 
 # 便捷函数：创建测试步骤
-def allure_step(step_name: str) -> contextmanager:
+def allure_step(step_name: str) -> ContextManager[Any]:
     """
     创建 Allure 测试步骤的便捷函数
     
@@ -303,7 +452,7 @@ def allure_step(step_name: str) -> contextmanager:
         step_name: 步骤名称
         
     Returns:
-        contextmanager: 步骤上下文管理器
+        ContextManager[Any]: 步骤上下文管理器
         
     使用示例:
         with allure_step("Verify user profile"):
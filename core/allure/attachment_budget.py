@@ -0,0 +1,264 @@
+"""
+Allure 附件大小预算模块
+
+限制单个附件和单个测试的附件总大小，避免个别大响应或大日志撑爆 allure-results：
+- 文本附件超出预算时保留开头和结尾，中间注明省略的字节数
+- JSON 附件超出预算时先改为紧凑格式，仍超出时省略长数组中间的元素，最后才按文本截断
+- 二进制附件（截图、文件、trace）无法截断，超出单个附件上限或单个测试的剩余预算时以说明文本代替
+会话结束时汇总因预算节省的字节数。
+"""
+
+import json
+import threading
+from typing import Any, Optional, Tuple
+
+from config.settings import Settings
+
+
+# 剩余预算小于该值时不再截断，直接以说明文本代替
+_MIN_EXCERPT_BYTES = 256
+
+
+def truncate_text(text: str, max_bytes: int) -> str:
+    """
+    截断文本，保留开头和结尾
+
+    Args:
+        text: 文本内容
+        max_bytes: 最大字节数（UTF-8）
+
+    Returns:
+        str: 截断后的文本，未超出时原样返回
+    """
+    data = text.encode("utf-8")
+    if len(data) <= max_bytes:
+        return text
+
+    marker_template = "\n\n... [truncated {} bytes] ...\n\n"
+    keep = max(max_bytes - len(marker_template.format(len(data)).encode("utf-8")), 0)
+    head = keep // 2
+    tail = keep - head
+    omitted = len(data) - head - tail
+
+    return (
+        data[:head].decode("utf-8", errors="ignore")
+        + marker_template.format(omitted)
+        + (data[len(data) - tail:].decode("utf-8", errors="ignore") if tail else "")
+    )
+
+
+def _elide_arrays(data: Any, max_items: int) -> Any:
+    """
+    省略长数组中间的元素（递归）
+
+    Args:
+        data: JSON 数据
+        max_items: 数组最多保留的元素数量（保留开头和结尾）
+
+    Returns:
+        Any: 处理后的数据，省略的位置以 "... N more items ..." 字符串代替
+    """
+    if isinstance(data, dict):
+        return {key: _elide_arrays(value, max_items) for key, value in data.items()}
+    if isinstance(data, (list, tuple)):
+        items = [_elide_arrays(item, max_items) for item in data]
+        if len(items) > max_items:
+            head = max(max_items - max_items // 2, 1)
+            tail = max_items - head
+            items = items[:head] + [f"... {len(items) - head - tail} more items ..."] + (items[-tail:] if tail else [])
+        return items
+    return data
+
+
+def fit_json(data: Any, max_bytes: int) -> Tuple[str, bool, int]:
+    """
+    将 JSON 数据序列化为不超过预算的字符串
+
+    依次尝试：格式化输出 -> 紧凑输出 -> 逐步减少数组保留元素的紧凑输出 -> 按文本截断。
+
+    Args:
+        data: JSON 数据
+        max_bytes: 最大字节数，0 表示不限制
+
+    Returns:
+        Tuple[str, bool, int]: (JSON 字符串, 是否仍为合法 JSON, 格式化输出的原始字节数)
+    """
+    pretty = json.dumps(data, indent=2, ensure_ascii=False)
+    original_size = len(pretty.encode("utf-8"))
+    if not max_bytes or original_size <= max_bytes:
+        return pretty, True, original_size
+
+    compact = json.dumps(data, ensure_ascii=False, separators=(",", ":"))
+    if len(compact.encode("utf-8")) <= max_bytes:
+        return compact, True, original_size
+
+    max_items = max(Settings.ALLURE_JSON_MAX_ARRAY_ITEMS, 1)
+    while True:
+        elided = json.dumps(_elide_arrays(data, max_items), ensure_ascii=False, separators=(",", ":"))
+        if len(elided.encode("utf-8")) <= max_bytes:
+            return elided, True, original_size
+        if max_items == 1:
+            return truncate_text(elided, max_bytes), False, original_size
+        max_items //= 2
+
+
+class AttachmentBudget:
+    """
+    附件预算管理器
+
+    单个测试的预算在 begin_test 和 end_test 之间计算（由功能级 test_logger fixture 调用），
+    测试之外附加的附件（会话级 fixture）只受单个附件预算限制。
+    """
+
+    _lock = threading.Lock()
+    _test_used: Optional[int] = None  # 当前测试已使用的字节数，None 表示不在测试中
+    _bytes_saved = 0
+    _truncated = 0
+    _omitted = 0
+
+    @classmethod
+    def begin_test(cls) -> None:
+        """
+        开始统计当前测试的附件大小
+        """
+        with cls._lock:
+            cls._test_used = 0
+
+    @classmethod
+    def end_test(cls) -> None:
+        """
+        结束统计当前测试的附件大小
+        """
+        with cls._lock:
+            cls._test_used = None
+
+    @classmethod
+    def _limit(cls) -> int:
+        """
+        当前可用于单个附件的字节数（内部方法，调用方需持有锁），0 表示不限制
+        """
+        limits = []
+        if Settings.ALLURE_ATTACHMENT_MAX_BYTES > 0:
+            limits.append(Settings.ALLURE_ATTACHMENT_MAX_BYTES)
+        if Settings.ALLURE_TEST_ATTACHMENT_BUDGET > 0 and cls._test_used is not None:
+            # 预算用完时按 1 字节计算，避免与表示不限制的 0 混淆
+            limits.append(max(Settings.ALLURE_TEST_ATTACHMENT_BUDGET - cls._test_used, 1))
+        return min(limits) if limits else 0
+
+    @classmethod
+    def _charge(cls, original: int, final: int) -> None:
+        """
+        记录附件实际使用的字节数和节省的字节数（内部方法，调用方需持有锁）
+        """
+        if cls._test_used is not None:
+            cls._test_used += final
+        if final < original:
+            cls._bytes_saved += original - final
+
+    @classmethod
+    def fit_text(cls, text: str, name: str) -> str:
+        """
+        按预算处理文本附件
+
+        Args:
+            text: 文本内容
+            name: 附件名称
+
+        Returns:
+            str: 处理后的文本
+        """
+        size = len(text.encode("utf-8"))
+        with cls._lock:
+            limit = cls._limit()
+            if limit and size > limit:
+                if limit < _MIN_EXCERPT_BYTES:
+                    text = cls._omission_note(name, size)
+                    cls._omitted += 1
+                else:
+                    text = truncate_text(text, limit)
+                    cls._truncated += 1
+            cls._charge(size, len(text.encode("utf-8")))
+        return text
+
+    @classmethod
+    def fit_json(cls, data: Any, name: str) -> Tuple[str, bool]:
+        """
+        按预算序列化 JSON 附件
+
+        Args:
+            data: JSON 数据
+            name: 附件名称
+
+        Returns:
+            Tuple[str, bool]: (附件内容, 是否为合法 JSON)
+        """
+        with cls._lock:
+            limit = cls._limit()
+
+        content, is_json, original_size = fit_json(data, limit)
+
+        with cls._lock:
+            if limit and original_size > limit:
+                if limit < _MIN_EXCERPT_BYTES:
+                    content, is_json = cls._omission_note(name, original_size), False
+                    cls._omitted += 1
+                else:
+                    cls._truncated += 1
+            cls._charge(original_size, len(content.encode("utf-8")))
+        return content, is_json
+
+    @classmethod
+    def fit_binary(cls, data: bytes, name: str) -> Optional[str]:
+        """
+        按预算检查二进制附件
+
+        Args:
+            data: 二进制内容
+            name: 附件名称
+
+        Returns:
+            Optional[str]: 在预算内返回 None；超出单个附件上限或单个测试剩余预算时返回代替附件的说明文本
+        """
+        size = len(data)
+        with cls._lock:
+            limit = cls._limit()
+            if limit and size > limit:
+                note = cls._omission_note(name, size)
+                cls._omitted += 1
+                cls._charge(size, len(note.encode("utf-8")))
+                return note
+
+            cls._charge(size, size)
+            return None
+
+    @staticmethod
+    def _omission_note(name: str, size: int) -> str:
+        """
+        生成代替被省略附件的说明文本（内部方法）
+        """
+        return f"[Attachment '{name}' omitted: {size} bytes exceeds the attachment budget]"
+
+    @classmethod
+    def get_stats(cls) -> dict:
+        """
+        获取预算统计
+
+        Returns:
+            dict: bytes_saved（节省的字节数）、truncated（被截断的附件数量）、omitted（被省略的附件数量）
+        """
+        with cls._lock:
+            return {
+                "bytes_saved": cls._bytes_saved,
+                "truncated": cls._truncated,
+                "omitted": cls._omitted,
+            }
+
+    @classmethod
+    def reset_stats(cls) -> None:
+        """
+        重置预算统计
+        """
+        with cls._lock:
+            cls._bytes_saved = 0
+            cls._truncated = 0
+            cls._omitted = 0
@@ -0,0 +1,311 @@
+"""
+Allure 附件后台写入模块
+
+allure.attach 会在测试线程上同步写入附件文件，单个测试附件较多时会明显增加测试耗时。
+启用 ALLURE_ASYNC_ATTACHMENTS 后：
+- 附件在调用线程（测试线程）上登记到当前测试/步骤，保证附件与测试的对应关系
+  （pytest-xdist 下每个 worker 进程各自登记、各自写入，互不影响）
+- 附件内容放入有界队列，由后台线程批量写入 allure-results 目录
+- 测试结束时（功能级 test_logger fixture 清理阶段）等待队列写完
+
+启用 ALLURE_DEDUP_ATTACHMENTS 后附件按内容（SHA-256）命名，相同内容的附件只写入一份文件，
+所有测试引用同一个文件（并行执行时各 worker 写入前检查文件是否已存在）。
+
+两者都未启用或 Allure 未启用时退化为同步的 allure.attach。
+
+登记附件和写入附件分开进行需要使用 AllureReporter._attach（requirements.txt 固定 allure-pytest 版本），
+其签名与预期不一致时（升级 allure-pytest 后）同样退化为同步的 allure.attach 并输出一次警告。
+"""
+
+import atexit
+import hashlib
+import inspect
+import logging
+import os
+import queue
+import threading
+import uuid
+from typing import Any, Callable, Optional, Union
+
+import allure
+import allure_commons
+
+from config.settings import Settings
+
+
+AttachmentBody = Union[str, bytes, Callable[[], Union[str, bytes]]]
+
+_STOP = object()
+
+# allure-pytest 2.13.2 中 AllureReporter._attach 的参数：登记附件到当前测试/步骤并返回附件文件名
+_REGISTER_PARAMETERS = ("uuid", "name", "attachment_type", "extension")
+
+
+class AllureAttachmentWriter:
+    """
+    Allure 附件后台写入器
+
+    所有方法都是类方法，同一进程内共享一个后台写入线程。
+    """
+
+    _queue: Optional[queue.Queue] = None
+    _thread: Optional[threading.Thread] = None
+    _lock = threading.Lock()
+    _atexit_registered = False
+    _written = 0
+    _failed = 0
+    _stored_files: set = set()  # 本进程已写入（或已确认存在）的去重附件文件
+    _dedup_hits = 0
+    _dedup_bytes_saved = 0
+    _register_supported: Optional[bool] = None  # AllureReporter._attach 签名检查结果
+
+    @classmethod
+    def _get_reporter(cls) -> Optional[Any]:
+        """
+        获取 allure-pytest 的 AllureReporter（内部方法）
+
+        Returns:
+            Optional[Any]: 未启用 Allure（未指定 --alluredir）时返回 None
+        """
+        for plugin in allure_commons.plugin_manager.get_plugins():
+            reporter = getattr(plugin, "allure_logger", None)
+            if reporter is not None:
+                return reporter
+        return None
+
+    @classmethod
+    def _supports_register(cls, reporter: Any) -> bool:
+        """
+        检查 AllureReporter 是否提供预期签名的 _attach 方法（内部方法）
+
+        Args:
+            reporter: AllureReporter
+
+        Returns:
+            bool: 签名与 allure-pytest 2.13.2 一致时返回 True
+        """
+        if cls._register_supported is None:
+            try:
+                parameters = tuple(inspect.signature(reporter._attach).parameters)
+                supported = parameters[:len(_REGISTER_PARAMETERS)] == _REGISTER_PARAMETERS
+            except (AttributeError, TypeError, ValueError):
+                supported = False
+            if not supported:
+                logging.warning(
+                    "Installed allure-pytest does not provide the expected AllureReporter._attach, "
+                    "falling back to synchronous allure.attach (background writing and deduplication disabled)"
+                )
+            cls._register_supported = supported
+        return cls._register_supported
+
+    @classmethod
+    def _get_results_dir(cls) -> Optional[str]:
+        """
+        获取 allure-results 目录（内部方法）
+
+        Returns:
+            Optional[str]: 未使用文件输出时返回 None
+        """
+        for plugin in allure_commons.plugin_manager.get_plugins():
+            report_dir = getattr(plugin, "_report_dir", None)
+            if report_dir is not None:
+                return str(report_dir)
+        return None
+
+    @classmethod
+    def _claim(cls, file_name: str, size: int) -> bool:
+        """
+        判断去重附件是否需要写入（内部方法）
+
+        Args:
+            file_name: 按内容命名的附件文件名
+            size: 附件字节数
+
+        Returns:
+            bool: 需要写入时返回 True；相同内容已写入时返回 False 并计入去重统计
+        """
+        with cls._lock:
+            exists = file_name in cls._stored_files
+            if not exists:
+                results_dir = cls._get_results_dir()
+                exists = results_dir is not None and os.path.exists(os.path.join(results_dir, file_name))
+                cls._stored_files.add(file_name)
+
+            if exists:
+                cls._dedup_hits += 1
+                cls._dedup_bytes_saved += size
+            return not exists
+
+    @classmethod
+    def attach(
+        cls,
+        body: AttachmentBody,
+        name: str,
+        attachment_type: Any = allure.attachment_type.TEXT,
+        extension: Optional[str] = None,
+        background: Optional[bool] = None
+    ) -> None:
+        """
+        附加数据到当前测试
+
+        Args:
+            body: 附件内容（str 或 bytes），也可以是返回附件内容的函数（在写入时才调用）
+            name: 附件名称
+            attachment_type: 附件类型
+            extension: 附件扩展名（attachment_type 不是 allure.attachment_type 时使用）
+            background: 是否在后台线程写入，如果为 None 则使用配置文件中的 ALLURE_ASYNC_ATTACHMENTS
+        """
+        background = Settings.ALLURE_ASYNC_ATTACHMENTS if background is None else background
+        enabled = background or Settings.ALLURE_DEDUP_ATTACHMENTS
+        reporter = cls._get_reporter() if enabled else None
+        if reporter is None or not cls._supports_register(reporter):
+            allure.attach(body() if callable(body) else body, name=name,
+                          attachment_type=attachment_type, extension=extension)
+            return
+
+        # 在调用线程上登记附件，保证附件挂在当前测试/步骤下
+        if Settings.ALLURE_DEDUP_ATTACHMENTS:
+            # 去重需要内容摘要，附件内容在调用线程上生成
+            body = body() if callable(body) else body
+            data = body.encode("utf-8") if isinstance(body, str) else body
+            digest = hashlib.sha256(data).hexdigest()
+            file_name = reporter._attach(digest, name=name, attachment_type=attachment_type, extension=extension)
+            if not cls._claim(file_name, len(data)):
+                return
+        else:
+            file_name = reporter._attach(uuid.uuid4(), name=name, attachment_type=attachment_type, extension=extension)
+
+        if background:
+            # 队列满时阻塞，对产生附件过快的测试形成反压
+            cls._ensure_started().put((file_name, body))
+        else:
+            cls._write(file_name, body)
+
+    @classmethod
+    def _ensure_started(cls) -> queue.Queue:
+        """
+        启动后台写入线程（内部方法）
+
+        Returns:
+            queue.Queue: 附件队列
+        """
+        with cls._lock:
+            if cls._thread is None or not cls._thread.is_alive():
+                cls._queue = queue.Queue(maxsize=Settings.ALLURE_ATTACHMENT_QUEUE_SIZE)
+                cls._thread = threading.Thread(
+                    target=cls._run,
+                    args=(cls._queue,),
+                    name="AllureAttachmentWriter",
+                    daemon=True
+                )
+                cls._thread.start()
+
+                if not cls._atexit_registered:
+                    atexit.register(cls.shutdown)
+                    cls._atexit_registered = True
+            return cls._queue
+
+    @classmethod
+    def _run(cls, attachment_queue: queue.Queue) -> None:
+        """
+        后台线程主循环：批量取出附件并写入（内部方法）
+        """
+        while True:
+            items = [attachment_queue.get()]
+            while len(items) < 100:
+                try:
+                    items.append(attachment_queue.get_nowait())
+                except queue.Empty:
+                    break
+
+            stop = False
+            for item in items:
+                if item is _STOP:
+                    stop = True
+                else:
+                    cls._write(*item)
+                attachment_queue.task_done()
+
+            if stop:
+                return
+
+    @classmethod
+    def _write(cls, file_name: str, body: AttachmentBody) -> None:
+        """
+        写入单个附件（内部方法，在后台线程中执行）
+        """
+        try:
+            data = body() if callable(body) else body
+            allure_commons.plugin_manager.hook.report_attached_data(body=data, file_name=file_name)
+            cls._written += 1
+        except Exception as e:
+            cls._failed += 1
+            # 写入失败的去重附件允许之后重新写入
+            cls._stored_files.discard(file_name)
+            logging.warning(f"Failed to write Allure attachment '{file_name}': {e}")
+
+    @classmethod
+    def flush(cls, timeout: Optional[float] = None) -> bool:
+        """
+        等待队列中的附件全部写入
+
+        Args:
+            timeout: 最长等待时间（秒），None 表示一直等待
+
+        Returns:
+            bool: 是否在超时前全部写入
+        """
+        attachment_queue = cls._queue
+        if attachment_queue is None or cls._thread is None or not cls._thread.is_alive():
+            return True
+
+        with attachment_queue.all_tasks_done:
+            return attachment_queue.all_tasks_done.wait_for(
+                lambda: attachment_queue.unfinished_tasks == 0,
+                timeout
+            )
+
+    @classmethod
+    def shutdown(cls, timeout: Optional[float] = 30.0) -> None:
+        """
+        写入剩余附件并停止后台线程，在会话结束时调用
+        """
+        with cls._lock:
+            thread = cls._thread
+            attachment_queue = cls._queue
+            cls._thread = None
+            cls._queue = None
+
+        if thread is not None and thread.is_alive():
+            attachment_queue.put(_STOP)
+            thread.join(timeout)
+
+    @classmethod
+    def get_stats(cls) -> dict:
+        """
+        获取写入统计
+
+        Returns:
+            dict: written（已写入数量）、failed（失败数量）、pending（待写入数量）、
+                  dedup_hits（因内容重复未写入的数量）、dedup_bytes_saved（因去重节省的字节数）
+        """
+        attachment_queue = cls._queue
+        return {
+            "written": cls._written,
+            "failed": cls._failed,
+            "pending": attachment_queue.unfinished_tasks if attachment_queue is not None else 0,
+            "dedup_hits": cls._dedup_hits,
+            "dedup_bytes_saved": cls._dedup_bytes_saved,
+        }
+
+    @classmethod
+    def reset_stats(cls) -> None:
+        """
+        重置写入和去重统计，同时清空本进程已写入的去重附件记录
+        """
+        with cls._lock:
+            cls._written = 0
+            cls._failed = 0
+            cls._stored_files.clear()
+            cls._dedup_hits = 0
+            cls._dedup_bytes_saved = 0
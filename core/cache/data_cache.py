@@ -3,10 +3,26 @@
 
 该模块提供线程安全的单例数据缓存，用于在测试执行期间存储和共享数据。
 使用单例模式确保全局唯一实例，使用线程锁确保并发安全。
+支持将指定命名空间的数据持久化为快照文件，并在下次测试会话启动时预热加载。
 """
 
+import gzip
+import json
+import logging
+import os
 import threading
-from typing import Any, Optional
+import time
+from pathlib import Path
+from typing import Any, Iterable, Optional
+
+from utils.file_lock import file_lock
+
+
+# 快照文件格式版本，格式不兼容时递增
+SNAPSHOT_VERSION = 1
+
+# 等待快照锁的最长时间（秒），持有者异常退出留下的锁文件超过该时间后视为失效
+_SNAPSHOT_LOCK_TIMEOUT = 30
 
 
 class DataCache:
@@ -18,6 +34,8 @@ class DataCache:
     - 线程安全：使用锁机制保护并发访问
     - 基本操作：set, get, clear, has 方法
     - 数据隔离：支持会话级别的数据清理
+    - 过期时间：set 时可指定 ttl（秒），过期的键视为不存在
+    - 快照持久化：save_snapshot/load_snapshot 按命名空间保存和预热数据
     
     使用示例：
         cache = DataCache.get_instance()
@@ -39,6 +57,8 @@ class DataCache:
         if not DataCache._initialized:
             # 数据存储字典
             self._data: dict[str, Any] = {}
+            # 键的过期时间戳（time.time()），未设置 ttl 的键不在此字典中
+            self._expires: dict[str, float] = {}
             # 实例级别的锁，用于保护数据访问
             self._data_lock = threading.Lock()
             DataCache._initialized = True
@@ -62,7 +82,7 @@ class DataCache:
         
         return cls._instance
     
-    def set(self, key: str, value: Any) -> None:
+    def set(self, key: str, value: Any, ttl: Optional[float] = None) -> None:
         """
         在缓存中存储键值对
         
@@ -71,9 +91,14 @@ class DataCache:
         Args:
             key: 缓存键
             value: 要存储的值，可以是任意类型
+            ttl: 过期时间（秒），为 None 时永不过期
         """
         with self._data_lock:
             self._data[key] = value
+            if ttl is None:
+                self._expires.pop(key, None)
+            else:
+                self._expires[key] = time.time() + ttl
     
     def get(self, key: str, default: Any = None) -> Any:
         """
@@ -87,6 +112,9 @@ class DataCache:
             Any: 存储的值，如果键不存在则返回 default
         """
         with self._data_lock:
+            if self._is_expired(key):
+                self._evict(key)
+                return default
             return self._data.get(key, default)
     
     def has(self, key: str) -> bool:
@@ -100,6 +128,9 @@ class DataCache:
             bool: 如果键存在返回 True，否则返回 False
         """
         with self._data_lock:
+            if self._is_expired(key):
+                self._evict(key)
+                return False
             return key in self._data
     
     def clear(self) -> None:
@@ -110,6 +141,7 @@ class DataCache:
         """
         with self._data_lock:
             self._data.clear()
+            self._expires.clear()
     
     def get_all_keys(self) -> list[str]:
         """
@@ -119,6 +151,7 @@ class DataCache:
             list[str]: 所有缓存键的列表
         """
         with self._data_lock:
+            self._purge_expired()
             return list(self._data.keys())
     
     def size(self) -> int:
@@ -129,8 +162,201 @@ class DataCache:
             int: 缓存中的项目数量
         """
         with self._data_lock:
+            self._purge_expired()
             return len(self._data)
     
+    def save_snapshot(
+        self,
+        file_path: Optional[str] = None,
+        namespaces: Optional[Iterable[str]] = None,
+        default_ttl: Optional[float] = None
+    ) -> int:
+        """
+        将指定命名空间的数据保存为快照文件（gzip 压缩的 JSON）
+        
+        命名空间即键的前缀：命名空间 "auth" 匹配键 "auth" 以及 "auth.token"、
+        "auth.admin.cookie" 等。无法 JSON 序列化的值会被跳过。
+        若快照文件已存在，会合并其中仍未过期的条目（多个 xdist worker 写同一文件），
+        读取、合并和写入在锁文件保护下完成，写入通过临时文件 + 原子替换完成。
+        
+        Args:
+            file_path: 快照文件路径，如果为 None 则使用配置文件中的设置
+            namespaces: 需要持久化的命名空间，如果为 None 则使用配置文件中的设置，
+                        配置也为空时保存全部数据
+            default_ttl: 未设置过期时间的键在快照中的有效期（秒），
+                         如果为 None 则使用配置文件中的设置
+            
+        Returns:
+            int: 本次写入快照的条目数量（不含合并的旧条目）
+        """
+        from config.settings import Settings
+        
+        file_path = Path(file_path or Settings.CACHE_SNAPSHOT_FILE)
+        if namespaces is None:
+            namespaces = Settings.CACHE_SNAPSHOT_NAMESPACES
+        namespaces = [ns for ns in namespaces if ns]
+        if default_ttl is None:
+            default_ttl = Settings.CACHE_SNAPSHOT_TTL
+        
+        now = time.time()
+        entries: dict[str, dict[str, Any]] = {}
+        
+        with self._data_lock:
+            self._purge_expired()
+            for key, value in self._data.items():
+                if namespaces and not self._in_namespaces(key, namespaces):
+                    continue
+                try:
+                    # 提前序列化一次，确保值可被 JSON 表示
+                    json.dumps(value)
+                except (TypeError, ValueError):
+                    logging.debug(f"Skip non JSON-serializable cache key in snapshot: {key}")
+                    continue
+                expires_at = self._expires.get(key)
+                if expires_at is None and default_ttl and default_ttl > 0:
+                    expires_at = now + default_ttl
+                entries[key] = {"value": value, "expires_at": expires_at}
+        
+        written = len(entries)
+        
+        file_path.parent.mkdir(parents=True, exist_ok=True)
+        # 读取、合并、替换在锁内完成，避免同时结束的 worker 互相覆盖对方的条目
+        with file_lock(file_path.with_name(f"{file_path.name}.lock"), timeout=_SNAPSHOT_LOCK_TIMEOUT):
+            # 合并已有快照中未过期且未被覆盖的条目
+            for key, entry in self._read_snapshot_entries(file_path).items():
+                if key not in entries and not self._entry_expired(entry, now):
+                    entries[key] = entry
+            
+            snapshot = {
+                "version": SNAPSHOT_VERSION,
+                "saved_at": now,
+                "entries": entries,
+            }
+            
+            tmp_path = file_path.with_name(f"{file_path.name}.{os.getpid()}.tmp")
+            with gzip.open(tmp_path, "wt", encoding="utf-8") as f:
+                json.dump(snapshot, f, ensure_ascii=False, separators=(",", ":"))
+            os.replace(tmp_path, file_path)
+        
+        return written
+    
+    def load_snapshot(
+        self,
+        file_path: Optional[str] = None,
+        namespaces: Optional[Iterable[str]] = None,
+        overwrite: bool = False
+    ) -> int:
+        """
+        从快照文件预热缓存
+        
+        已过期的条目会被丢弃，未过期的条目保留剩余有效期。
+        文件不存在、版本不兼容或内容损坏时不加载任何数据。
+        
+        Args:
+            file_path: 快照文件路径，如果为 None 则使用配置文件中的设置
+            namespaces: 只加载这些命名空间，如果为 None 则使用配置文件中的设置，
+                        配置也为空时加载全部条目
+            overwrite: 是否覆盖缓存中已存在的键
+            
+        Returns:
+            int: 加载到缓存中的条目数量
+        """
+        from config.settings import Settings
+        
+        file_path = Path(file_path or Settings.CACHE_SNAPSHOT_FILE)
+        if namespaces is None:
+            namespaces = Settings.CACHE_SNAPSHOT_NAMESPACES
+        namespaces = [ns for ns in namespaces if ns]
+        
+        now = time.time()
+        loaded = 0
+        entries = self._read_snapshot_entries(file_path)
+        
+        with self._data_lock:
+            for key, entry in entries.items():
+                if namespaces and not self._in_namespaces(key, namespaces):
+                    continue
+                if self._entry_expired(entry, now):
+                    continue
+                if not overwrite and key in self._data:
+                    continue
+                self._data[key] = entry.get("value")
+                expires_at = entry.get("expires_at")
+                if expires_at is None:
+                    self._expires.pop(key, None)
+                else:
+                    self._expires[key] = expires_at
+                loaded += 1
+        
+        return loaded
+    
+    @staticmethod
+    def _read_snapshot_entries(file_path: Path) -> dict[str, dict[str, Any]]:
+        """
+        读取快照文件中的条目（内部方法）
+        
+        Args:
+            file_path: 快照文件路径
+            
+        Returns:
+            dict: 键到 {"value", "expires_at"} 的映射，读取失败时返回空字典
+        """
+        if not file_path.exists():
+            return {}
+        
+        try:
+            with gzip.open(file_path, "rt", encoding="utf-8") as f:
+                snapshot = json.load(f)
+        except (OSError, ValueError) as e:
+            logging.warning(f"Failed to read data cache snapshot {file_path}: {e}")
+            return {}
+        
+        if not isinstance(snapshot, dict) or snapshot.get("version") != SNAPSHOT_VERSION:
+            logging.warning(f"Ignore incompatible data cache snapshot: {file_path}")
+            return {}
+        
+        entries = snapshot.get("entries")
+        return entries if isinstance(entries, dict) else {}
+    
+    @staticmethod
+    def _entry_expired(entry: dict[str, Any], now: float) -> bool:
+        """
+        判断快照条目是否已过期（内部方法）
+        """
+        expires_at = entry.get("expires_at")
+        return expires_at is not None and expires_at <= now
+    
+    @staticmethod
+    def _in_namespaces(key: str, namespaces: list[str]) -> bool:
+        """
+        判断键是否属于给定命名空间之一（内部方法）
+        """
+        return any(key == ns or key.startswith(f"{ns}.") for ns in namespaces)
+    
+    def _is_expired(self, key: str) -> bool:
+        """
+        判断键是否已过期（内部方法，调用方需持有 _data_lock）
+        """
+        expires_at = self._expires.get(key)
+        return expires_at is not None and expires_at <= time.time()
+    
+    def _evict(self, key: str) -> None:
+        """
+        移除键及其过期时间（内部方法，调用方需持有 _data_lock）
+        """
+        self._data.pop(key, None)
+        self._expires.pop(key, None)
+    
+    def _purge_expired(self) -> None:
+        """
+        清理所有已过期的键（内部方法，调用方需持有 _data_lock）
+        """
+        if not self._expires:
+            return
+        now = time.time()
+        for key in [k for k, expires_at in self._expires.items() if expires_at <= now]:
+            self._evict(key)
+    
     @classmethod
     def reset_instance(cls) -> None:
         """
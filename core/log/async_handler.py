@@ -0,0 +1,263 @@
+"""
+异步日志处理器模块
+
+该模块提供基于队列的异步日志输出能力：
+- BoundedQueueHandler: 挂在根日志记录器上，只负责把日志记录放入有界队列
+- BatchingQueueListener: 后台线程批量取出日志记录，交给真正的输出处理器，并按批次刷新
+- BatchStreamHandler / BatchFileHandler: 支持批量刷新的控制台与文件处理器
+
+测试线程只做一次入队操作，磁盘与控制台 I/O 全部在后台线程完成。
+"""
+
+import logging
+import queue
+import threading
+from logging.handlers import QueueHandler
+from typing import Iterable, Optional
+
+
+# 队列满时的处理策略
+QUEUE_POLICY_BLOCK = "block"
+QUEUE_POLICY_DROP = "drop"
+
+# 用于在测试线程上提前渲染异常堆栈
+_EXCEPTION_FORMATTER = logging.Formatter()
+
+
+class BoundedQueueHandler(QueueHandler):
+    """
+    有界队列日志处理器
+
+    队列满时根据策略处理：
+    - block: 阻塞等待队列有空位（反压，保证不丢日志）
+    - drop: 丢弃 WARNING 以下级别的日志并计数，WARNING 及以上级别仍然阻塞等待
+    """
+
+    def __init__(self, log_queue: queue.Queue, policy: str = QUEUE_POLICY_BLOCK):
+        """
+        初始化有界队列日志处理器
+
+        Args:
+            log_queue: 有界队列（queue.Queue(maxsize=...)）
+            policy: 队列满时的处理策略，可选值：block, drop
+        """
+        super().__init__(log_queue)
+        self.policy = policy
+        self._dropped = 0
+        self._dropped_lock = threading.Lock()
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        """
+        在测试线程上固化日志消息，避免后台线程处理时参数已被修改
+
+        与标准 QueueHandler 不同，这里不复制记录也不做完整格式化（格式化在后台线程完成），
+        只合并消息参数并缓存异常堆栈文本。
+        """
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info and not record.exc_text:
+            record.exc_text = _EXCEPTION_FORMATTER.formatException(record.exc_info)
+        return record
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        """
+        将日志记录放入队列
+
+        Args:
+            record: 日志记录
+        """
+        if self.policy == QUEUE_POLICY_DROP and record.levelno < logging.WARNING:
+            try:
+                self.queue.put_nowait(record)
+            except queue.Full:
+                with self._dropped_lock:
+                    self._dropped += 1
+            return
+
+        self.queue.put(record)
+
+    @property
+    def dropped_count(self) -> int:
+        """
+        因队列已满而被丢弃的日志数量
+        """
+        with self._dropped_lock:
+            return self._dropped
+
+
+class _BatchFlushMixin:
+    """
+    批量刷新混入类
+
+    batching 为 True 时 emit 之后不立即刷新，由监听器在每个批次结束时调用 flush_batch。
+    """
+
+    batching = False
+
+    def flush(self) -> None:
+        if not self.batching:
+            super().flush()
+
+    def flush_batch(self) -> None:
+        """
+        刷新当前批次写入的内容
+        """
+        super().flush()
+
+    def close(self) -> None:
+        # 关闭前确保缓冲区中的内容全部写出
+        self.batching = False
+        super().close()
+
+
+class BatchStreamHandler(_BatchFlushMixin, logging.StreamHandler):
+    """
+    支持批量刷新的控制台处理器
+    """
+
+
+class BatchFileHandler(_BatchFlushMixin, logging.FileHandler):
+    """
+    支持批量刷新的文件处理器
+    """
+
+
+class _FlushRequest:
+    """
+    刷新请求标记，放入队列后由监听器在处理完之前的日志后置位
+    """
+
+    def __init__(self):
+        self.done = threading.Event()
+
+
+_STOP = object()
+
+
+class BatchingQueueListener:
+    """
+    批量队列监听器
+
+    在后台线程中从队列批量取出日志记录并分发给输出处理器，
+    每处理完一个批次统一刷新一次处理器，减少系统调用次数。
+    """
+
+    def __init__(
+        self,
+        log_queue: queue.Queue,
+        handlers: Iterable[logging.Handler],
+        batch_size: int = 200
+    ):
+        """
+        初始化批量队列监听器
+
+        Args:
+            log_queue: 日志队列
+            handlers: 真正执行输出的处理器列表
+            batch_size: 每个批次最多处理的日志数量
+        """
+        self.queue = log_queue
+        self.handlers = list(handlers)
+        self.batch_size = max(1, batch_size)
+        self._thread: Optional[threading.Thread] = None
+
+        for handler in self.handlers:
+            if isinstance(handler, _BatchFlushMixin):
+                handler.batching = True
+
+    def start(self) -> None:
+        """
+        启动后台处理线程
+        """
+        if self._thread is not None:
+            return
+        self._thread = threading.Thread(target=self._monitor, name="TestLoggerQueueListener", daemon=True)
+        self._thread.start()
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """
+        等待队列中当前所有日志写出并刷新
+
+        Args:
+            timeout: 最长等待时间（秒），为 None 时一直等待
+
+        Returns:
+            bool: 是否在超时前完成刷新
+        """
+        if self._thread is None or not self._thread.is_alive():
+            self._flush_handlers()
+            return True
+
+        request = _FlushRequest()
+        self.queue.put(request)
+        return request.done.wait(timeout)
+
+    def stop(self, timeout: Optional[float] = None) -> None:
+        """
+        处理完队列中剩余的日志后停止后台线程
+
+        Args:
+            timeout: 等待线程结束的最长时间（秒）
+        """
+        if self._thread is None:
+            return
+
+        self.queue.put(_STOP)
+        self._thread.join(timeout)
+        self._thread = None
+
+        for handler in self.handlers:
+            if isinstance(handler, _BatchFlushMixin):
+                handler.batching = False
+        self._flush_handlers()
+
+    def _monitor(self) -> None:
+        """
+        后台线程主循环（内部方法）
+        """
+        while True:
+            batch = [self.queue.get()]
+            while len(batch) < self.batch_size:
+                try:
+                    batch.append(self.queue.get_nowait())
+                except queue.Empty:
+                    break
+
+            stop = False
+            flush_requests = []
+            for item in batch:
+                if item is _STOP:
+                    stop = True
+                elif isinstance(item, _FlushRequest):
+                    flush_requests.append(item)
+                else:
+                    self._handle(item)
+
+            self._flush_handlers()
+            for request in flush_requests:
+                request.done.set()
+
+            if stop:
+                return
+
+    def _handle(self, record: logging.LogRecord) -> None:
+        """
+        将日志记录分发给所有输出处理器（内部方法）
+        """
+        for handler in self.handlers:
+            if record.levelno >= handler.level:
+                handler.handle(record)
+
+    def _flush_handlers(self) -> None:
+        """
+        刷新所有输出处理器（内部方法）
+        """
+        for handler in self.handlers:
+            try:
+                if isinstance(handler, _BatchFlushMixin):
+                    handler.flush_batch()
+                else:
+                    handler.flush()
+            except Exception:
+                # 刷新失败（如磁盘已满）不应终止后台线程
+                pass
@@ -0,0 +1,96 @@
+"""
+日志捕获处理器模块
+
+该模块提供基于环形缓冲区的内存日志处理器，用于捕获单个测试执行期间产生的日志
+（包括测试启动的其他线程产生的日志），并在测试结束时附加到 Allure 报告。
+"""
+
+import logging
+import threading
+from collections import deque
+from typing import Optional
+
+
+class RingBufferHandler(logging.Handler):
+    """
+    环形缓冲区日志处理器
+
+    将格式化后的日志保存在内存中，超过条数或字节数上限时丢弃最早的日志，
+    保证单个测试的日志捕获占用的内存有上限。
+    """
+
+    def __init__(
+        self,
+        max_records: int = 5000,
+        max_bytes: int = 1024 * 1024,
+        level: int = logging.NOTSET,
+        formatter: Optional[logging.Formatter] = None
+    ):
+        """
+        初始化环形缓冲区日志处理器
+
+        Args:
+            max_records: 最多保留的日志条数，0 表示不限制
+            max_bytes: 最多保留的日志字节数（按 UTF-8 估算），0 表示不限制
+            level: 日志级别
+            formatter: 格式化器
+        """
+        super().__init__(level)
+        self.max_records = max_records
+        self.max_bytes = max_bytes
+        self._buffer: deque[tuple[str, int]] = deque()
+        self._size = 0
+        self._discarded = 0
+        self._buffer_lock = threading.Lock()
+        if formatter is not None:
+            self.setFormatter(formatter)
+
+    def emit(self, record: logging.LogRecord) -> None:
+        """
+        格式化日志并写入缓冲区
+
+        Args:
+            record: 日志记录
+        """
+        try:
+            line = self.format(record)
+        except Exception:
+            self.handleError(record)
+            return
+
+        line_size = len(line.encode("utf-8")) + 1
+
+        with self._buffer_lock:
+            self._buffer.append((line, line_size))
+            self._size += line_size
+
+            while self._buffer and (
+                (self.max_records and len(self._buffer) > self.max_records)
+                or (self.max_bytes and self._size > self.max_bytes)
+            ):
+                _, discarded_size = self._buffer.popleft()
+                self._size -= discarded_size
+                self._discarded += 1
+
+    def getvalue(self) -> str:
+        """
+        获取缓冲区中的日志文本
+
+        Returns:
+            str: 日志文本，若有日志因超出上限被丢弃，会在开头注明丢弃的条数
+        """
+        with self._buffer_lock:
+            lines = [line for line, _ in self._buffer]
+            discarded = self._discarded
+
+        if discarded:
+            lines.insert(0, f"... {discarded} earlier log record(s) discarded (capture limit reached) ...")
+        return "\n".join(lines)
+
+    @property
+    def discarded_count(self) -> int:
+        """
+        因超出上限被丢弃的日志条数
+        """
+        with self._buffer_lock:
+            return self._discarded
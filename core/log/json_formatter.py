@@ -0,0 +1,55 @@
+"""
+JSON 日志格式化器模块
+
+该模块将日志记录格式化为单行 JSON（JSON Lines），便于跨 worker 检索和聚合。
+安装了 orjson 时使用 orjson 序列化，否则回退到标准库 json。
+"""
+
+import json
+import logging
+from datetime import datetime
+
+try:
+    import orjson
+except ImportError:  # orjson 为可选依赖
+    orjson = None
+
+
+def _dumps(data: dict) -> str:
+    """
+    将字典序列化为紧凑的 JSON 字符串（内部方法）
+    """
+    if orjson is not None:
+        return orjson.dumps(data, default=str).decode("utf-8")
+    return json.dumps(data, ensure_ascii=False, separators=(",", ":"), default=str)
+
+
+class JsonLogFormatter(logging.Formatter):
+    """
+    JSON Lines 日志格式化器
+
+    每条日志输出一行 JSON，字段包括：
+    ts, level, logger, msg, worker, test, request_id, endpoint, elapsed_ms, thread，
+    有异常时额外包含 exc。上下文字段由 LogContextFilter 提供，缺失时为 null。
+    """
+
+    def format(self, record: logging.LogRecord) -> str:
+        data = {
+            "ts": datetime.fromtimestamp(record.created).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+            "msg": record.getMessage(),
+            "worker": getattr(record, "worker_id", None),
+            "test": getattr(record, "test_nodeid", None),
+            "request_id": getattr(record, "request_id", None),
+            "endpoint": getattr(record, "endpoint", None),
+            "elapsed_ms": getattr(record, "elapsed_ms", None),
+            "thread": record.threadName,
+        }
+
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            data["exc"] = record.exc_text
+
+        return _dumps(data)
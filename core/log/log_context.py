@@ -0,0 +1,108 @@
+"""
+日志上下文模块
+
+该模块维护附加到每条日志记录上的上下文信息：
+- worker_id: pytest-xdist worker ID（未并行时为 master）
+- test_nodeid: 当前正在执行的测试
+- request_id / endpoint: 当前正在发送的 API 请求
+- elapsed_ms: 距当前测试开始（无测试时距进程启动）的毫秒数
+
+测试信息使用进程级变量保存（每个 worker 进程同一时间只执行一个测试），
+因此测试启动的其他线程产生的日志同样带有测试信息；
+请求信息使用 contextvars 保存，只作用于发送请求的线程。
+"""
+
+import contextvars
+import logging
+import os
+import time
+import uuid
+from contextlib import contextmanager
+from typing import Generator, Optional
+
+
+_request_id: contextvars.ContextVar[Optional[str]] = contextvars.ContextVar("log_request_id", default=None)
+_endpoint: contextvars.ContextVar[Optional[str]] = contextvars.ContextVar("log_endpoint", default=None)
+
+_current_test: Optional[str] = None
+_test_start: Optional[float] = None
+_process_start = time.perf_counter()
+
+
+def get_worker_id() -> str:
+    """
+    获取当前进程的 xdist worker ID
+
+    Returns:
+        str: worker ID（如 gw0），未并行执行时返回 master
+    """
+    return os.environ.get("PYTEST_XDIST_WORKER", "master")
+
+
+def set_test_context(nodeid: Optional[str]) -> None:
+    """
+    设置当前正在执行的测试
+
+    Args:
+        nodeid: 测试 nodeid，为 None 时清除测试上下文
+    """
+    global _current_test, _test_start
+    _current_test = nodeid
+    _test_start = time.perf_counter() if nodeid else None
+
+
+def clear_test_context() -> None:
+    """
+    清除当前测试上下文
+    """
+    set_test_context(None)
+
+
+@contextmanager
+def request_context(endpoint: Optional[str] = None, request_id: Optional[str] = None) -> Generator[str, None, None]:
+    """
+    API 请求日志上下文管理器
+
+    上下文内记录的日志都会带上 request_id 和 endpoint。
+
+    Args:
+        endpoint: 请求端点（如 "GET /users/1"）
+        request_id: 请求 ID，为 None 时自动生成
+
+    Yields:
+        str: 请求 ID
+
+    使用示例:
+        with request_context("GET /users/1") as request_id:
+            logger.info("Sending request")
+    """
+    request_id = request_id or uuid.uuid4().hex[:16]
+    request_token = _request_id.set(request_id)
+    endpoint_token = _endpoint.set(endpoint)
+    try:
+        yield request_id
+    finally:
+        _request_id.reset(request_token)
+        _endpoint.reset(endpoint_token)
+
+
+class LogContextFilter(logging.Filter):
+    """
+    日志上下文过滤器
+
+    为日志记录补充 worker_id、test_nodeid、request_id、endpoint、elapsed_ms 属性，
+    从不过滤日志。已带有上下文的记录（例如已在测试线程上补充过、
+    再由异步日志后台线程处理的记录）不会被覆盖。
+    """
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if hasattr(record, "test_nodeid"):
+            return True
+
+        now = time.perf_counter()
+        record.worker_id = get_worker_id()
+        record.test_nodeid = _current_test
+        record.request_id = _request_id.get()
+        record.endpoint = _endpoint.get()
+        record.elapsed_ms = round((now - (_test_start or _process_start)) * 1000, 3)
+        return True
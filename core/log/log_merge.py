@@ -0,0 +1,177 @@
+"""
+日志合并模块
+
+pytest-xdist 并行执行时每个 worker 写入各自的日志文件，会话结束后由该模块
+将这些文件按时间顺序合并为一个会话日志。
+
+合并为流式的 k 路归并（heapq.merge）：每个文件内的日志本身已按时间有序，
+同一时刻内存中只保留每个文件的当前一条记录，不会将日志整体加载到内存。
+多行日志（如异常堆栈）与其首行作为一条记录整体移动；时间戳相同的记录保持输入文件的顺序。
+启用日志轮转时，每个输入文件轮转出的日志段（如 test_xxx_gw0.log.1.gz，可能已压缩为 gzip 或 zstd）
+按从旧到新的顺序排在该文件之前一起读取，合并结果包含轮转前的记录。
+
+使用方式:
+    python -m core.log.log_merge logs/test_20240101_120000.log logs/test_20240101_120000_*.log
+"""
+
+import argparse
+import gzip
+import heapq
+import io
+import itertools
+import os
+import re
+import sys
+from typing import IO, Iterator, List, Optional, Sequence, Tuple
+
+try:
+    import zstandard
+except ImportError:  # zstandard 为可选依赖，只有读取 zstd 压缩的日志段时需要
+    zstandard = None
+
+
+# 文本日志首行的时间戳（ISO 风格的时间字符串可以直接按字典序比较）
+_TEXT_TIMESTAMP = re.compile(r"^(\d{4}-\d{2}-\d{2}[ T]\d{2}:\d{2}:\d{2}(?:[.,]\d+)?)")
+# JSON Lines 日志的时间戳字段（JsonLogFormatter 输出的第一个字段）
+_JSON_TIMESTAMP = re.compile(r'"ts":\s*"([^"]+)"')
+
+# 轮转出的日志段的压缩扩展名（见 core/log/rotation.py）
+_COMPRESSED_EXTENSIONS = (".gz", ".zst")
+
+
+def rotated_segments(path: str) -> List[str]:
+    """
+    获取日志文件轮转出的日志段
+
+    按大小轮转的日志段以序号结尾（.1 最新），按时间轮转的日志段以时间结尾，
+    同一日志段同时存在压缩和未压缩的文件时（压缩尚未完成）使用压缩后的文件。
+
+    Args:
+        path: 当前日志文件路径
+
+    Returns:
+        List[str]: 日志段路径，按从旧到新排列
+    """
+    directory, name = os.path.split(path)
+    prefix = f"{name}."
+    try:
+        entries = os.listdir(directory or ".")
+    except FileNotFoundError:
+        return []
+
+    segments = {}
+    for entry in entries:
+        if not entry.startswith(prefix) or entry.endswith(".tmp"):
+            continue
+        suffix = entry[len(prefix):]
+        compressed = suffix.endswith(_COMPRESSED_EXTENSIONS)
+        if compressed:
+            suffix = os.path.splitext(suffix)[0]
+        if suffix in segments and not compressed:
+            continue
+        segments[suffix] = os.path.join(directory, entry)
+
+    def age(suffix: str) -> Tuple[int, int, str]:
+        # 序号越大越旧；时间后缀按字典序即为时间顺序
+        return (0, -int(suffix), "") if suffix.isdigit() else (1, 0, suffix)
+
+    return [segments[suffix] for suffix in sorted(segments, key=age)]
+
+
+def _open_text(path: str) -> IO[str]:
+    """
+    以文本方式打开日志文件，gzip / zstd 压缩的日志段透明解压（内部方法）
+    """
+    if path.endswith(".gz"):
+        return gzip.open(path, "rt", encoding="utf-8", errors="replace")
+    if path.endswith(".zst"):
+        if zstandard is None:
+            raise RuntimeError(f"zstandard is required to read compressed log segment: {path}")
+        reader = zstandard.ZstdDecompressor().stream_reader(open(path, "rb"), closefd=True)
+        return io.TextIOWrapper(reader, encoding="utf-8", errors="replace")
+    return open(path, "r", encoding="utf-8", errors="replace")
+
+
+def _iter_records(path: str) -> Iterator[Tuple[str, str]]:
+    """
+    逐条读取日志文件（内部方法）
+
+    以带时间戳的行作为一条记录的开始，其后不带时间戳的行（异常堆栈等）归入该记录。
+    文件开头不带时间戳的行以空时间戳输出，排在最前面。
+
+    Args:
+        path: 日志文件路径
+
+    Yields:
+        Tuple[str, str]: (时间戳, 记录文本)
+    """
+    timestamp = ""
+    lines: List[str] = []
+
+    with _open_text(path) as f:
+        for line in f:
+            if not line.endswith("\n"):
+                line += "\n"
+
+            match = _JSON_TIMESTAMP.search(line) if line.startswith("{") else _TEXT_TIMESTAMP.match(line)
+            if match:
+                if lines:
+                    yield timestamp, "".join(lines)
+                timestamp = match.group(1).replace(",", ".")
+                lines = [line]
+            else:
+                lines.append(line)
+
+    if lines:
+        yield timestamp, "".join(lines)
+
+
+def merge_log_files(paths: Sequence[str], output_path: str) -> int:
+    """
+    将多个按时间有序的日志文件合并为一个按时间有序的日志文件
+
+    输出先写入临时文件，完成后原子替换目标文件。
+
+    Args:
+        paths: 待合并的日志文件路径（轮转出的日志段自动包含，不存在的文件会被忽略）
+        output_path: 合并后的日志文件路径，不能与输入文件相同
+
+    Returns:
+        int: 合并的日志记录条数
+    """
+    # 每个输入文件与其轮转出的日志段按时间顺序组成一个有序的输入
+    chains = [rotated_segments(path) + ([path] if os.path.exists(path) else []) for path in paths]
+    chains = [chain for chain in chains if chain]
+    output_abs = os.path.abspath(output_path)
+    if any(os.path.abspath(path) == output_abs for chain in chains for path in chain):
+        raise ValueError(f"Output file must not be one of the input files: {output_path}")
+
+    merged = heapq.merge(
+        *(itertools.chain.from_iterable(_iter_records(path) for path in chain) for chain in chains),
+        key=lambda record: record[0]
+    )
+
+    count = 0
+    temp_path = f"{output_path}.tmp"
+    with open(temp_path, "w", encoding="utf-8", buffering=1024 * 1024) as out:
+        for _, text in merged:
+            out.write(text)
+            count += 1
+    os.replace(temp_path, output_path)
+
+    return count
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Merge per-worker log files into one time-ordered log")
+    parser.add_argument("output", help="合并后的日志文件")
+    parser.add_argument("inputs", nargs="+", help="各 worker 的日志文件")
+    args = parser.parse_args(argv)
+
+    count = merge_log_files(args.inputs, args.output)
+    print(f"Merged {count} record(s) from {len(args.inputs)} file(s) into {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,211 @@
+"""
+结构化日志查询工具
+
+读取 LOG_JSON 模式输出的 JSON Lines 日志文件，按测试、端点、级别、worker、
+请求 ID 过滤，或按字段聚合统计（条数、错误数、耗时）。文件逐行流式读取，
+不会一次性加载到内存。
+
+使用方式:
+    python -m core.log.log_query logs/test_20240101_120000.jsonl --test test_login
+    python -m core.log.log_query logs/*.jsonl --level ERROR --worker gw1
+    python -m core.log.log_query logs/*.jsonl --group-by endpoint
+"""
+
+import argparse
+import json
+import sys
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any, Dict, Iterable, Iterator, List, Optional
+
+
+GROUP_FIELDS = {
+    "test": "test",
+    "endpoint": "endpoint",
+    "level": "level",
+    "worker": "worker",
+    "logger": "logger",
+}
+
+ERROR_LEVELS = {"ERROR", "CRITICAL"}
+
+
+@dataclass
+class GroupStats:
+    """
+    聚合统计结果
+    """
+    count: int = 0
+    errors: int = 0
+    requests: set = field(default_factory=set)
+    first_ts: Optional[datetime] = None
+    last_ts: Optional[datetime] = None
+
+    def add(self, entry: dict) -> None:
+        self.count += 1
+        if entry.get("level") in ERROR_LEVELS:
+            self.errors += 1
+        if entry.get("request_id"):
+            self.requests.add(entry["request_id"])
+
+        # elapsed_ms 相对于各自测试的开始时间，跨测试聚合时使用记录的绝对时间
+        timestamp = parse_timestamp(entry.get("ts"))
+        if timestamp is not None:
+            self.first_ts = timestamp if self.first_ts is None else min(self.first_ts, timestamp)
+            self.last_ts = timestamp if self.last_ts is None else max(self.last_ts, timestamp)
+
+    @property
+    def span_ms(self) -> float:
+        """
+        组内第一条与最后一条日志之间的耗时（毫秒）
+        """
+        if self.first_ts is None or self.last_ts is None:
+            return 0.0
+        return (self.last_ts - self.first_ts).total_seconds() * 1000
+
+
+def parse_timestamp(value: Any) -> Optional[datetime]:
+    """
+    解析日志记录的 ts 字段（ISO 8601）
+
+    Args:
+        value: ts 字段的值
+
+    Returns:
+        Optional[datetime]: 记录时间，无法解析时返回 None
+    """
+    if not isinstance(value, str):
+        return None
+    try:
+        return datetime.fromisoformat(value)
+    except ValueError:
+        return None
+
+
+def iter_entries(paths: Iterable[str]) -> Iterator[dict]:
+    """
+    逐行读取 JSON Lines 日志文件
+
+    Args:
+        paths: 日志文件路径列表
+
+    Yields:
+        dict: 日志记录，无法解析的行会被跳过
+    """
+    for path in paths:
+        with open(path, "r", encoding="utf-8") as f:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    entry = json.loads(line)
+                except json.JSONDecodeError:
+                    continue
+                if isinstance(entry, dict):
+                    yield entry
+
+
+def matches(
+    entry: dict,
+    test: Optional[str] = None,
+    endpoint: Optional[str] = None,
+    level: Optional[str] = None,
+    worker: Optional[str] = None,
+    request_id: Optional[str] = None
+) -> bool:
+    """
+    判断日志记录是否符合过滤条件
+
+    test 和 endpoint 为子串匹配，其余条件为精确匹配（级别不区分大小写）。
+
+    Returns:
+        bool: 是否符合全部条件
+    """
+    if test and test not in (entry.get("test") or ""):
+        return False
+    if endpoint and endpoint not in (entry.get("endpoint") or ""):
+        return False
+    if level and (entry.get("level") or "").upper() != level.upper():
+        return False
+    if worker and entry.get("worker") != worker:
+        return False
+    if request_id and entry.get("request_id") != request_id:
+        return False
+    return True
+
+
+def group_entries(entries: Iterable[dict], group_by: str) -> Dict[str, GroupStats]:
+    """
+    按字段聚合日志记录
+
+    Args:
+        entries: 日志记录
+        group_by: 聚合字段（test / endpoint / level / worker / logger）
+
+    Returns:
+        Dict[str, GroupStats]: 分组名 -> 统计结果
+    """
+    key_name = GROUP_FIELDS[group_by]
+    groups: Dict[str, GroupStats] = {}
+    for entry in entries:
+        key = entry.get(key_name) or "-"
+        groups.setdefault(key, GroupStats()).add(entry)
+    return groups
+
+
+def format_entry(entry: dict) -> str:
+    """
+    将日志记录格式化为单行文本
+    """
+    parts = [
+        entry.get("ts") or "",
+        f"[{entry.get('worker') or '-'}]",
+        (entry.get("level") or "").ljust(8),
+        entry.get("logger") or "",
+    ]
+    if entry.get("request_id"):
+        endpoint = entry.get("endpoint")
+        parts.append(f"<{entry['request_id']} {endpoint}>" if endpoint else f"<{entry['request_id']}>")
+    parts.append("- " + (entry.get("msg") or ""))
+    text = " ".join(parts)
+    if entry.get("exc"):
+        text += "\n" + entry["exc"]
+    return text
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Query structured (JSON Lines) test logs")
+    parser.add_argument("files", nargs="+", help="JSON Lines 日志文件")
+    parser.add_argument("--test", help="按测试 nodeid 过滤（子串匹配）")
+    parser.add_argument("--endpoint", help="按请求端点过滤（子串匹配）")
+    parser.add_argument("--level", help="按日志级别过滤")
+    parser.add_argument("--worker", help="按 xdist worker ID 过滤")
+    parser.add_argument("--request-id", help="按请求 ID 过滤")
+    parser.add_argument("--group-by", choices=sorted(GROUP_FIELDS), help="按字段聚合统计")
+    parser.add_argument("--json", action="store_true", help="以 JSON Lines 输出匹配的日志")
+    args = parser.parse_args(argv)
+
+    entries = (
+        entry for entry in iter_entries(args.files)
+        if matches(entry, args.test, args.endpoint, args.level, args.worker, args.request_id)
+    )
+
+    if args.group_by:
+        groups = group_entries(entries, args.group_by)
+        print(f"{args.group_by:<60}{'records':>10}{'errors':>8}{'requests':>10}{'span ms':>12}")
+        for key, stats in sorted(groups.items(), key=lambda item: item[1].count, reverse=True):
+            print(f"{key[:59]:<60}{stats.count:>10}{stats.errors:>8}"
+                  f"{len(stats.requests):>10}{stats.span_ms:>12,.1f}")
+        return 0
+
+    for entry in entries:
+        if args.json:
+            print(json.dumps(entry, ensure_ascii=False))
+        else:
+            print(format_entry(entry))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -3,17 +3,35 @@
 
 该模块提供统一的日志记录接口，支持多级别日志记录、双输出（控制台和文件）、
 日志格式化以及 Allure 报告集成。
+可选启用基于有界队列的异步输出模式（LOG_ASYNC），将磁盘和控制台 I/O 移出测试线程。
+pytest-xdist 并行执行时每个 worker 写入各自的日志文件，会话结束后合并为一个按时间排序的会话日志。
 """
 
+import atexit
 import logging
 import os
+import queue
+import re
 import threading
+from collections import deque
 from datetime import datetime
 from pathlib import Path
 from typing import Optional
-import allure
 
 from config.settings import Settings
+from core.allure.allure_helper import AllureHelper
+from core.log.async_handler import (
+    BatchFileHandler,
+    BatchingQueueListener,
+    BatchStreamHandler,
+    BoundedQueueHandler,
+)
+from core.log.capture_handler import RingBufferHandler
+from core.log.json_formatter import JsonLogFormatter
+from core.log.log_context import LogContextFilter
+from core.log.log_merge import merge_log_files
+from core.log.rotation import CompressingRotatingFileHandler, CompressingTimedRotatingFileHandler
+from core.log.sampling import DuplicateFilter, create_volume_filters
 
 
 class TestLogger:
@@ -26,13 +44,26 @@ class TestLogger:
     - 统一的日志格式（包含时间戳、级别和消息）
     - Allure 报告集成
     - 线程安全的文件写入
+    - 可选的异步队列输出模式（有界队列、批量刷新、丢弃/反压策略）
+    - 按测试捕获内存日志（环形缓冲区，有大小上限）
+    - 可选的 JSON Lines 结构化文件日志（携带 worker、测试、请求 ID 等上下文）
+    - 并行执行时按 worker 分文件输出，会话结束后流式合并
+    - 可选的按大小/时间轮转日志文件，轮转出的日志段在后台压缩
+    - 可选的按记录器采样和重复警告去重，降低高频路径的日志量
     """
     
     _loggers = {}
     _log_file_path: Optional[str] = None
     _session_start_time: Optional[str] = None
+    _worker_id: Optional[str] = None  # 并行执行时的 worker ID，用作日志文件名后缀
     _setup_lock = threading.Lock()  # 保护日志系统初始化
     _file_lock = threading.Lock()  # 保护文件操作
+    _queue_handler: Optional[BoundedQueueHandler] = None  # 异步模式下挂在根日志记录器上的处理器
+    _queue_listener: Optional[BatchingQueueListener] = None  # 异步模式下的后台输出线程
+    _atexit_registered = False
+    _capture_handlers: list[RingBufferHandler] = []  # 正在进行的测试日志捕获
+    _handler_filters: list[logging.Filter] = []  # 挂在输出入口处理器上的过滤器（上下文、采样、去重）
+    _duplicate_filter: Optional[DuplicateFilter] = None
     
     @classmethod
     def setup_logger(cls, log_level: str = None) -> None:
@@ -55,40 +86,259 @@ class TestLogger:
             if cls._session_start_time is None:
                 cls._session_start_time = datetime.now().strftime("%Y%m%d_%H%M%S")
             
-            log_filename = Settings.LOG_FILE_FORMAT.replace("{timestamp}", cls._session_start_time)
-            cls._log_file_path = str(log_dir / log_filename)
+            cls._log_file_path = str(log_dir / cls._build_log_filename(cls._worker_id))
             
             # 设置根日志记录器
             root_logger = logging.getLogger()
             root_logger.setLevel(getattr(logging, log_level))
             
-            # 清除现有的处理器
+            # 停止之前的异步输出线程，并清除现有的处理器
+            cls._stop_queue_listener()
             root_logger.handlers.clear()
             
-            # 创建格式化器
-            formatter = logging.Formatter(
-                fmt=Settings.LOG_FORMAT,
-                datefmt=Settings.LOG_DATE_FORMAT
+            handlers = cls._create_output_handlers(log_level, batching=Settings.LOG_ASYNC)
+            
+            # 上下文过滤器需要在采样过滤器之前执行（采样按 request_id 判定）
+            sampling_filter, cls._duplicate_filter = create_volume_filters(
+                Settings.LOG_SAMPLING_RULES,
+                Settings.LOG_DEDUP_WINDOW
             )
+            cls._handler_filters = [
+                f for f in (LogContextFilter(), sampling_filter, cls._duplicate_filter) if f is not None
+            ]
+            
+            if Settings.LOG_ASYNC:
+                # 异步模式：根日志记录器只挂队列处理器，输出处理器由后台线程驱动
+                log_queue = queue.Queue(maxsize=Settings.LOG_QUEUE_SIZE)
+                cls._queue_handler = BoundedQueueHandler(log_queue, policy=Settings.LOG_QUEUE_FULL_POLICY)
+                cls._queue_listener = BatchingQueueListener(
+                    log_queue,
+                    handlers,
+                    batch_size=Settings.LOG_BATCH_SIZE
+                )
+                cls._queue_listener.start()
+                # 在测试线程上补充日志上下文并完成采样，被采样丢弃的日志不进入队列
+                for handler_filter in cls._handler_filters:
+                    cls._queue_handler.addFilter(handler_filter)
+                root_logger.addHandler(cls._queue_handler)
+                
+                if not cls._atexit_registered:
+                    atexit.register(cls.shutdown)
+                    cls._atexit_registered = True
+            else:
+                for handler in handlers:
+                    for handler_filter in cls._handler_filters:
+                        handler.addFilter(handler_filter)
+                    root_logger.addHandler(handler)
+            
+            # 重新配置时保留正在进行的测试日志捕获
+            for capture_handler in cls._capture_handlers:
+                root_logger.addHandler(capture_handler)
+    
+    @classmethod
+    def _build_log_filename(cls, worker_id: Optional[str] = None) -> str:
+        """
+        按配置生成日志文件名（内部方法）
+        
+        Args:
+            worker_id: worker ID，不为 None 时作为文件名后缀（如 test_20240101_120000_gw0.log）
+            
+        Returns:
+            str: 日志文件名
+        """
+        log_filename = Path(Settings.LOG_FILE_FORMAT.replace("{timestamp}", cls._session_start_time))
+        if Settings.LOG_JSON:
+            log_filename = log_filename.with_suffix(".jsonl")
+        if worker_id:
+            log_filename = log_filename.with_name(f"{log_filename.stem}_{worker_id}{log_filename.suffix}")
+        return str(log_filename)
+    
+    @classmethod
+    def use_worker_log(cls, worker_id: Optional[str], session_start_time: Optional[str] = None) -> None:
+        """
+        切换为按 worker 分文件输出日志（线程安全）
+        
+        pytest-xdist 并行执行时由各 worker 进程（以及控制进程，使用 master）调用，
+        各进程使用相同的会话时间戳，避免多个进程追加写入同一个日志文件。
+        日志系统已初始化时会立即切换到新的日志文件。
+        
+        Args:
+            worker_id: worker ID（如 gw0），为 None 时恢复为单个日志文件
+            session_start_time: 会话时间戳，通常由控制进程传给 worker，为 None 时保持当前值
+        """
+        with cls._setup_lock:
+            cls._worker_id = worker_id
+            if session_start_time:
+                cls._session_start_time = session_start_time
+            initialized = cls._log_file_path is not None
+        
+        if initialized:
+            cls.setup_logger()
+    
+    @classmethod
+    def get_session_start_time(cls) -> str:
+        """
+        获取会话时间戳（日志文件名中使用的时间戳）
+        
+        Returns:
+            str: 会话时间戳，格式为 %Y%m%d_%H%M%S
+        """
+        if cls._log_file_path is None:
+            cls.setup_logger()
+        return cls._session_start_time
+    
+    @classmethod
+    def merge_worker_logs(cls) -> Optional[str]:
+        """
+        将本次会话各 worker 的日志文件合并为一个按时间排序的会话日志
+        
+        在控制进程中所有 worker 结束后调用。合并为流式 k 路归并，不会将日志整体加载到内存，
+        启用日志轮转时包括各 worker 轮转出的日志段（已压缩的日志段直接解压读取），
+        各 worker 的日志文件会保留。未按 worker 分文件输出时不做任何操作。
+        
+        Returns:
+            Optional[str]: 合并后的日志文件路径，未合并时返回 None
+        """
+        if cls._worker_id is None or cls._session_start_time is None or not Settings.LOG_TO_FILE:
+            return None
+        
+        # 先写出本进程尚未写出的日志
+        cls.flush()
+        
+        log_dir = Path(Settings.LOG_DIR)
+        session_path = Path(cls._build_log_filename())
+        worker_files = sorted(log_dir.glob(f"{session_path.stem}_*{session_path.suffix}"))
+        if not worker_files:
+            return None
+        
+        output_path = str(log_dir / session_path)
+        try:
+            with cls._file_lock:
+                merge_log_files([str(path) for path in worker_files], output_path)
+        except Exception as e:
+            logging.warning(f"Failed to merge worker log files: {e}")
+            return None
+        
+        return output_path
+    
+    @classmethod
+    def _create_output_handlers(cls, log_level: str, batching: bool = False) -> list[logging.Handler]:
+        """
+        按配置创建控制台和文件输出处理器（内部方法）
+        
+        Args:
+            log_level: 日志级别
+            batching: 是否创建支持批量刷新的处理器（异步模式使用）
             
-            # 添加控制台处理器
-            if Settings.LOG_TO_CONSOLE:
-                console_handler = logging.StreamHandler()
-                console_handler.setLevel(getattr(logging, log_level))
-                console_handler.setFormatter(formatter)
-                root_logger.addHandler(console_handler)
-            
-            # 添加文件处理器（使用线程安全的处理器）
-            if Settings.LOG_TO_FILE:
-                # logging.FileHandler 本身是线程安全的，但我们添加额外的保护
-                file_handler = logging.FileHandler(
+        Returns:
+            list[logging.Handler]: 输出处理器列表
+        """
+        handlers = []
+        
+        # 创建格式化器
+        formatter = logging.Formatter(
+            fmt=Settings.LOG_FORMAT,
+            datefmt=Settings.LOG_DATE_FORMAT
+        )
+        
+        # 添加控制台处理器
+        if Settings.LOG_TO_CONSOLE:
+            console_handler = BatchStreamHandler() if batching else logging.StreamHandler()
+            console_handler.setLevel(getattr(logging, log_level))
+            console_handler.setFormatter(formatter)
+            handlers.append(console_handler)
+        
+        # 添加文件处理器（使用线程安全的处理器）
+        if Settings.LOG_TO_FILE:
+            # logging.FileHandler 本身是线程安全的，但我们添加额外的保护
+            if Settings.LOG_ROTATE_MAX_BYTES > 0:
+                file_handler = CompressingRotatingFileHandler(
+                    cls._log_file_path,
+                    max_bytes=Settings.LOG_ROTATE_MAX_BYTES,
+                    backup_count=Settings.LOG_ROTATE_BACKUP_COUNT,
+                    compression=Settings.LOG_ROTATE_COMPRESSION
+                )
+            elif Settings.LOG_ROTATE_WHEN:
+                file_handler = CompressingTimedRotatingFileHandler(
+                    cls._log_file_path,
+                    when=Settings.LOG_ROTATE_WHEN,
+                    interval=Settings.LOG_ROTATE_INTERVAL,
+                    backup_count=Settings.LOG_ROTATE_BACKUP_COUNT,
+                    compression=Settings.LOG_ROTATE_COMPRESSION
+                )
+            else:
+                file_handler_class = BatchFileHandler if batching else logging.FileHandler
+                file_handler = file_handler_class(
                     cls._log_file_path,
                     mode='a',
                     encoding='utf-8'
                 )
-                file_handler.setLevel(getattr(logging, log_level))
-                file_handler.setFormatter(formatter)
-                root_logger.addHandler(file_handler)
+            file_handler.setLevel(getattr(logging, log_level))
+            file_handler.setFormatter(JsonLogFormatter() if Settings.LOG_JSON else formatter)
+            handlers.append(file_handler)
+        
+        return handlers
+    
+    @classmethod
+    def flush(cls, timeout: Optional[float] = 5.0) -> None:
+        """
+        等待已记录的日志全部写出（异步模式下等待后台队列清空）
+        
+        Args:
+            timeout: 最长等待时间（秒）
+        """
+        if cls._queue_listener is not None:
+            cls._queue_listener.flush(timeout)
+            return
+        
+        for handler in logging.getLogger().handlers:
+            try:
+                handler.flush()
+            except Exception:
+                pass
+    
+    @classmethod
+    def shutdown(cls) -> None:
+        """
+        停止异步输出线程并写出队列中剩余的日志（线程安全）
+        
+        停止后输出处理器直接挂回根日志记录器，后续日志以同步方式继续输出。
+        同时输出被去重抑制、尚未汇总的警告次数。
+        在会话结束和进程退出时调用。
+        """
+        with cls._setup_lock:
+            listener = cls._queue_listener
+            queue_handler = cls._queue_handler
+            
+            if listener is not None:
+                cls._stop_queue_listener()
+                
+                root_logger = logging.getLogger()
+                if queue_handler in root_logger.handlers:
+                    root_logger.removeHandler(queue_handler)
+                for handler in listener.handlers:
+                    for handler_filter in cls._handler_filters:
+                        handler.addFilter(handler_filter)
+                    root_logger.addHandler(handler)
+        
+        if queue_handler is not None and queue_handler.dropped_count:
+            logging.getLogger("TestLogger").warning(
+                f"Dropped {queue_handler.dropped_count} log record(s) because the log queue was full"
+            )
+        
+        if cls._duplicate_filter is not None:
+            for name, message, count in cls._duplicate_filter.pop_suppressed():
+                logging.getLogger(name).warning(f"{message} (suppressed {count} times)")
+    
+    @classmethod
+    def _stop_queue_listener(cls) -> None:
+        """
+        停止异步输出线程（内部方法，调用方需持有 _setup_lock）
+        """
+        if cls._queue_listener is not None:
+            cls._queue_listener.stop(timeout=10)
+            cls._queue_listener = None
+            cls._queue_handler = None
     
     @classmethod
     def get_logger(cls, name: str) -> logging.Logger:
@@ -114,32 +364,158 @@ class TestLogger:
             return cls._loggers[name]
     
     @classmethod
-    def attach_log_to_allure(cls, log_file_path: str = None) -> None:
+    def attach_log_to_allure(
+        cls,
+        log_file_path: str = None,
+        tail_lines: Optional[int] = None,
+        pattern: Optional[str] = None,
+        max_bytes: Optional[int] = None
+    ) -> None:
         """
-        将日志文件附加到 Allure 报告（线程安全）
+        将日志文件（或其中的一部分）附加到 Allure 报告（线程安全）
+        
+        长时间运行产生的大日志文件不会被整体读入内存：只从文件末尾读取所需的部分，
+        按正则过滤时逐行流式读取。
         
         Args:
             log_file_path: 日志文件路径，如果为 None 则使用当前会话的日志文件
+            tail_lines: 只附加最后 N 行（与 pattern 同时使用时为最后 N 条匹配的行）
+            pattern: 只附加匹配该正则表达式的行
+            max_bytes: 最多附加的字节数（从末尾开始），如果为 None 则使用配置文件中的设置，0 表示不限制
         """
+        # 未启用 Allure 时不读取日志文件
+        if not AllureHelper.is_enabled():
+            return
+        
         if log_file_path is None:
             log_file_path = cls._log_file_path
+        if max_bytes is None:
+            max_bytes = Settings.LOG_ATTACH_MAX_BYTES
+        
+        # 异步模式下先等待队列中的日志写出
+        cls.flush()
         
         if log_file_path and os.path.exists(log_file_path):
             try:
                 # 使用锁保护文件读取操作
                 with cls._file_lock:
-                    with open(log_file_path, 'r', encoding='utf-8') as f:
-                        log_content = f.read()
+                    log_content = cls._read_log_excerpt(log_file_path, tail_lines, pattern, max_bytes)
                 
-                allure.attach(
-                    log_content,
-                    name="Test Execution Log",
-                    attachment_type=allure.attachment_type.TEXT
-                )
+                AllureHelper.attach_log(log_content, "Test Execution Log")
             except Exception as e:
                 # 如果附加失败，记录警告但不中断测试
                 logging.warning(f"Failed to attach log to Allure: {e}")
     
+    @classmethod
+    def _read_log_excerpt(
+        cls,
+        log_file_path: str,
+        tail_lines: Optional[int] = None,
+        pattern: Optional[str] = None,
+        max_bytes: int = 0
+    ) -> str:
+        """
+        读取日志文件的末尾部分或过滤后的内容（内部方法）
+        
+        Args:
+            log_file_path: 日志文件路径
+            tail_lines: 只保留最后 N 行
+            pattern: 只保留匹配该正则表达式的行
+            max_bytes: 最多读取的字节数（从末尾开始），0 表示不限制
+            
+        Returns:
+            str: 日志内容，内容被截断时在开头注明
+        """
+        if pattern:
+            regex = re.compile(pattern)
+            matched = deque(maxlen=tail_lines or None)
+            with open(log_file_path, 'r', encoding='utf-8', errors='replace') as f:
+                for line in f:
+                    if regex.search(line):
+                        matched.append(line)
+            content = "".join(matched)
+            if max_bytes and len(content) > max_bytes:
+                content = content[-max_bytes:].split("\n", 1)[-1]
+            return content
+        
+        file_size = os.path.getsize(log_file_path)
+        read_limit = min(file_size, max_bytes) if max_bytes else file_size
+        
+        with open(log_file_path, 'rb') as f:
+            if tail_lines:
+                # 从末尾按块向前读取，直到包含足够的行
+                data = b""
+                position = file_size
+                while position > file_size - read_limit and data.count(b"\n") <= tail_lines:
+                    block_size = min(64 * 1024, position - (file_size - read_limit))
+                    position -= block_size
+                    f.seek(position)
+                    data = f.read(block_size) + data
+                lines = data.splitlines(keepends=True)
+                if position > 0 and len(lines) <= tail_lines:
+                    # 达到字节上限，丢弃可能不完整的第一行
+                    lines = lines[1:]
+                data = b"".join(lines[-tail_lines:])
+            else:
+                f.seek(file_size - read_limit)
+                data = f.read(read_limit)
+                if read_limit < file_size:
+                    data = data.split(b"\n", 1)[-1]
+        
+        content = data.decode('utf-8', errors='replace')
+        omitted = file_size - len(data)
+        if omitted > 0:
+            content = f"... {omitted} earlier byte(s) of {log_file_path} omitted ...\n" + content
+        return content
+    
+    @classmethod
+    def start_capture(cls, log_level: str = None) -> RingBufferHandler:
+        """
+        开始在内存中捕获日志（线程安全）
+        
+        捕获处理器挂在根日志记录器上，因此测试线程及其启动的其他线程产生的日志都会被捕获。
+        
+        Args:
+            log_level: 捕获的日志级别，如果为 None 则使用配置文件中的设置
+            
+        Returns:
+            RingBufferHandler: 捕获处理器，传给 stop_capture 结束捕获
+        """
+        if cls._log_file_path is None:
+            cls.setup_logger()
+        
+        handler = RingBufferHandler(
+            max_records=Settings.LOG_CAPTURE_MAX_RECORDS,
+            max_bytes=Settings.LOG_CAPTURE_MAX_BYTES,
+            level=getattr(logging, log_level or Settings.LOG_LEVEL),
+            formatter=logging.Formatter(fmt=Settings.LOG_FORMAT, datefmt=Settings.LOG_DATE_FORMAT)
+        )
+        handler.addFilter(LogContextFilter())
+        
+        with cls._setup_lock:
+            cls._capture_handlers.append(handler)
+            logging.getLogger().addHandler(handler)
+        
+        return handler
+    
+    @classmethod
+    def stop_capture(cls, handler: RingBufferHandler) -> str:
+        """
+        结束日志捕获并返回捕获到的日志文本（线程安全）
+        
+        Args:
+            handler: start_capture 返回的捕获处理器
+            
+        Returns:
+            str: 捕获期间产生的日志文本
+        """
+        with cls._setup_lock:
+            if handler in cls._capture_handlers:
+                cls._capture_handlers.remove(handler)
+            logging.getLogger().removeHandler(handler)
+        
+        return handler.getvalue()
+    
     @classmethod
     def get_log_file_path(cls) -> Optional[str]:
         """
@@ -156,12 +532,17 @@ class TestLogger:
         重置日志系统（主要用于测试，线程安全）
         """
         with cls._setup_lock:
+            cls._stop_queue_listener()
             cls._loggers.clear()
             cls._log_file_path = None
             cls._session_start_time = None
+            cls._worker_id = None
             
             # 清除根日志记录器的处理器
             root_logger = logging.getLogger()
+            for handler in root_logger.handlers:
+                if handler not in cls._capture_handlers:
+                    handler.close()
             root_logger.handlers.clear()
 
 
@@ -0,0 +1,205 @@
+"""
+日志轮转模块
+
+该模块提供按大小或按时间轮转的文件日志处理器，轮转出的日志段在后台线程中压缩
+（gzip，或安装了 zstandard 时可选 zstd），避免长时间运行（如 12 小时稳定性测试）
+产生单个无上限的日志文件，同时不阻塞记录日志的线程。
+"""
+
+import gzip
+import logging
+import os
+import shutil
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from logging.handlers import RotatingFileHandler, TimedRotatingFileHandler
+from typing import Optional
+
+from core.log.async_handler import _BatchFlushMixin
+
+try:
+    import zstandard
+except ImportError:  # zstandard 为可选依赖
+    zstandard = None
+
+
+COMPRESSION_NONE = "none"
+COMPRESSION_GZIP = "gzip"
+COMPRESSION_ZSTD = "zstd"
+
+_EXTENSIONS = {
+    COMPRESSION_GZIP: ".gz",
+    COMPRESSION_ZSTD: ".zst",
+}
+
+
+class SegmentCompressor:
+    """
+    日志段压缩器
+
+    作为轮转处理器的 rotator / namer 使用：轮转时只重命名当前日志文件，
+    压缩在单个后台线程中进行。下一次轮转前会等待上一段压缩完成，
+    保证轮转时移动的备份文件都已压缩完毕。
+    """
+
+    def __init__(self, compression: str = COMPRESSION_GZIP):
+        """
+        初始化日志段压缩器
+
+        Args:
+            compression: 压缩方式：gzip, zstd, none；zstd 需要安装 zstandard，未安装时回退到 gzip
+        """
+        if compression == COMPRESSION_ZSTD and zstandard is None:
+            logging.warning("zstandard is not installed, falling back to gzip for log compression")
+            compression = COMPRESSION_GZIP
+        self.compression = compression
+        self.extension = _EXTENSIONS.get(compression, "")
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._pending: Optional[Future] = None
+        self._lock = threading.Lock()
+
+    @property
+    def enabled(self) -> bool:
+        """
+        是否压缩轮转出的日志段
+        """
+        return bool(self.extension)
+
+    def namer(self, default_name: str) -> str:
+        """
+        生成轮转后的日志段文件名（带压缩扩展名）
+        """
+        return default_name + self.extension
+
+    def rotator(self, source: str, dest: str) -> None:
+        """
+        将当前日志文件重命名为日志段，并提交后台压缩
+
+        Args:
+            source: 当前日志文件
+            dest: 压缩后的日志段文件名（namer 生成）
+        """
+        segment = dest[:-len(self.extension)]
+        if not os.path.exists(source):
+            return
+        os.replace(source, segment)
+
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="LogCompressor")
+            self._pending = self._executor.submit(self._compress, segment, dest)
+
+    def _compress(self, segment: str, dest: str) -> None:
+        """
+        压缩日志段并删除未压缩的文件（内部方法，在后台线程中执行）
+        """
+        temp_path = f"{dest}.tmp"
+        try:
+            with open(segment, "rb") as src:
+                if self.compression == COMPRESSION_ZSTD:
+                    with open(temp_path, "wb") as out:
+                        zstandard.ZstdCompressor().copy_stream(src, out)
+                else:
+                    with gzip.open(temp_path, "wb", compresslevel=6) as out:
+                        shutil.copyfileobj(src, out, 1024 * 1024)
+            os.replace(temp_path, dest)
+            os.remove(segment)
+        except Exception as e:
+            # 压缩失败时保留未压缩的日志段
+            logging.warning(f"Failed to compress rotated log segment {segment}: {e}")
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+
+    def wait(self, timeout: Optional[float] = None) -> None:
+        """
+        等待正在进行的压缩完成
+
+        Args:
+            timeout: 最长等待时间（秒），None 表示一直等待
+        """
+        with self._lock:
+            pending = self._pending
+        if pending is not None:
+            try:
+                pending.result(timeout)
+            except Exception:
+                pass
+
+    def shutdown(self) -> None:
+        """
+        等待压缩完成并停止后台线程
+        """
+        with self._lock:
+            executor = self._executor
+            self._executor = None
+            self._pending = None
+        if executor is not None:
+            executor.shutdown(wait=True)
+
+
+def _attach_compressor(handler: logging.Handler, compression: str) -> SegmentCompressor:
+    """
+    为轮转处理器设置压缩用的 namer 和 rotator（内部方法）
+    """
+    compressor = SegmentCompressor(compression)
+    if compressor.enabled:
+        handler.namer = compressor.namer
+        handler.rotator = compressor.rotator
+    return compressor
+
+
+class CompressingRotatingFileHandler(_BatchFlushMixin, RotatingFileHandler):
+    """
+    按大小轮转并在后台压缩日志段的文件处理器（支持异步模式的批量刷新）
+    """
+
+    def __init__(self, filename: str, max_bytes: int, backup_count: int,
+                 compression: str = COMPRESSION_GZIP, encoding: str = "utf-8"):
+        """
+        Args:
+            filename: 日志文件路径
+            max_bytes: 单个日志文件的最大字节数
+            backup_count: 保留的日志段数量
+            compression: 日志段压缩方式：gzip, zstd, none
+            encoding: 文件编码
+        """
+        super().__init__(filename, mode="a", maxBytes=max_bytes, backupCount=backup_count, encoding=encoding)
+        self.compressor = _attach_compressor(self, compression)
+
+    def doRollover(self) -> None:
+        # 移动备份文件前等待上一段压缩完成
+        self.compressor.wait()
+        super().doRollover()
+
+    def close(self) -> None:
+        super().close()
+        self.compressor.shutdown()
+
+
+class CompressingTimedRotatingFileHandler(_BatchFlushMixin, TimedRotatingFileHandler):
+    """
+    按时间轮转并在后台压缩日志段的文件处理器（支持异步模式的批量刷新）
+    """
+
+    def __init__(self, filename: str, when: str, interval: int, backup_count: int,
+                 compression: str = COMPRESSION_GZIP, encoding: str = "utf-8"):
+        """
+        Args:
+            filename: 日志文件路径
+            when: 轮转周期单位：S, M, H, D, midnight, W0-W6
+            interval: 轮转周期
+            backup_count: 保留的日志段数量
+            compression: 日志段压缩方式：gzip, zstd, none
+            encoding: 文件编码
+        """
+        super().__init__(filename, when=when, interval=interval, backupCount=backup_count, encoding=encoding)
+        self.compressor = _attach_compressor(self, compression)
+
+    def doRollover(self) -> None:
+        # 删除过期日志段前等待上一段压缩完成
+        self.compressor.wait()
+        super().doRollover()
+
+    def close(self) -> None:
+        super().close()
+        self.compressor.shutdown()
@@ -0,0 +1,197 @@
+"""
+日志采样与去重模块
+
+高并发和长时间运行的测试中，BaseService、BasePage 等每次操作都会输出多条 INFO 日志，
+日志量本身会成为吞吐量瓶颈。该模块提供两个日志过滤器：
+- SamplingFilter: 按日志记录器名称配置采样率，WARNING 以下的日志只保留 1/N，WARNING 及以上始终保留
+- DuplicateFilter: 在时间窗口内抑制重复的相同警告，并在之后输出 "suppressed N times" 汇总
+
+过滤器挂在输出处理器上，不影响按测试捕获的日志（附加到 Allure 的测试日志仍然完整）。
+同一条记录经过多个处理器时只做一次判定。
+"""
+
+import fnmatch
+import logging
+import threading
+import time
+import zlib
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple
+
+
+def parse_sampling_rules(rules: str) -> List[Tuple[str, int]]:
+    """
+    解析采样规则配置
+
+    Args:
+        rules: 逗号分隔的 "日志记录器名称模式=N" 列表，如 "*Service=10,*Page=5"，
+               模式支持通配符（fnmatch），N 表示每 N 条保留 1 条
+
+    Returns:
+        List[Tuple[str, int]]: (模式, N) 列表，保持配置顺序
+
+    Raises:
+        ValueError: 规则格式错误或 N 不是正整数
+    """
+    parsed = []
+    for rule in rules.split(","):
+        rule = rule.strip()
+        if not rule:
+            continue
+        pattern, sep, rate = rule.rpartition("=")
+        if not sep or not pattern.strip():
+            raise ValueError(f"Invalid sampling rule: {rule!r}, expected '<logger pattern>=<N>'")
+        if not rate.strip().isdigit() or int(rate) <= 0:
+            raise ValueError(f"Sampling rate must be a positive integer, got: {rule!r}")
+        rate = int(rate)
+        parsed.append((pattern.strip(), rate))
+    return parsed
+
+
+class SamplingFilter(logging.Filter):
+    """
+    日志采样过滤器
+
+    按第一条匹配的规则对 WARNING 以下的日志采样，WARNING 及以上级别始终保留。
+    带有 request_id 的日志（见 log_context.request_context）按请求整体采样：
+    同一个请求的日志要么全部保留，要么全部丢弃；其余日志按记录器计数，每 N 条保留 1 条。
+    """
+
+    def __init__(self, rules: List[Tuple[str, int]]):
+        """
+        初始化日志采样过滤器
+
+        Args:
+            rules: (日志记录器名称模式, N) 列表，见 parse_sampling_rules
+        """
+        super().__init__()
+        self.rules = list(rules)
+        self._rates: Dict[str, int] = {}
+        self._counters: Dict[str, int] = {}
+        self._lock = threading.Lock()
+        self.sampled_out = 0
+
+    def _rate_for(self, name: str) -> int:
+        """
+        获取记录器的采样率（内部方法，调用方需持有锁）
+        """
+        rate = self._rates.get(name)
+        if rate is None:
+            rate = next((n for pattern, n in self.rules if fnmatch.fnmatchcase(name, pattern)), 1)
+            self._rates[name] = rate
+        return rate
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        decision = getattr(record, "_sampled", None)
+        if decision is not None:
+            return decision
+
+        decision = True
+        if record.levelno < logging.WARNING:
+            with self._lock:
+                rate = self._rate_for(record.name)
+                if rate > 1:
+                    request_id = getattr(record, "request_id", None)
+                    if request_id:
+                        decision = zlib.crc32(request_id.encode("utf-8")) % rate == 0
+                    else:
+                        count = self._counters.get(record.name, 0)
+                        self._counters[record.name] = count + 1
+                        decision = count % rate == 0
+                    if not decision:
+                        self.sampled_out += 1
+
+        record._sampled = decision
+        return decision
+
+
+class DuplicateFilter(logging.Filter):
+    """
+    重复警告去重过滤器
+
+    同一记录器、同一内容的 WARNING 日志在时间窗口内只输出第一条，其余的计数后丢弃；
+    窗口结束后再次出现时输出该条并附带被抑制的次数，未再出现的汇总通过 pop_suppressed 获取。
+    """
+
+    def __init__(self, window: float, max_keys: int = 1000):
+        """
+        初始化重复警告去重过滤器
+
+        Args:
+            window: 去重时间窗口（秒）
+            max_keys: 最多跟踪的不同警告数量，超出时淘汰最早的
+        """
+        super().__init__()
+        self.window = window
+        self.max_keys = max_keys
+        # 警告键 -> [窗口开始时间, 被抑制次数]
+        self._seen: "OrderedDict[Tuple[str, str], List]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        decision = getattr(record, "_deduplicated", None)
+        if decision is not None:
+            return decision
+
+        decision = True
+        if record.levelno == logging.WARNING:
+            key = (record.name, record.getMessage())
+            now = time.monotonic()
+            suppressed = 0
+
+            with self._lock:
+                entry = self._seen.get(key)
+                if entry is not None and now - entry[0] < self.window:
+                    entry[1] += 1
+                    decision = False
+                else:
+                    if entry is not None:
+                        suppressed = entry[1]
+                    self._seen[key] = [now, 0]
+                    self._seen.move_to_end(key)
+                    while len(self._seen) > self.max_keys:
+                        self._seen.popitem(last=False)
+
+            if suppressed:
+                record.msg = f"{record.getMessage()} (suppressed {suppressed} times in the last {self.window:g}s)"
+                record.args = None
+
+        record._deduplicated = decision
+        return decision
+
+    def pop_suppressed(self) -> List[Tuple[str, str, int]]:
+        """
+        取出尚未输出汇总的被抑制警告，并清空去重状态
+
+        Returns:
+            List[Tuple[str, str, int]]: (记录器名称, 警告内容, 被抑制次数) 列表
+        """
+        with self._lock:
+            seen = self._seen
+            self._seen = OrderedDict()
+        return [(name, message, entry[1]) for (name, message), entry in seen.items() if entry[1]]
+
+
+def create_volume_filters(
+    sampling_rules: str,
+    dedup_window: float
+) -> Tuple[Optional[SamplingFilter], Optional[DuplicateFilter]]:
+    """
+    按配置创建采样和去重过滤器
+
+    Args:
+        sampling_rules: 采样规则配置，为空时不采样
+        dedup_window: 去重时间窗口（秒），0 表示不去重
+
+    Returns:
+        Tuple[Optional[SamplingFilter], Optional[DuplicateFilter]]: 未启用的过滤器为 None
+    """
+    try:
+        rules = parse_sampling_rules(sampling_rules or "")
+    except ValueError as e:
+        logging.warning(f"Ignoring invalid LOG_SAMPLING_RULES: {e}")
+        rules = []
+
+    sampling_filter = SamplingFilter(rules) if rules else None
+    duplicate_filter = DuplicateFilter(dedup_window) if dedup_window > 0 else None
+    return sampling_filter, duplicate_filter
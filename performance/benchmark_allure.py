@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""
+Allure 辅助工具开销基准测试脚本
+
+对比未启用 Allure（空操作）与启用 Allure 时 AllureHelper 每个步骤的开销（µs/step）。
+每个步骤包含一次 step、一次 attach_text 和一次 attach_json，模拟一个典型的 API 测试步骤。
+启用模式下使用临时目录作为 allure-results，附件会真实写入文件。
+
+使用方式:
+    python performance/benchmark_allure.py
+    python performance/benchmark_allure.py --steps 5000 --items 100
+"""
+
+import argparse
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# 添加项目根目录到 Python 路径
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import allure_commons
+from allure_commons.logger import AllureFileLogger
+from allure_commons.model2 import TestResult
+from allure_commons.utils import uuid4
+from allure_commons.reporter import AllureReporter
+
+from core.allure.allure_helper import AllureHelper
+
+
+class _BenchmarkListener:
+    """
+    最小的 Allure 监听器：只提供 allure_logger 和附件登记/写入所需的钩子
+    """
+
+    def __init__(self):
+        self.allure_logger = AllureReporter()
+
+    @allure_commons.hookimpl
+    def start_step(self, uuid, title, params):
+        self.allure_logger.start_step(None, uuid, None)
+
+    @allure_commons.hookimpl
+    def stop_step(self, uuid, exc_type, exc_val, exc_tb):
+        self.allure_logger.stop_step(uuid)
+
+    @allure_commons.hookimpl
+    def attach_data(self, body, name, attachment_type, extension):
+        self.allure_logger.attach_data(uuid4(), body, name=name,
+                                       attachment_type=attachment_type, extension=extension)
+
+
+def run_steps(steps: int, items: int) -> float:
+    """
+    执行指定数量的步骤并返回每个步骤的平均耗时（微秒）
+
+    Args:
+        steps: 步骤数量
+        items: 每个 JSON 附件包含的元素数量
+
+    Returns:
+        float: 每个步骤的平均耗时（µs）
+    """
+    payload = {"users": [{"id": i, "name": f"user{i}", "active": True} for i in range(items)]}
+
+    start = time.perf_counter()
+    for i in range(steps):
+        with AllureHelper.step(f"Step {i}: GET /api/users"):
+            AllureHelper.attach_text(f"GET /api/users?page={i} -> 200", f"Request {i}")
+            AllureHelper.attach_json(payload, f"Response {i}")
+    return (time.perf_counter() - start) / steps * 1_000_000
+
+
+def run_enabled(steps: int, items: int, results_dir: str) -> float:
+    """
+    在启用 Allure 的情况下执行步骤（附件写入临时的 allure-results 目录）
+    """
+    listener = _BenchmarkListener()
+    file_logger = AllureFileLogger(results_dir)
+    allure_commons.plugin_manager.register(listener)
+    allure_commons.plugin_manager.register(file_logger)
+    listener.allure_logger.schedule_test(uuid4(), TestResult(name="benchmark"))
+    try:
+        AllureHelper.refresh_enabled()
+        return run_steps(steps, items)
+    finally:
+        allure_commons.plugin_manager.unregister(listener)
+        allure_commons.plugin_manager.unregister(file_logger)
+        AllureHelper.refresh_enabled()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="AllureHelper per-step overhead benchmark")
+    parser.add_argument("--steps", type=int, default=2000, help="执行的步骤数量")
+    parser.add_argument("--items", type=int, default=50, help="每个 JSON 附件包含的元素数量")
+    args = parser.parse_args()
+
+    AllureHelper.refresh_enabled()
+    disabled = run_steps(args.steps, args.items)
+    with tempfile.TemporaryDirectory() as results_dir:
+        enabled = run_enabled(args.steps, args.items, results_dir)
+
+    print(f"\n{'mode':<12}{'µs/step':>12}")
+    print(f"{'disabled':<12}{disabled:>12.2f}")
+    print(f"{'enabled':<12}{enabled:>12.2f}")
+    print(f"\nDisabled mode is {enabled / disabled:,.0f}x faster per step")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""
+日志吞吐量基准测试脚本
+
+对比 TestLogger 同步模式与异步队列模式（block / drop 策略）的日志吞吐量（records/sec）。
+- producer: 测试线程视角的吞吐量（记录日志调用返回的速度）
+- end-to-end: 包含后台队列全部写出磁盘在内的吞吐量
+
+使用方式:
+    python performance/benchmark_logging.py
+    python performance/benchmark_logging.py --records 50000 --threads 8 --console
+"""
+
+import argparse
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+# 添加项目根目录到 Python 路径
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from config.settings import Settings
+from core.log.logger import TestLogger
+
+
+MODES = [
+    ("sync", False, "block"),
+    ("async-block", True, "block"),
+    ("async-drop", True, "drop"),
+]
+
+
+def run_mode(name: str, async_mode: bool, policy: str, records: int, threads: int,
+             console: bool, log_dir: str) -> dict:
+    """
+    在指定模式下记录日志并统计吞吐量
+
+    Args:
+        name: 模式名称
+        async_mode: 是否启用异步模式
+        policy: 队列满时的策略
+        records: 每个线程记录的日志条数
+        threads: 并发线程数
+        console: 是否同时输出到控制台
+        log_dir: 日志目录
+
+    Returns:
+        dict: 统计结果
+    """
+    Settings.LOG_DIR = log_dir
+    Settings.LOG_TO_CONSOLE = console
+    Settings.LOG_TO_FILE = True
+    Settings.LOG_ASYNC = async_mode
+    Settings.LOG_QUEUE_FULL_POLICY = policy
+    Settings.LOG_FILE_FORMAT = f"bench_{name}.log"
+
+    TestLogger.reset()
+    TestLogger.setup_logger("INFO")
+
+    def worker(thread_id: int) -> None:
+        logger = TestLogger.get_logger(f"Benchmark.{thread_id}")
+        for i in range(records):
+            logger.info(f"thread={thread_id} record={i} payload=GET /api/users/{i} status=200")
+
+    workers = [threading.Thread(target=worker, args=(i,)) for i in range(threads)]
+    start = time.perf_counter()
+    for thread in workers:
+        thread.start()
+    for thread in workers:
+        thread.join()
+    produced = time.perf_counter() - start
+
+    dropped = TestLogger._queue_handler.dropped_count if TestLogger._queue_handler else 0
+    TestLogger.shutdown()
+    total = time.perf_counter() - start
+    TestLogger.reset()
+
+    count = records * threads
+    return {
+        "mode": name,
+        "producer_rps": count / produced,
+        "end_to_end_rps": count / total,
+        "dropped": dropped,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="TestLogger throughput benchmark")
+    parser.add_argument("--records", type=int, default=20000, help="每个线程记录的日志条数")
+    parser.add_argument("--threads", type=int, default=4, help="并发线程数")
+    parser.add_argument("--console", action="store_true", help="同时输出到控制台")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as log_dir:
+        results = [
+            run_mode(name, async_mode, policy, args.records, args.threads, args.console, log_dir)
+            for name, async_mode, policy in MODES
+        ]
+
+    print(f"\n{'mode':<14}{'producer rec/s':>18}{'end-to-end rec/s':>20}{'dropped':>10}")
+    for result in results:
+        print(f"{result['mode']:<14}{result['producer_rps']:>18,.0f}"
+              f"{result['end_to_end_rps']:>20,.0f}{result['dropped']:>10}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""
+网络资源拦截配置基准测试脚本
+
+对比不同网络配置（off / lean / minimal 及自定义配置）下页面的加载时间和传输字节数。
+每次加载使用新的浏览器上下文（不使用缓存），传输字节数来自页面的 Resource Timing 数据。
+
+使用方式:
+    python performance/benchmark_network_profiles.py https://example.com
+    python performance/benchmark_network_profiles.py https://example.com --profiles off lean --count 10
+"""
+
+import argparse
+import statistics
+import sys
+import time
+from pathlib import Path
+
+# 添加项目根目录到 Python 路径
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from playwright.sync_api import sync_playwright
+
+from base.ui.context_pool import build_context_options
+from base.ui.network_profiles import NetworkProfileRouter, get_network_profile
+
+
+# 页面及其所有资源的传输字节数（跨域资源未设置 Timing-Allow-Origin 时为 0）
+TRANSFER_SIZE_SCRIPT = """() => performance.getEntriesByType('navigation')
+    .concat(performance.getEntriesByType('resource'))
+    .reduce((total, entry) => total + (entry.transferSize || 0), 0)"""
+
+
+def run_profile(browser, url: str, profile_name: str, count: int, wait_until: str) -> dict:
+    """
+    使用指定网络配置多次加载页面并统计
+
+    Args:
+        browser: 浏览器实例
+        url: 页面 URL
+        profile_name: 网络配置名称
+        count: 加载次数
+        wait_until: 等待的加载事件（load, domcontentloaded, networkidle）
+
+    Returns:
+        dict: 统计结果
+    """
+    profile = get_network_profile(profile_name)
+    load_times, transfer_sizes, blocked = [], [], 0
+
+    for _ in range(count):
+        context = browser.new_context(**build_context_options())
+        router = NetworkProfileRouter(profile)
+        router.apply(context)
+        page = context.new_page()
+
+        start = time.perf_counter()
+        page.goto(url, wait_until=wait_until)
+        load_times.append((time.perf_counter() - start) * 1000)
+        transfer_sizes.append(page.evaluate(TRANSFER_SIZE_SCRIPT))
+        blocked += router.blocked
+        context.close()
+
+    return {
+        "profile": profile_name,
+        "load_ms": statistics.median(load_times),
+        "bytes": statistics.median(transfer_sizes),
+        "blocked": blocked / count,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Network profile page-load benchmark")
+    parser.add_argument("url", help="页面 URL")
+    parser.add_argument("--profiles", nargs="+", default=["off", "lean", "minimal"], help="对比的网络配置")
+    parser.add_argument("--count", type=int, default=5, help="每种配置的加载次数")
+    parser.add_argument("--wait-until", default="load", help="等待的加载事件")
+    args = parser.parse_args()
+
+    with sync_playwright() as playwright:
+        browser = playwright.chromium.launch()
+        results = [run_profile(browser, args.url, name, args.count, args.wait_until) for name in args.profiles]
+        browser.close()
+
+    print(f"\n{'profile':<12}{'load ms (p50)':>16}{'bytes (p50)':>16}{'blocked/load':>14}")
+    for result in results:
+        print(f"{result['profile']:<12}{result['load_ms']:>16.0f}{result['bytes']:>16,.0f}{result['blocked']:>14.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+"""
+截图编码基准测试脚本
+
+对比不同截图编码配置下每张截图的大小（bytes）和耗时（ms，包含截图和编码）。
+需要安装 Playwright 浏览器；webp、缩放和灰度配置需要安装 Pillow，未安装时跳过。
+
+使用方式:
+    python performance/benchmark_screenshots.py
+    python performance/benchmark_screenshots.py --url https://example.com --count 20
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+# 添加项目根目录到 Python 路径
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from playwright.sync_api import sync_playwright
+
+import base.ui.screenshot_encoder as screenshot_encoder
+from base.ui.screenshot_encoder import ScreenshotEncoder
+from config.settings import Settings
+
+
+# (名称, 格式, 质量, 最大宽度, 灰度, 是否需要 Pillow)
+CONFIGS = [
+    ("png", "png", 80, 0, False, False),
+    ("jpeg-q80", "jpeg", 80, 0, False, False),
+    ("jpeg-q60", "jpeg", 60, 0, False, False),
+    ("webp-q80", "webp", 80, 0, False, True),
+    ("jpeg-q80-1280w", "jpeg", 80, 1280, False, True),
+    ("webp-q60-1280w", "webp", 60, 1280, False, True),
+    ("webp-q80-gray", "webp", 80, 0, True, True),
+]
+
+# 默认测试页面：包含文字、渐变和色块，接近真实页面的压缩特征
+SAMPLE_HTML = """
+<html><body style="margin:0;font-family:sans-serif;background:linear-gradient(135deg,#e0eafc,#cfdef3)">
+<header style="height:80px;background:#1f3a60;color:#fff;font-size:32px;padding:20px">Dashboard</header>
+<main style="display:grid;grid-template-columns:repeat(4,1fr);gap:16px;padding:24px">
+""" + "".join(
+    f'<div style="background:hsl({i * 23 % 360},60%,85%);padding:16px;border-radius:8px">'
+    f'<h3>Card {i}</h3><p>{"Lorem ipsum dolor sit amet, consectetur adipiscing elit. " * 3}</p></div>'
+    for i in range(24)
+) + "</main></body></html>"
+
+
+def run_config(page, name: str, image_format: str, quality: int, max_width: int,
+               grayscale: bool, count: int) -> dict:
+    """
+    在指定配置下多次截图并统计平均大小和耗时
+
+    Args:
+        page: Playwright Page 对象
+        name: 配置名称
+        image_format: 截图格式
+        quality: 截图质量
+        max_width: 最大宽度
+        grayscale: 是否转换为灰度
+        count: 截图次数
+
+    Returns:
+        dict: 统计结果
+    """
+    Settings.SCREENSHOT_FORMAT = image_format
+    Settings.SCREENSHOT_QUALITY = quality
+    Settings.SCREENSHOT_MAX_WIDTH = max_width
+    Settings.SCREENSHOT_GRAYSCALE = grayscale
+
+    # 预热（启动编码线程池）
+    ScreenshotEncoder.capture(page)
+
+    total_bytes = 0
+    start = time.perf_counter()
+    for _ in range(count):
+        total_bytes += len(ScreenshotEncoder.capture(page).data)
+    elapsed = time.perf_counter() - start
+
+    return {
+        "config": name,
+        "bytes": total_bytes / count,
+        "ms": elapsed / count * 1000,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Screenshot encoding benchmark")
+    parser.add_argument("--url", default=None, help="截图页面 URL，默认使用内置测试页面")
+    parser.add_argument("--count", type=int, default=10, help="每种配置的截图次数")
+    parser.add_argument("--width", type=int, default=1920, help="视口宽度")
+    parser.add_argument("--height", type=int, default=1080, help="视口高度")
+    args = parser.parse_args()
+
+    results = []
+    with sync_playwright() as playwright:
+        browser = playwright.chromium.launch()
+        page = browser.new_page(viewport={"width": args.width, "height": args.height})
+        if args.url:
+            page.goto(args.url, wait_until="load")
+        else:
+            page.set_content(SAMPLE_HTML)
+
+        for name, image_format, quality, max_width, grayscale, needs_pillow in CONFIGS:
+            if needs_pillow and screenshot_encoder.Image is None:
+                print(f"Skipping {name}: Pillow is not installed")
+                continue
+            results.append(run_config(page, name, image_format, quality, max_width, grayscale, args.count))
+
+        browser.close()
+    ScreenshotEncoder.shutdown()
+
+    baseline = results[0]["bytes"]
+    print(f"\n{'config':<18}{'bytes/shot':>14}{'vs png':>10}{'ms/shot':>10}")
+    for result in results:
+        print(f"{result['config']:<18}{result['bytes']:>14,.0f}"
+              f"{result['bytes'] / baseline:>10.0%}{result['ms']:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""
+Trace 录制基准测试脚本
+
+对比不同 TRACE_MODE（off / retain-on-failure / on）下测试的耗时和保存的 trace 大小。
+每种模式在同一个浏览器上下文中按顺序执行多个模拟测试（加载页面并读取标题），
+通过 TraceRecorder 按测试录制分块，--fail-every 指定每隔几个测试模拟一次失败。
+
+使用方式:
+    python performance/benchmark_tracing.py https://example.com
+    python performance/benchmark_tracing.py https://example.com --count 20 --fail-every 5 --ring-size 3
+"""
+
+import argparse
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# 添加项目根目录到 Python 路径
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from playwright.sync_api import sync_playwright
+
+from base.ui.context_pool import build_context_options
+from base.ui.trace_recorder import TraceRecorder
+from config.settings import Settings
+
+
+def run_mode(browser, url: str, mode: str, count: int, fail_every: int, ring_size: int) -> dict:
+    """
+    使用指定 trace 模式执行多个模拟测试并统计
+
+    Args:
+        browser: 浏览器实例
+        url: 页面 URL
+        mode: trace 模式（off, retain-on-failure, on）
+        count: 模拟测试数量
+        fail_every: 每隔几个测试模拟一次失败（0 表示不失败）
+        ring_size: 保留的最近分块数量
+
+    Returns:
+        dict: 统计结果
+    """
+    Settings.TRACE_MODE = mode
+    trace_dir = Path(tempfile.mkdtemp(prefix="trace_benchmark_"))
+    context = browser.new_context(**build_context_options())
+    page = context.new_page()
+    recorder = None if mode == "off" else TraceRecorder(context, ring_size=ring_size, trace_dir=str(trace_dir))
+    test_times = []
+
+    for index in range(count):
+        failed = bool(fail_every) and (index + 1) % fail_every == 0
+        start = time.perf_counter()
+        if recorder is not None:
+            recorder.start_chunk(f"test_{index}")
+        page.goto(url)
+        page.title()
+        if recorder is not None:
+            recorder.stop_chunk(failed)
+        test_times.append((time.perf_counter() - start) * 1000)
+
+    if recorder is not None:
+        recorder.close()
+    context.close()
+
+    saved = [path for path in trace_dir.glob("*.zip")]
+    result = {
+        "mode": mode,
+        "test_ms": statistics.median(test_times),
+        "total_s": sum(test_times) / 1000,
+        "files": len(saved),
+        "bytes": sum(path.stat().st_size for path in saved),
+    }
+    shutil.rmtree(trace_dir, ignore_errors=True)
+    return result
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Playwright tracing overhead benchmark")
+    parser.add_argument("url", help="页面 URL")
+    parser.add_argument("--modes", nargs="+", default=["off", "retain-on-failure", "on"], help="对比的 trace 模式")
+    parser.add_argument("--count", type=int, default=10, help="每种模式的模拟测试数量")
+    parser.add_argument("--fail-every", type=int, default=5, help="每隔几个测试模拟一次失败（0 表示不失败）")
+    parser.add_argument("--ring-size", type=int, default=1, help="保留的最近分块数量")
+    args = parser.parse_args()
+
+    with sync_playwright() as playwright:
+        browser = playwright.chromium.launch()
+        results = [
+            run_mode(browser, args.url, mode, args.count, args.fail_every, args.ring_size)
+            for mode in args.modes
+        ]
+        browser.close()
+
+    baseline = next((result["total_s"] for result in results if result["mode"] == "off"), None)
+    print(f"\n{'mode':<20}{'test ms (p50)':>15}{'total s':>10}{'overhead':>10}{'files':>7}{'trace bytes':>14}")
+    for result in results:
+        overhead = f"{(result['total_s'] / baseline - 1) * 100:+.0f}%" if baseline else "-"
+        print(
+            f"{result['mode']:<20}{result['test_ms']:>15.0f}{result['total_s']:>10.2f}{overhead:>10}"
+            f"{result['files']:>7}{result['bytes']:>14,}"
+        )
+
+
+if __name__ == "__main__":
+    main()
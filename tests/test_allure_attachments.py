@@ -0,0 +1,223 @@
+"""
+Allure 附件写入测试
+
+验证后台写入模式下附件登记到当前测试、在后台线程中写入，并在 flush 后全部落盘，
+以及未启用 Allure 时所有方法都是空操作
+"""
+
+import threading
+from pathlib import Path
+
+import pytest
+
+from config.settings import Settings
+from core.allure.allure_helper import AllureHelper
+from core.allure.attachment_budget import AttachmentBudget
+from core.allure.attachment_writer import AllureAttachmentWriter
+
+
+@pytest.fixture(autouse=True)
+def attachment_stats():
+    # 统计是类级别的，避免这里的附件计入会话结束时输出的去重和预算统计
+    AllureAttachmentWriter.reset_stats()
+    AttachmentBudget.reset_stats()
+    yield
+    AllureAttachmentWriter.flush()
+    AllureAttachmentWriter.reset_stats()
+    AttachmentBudget.reset_stats()
+
+
+@pytest.fixture
+def allure_reporter():
+    reporter = AllureAttachmentWriter._get_reporter()
+    if reporter is None:
+        pytest.skip("Allure reporting is not enabled (run with --alluredir)")
+    return reporter
+
+
+@pytest.fixture
+def results_dir(allure_reporter):
+    # 与写入器一致，从监听器获取实际的 allure-results 目录（--alluredir）
+    return Path(AllureAttachmentWriter._get_results_dir())
+
+
+@pytest.fixture
+def async_attachments(monkeypatch):
+    monkeypatch.setattr(Settings, "ALLURE_ASYNC_ATTACHMENTS", True)
+    yield
+    AllureAttachmentWriter.flush()
+
+
+class TestAllureAttachmentWriter:
+    """Allure 附件后台写入测试"""
+
+    def test_attachments_registered_on_current_test(self, allure_reporter, results_dir, async_attachments):
+        """测试附件登记在当前测试下，flush 后写入 allure-results"""
+        test_result = allure_reporter.get_test(None)
+        before = len(test_result.attachments)
+
+        for i in range(20):
+            AllureHelper.attach_text(f"attachment body {i}", f"Async Attachment {i}")
+        assert AllureAttachmentWriter.flush(timeout=10)
+
+        attachments = test_result.attachments[before:]
+        assert [a.name for a in attachments] == [f"Async Attachment {i}" for i in range(20)]
+        for i, attachment in enumerate(attachments):
+            assert (results_dir / attachment.source).read_text(encoding="utf-8") == f"attachment body {i}"
+
+    def test_lazy_body_written_off_thread(self, allure_reporter, async_attachments):
+        """测试延迟生成的附件内容在后台线程中生成"""
+        writer_threads = []
+
+        def build_body():
+            writer_threads.append(threading.current_thread().name)
+            return b"lazy body"
+
+        AllureAttachmentWriter.attach(build_body, "Lazy Attachment")
+        assert AllureAttachmentWriter.flush(timeout=10)
+
+        assert writer_threads == ["AllureAttachmentWriter"]
+
+    def test_sync_mode_writes_immediately(self, allure_reporter, results_dir, monkeypatch):
+        """测试未启用后台写入时同步写入附件"""
+        monkeypatch.setattr(Settings, "ALLURE_ASYNC_ATTACHMENTS", False)
+        test_result = allure_reporter.get_test(None)
+
+        AllureHelper.attach_text("sync body", "Sync Attachment")
+
+        source = test_result.attachments[-1].source
+        assert (results_dir / source).read_text(encoding="utf-8") == "sync body"
+
+    @pytest.mark.parametrize("data, mime_type, extension", [
+        (b"\x89PNG\r\n\x1a\n", "image/png", "png"),
+        (b"\xff\xd8\xff\xe0", "image/jpg", "jpg"),
+        (b"RIFF\x00\x00\x00\x00WEBPVP8 ", "image/webp", "webp"),
+    ])
+    def test_screenshot_type_detected(self, allure_reporter, monkeypatch, data, mime_type, extension):
+        """测试截图附件的类型根据内容识别"""
+        monkeypatch.setattr(Settings, "ALLURE_ASYNC_ATTACHMENTS", False)
+        test_result = allure_reporter.get_test(None)
+
+        AllureHelper.attach_screenshot(data, f"Screenshot {extension}")
+
+        attachment = test_result.attachments[-1]
+        assert attachment.type == mime_type
+        assert attachment.source.endswith(f".{extension}")
+
+
+    def test_unexpected_reporter_falls_back_to_allure_attach(self, monkeypatch):
+        """测试 AllureReporter 不提供预期的 _attach 时退化为同步的 allure.attach"""
+        attached = []
+        monkeypatch.setattr(Settings, "ALLURE_ASYNC_ATTACHMENTS", True)
+        monkeypatch.setattr(AllureAttachmentWriter, "_register_supported", None)
+        monkeypatch.setattr(AllureAttachmentWriter, "_get_reporter", classmethod(lambda cls: object()))
+        monkeypatch.setattr(
+            "allure.attach",
+            lambda body, name=None, attachment_type=None, extension=None: attached.append((name, body))
+        )
+
+        AllureAttachmentWriter.attach(lambda: "lazy body", "Fallback Attachment")
+
+        assert attached == [("Fallback Attachment", "lazy body")]
+        assert AllureAttachmentWriter._register_supported is False
+        assert AllureAttachmentWriter.get_stats()["written"] == 0
+
+
+class TestAttachmentDeduplication:
+    """Allure 附件去重测试"""
+
+    @pytest.fixture(params=[False, True], ids=["sync", "async"])
+    def dedup_attachments(self, request, monkeypatch):
+        monkeypatch.setattr(Settings, "ALLURE_DEDUP_ATTACHMENTS", True)
+        monkeypatch.setattr(Settings, "ALLURE_ASYNC_ATTACHMENTS", request.param)
+        yield
+        AllureAttachmentWriter.flush()
+
+    def test_identical_content_stored_once(self, allure_reporter, results_dir, dedup_attachments):
+        """测试相同内容的附件引用同一个文件，不同内容的附件各自保存"""
+        test_result = allure_reporter.get_test(None)
+        before = len(test_result.attachments)
+        stats_before = AllureAttachmentWriter.get_stats()
+        body = f"reference data for {test_result.uuid}"
+
+        AllureHelper.attach_text(body, "Reference Data 1")
+        AllureHelper.attach_text(body, "Reference Data 2")
+        AllureHelper.attach_text(body + " (changed)", "Reference Data 3")
+        assert AllureAttachmentWriter.flush(timeout=10)
+
+        first, second, third = test_result.attachments[before:]
+        assert first.source == second.source
+        assert third.source != first.source
+        assert [a.name for a in (first, second, third)] == [f"Reference Data {i}" for i in (1, 2, 3)]
+
+        assert (results_dir / first.source).read_text(encoding="utf-8") == body
+        assert (results_dir / third.source).exists()
+
+        stats = AllureAttachmentWriter.get_stats()
+        assert stats["dedup_hits"] - stats_before["dedup_hits"] == 1
+        assert stats["dedup_bytes_saved"] - stats_before["dedup_bytes_saved"] == len(body.encode("utf-8"))
+
+    def test_existing_file_not_rewritten(self, allure_reporter, dedup_attachments):
+        """测试其他进程已写入的相同内容不会重复写入"""
+        test_result = allure_reporter.get_test(None)
+        AllureHelper.attach_text(f"shared blob {test_result.uuid}", "Shared Blob")
+        AllureAttachmentWriter.flush(timeout=10)
+        source = test_result.attachments[-1].source
+
+        # 模拟其他 worker：清除本进程记录后再次附加相同内容
+        AllureAttachmentWriter._stored_files.discard(source)
+        stats_before = AllureAttachmentWriter.get_stats()
+        AllureHelper.attach_text(f"shared blob {test_result.uuid}", "Shared Blob Again")
+        AllureAttachmentWriter.flush(timeout=10)
+
+        assert test_result.attachments[-1].source == source
+        assert AllureAttachmentWriter.get_stats()["written"] == stats_before["written"]
+
+
+class TestAllureDisabled:
+    """未启用 Allure 时的空操作测试"""
+
+    @pytest.fixture
+    def allure_disabled(self, monkeypatch):
+        monkeypatch.setattr(AllureHelper, "_enabled", False)
+
+    def test_detects_reporter(self, allure_reporter, monkeypatch):
+        """测试会话开始时检测到 Allure 监听器"""
+        monkeypatch.setattr(AllureHelper, "_enabled", None)
+
+        assert AllureHelper.is_enabled()
+        assert AllureHelper.refresh_enabled()
+        assert AllureHelper._enabled is True
+
+    def test_attachments_skipped(self, allure_reporter, allure_disabled, monkeypatch, tmp_path):
+        """测试附件方法不序列化、不读取文件、不登记附件"""
+        def fail(*args, **kwargs):
+            raise AssertionError("attachment content should not be processed")
+
+        monkeypatch.setattr(AttachmentBudget, "fit_text", fail)
+        monkeypatch.setattr(AttachmentBudget, "fit_json", fail)
+        monkeypatch.setattr(AttachmentBudget, "fit_binary", fail)
+        test_result = allure_reporter.get_test(None)
+        before = len(test_result.attachments)
+
+        AllureHelper.attach_text("text", "Text")
+        AllureHelper.attach_json({"key": "value"}, "JSON")
+        AllureHelper.attach_screenshot(b"\x89PNG", "Screenshot")
+        AllureHelper.attach_file(str(tmp_path / "missing.log"), "File")
+        AllureHelper.add_tag("disabled")
+
+        assert len(test_result.attachments) == before
+        assert "disabled" not in [label.value for label in test_result.labels]
+
+    def test_step_is_no_op(self, allure_reporter, allure_disabled):
+        """测试步骤不记录到报告中，步骤内的异常正常抛出"""
+        test_result = allure_reporter.get_test(None)
+        before = len(test_result.steps)
+
+        with AllureHelper.step("Disabled Step"):
+            pass
+        with pytest.raises(ValueError):
+            with AllureHelper.step("Failing Step"):
+                raise ValueError("boom")
+
+        assert len(test_result.steps) == before
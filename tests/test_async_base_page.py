@@ -0,0 +1,247 @@
+"""
+异步页面对象测试
+
+验证 gather_pages 的并发上限、AsyncRunner 的事件循环管理，
+以及 AsyncBasePage 的页面操作、截图和失败截图
+"""
+
+import asyncio
+import contextvars
+import threading
+
+import pytest
+
+from base.ui.async_runner import AsyncRunner
+from base.ui.pages.async_base_page import AsyncBasePage, gather_pages
+from base.ui.screenshot_encoder import ScreenshotEncoder
+from config.settings import Settings
+
+
+class FakeLocator:
+    """异步定位器替身"""
+
+    def __init__(self, page, selector):
+        self.page = page
+        self.selector = selector
+
+    async def wait_for(self, state, timeout):
+        if self.selector in self.page.missing:
+            raise RuntimeError(f"element not found: {self.selector}")
+
+    async def click(self, force, timeout):
+        # 与 Playwright 相同，点击本身等待元素可操作
+        await self.wait_for("visible", timeout)
+        self.page.actions.append(("click", self.selector))
+
+    async def inner_text(self, timeout):
+        return f"text of {self.selector}"
+
+
+class FakeAsyncPage:
+    """记录调用的异步页面替身，goto 时让出事件循环以模拟页面加载"""
+
+    def __init__(self, title="Example", missing=()):
+        self._title = title
+        self.missing = set(missing)
+        self.url = "about:blank"
+        self.actions = []
+        self.screenshots = []
+
+    def set_default_timeout(self, timeout):
+        self.default_timeout = timeout
+
+    def locator(self, selector):
+        return FakeLocator(self, selector)
+
+    async def goto(self, url, wait_until, timeout):
+        await asyncio.sleep(0.01)
+        self.url = url
+
+    async def title(self):
+        return self._title
+
+    async def screenshot(self, **kwargs):
+        self.screenshots.append(kwargs)
+        return b"\x89PNG\r\n\x1a\n"
+
+
+@pytest.fixture
+def runner():
+    runner = AsyncRunner()
+    yield runner
+    runner.close()
+
+
+class TestGatherPages:
+    """并发执行测试"""
+
+    def test_results_in_order_and_limit_respected(self, runner):
+        """测试结果按输入顺序返回，且同时执行的数量不超过上限"""
+        running = 0
+        peak = 0
+
+        async def check(index):
+            nonlocal running, peak
+            running += 1
+            peak = max(peak, running)
+            await asyncio.sleep(0.01)
+            running -= 1
+            return index
+
+        results = runner.run(gather_pages((check(i) for i in range(20)), limit=5))
+
+        assert results == list(range(20))
+        assert peak == 5
+
+    def test_default_limit_from_settings(self, runner, monkeypatch):
+        """测试未指定上限时使用 ASYNC_UI_CONCURRENCY"""
+        monkeypatch.setattr(Settings, "ASYNC_UI_CONCURRENCY", 2)
+        running = 0
+        peak = 0
+
+        async def check():
+            nonlocal running, peak
+            running += 1
+            peak = max(peak, running)
+            await asyncio.sleep(0.01)
+            running -= 1
+
+        runner.run(gather_pages(check() for _ in range(6)))
+
+        assert peak == 2
+
+    def test_return_exceptions(self, runner):
+        """测试 return_exceptions=True 时单个失败不影响其他结果"""
+        async def check(index):
+            if index == 1:
+                raise ValueError("broken page")
+            return index
+
+        results = runner.run(gather_pages((check(i) for i in range(3)), return_exceptions=True))
+
+        assert results[0] == 0 and results[2] == 2
+        assert isinstance(results[1], ValueError)
+
+
+class TestAsyncRunner:
+    """事件循环运行器测试"""
+
+    def test_close_cancels_pending_tasks(self):
+        """测试关闭时取消未完成的任务并关闭事件循环"""
+        runner = AsyncRunner()
+        task = runner.loop.create_task(asyncio.sleep(60))
+
+        runner.close()
+        runner.close()
+
+        assert task.cancelled()
+        assert runner.loop.is_closed()
+
+    def test_runs_while_another_loop_is_running(self, runner):
+        """测试测试线程上已有正在运行的事件循环（Playwright 同步 API）时也能运行"""
+        async def sync_api_session():
+            return runner.run(asyncio.sleep(0, result="done"))
+
+        assert asyncio.run(sync_api_session()) == "done"
+
+    def test_runs_in_separate_thread_with_caller_context(self, runner):
+        """测试协程在单独的线程中运行，并继承调用方的 contextvars"""
+        variable = contextvars.ContextVar("variable", default=None)
+        variable.set("from test thread")
+        test_thread = threading.current_thread()
+
+        async def check():
+            return threading.current_thread() is not test_thread, variable.get()
+
+        assert runner.run(check()) == (True, "from test thread")
+
+    def test_exceptions_propagate(self, runner):
+        """测试协程中的异常在测试线程中重新抛出，之后仍可继续运行"""
+        async def fail():
+            raise ValueError("broken page")
+
+        with pytest.raises(ValueError, match="broken page"):
+            runner.run(fail())
+        assert runner.run(asyncio.sleep(0, result="still usable")) == "still usable"
+
+
+class TestAsyncBasePage:
+    """异步基础页面测试"""
+
+    @pytest.fixture(autouse=True)
+    def png_screenshots(self, monkeypatch, tmp_path):
+        monkeypatch.setattr(Settings, "SCREENSHOT_FORMAT", "png")
+        monkeypatch.setattr(Settings, "SCREENSHOT_MAX_WIDTH", 0)
+        monkeypatch.setattr(Settings, "SCREENSHOT_MAX_HEIGHT", 0)
+        monkeypatch.setattr(Settings, "SCREENSHOT_GRAYSCALE", False)
+        monkeypatch.setattr(Settings, "SCREENSHOT_DIR", str(tmp_path))
+
+    def test_pages_navigate_concurrently(self, runner):
+        """测试多个页面的导航在同一个事件循环中并发执行"""
+        pages = [AsyncBasePage(FakeAsyncPage(title=f"Page {i}")) for i in range(10)]
+
+        async def check(page, index):
+            await page.navigate(f"https://example.com/{index}")
+            return await page.get_title()
+
+        loop_time = runner.loop.time()
+        titles = runner.run(gather_pages(check(page, i) for i, page in enumerate(pages)))
+
+        assert titles == [f"Page {i}" for i in range(10)]
+        assert pages[3].get_current_url() == "https://example.com/3"
+        # 10 次 10ms 的导航并发执行，总耗时远小于串行的 100ms
+        assert runner.loop.time() - loop_time < 0.08
+
+    def test_click_and_get_text(self, runner):
+        """测试点击和获取文本"""
+        page = AsyncBasePage(FakeAsyncPage())
+
+        runner.run(page.click("#submit"))
+        text = runner.run(page.get_text("#message"))
+
+        assert page.page.actions == [("click", "#submit")]
+        assert text == "text of #message"
+
+    def test_take_screenshot_saves_file(self, runner, tmp_path):
+        """测试截图保存到截图目录"""
+        page = AsyncBasePage(FakeAsyncPage())
+
+        data = runner.run(page.take_screenshot("home", attach_to_allure=False))
+
+        assert (tmp_path / "home.png").read_bytes() == data
+        assert page.page.screenshots == [{"full_page": False, "type": "png"}]
+
+    def test_failure_screenshot_on_missing_element(self, runner, tmp_path):
+        """测试点击找不到的元素时截图并重新抛出异常"""
+        page = AsyncBasePage(FakeAsyncPage(missing={"#missing"}))
+
+        with pytest.raises(RuntimeError):
+            runner.run(page.click("#missing"))
+
+        assert page.page.screenshots
+        assert list(tmp_path.glob("click_error_*.png"))
+
+
+class TestCaptureAsync:
+    """异步截图编码测试"""
+
+    def test_post_processing_runs_in_encoder_thread(self, runner, monkeypatch):
+        """测试需要后处理时在编码线程中编码，并返回编码结果"""
+        threads = []
+
+        def encode(cls, png_bytes):
+            threads.append(threading.current_thread().name)
+            return ("encoded", png_bytes)
+
+        monkeypatch.setattr(ScreenshotEncoder, "needs_post_processing", classmethod(lambda cls: True))
+        monkeypatch.setattr(ScreenshotEncoder, "encode", classmethod(encode))
+        page = FakeAsyncPage()
+
+        try:
+            screenshot = runner.run(ScreenshotEncoder.capture_async(page))
+        finally:
+            ScreenshotEncoder.shutdown()
+
+        assert page.screenshots == [{"full_page": False, "type": "png"}]
+        assert screenshot == ("encoded", b"\x89PNG\r\n\x1a\n")
+        assert threads[0].startswith("ScreenshotEncoder")
@@ -0,0 +1,105 @@
+"""
+异步日志测试
+
+验证 TestLogger 异步队列模式的日志输出、丢弃策略和会话结束时的刷新
+"""
+
+import logging
+import queue
+import threading
+import pytest
+from pathlib import Path
+
+from config.settings import Settings
+from core.log.async_handler import BoundedQueueHandler, BatchingQueueListener
+from core.log.logger import TestLogger
+
+
+@pytest.fixture
+def async_logger(tmp_path, monkeypatch):
+    """启用异步模式并将日志写入临时目录"""
+    monkeypatch.setattr(Settings, "LOG_DIR", str(tmp_path))
+    monkeypatch.setattr(Settings, "LOG_TO_CONSOLE", False)
+    monkeypatch.setattr(Settings, "LOG_ASYNC", True)
+    monkeypatch.setattr(Settings, "LOG_QUEUE_SIZE", 1000)
+    monkeypatch.setattr(Settings, "LOG_QUEUE_FULL_POLICY", "block")
+
+    TestLogger.reset()
+    TestLogger.setup_logger("INFO")
+    yield TestLogger
+    TestLogger.reset()
+
+
+class TestAsyncLogging:
+    """异步日志模式测试"""
+
+    def test_records_written_after_flush(self, async_logger):
+        """测试多线程写入的日志在 flush 后全部落盘"""
+        num_threads = 10
+        logs_per_thread = 100
+
+        def worker(thread_id):
+            logger = async_logger.get_logger(f"async_thread_{thread_id}")
+            for i in range(logs_per_thread):
+                logger.info(f"Thread {thread_id} - message {i}")
+
+        threads = [threading.Thread(target=worker, args=(i,)) for i in range(num_threads)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        async_logger.flush()
+
+        content = Path(async_logger.get_log_file_path()).read_text(encoding="utf-8")
+        assert content.count("message") == num_threads * logs_per_thread
+
+    def test_shutdown_restores_sync_output(self, async_logger):
+        """测试 shutdown 后日志仍以同步方式继续输出"""
+        logger = async_logger.get_logger("async_shutdown")
+        logger.info("before shutdown")
+
+        async_logger.shutdown()
+
+        root_handlers = logging.getLogger().handlers
+        assert not any(isinstance(h, BoundedQueueHandler) for h in root_handlers)
+
+        logger.info("after shutdown")
+        content = Path(async_logger.get_log_file_path()).read_text(encoding="utf-8")
+        assert "before shutdown" in content
+        assert "after shutdown" in content
+
+    def test_drop_policy_keeps_warnings(self):
+        """测试 drop 策略在队列满时只丢弃 WARNING 以下级别的日志"""
+        log_queue = queue.Queue(maxsize=2)
+        handler = BoundedQueueHandler(log_queue, policy="drop")
+        logger = logging.getLogger("async_drop_policy")
+        logger.propagate = False
+        logger.setLevel(logging.INFO)
+        logger.addHandler(handler)
+
+        try:
+            logger.warning("first warning")
+            for i in range(4):
+                logger.info(f"filler {i}")
+
+            # 队列容量为 2：1 条 WARNING + 1 条 INFO 入队，其余 3 条 INFO 被丢弃
+            assert handler.dropped_count == 3
+            assert log_queue.qsize() == 2
+
+            # 启动监听器消费后 WARNING 仍可写入
+            messages = []
+
+            class _ListHandler(logging.Handler):
+                def emit(self, record):
+                    messages.append(record.getMessage())
+
+            listener = BatchingQueueListener(log_queue, [_ListHandler()])
+            listener.start()
+            logger.warning("final warning")
+            listener.stop(timeout=5)
+
+            assert messages == ["first warning", "filler 0", "final warning"]
+        finally:
+            logger.removeHandler(handler)
+            logger.propagate = True
@@ -0,0 +1,138 @@
+"""
+Allure 附件预算测试
+
+验证文本首尾截断、JSON 紧凑与数组省略、单个测试预算以及节省字节数统计
+"""
+
+import json
+
+import pytest
+
+from config.settings import Settings
+from core.allure.attachment_budget import AttachmentBudget, fit_json, truncate_text
+
+
+class TestTruncation:
+    """截断策略测试"""
+
+    def test_truncate_text_keeps_head_and_tail(self):
+        """测试文本超出预算时保留开头和结尾"""
+        text = "HEAD" + "x" * 10000 + "TAIL"
+        truncated = truncate_text(text, 500)
+
+        assert len(truncated.encode("utf-8")) <= 500
+        assert truncated.startswith("HEAD")
+        assert truncated.endswith("TAIL")
+        assert "[truncated" in truncated
+
+    def test_truncate_text_multibyte(self):
+        """测试截断不会产生不完整的 UTF-8 字符"""
+        truncated = truncate_text("中文日志" * 1000, 301)
+
+        assert len(truncated.encode("utf-8")) <= 301
+        truncated.encode("utf-8").decode("utf-8")
+
+    def test_truncate_text_within_budget(self):
+        """测试未超出预算时原样返回"""
+        assert truncate_text("short", 100) == "short"
+
+    def test_fit_json_prefers_pretty_then_compact(self):
+        """测试 JSON 在预算内时格式化输出，超出时改为紧凑输出"""
+        data = {"users": [{"id": i, "name": f"user{i}"} for i in range(5)]}
+        pretty = json.dumps(data, indent=2, ensure_ascii=False)
+        compact = json.dumps(data, separators=(",", ":"))
+
+        assert fit_json(data, 0) == (pretty, True, len(pretty))
+        content, is_json, original = fit_json(data, len(compact) + 1)
+        assert content == compact
+        assert is_json and original == len(pretty)
+
+    def test_fit_json_elides_arrays(self):
+        """测试紧凑输出仍超出预算时省略长数组的中间元素，保持合法 JSON"""
+        data = {"items": [{"id": i, "payload": "x" * 50} for i in range(1000)], "total": 1000}
+        content, is_json, _ = fit_json(data, 4096)
+
+        assert is_json
+        assert len(content.encode("utf-8")) <= 4096
+        parsed = json.loads(content)
+        assert parsed["total"] == 1000
+        assert parsed["items"][0]["id"] == 0
+        assert parsed["items"][-1]["id"] == 999
+        assert any(isinstance(item, str) and "more items" in item for item in parsed["items"])
+
+
+class TestAttachmentBudget:
+    """附件预算测试"""
+
+    @pytest.fixture(autouse=True)
+    def budgets(self, monkeypatch):
+        monkeypatch.setattr(Settings, "ALLURE_ATTACHMENT_MAX_BYTES", 1000)
+        monkeypatch.setattr(Settings, "ALLURE_TEST_ATTACHMENT_BUDGET", 2500)
+        # 统计是类级别的，避免这里的附件计入会话结束时输出的预算统计
+        AttachmentBudget.reset_stats()
+        yield
+        AttachmentBudget.reset_stats()
+
+    def test_per_attachment_limit(self):
+        """测试单个附件超出上限时被截断，并统计节省的字节数"""
+        before = AttachmentBudget.get_stats()
+        text = AttachmentBudget.fit_text("x" * 5000, "Big Log")
+        after = AttachmentBudget.get_stats()
+
+        assert len(text) <= 1000
+        assert after["truncated"] == before["truncated"] + 1
+        assert after["bytes_saved"] - before["bytes_saved"] == 5000 - len(text)
+
+    def test_per_test_budget(self):
+        """测试单个测试的预算用完后附件被截断或以说明文本代替"""
+        AttachmentBudget.begin_test()
+        try:
+            first = AttachmentBudget.fit_text("a" * 1000, "First")
+            second = AttachmentBudget.fit_text("b" * 1000, "Second")
+            third = AttachmentBudget.fit_text("c" * 1000, "Third")
+            screenshot_note = AttachmentBudget.fit_binary(b"\x89PNG" + b"0" * 1000, "Screenshot")
+        finally:
+            AttachmentBudget.end_test()
+
+        assert first == "a" * 1000
+        assert second == "b" * 1000
+        assert len(third) <= 500 and "[truncated" in third
+        assert screenshot_note.startswith("[Attachment 'Screenshot' omitted")
+
+    def test_budget_not_applied_outside_test(self):
+        """测试测试之外附加的附件只受单个附件上限限制"""
+        AttachmentBudget.end_test()
+
+        assert AttachmentBudget.fit_binary(b"0" * 900, "Session Screenshot") is None
+        assert len(AttachmentBudget.fit_text("x" * 900, "Session Log")) == 900
+
+    def test_binary_per_attachment_limit(self):
+        """测试二进制附件超出单个附件上限时以说明文本代替，即使单个测试的预算足够"""
+        AttachmentBudget.end_test()
+        before = AttachmentBudget.get_stats()
+
+        note = AttachmentBudget.fit_binary(b"\x89PNG" + b"0" * 100000, "Full Page Screenshot")
+
+        assert note.startswith("[Attachment 'Full Page Screenshot' omitted: 100004 bytes")
+        assert AttachmentBudget.get_stats()["omitted"] == before["omitted"] + 1
+
+    def test_exhausted_budget_omits_everything(self):
+        """测试单个测试的预算用完后，之后的附件不会因剩余预算为 0 而不受限制"""
+        AttachmentBudget.begin_test()
+        try:
+            for i, size in enumerate((900, 900, 700)):
+                assert AttachmentBudget.fit_binary(b"0" * size, f"Screenshot {i}") is None
+            text = AttachmentBudget.fit_text("x" * 300, "Late Log")
+            screenshot_note = AttachmentBudget.fit_binary(b"0" * 10, "Late Screenshot")
+        finally:
+            AttachmentBudget.end_test()
+
+        assert text.startswith("[Attachment 'Late Log' omitted")
+        assert screenshot_note.startswith("[Attachment 'Late Screenshot' omitted")
+
+    def test_json_budget_falls_back_to_text(self):
+        """测试 JSON 无法压缩到预算内时按文本截断"""
+        content, is_json = AttachmentBudget.fit_json({"blob": "x" * 5000}, "Blob")
+
+        assert not is_json
+        assert len(content.encode("utf-8")) <= 1000
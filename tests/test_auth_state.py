@@ -0,0 +1,108 @@
+"""
+登录状态缓存测试
+
+验证每个角色只登录一次、过期后重新登录，以及多个进程/线程同时获取时只登录一次
+"""
+
+import json
+import os
+import threading
+import time
+
+from base.ui.auth_state import AuthStateCache
+
+
+class FakeLogin:
+    """记录登录次数的登录函数替身"""
+
+    def __init__(self, expires: float = -1, delay: float = 0):
+        self.expires = expires
+        self.delay = delay
+        self.calls = []
+        self._lock = threading.Lock()
+
+    def __call__(self, role):
+        with self._lock:
+            self.calls.append(role)
+        time.sleep(self.delay)
+        return {"cookies": [{"name": "session", "value": role, "expires": self.expires}], "origins": []}
+
+
+class TestAuthStateCache:
+    """登录状态缓存测试"""
+
+    def test_login_once_per_role(self, tmp_path):
+        """测试每个角色只登录一次，之后直接使用保存的状态"""
+        login = FakeLogin()
+        cache = AuthStateCache(login, state_dir=str(tmp_path), ttl=3600)
+
+        paths = [cache.get("admin"), cache.get("admin"), cache.get("viewer")]
+
+        assert login.calls == ["admin", "viewer"]
+        assert paths[0] == paths[1] != paths[2]
+        with open(paths[0], encoding="utf-8") as f:
+            assert json.load(f)["cookies"][0]["value"] == "admin"
+
+    def test_shared_across_instances(self, tmp_path):
+        """测试状态文件在不同进程（缓存实例）之间共享"""
+        first, second = FakeLogin(), FakeLogin()
+        AuthStateCache(first, state_dir=str(tmp_path)).get("admin")
+        AuthStateCache(second, state_dir=str(tmp_path)).get("admin")
+
+        assert first.calls == ["admin"]
+        assert second.calls == []
+
+    def test_expired_cookie_triggers_login(self, tmp_path):
+        """测试 cookie 已过期时重新登录"""
+        login = FakeLogin(expires=time.time() + 10)
+        cache = AuthStateCache(login, state_dir=str(tmp_path))
+
+        cache.get("admin")
+        cache.get("admin")
+
+        assert login.calls == ["admin", "admin"]
+
+    def test_ttl_and_invalidate(self, tmp_path):
+        """测试状态文件超过有效期或被删除后重新登录"""
+        login = FakeLogin()
+        cache = AuthStateCache(login, state_dir=str(tmp_path), ttl=60)
+
+        path = cache.get("admin")
+        old = time.time() - 120
+        os.utime(path, (old, old))
+        cache.get("admin")
+        cache.invalidate("admin")
+        cache.get("admin")
+
+        assert login.calls == ["admin"] * 3
+
+    def test_concurrent_login_once(self, tmp_path):
+        """测试多个 worker 同时获取同一角色时只有一个执行登录"""
+        login = FakeLogin(delay=0.3)
+        paths = []
+
+        def worker():
+            paths.append(AuthStateCache(login, state_dir=str(tmp_path)).get("admin"))
+
+        threads = [threading.Thread(target=worker) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert login.calls == ["admin"]
+        assert len(set(paths)) == 1
+        assert not list(tmp_path.glob("*.lock"))
+
+    def test_stale_lock_removed(self, tmp_path, monkeypatch):
+        """测试异常退出留下的锁文件超时后被清除"""
+        from config.settings import Settings
+
+        monkeypatch.setattr(Settings, "AUTH_STATE_LOCK_TIMEOUT", 1)
+        cache = AuthStateCache(FakeLogin(), state_dir=str(tmp_path))
+        lock_path = cache.state_path("admin").with_suffix(".lock")
+        lock_path.write_text("12345")
+        old = time.time() - 10
+        os.utime(lock_path, (old, old))
+
+        assert os.path.exists(cache.get("admin"))
@@ -0,0 +1,223 @@
+"""
+浏览器上下文池测试
+
+使用替身对象验证预热、重用、重置（包括测试注册的监听器和 init script）、失败后不重用以及补充新的上下文
+"""
+
+import pytest
+
+from base.ui.context_pool import ContextPool
+from config.settings import Settings
+
+
+class FakePage:
+    """记录调用的页面替身"""
+
+    def __init__(self, context):
+        self.context = context
+        self.url = "about:blank"
+        self.viewport_size = {"width": Settings.VIEWPORT_WIDTH, "height": Settings.VIEWPORT_HEIGHT}
+        self.closed = False
+        self.evaluated = []
+
+    def is_closed(self):
+        return self.closed
+
+    def close(self):
+        self.closed = True
+        self.context.pages.remove(self)
+
+    def evaluate(self, script):
+        self.evaluated.append(self.url)
+        self.context.local_storage.pop(self.url, None)
+
+    def goto(self, url):
+        self.url = url
+
+    def unroute_all(self, behavior=None):
+        pass
+
+    def set_default_timeout(self, timeout):
+        pass
+
+    def set_default_navigation_timeout(self, timeout):
+        pass
+
+    def set_viewport_size(self, viewport):
+        self.viewport_size = viewport
+
+
+class FakeContext:
+    """记录状态的浏览器上下文替身"""
+
+    def __init__(self):
+        self.pages = []
+        self.cookies = []
+        self.local_storage = {}
+        self.listeners = []
+        self.init_scripts = []
+        self.closed = False
+
+    def new_page(self):
+        page = FakePage(self)
+        self.pages.append(page)
+        return page
+
+    def close(self):
+        self.closed = True
+
+    def on(self, event, handler):
+        self.listeners.append((event, handler))
+
+    def once(self, event, handler):
+        self.listeners.append((event, handler))
+
+    def remove_listener(self, event, handler):
+        self.listeners.remove((event, handler))
+
+    def add_init_script(self, script=None, path=None):
+        self.init_scripts.append(script)
+
+    def expose_binding(self, name, callback):
+        pass
+
+    def expose_function(self, name, callback):
+        pass
+
+    def storage_state(self):
+        return {
+            "cookies": self.cookies,
+            "origins": [{"origin": origin} for origin in self.local_storage],
+        }
+
+    def clear_cookies(self):
+        self.cookies = []
+
+    def set_default_timeout(self, timeout):
+        pass
+
+    def set_default_navigation_timeout(self, timeout):
+        pass
+
+    def unroute_all(self, behavior=None):
+        pass
+
+    def clear_permissions(self):
+        pass
+
+    def set_extra_http_headers(self, headers):
+        pass
+
+    def set_offline(self, offline):
+        pass
+
+    def set_geolocation(self, geolocation):
+        pass
+
+
+class FakeBrowser:
+    """记录创建的上下文的浏览器替身"""
+
+    def __init__(self):
+        self.contexts = []
+
+    def new_context(self, **options):
+        context = FakeContext()
+        self.contexts.append(context)
+        return context
+
+
+@pytest.fixture
+def pool():
+    context_pool = ContextPool(FakeBrowser(), size=2)
+    context_pool.warm_up()
+    yield context_pool
+    context_pool.close()
+
+
+class TestContextPool:
+    """浏览器上下文池测试"""
+
+    def test_warm_up(self, pool):
+        """测试预热后池中有就绪的上下文和页面"""
+        assert pool.get_stats()["idle"] == 2
+        assert all(len(context.pages) == 1 for context in pool.browser.contexts)
+
+    def test_reuse_after_reset(self, pool):
+        """测试归还的上下文被重置后重用，测试使用的页面全部关闭，下一个测试使用新的页面"""
+        entry = pool.acquire()
+        page = pool.page_for(entry.context)
+        page.goto("https://example.com/login")
+        entry.context.cookies.append({"name": "session"})
+        entry.context.local_storage["https://example.com/login"] = {"token": "x"}
+        other_page = entry.context.new_page()
+        pool.release(entry)
+
+        assert entry.context.cookies == []
+        assert page.closed and other_page.closed
+        assert page.evaluated == ["https://example.com/login"]
+        assert len(entry.context.pages) == 1 and entry.page is entry.context.pages[0]
+        assert entry.page.url == "about:blank"
+
+        for _ in range(3):
+            pool.release(pool.acquire())
+        assert pool.get_stats()["created"] == 2
+        assert pool.get_stats()["reused"] == 2
+
+    def test_listeners_and_init_scripts_not_leaked(self, pool):
+        """测试下一个测试看不到上一个测试注册的上下文监听器和 init script"""
+        for _ in range(pool.size):
+            pool.release(pool.acquire())
+        entry = pool.acquire()
+        entry.context.on("dialog", lambda dialog: dialog.accept())
+        entry.context.once("console", print)
+        pool.release(entry)
+
+        assert entry.context.listeners == []
+        assert not entry.context.closed
+        assert "on" not in vars(entry.context)
+
+        entry = pool.acquire()
+        entry.context.add_init_script("window.__injected = true")
+        pool.release(entry)
+
+        assert entry.context.closed
+        assert pool.get_stats()["discarded"] == 1
+        next_entries = [pool.acquire() for _ in range(pool.size)]
+        assert all(e.context.init_scripts == [] and e.context.listeners == [] for e in next_entries)
+
+    def test_failed_test_not_reused(self, pool):
+        """测试失败的测试使用的上下文被关闭，并补充新的上下文"""
+        entry = pool.acquire()
+        pool.release(entry, reusable=False)
+
+        assert entry.context.closed
+        stats = pool.get_stats()
+        assert stats["discarded"] == 1
+        assert stats["created"] == 3
+        assert stats["idle"] == 2
+
+    def test_leftover_state_discarded(self, pool):
+        """测试重置后仍有其他源的存储时不重用"""
+        entry = pool.acquire()
+        entry.context.local_storage["https://other.example.com"] = {"key": "value"}
+        pool.release(entry)
+
+        assert entry.context.closed
+        assert pool.get_stats()["discarded"] == 1
+
+    def test_max_uses(self, pool, monkeypatch):
+        """测试达到最大重用次数后关闭上下文"""
+        monkeypatch.setattr(Settings, "BROWSER_POOL_MAX_USES", 1)
+        entry = pool.acquire()
+        pool.release(entry)
+
+        assert entry.context.closed
+
+    def test_close(self, pool):
+        """测试关闭池时关闭所有上下文（包括未归还的）"""
+        entry = pool.acquire()
+        pool.close()
+
+        assert all(context.closed for context in pool.browser.contexts)
+        assert entry.context.closed
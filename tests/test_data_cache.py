@@ -4,7 +4,9 @@
 验证 DataCache 的基本功能和线程安全性
 """
 
+import multiprocessing
 import threading
+import time
 import pytest
 from core.cache.data_cache import DataCache, get_cache
 
@@ -210,5 +212,124 @@ class TestDataCache:
         assert cache.size() == 1
 
 
+class TestDataCacheSnapshot:
+    """DataCache 过期时间与快照持久化测试"""
+    
+    def setup_method(self):
+        """每个测试前清理缓存"""
+        DataCache.get_instance().clear()
+    
+    def test_ttl_expiry(self):
+        """测试设置 ttl 的键过期后视为不存在"""
+        cache = DataCache.get_instance()
+        
+        cache.set("short", "value", ttl=0.05)
+        cache.set("forever", "value")
+        assert cache.get("short") == "value"
+        
+        time.sleep(0.1)
+        
+        assert cache.get("short") is None
+        assert not cache.has("short")
+        assert cache.get_all_keys() == ["forever"]
+        assert cache.size() == 1
+    
+    def test_snapshot_round_trip_by_namespace(self, tmp_path):
+        """测试按命名空间保存快照并预热加载"""
+        cache = DataCache.get_instance()
+        snapshot_file = tmp_path / "cache.json.gz"
+        
+        cache.set("auth.token", "abc")
+        cache.set("auth.user", {"id": 1, "roles": ["admin"]})
+        cache.set("reference.countries", ["CN", "US"])
+        cache.set("temp", "not persisted")
+        
+        saved = cache.save_snapshot(str(snapshot_file), namespaces=["auth", "reference"])
+        assert saved == 3
+        
+        cache.clear()
+        loaded = cache.load_snapshot(str(snapshot_file), namespaces=[])
+        
+        assert loaded == 3
+        assert cache.get("auth.token") == "abc"
+        assert cache.get("auth.user") == {"id": 1, "roles": ["admin"]}
+        assert cache.get("reference.countries") == ["CN", "US"]
+        assert not cache.has("temp")
+    
+    def test_snapshot_skips_expired_and_unserializable(self, tmp_path):
+        """测试快照丢弃过期条目和无法序列化的值"""
+        cache = DataCache.get_instance()
+        snapshot_file = tmp_path / "cache.json.gz"
+        
+        cache.set("auth.token", "abc", ttl=0.05)
+        cache.set("auth.session", object())
+        cache.set("auth.user", "tester")
+        
+        assert cache.save_snapshot(str(snapshot_file), namespaces=["auth"]) == 2
+        time.sleep(0.1)
+        
+        cache.clear()
+        assert cache.load_snapshot(str(snapshot_file), namespaces=["auth"]) == 1
+        assert cache.get("auth.user") == "tester"
+        assert not cache.has("auth.token")
+    
+    def test_snapshot_merges_and_keeps_existing_keys(self, tmp_path):
+        """测试快照合并旧条目，且加载时默认不覆盖已有的键"""
+        cache = DataCache.get_instance()
+        snapshot_file = tmp_path / "cache.json.gz"
+        
+        cache.set("auth.admin", "admin-token")
+        cache.save_snapshot(str(snapshot_file), namespaces=["auth"])
+        
+        cache.clear()
+        cache.set("auth.guest", "guest-token")
+        cache.save_snapshot(str(snapshot_file), namespaces=["auth"])
+        
+        cache.clear()
+        cache.set("auth.admin", "fresh-token")
+        assert cache.load_snapshot(str(snapshot_file), namespaces=["auth"]) == 1
+        assert cache.get("auth.admin") == "fresh-token"
+        assert cache.get("auth.guest") == "guest-token"
+    
+    def test_concurrent_workers_keep_all_entries(self, tmp_path):
+        """测试多个进程同时保存快照时不会丢失彼此的条目"""
+        snapshot_file = tmp_path / "cache.json.gz"
+        context = multiprocessing.get_context("fork")
+        start = context.Barrier(6)
+        workers = [
+            context.Process(target=_save_worker_snapshot, args=(str(snapshot_file), i, start))
+            for i in range(6)
+        ]
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join(30)
+        
+        assert [worker.exitcode for worker in workers] == [0] * 6
+        cache = DataCache.get_instance()
+        assert cache.load_snapshot(str(snapshot_file), namespaces=["auth"]) == 6
+        assert not (tmp_path / "cache.json.gz.lock").exists()
+    
+    def test_load_missing_or_corrupt_snapshot(self, tmp_path):
+        """测试快照文件不存在或损坏时不加载任何数据"""
+        cache = DataCache.get_instance()
+        
+        assert cache.load_snapshot(str(tmp_path / "missing.json.gz")) == 0
+        
+        corrupt_file = tmp_path / "corrupt.json.gz"
+        corrupt_file.write_bytes(b"not a gzip file")
+        assert cache.load_snapshot(str(corrupt_file)) == 0
+        assert cache.size() == 0
+
+
+def _save_worker_snapshot(snapshot_file, index, start):
+    """模拟 xdist worker：同时保存各自的条目"""
+    cache = DataCache.get_instance()
+    cache.clear()
+    cache.set(f"auth.worker{index}", index)
+    start.wait(10)
+    cache.save_snapshot(snapshot_file, namespaces=["auth"])
+
+
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])
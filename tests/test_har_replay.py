@@ -0,0 +1,76 @@
+"""
+HAR 录制与回放测试
+
+验证 HAR 文件命名、auto 模式的解析以及录制/回放时传给 route_from_har 的参数
+"""
+
+from pathlib import Path
+
+import pytest
+
+from base.ui.har_replay import apply_har, har_path_for, resolve_har_mode
+from config.settings import Settings
+
+
+class FakeContext:
+    """记录 route_from_har 调用的浏览器上下文替身"""
+
+    def __init__(self):
+        self.calls = []
+
+    def route_from_har(self, har, **kwargs):
+        self.calls.append((Path(har), kwargs))
+
+
+@pytest.fixture
+def har_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(Settings, "HAR_DIR", str(tmp_path))
+    return tmp_path
+
+
+class TestHarReplay:
+    """HAR 录制与回放测试"""
+
+    def test_har_path_per_test_and_per_page(self, har_dir):
+        """测试 HAR 文件按测试命名，指定名称时多个测试共享"""
+        nodeid = "tests/ui/test_login_page.py::TestLoginPage::test_login[admin]"
+
+        assert har_path_for(nodeid) == har_dir / "tests/ui/test_login_page" / "TestLoginPage_test_login_admin_.har"
+        assert har_path_for(nodeid, "login_page") == har_dir / "tests/ui/test_login_page" / "login_page.har"
+
+    def test_auto_mode(self, har_dir):
+        """测试 auto 模式在 HAR 文件存在时回放，否则录制"""
+        har_path = har_dir / "page.har"
+
+        assert resolve_har_mode(har_path, "auto") == "record"
+        har_path.write_text("{}")
+        assert resolve_har_mode(har_path, "auto") == "replay"
+        assert resolve_har_mode(har_path, "off") == "off"
+
+    def test_record(self, har_dir):
+        """测试录制模式创建目录并以 minimal 模式录制"""
+        context = FakeContext()
+        har_path = har_dir / "module" / "page.har"
+
+        apply_har(context, har_path, "record", "full")
+
+        assert har_path.parent.is_dir()
+        assert context.calls == [(har_path, {
+            "url": None, "update": True, "update_content": "embed", "update_mode": "minimal"
+        })]
+
+    def test_replay_api_scope(self, har_dir, monkeypatch):
+        """测试 api 范围只回放接口请求，未录制的请求按 HAR_NOT_FOUND 处理"""
+        monkeypatch.setattr(Settings, "HAR_NOT_FOUND", "fallback")
+        context = FakeContext()
+        har_path = har_dir / "page.har"
+        har_path.write_text("{}")
+
+        apply_har(context, har_path, "replay", "api")
+
+        assert context.calls == [(har_path, {"url": Settings.HAR_API_URL_PATTERN, "not_found": "fallback"})]
+
+    def test_replay_missing_har(self, har_dir):
+        """测试回放模式下 HAR 文件不存在时报错"""
+        with pytest.raises(FileNotFoundError, match="HAR_MODE=record"):
+            apply_har(FakeContext(), har_dir / "missing.har", "replay")
@@ -0,0 +1,85 @@
+"""
+测试日志捕获测试
+
+验证 TestLogger 按测试捕获内存日志的范围、跨线程捕获和大小上限
+"""
+
+import threading
+import pytest
+
+from config.settings import Settings
+from core.log.capture_handler import RingBufferHandler
+from core.log.logger import TestLogger
+
+
+class TestLogCapture:
+    """按测试捕获日志测试"""
+
+    def test_capture_only_records_during_capture(self):
+        """测试只捕获 start_capture 与 stop_capture 之间的日志"""
+        logger = TestLogger.get_logger("capture_scope")
+        logger.info("before capture")
+
+        capture = TestLogger.start_capture("INFO")
+        logger.info("inside capture")
+        content = TestLogger.stop_capture(capture)
+
+        logger.info("after capture")
+
+        assert "inside capture" in content
+        assert "before capture" not in content
+        assert "after capture" not in content
+
+    def test_capture_includes_worker_threads(self):
+        """测试捕获测试线程启动的其他线程产生的日志"""
+        capture = TestLogger.start_capture("INFO")
+
+        def worker(thread_id):
+            TestLogger.get_logger(f"capture_worker_{thread_id}").info(f"worker {thread_id} done")
+
+        threads = [threading.Thread(target=worker, args=(i,)) for i in range(5)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        content = TestLogger.stop_capture(capture)
+        for i in range(5):
+            assert f"worker {i} done" in content
+
+    def test_capture_survives_logger_reconfiguration(self):
+        """测试测试过程中重新配置日志系统不会中断捕获"""
+        capture = TestLogger.start_capture("INFO")
+        TestLogger.setup_logger()
+        TestLogger.get_logger("capture_reconfigure").info("after setup_logger")
+        content = TestLogger.stop_capture(capture)
+
+        assert "after setup_logger" in content
+
+    @pytest.mark.parametrize("max_records, max_bytes", [(10, 0), (0, 200)])
+    def test_ring_buffer_limits(self, max_records, max_bytes):
+        """测试超过条数或字节数上限时丢弃最早的日志"""
+        handler = RingBufferHandler(max_records=max_records, max_bytes=max_bytes)
+        logger = TestLogger.get_logger("capture_limits")
+        logger.addHandler(handler)
+        try:
+            for i in range(100):
+                logger.warning(f"record {i:03d}")
+        finally:
+            logger.removeHandler(handler)
+
+        content = handler.getvalue()
+        assert handler.discarded_count > 0
+        assert "record 099" in content
+        assert "record 000" not in content
+        assert content.startswith(f"... {handler.discarded_count} earlier log record(s) discarded")
+        if max_bytes:
+            assert sum(len(line) + 1 for line in content.splitlines()[1:]) <= max_bytes
+
+    def test_default_limits_from_settings(self):
+        """测试捕获处理器使用配置文件中的上限"""
+        capture = TestLogger.start_capture()
+        TestLogger.stop_capture(capture)
+
+        assert capture.max_records == Settings.LOG_CAPTURE_MAX_RECORDS
+        assert capture.max_bytes == Settings.LOG_CAPTURE_MAX_BYTES
@@ -0,0 +1,175 @@
+"""
+日志合并测试
+
+验证按 worker 分文件输出日志以及会话结束后的流式合并
+"""
+
+import gzip
+import json
+from pathlib import Path
+
+from config.settings import Settings
+from core.log.log_merge import merge_log_files, rotated_segments
+from core.log.logger import TestLogger
+
+
+class TestLogMerge:
+    """日志文件合并测试"""
+
+    def test_merge_orders_by_timestamp(self, tmp_path):
+        """测试合并结果按时间排序，多行日志随首行移动"""
+        gw0 = tmp_path / "gw0.log"
+        gw1 = tmp_path / "gw1.log"
+        gw0.write_text(
+            "2024-01-01 10:00:01 - A - INFO - gw0 first\n"
+            "2024-01-01 10:00:03 - A - ERROR - gw0 failed\n"
+            "Traceback (most recent call last):\n"
+            "ValueError: boom\n"
+            "2024-01-01 10:00:05 - A - INFO - gw0 last\n",
+            encoding="utf-8"
+        )
+        gw1.write_text(
+            "2024-01-01 10:00:02 - B - INFO - gw1 first\n"
+            "2024-01-01 10:00:04 - B - INFO - gw1 last",
+            encoding="utf-8"
+        )
+
+        output = tmp_path / "merged.log"
+        count = merge_log_files([str(gw0), str(gw1), str(tmp_path / "missing.log")], str(output))
+
+        assert count == 5
+        assert output.read_text(encoding="utf-8").splitlines() == [
+            "2024-01-01 10:00:01 - A - INFO - gw0 first",
+            "2024-01-01 10:00:02 - B - INFO - gw1 first",
+            "2024-01-01 10:00:03 - A - ERROR - gw0 failed",
+            "Traceback (most recent call last):",
+            "ValueError: boom",
+            "2024-01-01 10:00:04 - B - INFO - gw1 last",
+            "2024-01-01 10:00:05 - A - INFO - gw0 last",
+        ]
+
+    def test_merge_json_lines(self, tmp_path):
+        """测试按 ts 字段合并 JSON Lines 日志"""
+        files = []
+        for worker, seconds in (("gw0", (1, 4)), ("gw1", (2, 3))):
+            path = tmp_path / f"{worker}.jsonl"
+            path.write_text(
+                "".join(json.dumps({"ts": f"2024-01-01T10:00:0{s}.000", "worker": worker}) + "\n"
+                        for s in seconds),
+                encoding="utf-8"
+            )
+            files.append(str(path))
+
+        output = tmp_path / "merged.jsonl"
+        merge_log_files(files, str(output))
+
+        entries = [json.loads(line) for line in output.read_text(encoding="utf-8").splitlines()]
+        assert [entry["worker"] for entry in entries] == ["gw0", "gw1", "gw1", "gw0"]
+
+    def test_equal_timestamps_keep_input_order(self, tmp_path):
+        """测试时间戳相同的记录保持输入文件的顺序"""
+        first = tmp_path / "first.log"
+        second = tmp_path / "second.log"
+        first.write_text("2024-01-01 10:00:00 - A - INFO - a1\n2024-01-01 10:00:00 - A - INFO - a2\n",
+                         encoding="utf-8")
+        second.write_text("2024-01-01 10:00:00 - B - INFO - b1\n", encoding="utf-8")
+
+        output = tmp_path / "merged.log"
+        merge_log_files([str(first), str(second)], str(output))
+
+        assert [line[-2:] for line in output.read_text(encoding="utf-8").splitlines()] == ["a1", "a2", "b1"]
+
+    def test_rotated_segments_merged_in_order(self, tmp_path):
+        """测试轮转出的日志段（包括 gzip 压缩的）按从旧到新的顺序排在当前文件之前合并"""
+        gw0 = tmp_path / "gw0.log"
+        with gzip.open(tmp_path / "gw0.log.2.gz", "wt", encoding="utf-8") as f:
+            f.write("2024-01-01 10:00:01 - A - INFO - gw0 oldest\n")
+        with gzip.open(tmp_path / "gw0.log.1.gz", "wt", encoding="utf-8") as f:
+            f.write("2024-01-01 10:00:03 - A - INFO - gw0 older\n")
+        # 压缩尚未完成的日志段同时存在未压缩的文件和临时文件
+        (tmp_path / "gw0.log.1").write_text("2024-01-01 10:00:03 - A - INFO - gw0 older\n", encoding="utf-8")
+        (tmp_path / "gw0.log.3.gz.tmp").write_bytes(b"partial")
+        gw0.write_text("2024-01-01 10:00:05 - A - INFO - gw0 current\n", encoding="utf-8")
+        gw1 = tmp_path / "gw1.log"
+        gw1.write_text("2024-01-01 10:00:02 - B - INFO - gw1\n2024-01-01 10:00:04 - B - INFO - gw1\n",
+                       encoding="utf-8")
+
+        assert [Path(path).name for path in rotated_segments(str(gw0))] == ["gw0.log.2.gz", "gw0.log.1.gz"]
+        assert rotated_segments(str(gw1)) == []
+
+        output = tmp_path / "merged.log"
+        assert merge_log_files([str(gw0), str(gw1)], str(output)) == 5
+        assert [line.rsplit(" - ", 1)[1] for line in output.read_text(encoding="utf-8").splitlines()] == [
+            "gw0 oldest", "gw1", "gw0 older", "gw1", "gw0 current"
+        ]
+
+    def test_timed_segments_ordered_by_time(self, tmp_path):
+        """测试按时间轮转的日志段按时间顺序排列"""
+        for suffix in ("2024-01-01_11", "2024-01-01_09", "2024-01-01_10"):
+            (tmp_path / f"gw0.log.{suffix}.gz").write_bytes(b"")
+
+        assert [Path(path).name for path in rotated_segments(str(tmp_path / "gw0.log"))] == [
+            "gw0.log.2024-01-01_09.gz", "gw0.log.2024-01-01_10.gz", "gw0.log.2024-01-01_11.gz"
+        ]
+
+
+class TestWorkerLogFiles:
+    """按 worker 分文件输出日志测试"""
+
+    def test_worker_log_files_are_merged(self, tmp_path, monkeypatch):
+        """测试各 worker 写入各自的日志文件，并合并为会话日志"""
+        monkeypatch.setattr(Settings, "LOG_DIR", str(tmp_path))
+        monkeypatch.setattr(Settings, "LOG_TO_CONSOLE", False)
+        monkeypatch.setattr(Settings, "LOG_TO_FILE", True)
+        monkeypatch.setattr(Settings, "LOG_ASYNC", False)
+        monkeypatch.setattr(Settings, "LOG_JSON", False)
+
+        original_session_time = TestLogger.get_session_start_time()
+        try:
+            TestLogger.reset()
+            for worker_id in ("gw0", "gw1", "master"):
+                TestLogger.use_worker_log(worker_id, "20240101_120000")
+                TestLogger.get_logger("WorkerLog").info(f"message from {worker_id}")
+
+            assert Path(TestLogger.get_log_file_path()).name == "test_20240101_120000_master.log"
+            merged = TestLogger.merge_worker_logs()
+        finally:
+            TestLogger.reset()
+            monkeypatch.undo()
+            TestLogger.use_worker_log(None, original_session_time)
+
+        assert Path(merged).name == "test_20240101_120000.log"
+        content = Path(merged).read_text(encoding="utf-8")
+        for worker_id in ("gw0", "gw1", "master"):
+            assert (tmp_path / f"test_20240101_120000_{worker_id}.log").exists()
+            assert f"message from {worker_id}" in content
+
+    def test_rotated_worker_logs_are_merged(self, tmp_path, monkeypatch):
+        """测试合并会话日志时包含 worker 轮转并压缩的日志段"""
+        monkeypatch.setattr(Settings, "LOG_DIR", str(tmp_path))
+        monkeypatch.setattr(Settings, "LOG_TO_CONSOLE", False)
+        monkeypatch.setattr(Settings, "LOG_TO_FILE", True)
+        monkeypatch.setattr(Settings, "LOG_ASYNC", False)
+        monkeypatch.setattr(Settings, "LOG_JSON", False)
+        monkeypatch.setattr(Settings, "LOG_ROTATE_MAX_BYTES", 400)
+        monkeypatch.setattr(Settings, "LOG_ROTATE_COMPRESSION", "gzip")
+
+        original_session_time = TestLogger.get_session_start_time()
+        try:
+            TestLogger.reset()
+            TestLogger.use_worker_log("gw0", "20240101_120000")
+            for i in range(20):
+                TestLogger.get_logger("WorkerLog").info(f"gw0 message {i:02d}")
+            TestLogger.use_worker_log("gw1", "20240101_120000")
+            TestLogger.get_logger("WorkerLog").info("gw1 message")
+            merged = TestLogger.merge_worker_logs()
+        finally:
+            TestLogger.reset()
+            monkeypatch.undo()
+            TestLogger.use_worker_log(None, original_session_time)
+
+        assert list(tmp_path.glob("test_20240101_120000_gw0.log.*.gz"))
+        content = Path(merged).read_text(encoding="utf-8")
+        gw0_messages = [line.rsplit(" - ", 1)[1] for line in content.splitlines() if "gw0 message" in line]
+        assert gw0_messages == [f"gw0 message {i:02d}" for i in range(20)]
+        assert "gw1 message" in content
@@ -0,0 +1,106 @@
+"""
+日志轮转测试
+
+验证按大小轮转、日志段后台压缩以及会话日志按末尾/过滤读取
+"""
+
+import gzip
+import logging
+
+import pytest
+
+from core.log.logger import TestLogger
+from core.log.rotation import CompressingRotatingFileHandler
+
+
+def _write_records(handler: logging.Handler, count: int) -> None:
+    logger = logging.getLogger("rotation_test")
+    logger.propagate = False
+    logger.setLevel(logging.INFO)
+    logger.addHandler(handler)
+    try:
+        for i in range(count):
+            logger.info(f"record {i:04d} " + "x" * 80)
+    finally:
+        logger.removeHandler(handler)
+        handler.close()
+
+
+class TestLogRotation:
+    """日志轮转测试"""
+
+    def test_rotated_segments_are_compressed(self, tmp_path):
+        """测试按大小轮转并压缩日志段，且不丢失日志"""
+        log_file = tmp_path / "session.log"
+        handler = CompressingRotatingFileHandler(str(log_file), max_bytes=4096, backup_count=100)
+        handler.setFormatter(logging.Formatter("%(message)s"))
+        _write_records(handler, 500)
+
+        segments = sorted(tmp_path.glob("session.log.*"))
+        assert segments
+        assert all(segment.suffix == ".gz" for segment in segments)
+
+        lines = log_file.read_text(encoding="utf-8").splitlines()
+        for segment in segments:
+            with gzip.open(segment, "rt", encoding="utf-8") as f:
+                lines.extend(f.read().splitlines())
+        assert sorted(lines) == [f"record {i:04d} " + "x" * 80 for i in range(500)]
+
+    def test_backup_count_limits_segments(self, tmp_path):
+        """测试只保留指定数量的日志段"""
+        log_file = tmp_path / "session.log"
+        handler = CompressingRotatingFileHandler(str(log_file), max_bytes=2048, backup_count=3)
+        _write_records(handler, 500)
+
+        assert len(list(tmp_path.glob("session.log.*"))) == 3
+
+    def test_no_compression(self, tmp_path):
+        """测试不压缩时日志段保持原始文本"""
+        log_file = tmp_path / "session.log"
+        handler = CompressingRotatingFileHandler(str(log_file), max_bytes=2048, backup_count=2,
+                                                 compression="none")
+        _write_records(handler, 100)
+
+        assert (tmp_path / "session.log.1").read_text(encoding="utf-8").startswith("record")
+
+
+class TestLogExcerpt:
+    """会话日志摘录测试"""
+
+    @pytest.fixture
+    def log_file(self, tmp_path):
+        path = tmp_path / "session.log"
+        path.write_text(
+            "".join(f"line {i:04d} {'ERROR' if i % 100 == 0 else 'INFO'}\n" for i in range(1000)),
+            encoding="utf-8"
+        )
+        return str(path)
+
+    def test_tail_lines(self, log_file):
+        """测试只读取最后 N 行"""
+        content = TestLogger._read_log_excerpt(log_file, tail_lines=3)
+
+        assert content.splitlines()[-3:] == ["line 0997 INFO", "line 0998 INFO", "line 0999 INFO"]
+        assert content.startswith("... ")
+        assert "line 0996" not in content
+
+    def test_pattern_filter(self, log_file):
+        """测试按正则过滤，并与 tail_lines 组合"""
+        content = TestLogger._read_log_excerpt(log_file, tail_lines=2, pattern="ERROR")
+
+        assert content.splitlines() == ["line 0800 ERROR", "line 0900 ERROR"]
+
+    def test_max_bytes(self, log_file):
+        """测试按字节上限只读取末尾的完整行"""
+        content = TestLogger._read_log_excerpt(log_file, max_bytes=100)
+        lines = content.splitlines()
+
+        assert lines[0].startswith("... ")
+        assert lines[-1] == "line 0999 INFO"
+        assert all(line.startswith("line ") for line in lines[1:])
+
+    def test_whole_file_without_limits(self, log_file):
+        """测试未设置限制时读取整个文件"""
+        content = TestLogger._read_log_excerpt(log_file)
+
+        assert len(content.splitlines()) == 1000
@@ -0,0 +1,114 @@
+"""
+日志采样与去重测试
+
+验证按记录器采样、按请求整体采样以及重复警告去重
+"""
+
+import logging
+import time
+
+import pytest
+
+from core.log.log_context import LogContextFilter, request_context
+from core.log.sampling import DuplicateFilter, SamplingFilter, parse_sampling_rules
+
+
+def _record(name: str, msg: str, level: int = logging.INFO) -> logging.LogRecord:
+    return logging.LogRecord(name, level, __file__, 1, msg, None, None)
+
+
+class TestSamplingFilter:
+    """日志采样过滤器测试"""
+
+    def test_parse_rules(self):
+        """测试解析采样规则"""
+        assert parse_sampling_rules(" *Service=10, LoginPage=2 ,") == [("*Service", 10), ("LoginPage", 2)]
+
+    @pytest.mark.parametrize("rules", ["*Service", "*Service=0", "=5", "*Service=ten"])
+    def test_parse_invalid_rules(self, rules):
+        """测试无效的采样规则"""
+        with pytest.raises(ValueError):
+            parse_sampling_rules(rules)
+
+    def test_sample_one_in_n(self):
+        """测试匹配规则的记录器每 N 条保留 1 条，未匹配的全部保留"""
+        sampling_filter = SamplingFilter(parse_sampling_rules("*Service=10"))
+
+        kept = sum(sampling_filter.filter(_record("UserService", f"request {i}")) for i in range(100))
+        other = sum(sampling_filter.filter(_record("LoginPage", f"click {i}")) for i in range(100))
+
+        assert kept == 10
+        assert other == 100
+        assert sampling_filter.sampled_out == 90
+
+    def test_warnings_and_errors_always_kept(self):
+        """测试 WARNING 及以上级别的日志始终保留"""
+        sampling_filter = SamplingFilter([("*", 1000)])
+
+        for level in (logging.WARNING, logging.ERROR, logging.CRITICAL):
+            assert all(sampling_filter.filter(_record("UserService", "failed", level)) for _ in range(20))
+
+    def test_request_sampled_as_a_whole(self):
+        """测试同一请求的日志整体保留或丢弃"""
+        sampling_filter = SamplingFilter([("*Service", 4)])
+        context_filter = LogContextFilter()
+
+        kept_requests = 0
+        for _ in range(200):
+            with request_context("GET /users"):
+                decisions = set()
+                for msg in ("request", "response", "done"):
+                    record = _record("UserService", msg)
+                    context_filter.filter(record)
+                    decisions.add(sampling_filter.filter(record))
+            assert len(decisions) == 1
+            kept_requests += decisions.pop()
+
+        assert 0 < kept_requests < 200
+
+    def test_decision_shared_across_handlers(self):
+        """测试同一条记录经过多个处理器时只判定一次"""
+        sampling_filter = SamplingFilter([("*", 2)])
+        record = _record("UserService", "request")
+
+        first = sampling_filter.filter(record)
+        assert all(sampling_filter.filter(record) == first for _ in range(5))
+
+
+class TestDuplicateFilter:
+    """重复警告去重过滤器测试"""
+
+    def test_suppress_within_window(self):
+        """测试窗口内重复的警告只输出一次"""
+        duplicate_filter = DuplicateFilter(window=60)
+
+        results = [duplicate_filter.filter(_record("API", "slow response", logging.WARNING)) for _ in range(5)]
+        other = duplicate_filter.filter(_record("API", "retrying", logging.WARNING))
+        info = [duplicate_filter.filter(_record("API", "slow response")) for _ in range(3)]
+
+        assert results == [True, False, False, False, False]
+        assert other is True
+        assert info == [True, True, True]
+        assert duplicate_filter.pop_suppressed() == [("API", "slow response", 4)]
+        assert duplicate_filter.pop_suppressed() == []
+
+    def test_summary_after_window(self):
+        """测试窗口结束后再次出现时附带被抑制的次数"""
+        duplicate_filter = DuplicateFilter(window=0.05)
+
+        for _ in range(3):
+            duplicate_filter.filter(_record("API", "slow response", logging.WARNING))
+        time.sleep(0.06)
+        record = _record("API", "slow response", logging.WARNING)
+
+        assert duplicate_filter.filter(record) is True
+        assert record.getMessage() == "slow response (suppressed 2 times in the last 0.05s)"
+
+    def test_tracked_keys_bounded(self):
+        """测试跟踪的警告数量有上限"""
+        duplicate_filter = DuplicateFilter(window=60, max_keys=10)
+
+        for i in range(100):
+            duplicate_filter.filter(_record("API", f"warning {i}", logging.WARNING))
+
+        assert len(duplicate_filter._seen) == 10
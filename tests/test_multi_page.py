@@ -0,0 +1,89 @@
+"""
+多页面执行测试
+
+验证结果按顺序返回、失败页面不影响其他页面，以及 raise_on_failure 在所有页面结束后抛出
+"""
+
+import pytest
+
+from base.ui.multi_page import run_on_pages
+
+
+class FakeSyncPage:
+    """同步 API 页面替身"""
+
+    def __init__(self, title):
+        self.title = title
+        self.url = "about:blank"
+
+    def goto(self, url):
+        self.url = url
+
+
+class FakePageObject:
+    """带有 page 属性的页面对象"""
+
+    def __init__(self, page):
+        self.page = page
+
+
+class TestRunOnPages:
+    """多页面执行测试"""
+
+    def test_results_in_order(self):
+        """测试每个页面都执行操作，结果按页面顺序返回"""
+        pages = [FakeSyncPage(f"Page {i}") for i in range(10)]
+
+        def check(page):
+            page.goto(f"https://example.com/{page.title}")
+            return page.title
+
+        results = run_on_pages(pages, check)
+
+        assert [result.value for result in results] == [f"Page {i}" for i in range(10)]
+        assert all(result.ok for result in results)
+        assert [result.index for result in results] == list(range(10))
+
+    def test_failures_reported_per_page(self):
+        """测试失败的页面记录异常，其他页面正常完成"""
+        pages = [FakePageObject(FakeSyncPage(f"Page {i}")) for i in range(3)]
+
+        def check(page_object):
+            page_object.page.goto("https://example.com")
+            if page_object.page.title == "Page 1":
+                raise AssertionError("unexpected title")
+            return page_object.page.url
+
+        results = run_on_pages(pages, check)
+
+        assert [result.ok for result in results] == [True, False, True]
+        assert isinstance(results[1].error, AssertionError)
+        assert results[2].value == "https://example.com"
+        assert all(result.duration >= 0 for result in results)
+
+    def test_raise_on_failure(self):
+        """测试 raise_on_failure=True 时在所有页面结束后抛出第一个异常"""
+        pages = [FakeSyncPage(f"Page {i}") for i in range(3)]
+        finished = []
+
+        def check(page):
+            page.goto("https://example.com")
+            if page.title != "Page 2":
+                raise ValueError(page.title)
+            finished.append(page.title)
+
+        with pytest.raises(ValueError, match="Page 0"):
+            run_on_pages(pages, check, raise_on_failure=True)
+        assert finished == ["Page 2"]
+
+    def test_interrupt_not_captured(self):
+        """测试 KeyboardInterrupt 等非页面失败直接抛出"""
+        def interrupt(page):
+            raise KeyboardInterrupt
+
+        with pytest.raises(KeyboardInterrupt):
+            run_on_pages([FakeSyncPage("Page 0")], interrupt)
+
+    def test_empty_targets(self):
+        """测试没有页面时直接返回空列表"""
+        assert run_on_pages([], lambda page: None) == []
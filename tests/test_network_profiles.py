@@ -0,0 +1,104 @@
+"""
+网络资源拦截配置测试
+
+验证按资源类型和 URL 模式拦截、放行例外、自定义配置的加载顺序以及路由处理
+"""
+
+import json
+
+import pytest
+
+from base.ui.network_profiles import NetworkProfile, NetworkProfileRouter, get_network_profile
+from config.settings import Settings
+
+
+class FakeRequest:
+    def __init__(self, resource_type: str, url: str):
+        self.resource_type = resource_type
+        self.url = url
+
+
+class FakeRoute:
+    """记录处理结果的路由替身"""
+
+    def __init__(self, resource_type: str, url: str):
+        self.request = FakeRequest(resource_type, url)
+        self.result = None
+
+    def abort(self, error_code=None):
+        self.result = "abort"
+
+    def fallback(self):
+        self.result = "fallback"
+
+
+class TestNetworkProfile:
+    """网络配置测试"""
+
+    def test_lean_profile(self):
+        """测试 lean 配置拦截图片、字体和统计脚本，放行页面和接口"""
+        profile = get_network_profile("lean")
+
+        assert profile.should_block("image", "https://example.com/logo.png")
+        assert profile.should_block("font", "https://example.com/font.woff2")
+        assert profile.should_block("script", "https://www.googletagmanager.com/gtm.js")
+        assert not profile.should_block("document", "https://example.com/")
+        assert not profile.should_block("xhr", "https://example.com/api/users")
+        assert not profile.should_block("stylesheet", "https://example.com/app.css")
+
+    def test_allow_patterns_take_precedence(self):
+        """测试 allow_url_patterns 中的 URL 始终放行"""
+        profile = NetworkProfile.from_dict("custom", {
+            "block_resource_types": ["image"],
+            "block_url_patterns": ["*cdn.example.com*"],
+            "allow_url_patterns": ["*/captcha/*"],
+        })
+
+        assert profile.should_block("script", "https://cdn.example.com/app.js")
+        assert not profile.should_block("image", "https://example.com/captcha/1.png")
+
+    def test_custom_profiles_lookup_order(self, monkeypatch):
+        """测试 NETWORK_PROFILES 优先于环境配置文件，环境配置文件优先于内置配置"""
+        monkeypatch.setattr(Settings, "NETWORK_PROFILES", json.dumps({"lean": {"block_resource_types": ["media"]}}))
+        env_profiles = {
+            "lean": {"block_resource_types": ["font"]},
+            "no-font": {"block_resource_types": ["font"]},
+        }
+
+        assert get_network_profile("lean", env_profiles).block_resource_types == {"media"}
+        assert get_network_profile("no-font", env_profiles).block_resource_types == {"font"}
+        assert not get_network_profile("off", env_profiles).enabled
+
+    def test_unknown_profile(self):
+        """测试未知的配置名称"""
+        with pytest.raises(ValueError, match="Unknown network profile"):
+            get_network_profile("does-not-exist")
+
+
+class TestNetworkProfileRouter:
+    """网络配置路由测试"""
+
+    def test_handle_counts_requests(self):
+        """测试拦截的请求被中止，其他请求交给后续路由处理"""
+        router = NetworkProfileRouter(get_network_profile("lean"))
+        image = FakeRoute("image", "https://example.com/banner.jpg")
+        page = FakeRoute("document", "https://example.com/")
+
+        router.handle(image)
+        router.handle(page)
+
+        assert (image.result, page.result) == ("abort", "fallback")
+        assert (router.blocked, router.allowed) == (1, 1)
+
+    def test_off_profile_registers_no_route(self):
+        """测试 off 配置不注册路由"""
+        class FakeContext:
+            routes = []
+
+            def route(self, url, handler):
+                self.routes.append(url)
+
+        context = FakeContext()
+        NetworkProfileRouter(get_network_profile("off")).apply(context)
+
+        assert context.routes == []
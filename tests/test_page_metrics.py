@@ -0,0 +1,140 @@
+"""
+页面性能指标测试
+
+验证按 URL 聚合指标、分位数报告、与基线对比的退化检查、基线文件的读写，
+以及 BasePage.navigate 按配置采集指标
+"""
+
+import json
+
+import pytest
+
+from base.ui.page_metrics import PageMetrics, normalize_url, percentile
+from base.ui.pages.base_page import BasePage
+from config.settings import Settings
+
+
+class FakePage:
+    """导航后返回固定指标的页面替身"""
+
+    def __init__(self, metrics=None, error=None):
+        self.url = "about:blank"
+        self.metrics = metrics or {}
+        self.error = error
+        self.evaluated = 0
+
+    def set_default_timeout(self, timeout):
+        pass
+
+    def goto(self, url, wait_until, timeout):
+        self.url = url
+
+    def evaluate(self, script):
+        self.evaluated += 1
+        if self.error:
+            raise self.error
+        return self.metrics
+
+
+@pytest.fixture(autouse=True)
+def reset_page_metrics(monkeypatch):
+    monkeypatch.setattr(Settings, "PAGE_METRICS_ENABLED", False)
+    monkeypatch.setattr(Settings, "PAGE_METRICS_REGRESSION_TOLERANCE", 0.2)
+    PageMetrics.reset()
+    yield
+    PageMetrics.reset()
+
+
+class TestPageMetrics:
+    """指标统计测试"""
+
+    def test_percentile(self):
+        """测试最近秩法分位数"""
+        values = list(range(1, 101))
+
+        assert percentile(values, 50) == 50
+        assert percentile(values, 95) == 95
+        assert percentile([7], 75) == 7
+        assert percentile([], 50) is None
+
+    def test_aggregates_by_url_without_query(self):
+        """测试按不含查询参数的 URL 聚合，空指标不记录"""
+        PageMetrics.record("https://example.com/list?page=1", {"load": 100, "lcp": None})
+        PageMetrics.record("https://example.com/list?page=2#top", {"load": 300, "lcp": None})
+
+        summary = PageMetrics.get_summary()
+
+        assert list(summary) == [normalize_url("https://example.com/list")]
+        assert summary["https://example.com/list"] == {"load": {"count": 2, "p50": 100, "p75": 300, "p95": 300}}
+        assert "load" in PageMetrics.format_report()
+
+    def test_regression_check(self):
+        """测试 p75 超过基线容差时报告退化，基线中没有的指标不检查"""
+        for load in (100, 130, 140, 150):
+            PageMetrics.record("https://example.com/", {"load": load, "fcp": 50})
+        baseline = {"https://example.com/": {"load": {"p75": 100}, "fcp": {"p75": 45}}}
+
+        regressions = PageMetrics.check_regressions(baseline)
+
+        assert len(regressions) == 1 and "load" in regressions[0]
+        assert PageMetrics.check_regressions(baseline, tolerance=0.5) == []
+
+    def test_baseline_round_trip(self, tmp_path):
+        """测试保存基线时保留本次会话没有采集的 URL"""
+        path = tmp_path / "baseline.json"
+        path.write_text(json.dumps({"https://example.com/old": {"load": {"p75": 1}}}))
+        PageMetrics.record("https://example.com/new", {"load": 200})
+
+        PageMetrics.save_baseline(str(path))
+        baseline = PageMetrics.load_baseline(str(path))
+
+        assert set(baseline) == {"https://example.com/old", "https://example.com/new"}
+        assert PageMetrics.load_baseline(str(tmp_path / "missing.json")) == {}
+
+    def test_merge_worker_samples(self):
+        """测试控制进程合并各 worker 的原始样本后按全部样本计算分位数"""
+        worker_samples = []
+        for loads in ((100, 110), (300, 400)):
+            PageMetrics.reset()
+            for load in loads:
+                PageMetrics.record("https://example.com/", {"load": load})
+            worker_samples.append(json.loads(json.dumps(PageMetrics.export_samples())))
+
+        PageMetrics.reset()
+        for samples in worker_samples:
+            PageMetrics.merge_samples(samples)
+
+        stats = PageMetrics.get_summary()["https://example.com/"]["load"]
+        assert stats["count"] == 4 and stats["p75"] == 300
+
+
+class TestNavigateMetrics:
+    """BasePage.navigate 采集指标测试"""
+
+    def test_collect_when_enabled(self, monkeypatch):
+        """测试启用 PAGE_METRICS_ENABLED 时导航后采集指标"""
+        monkeypatch.setattr(Settings, "PAGE_METRICS_ENABLED", True)
+        page = FakePage({"ttfb": 20, "load": 250, "resources": 12})
+
+        BasePage(page).navigate("https://example.com/home?from=test")
+
+        assert PageMetrics.get_summary()["https://example.com/home"]["resources"]["p50"] == 12
+
+    def test_disabled_by_default(self):
+        """测试默认不采集，collect_metrics=True 时单次采集"""
+        page = FakePage({"load": 250})
+        base_page = BasePage(page)
+
+        base_page.navigate("https://example.com/")
+        assert page.evaluated == 0
+
+        base_page.navigate("https://example.com/", collect_metrics=True)
+        assert page.evaluated == 1
+
+    def test_collect_failure_does_not_fail_navigation(self):
+        """测试采集失败时只输出警告，导航仍然成功"""
+        page = FakePage(error=RuntimeError("Execution context was destroyed"))
+
+        BasePage(page).navigate("https://example.com/", collect_metrics=True)
+
+        assert PageMetrics.get_summary() == {}
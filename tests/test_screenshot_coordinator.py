@@ -0,0 +1,135 @@
+"""
+失败截图协调测试
+
+验证同一测试中同一页面状态的失败截图只截取一次（BasePage 和 fixture 共用），
+页面状态变化、不同页面、新的测试以及无法获取页面状态时重新截图
+"""
+
+import asyncio
+
+import pytest
+
+from base.ui.fixtures import _capture_failure_screenshot
+from base.ui.pages.base_page import BasePage
+from base.ui.screenshot_coordinator import ScreenshotCoordinator
+from config.settings import Settings
+
+
+class FakePage:
+    """页面状态可控的页面替身，记录截图次数"""
+
+    def __init__(self, state="https://example.com/|1|0"):
+        self.state = state
+        self.screenshots = 0
+
+    def set_default_timeout(self, timeout):
+        pass
+
+    def evaluate(self, script):
+        if self.state is None:
+            raise RuntimeError("Target page, context or browser has been closed")
+        return self.state
+
+    def screenshot(self, full_page=False, **options):
+        self.screenshots += 1
+        return b"\x89PNG\r\n\x1a\n" + bytes([self.screenshots])
+
+
+class FakeAsyncPage(FakePage):
+    """异步页面替身"""
+
+    async def evaluate(self, script):
+        return FakePage.evaluate(self, script)
+
+    async def screenshot(self, full_page=False, **options):
+        return FakePage.screenshot(self, full_page, **options)
+
+
+@pytest.fixture(autouse=True)
+def coordinator(monkeypatch, tmp_path):
+    monkeypatch.setattr(Settings, "SCREENSHOT_DIR", str(tmp_path))
+    monkeypatch.setattr(Settings, "SCREENSHOT_FORMAT", "png")
+    monkeypatch.setattr(Settings, "SCREENSHOT_ASYNC_WRITE", False)
+    ScreenshotCoordinator.end_test()
+    ScreenshotCoordinator.reset_stats()
+    yield
+    ScreenshotCoordinator.end_test()
+    ScreenshotCoordinator.reset_stats()
+
+
+class TestScreenshotCoordinator:
+    """失败截图协调测试"""
+
+    def test_same_state_captured_once(self):
+        """测试同一页面状态只截图一次，之后复用截图数据"""
+        page = FakePage()
+
+        first = ScreenshotCoordinator.capture(page)
+        second = ScreenshotCoordinator.capture(page)
+
+        assert page.screenshots == 1
+        assert not first.reused and second.reused
+        assert second.screenshot.data == first.screenshot.data
+        assert ScreenshotCoordinator.get_stats() == {"captured": 1, "reused": 1}
+
+    def test_state_change_captures_again(self):
+        """测试 DOM 或 URL 变化后重新截图"""
+        page = FakePage()
+
+        ScreenshotCoordinator.capture(page)
+        page.state = "https://example.com/|1|3"
+        ScreenshotCoordinator.capture(page)
+
+        assert page.screenshots == 2
+
+    def test_pages_and_tests_are_separate(self):
+        """测试不同页面各自截图，测试结束后缓存清空"""
+        page, other_page = FakePage(), FakePage()
+
+        ScreenshotCoordinator.capture(page)
+        ScreenshotCoordinator.capture(other_page)
+        ScreenshotCoordinator.end_test()
+        ScreenshotCoordinator.capture(page)
+
+        assert (page.screenshots, other_page.screenshots) == (2, 1)
+
+    def test_unknown_state_not_cached(self):
+        """测试无法获取页面状态时每次都截图"""
+        page = FakePage(state=None)
+
+        ScreenshotCoordinator.capture(page)
+        ScreenshotCoordinator.capture(page)
+
+        assert page.screenshots == 2
+
+    def test_async_capture(self):
+        """测试异步页面同样只截图一次"""
+        page = FakeAsyncPage()
+
+        async def capture_twice():
+            return [await ScreenshotCoordinator.capture_async(page) for _ in range(2)]
+
+        results = asyncio.run(capture_twice())
+
+        assert page.screenshots == 1 and [result.reused for result in results] == [False, True]
+
+
+class TestFailureScreenshotConsumers:
+    """BasePage 和 fixture 共用失败截图测试"""
+
+    def test_base_page_and_fixtures_share_capture(self, tmp_path, monkeypatch):
+        """测试 BasePage 操作失败后，fixture 清理阶段的失败截图复用同一截图，不重复附加"""
+        attached = []
+        monkeypatch.setattr(
+            "core.allure.allure_helper.AllureHelper.attach_screenshot",
+            lambda data, name="Screenshot", background=None: attached.append(name)
+        )
+        page = FakePage()
+
+        BasePage(page)._capture_failure_screenshot("click_error")
+        _capture_failure_screenshot(page, "test_login", "test_failure")
+        _capture_failure_screenshot(page, "test_login", "failure")
+
+        assert page.screenshots == 1
+        assert attached == ["click_error"]
+        assert (tmp_path / "click_error.png").exists()
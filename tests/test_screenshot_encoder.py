@@ -0,0 +1,107 @@
+"""
+截图编码测试
+
+验证不需要后处理时直接使用 Playwright 原生编码、未安装 Pillow 时的回退，
+以及使用 Pillow 时的格式转换、缩放和灰度处理
+"""
+
+import io
+
+import pytest
+
+import base.ui.screenshot_encoder as screenshot_encoder
+from base.ui.screenshot_encoder import ScreenshotEncoder
+from config.settings import Settings
+
+
+class FakePage:
+    """记录 screenshot 调用参数的页面替身"""
+
+    def __init__(self, data: bytes = b"\x89PNG\r\n\x1a\n"):
+        self.data = data
+        self.calls = []
+
+    def screenshot(self, **kwargs):
+        self.calls.append(kwargs)
+        return self.data
+
+
+@pytest.fixture
+def screenshot_settings(monkeypatch):
+    def configure(image_format="png", quality=80, max_width=0, max_height=0, grayscale=False):
+        monkeypatch.setattr(Settings, "SCREENSHOT_FORMAT", image_format)
+        monkeypatch.setattr(Settings, "SCREENSHOT_QUALITY", quality)
+        monkeypatch.setattr(Settings, "SCREENSHOT_MAX_WIDTH", max_width)
+        monkeypatch.setattr(Settings, "SCREENSHOT_MAX_HEIGHT", max_height)
+        monkeypatch.setattr(Settings, "SCREENSHOT_GRAYSCALE", grayscale)
+    return configure
+
+
+class TestNativeEncoding:
+    """Playwright 原生编码测试"""
+
+    def test_png_fast_path(self, screenshot_settings):
+        """测试 png 不经过后处理"""
+        screenshot_settings("png")
+        page = FakePage()
+
+        screenshot = ScreenshotEncoder.capture(page, full_page=True)
+
+        assert page.calls == [{"full_page": True, "type": "png"}]
+        assert screenshot.format == "png" and screenshot.extension == "png"
+
+    def test_jpeg_quality_passed_to_playwright(self, screenshot_settings):
+        """测试 jpeg 由 Playwright 按配置的质量编码"""
+        screenshot_settings("jpeg", quality=60)
+        page = FakePage(b"\xff\xd8\xff\xe0")
+
+        screenshot = ScreenshotEncoder.capture(page)
+
+        assert page.calls == [{"full_page": False, "type": "jpeg", "quality": 60}]
+        assert screenshot.extension == "jpg"
+
+    def test_fallback_without_pillow(self, screenshot_settings, monkeypatch):
+        """测试未安装 Pillow 时 webp 回退到 jpeg，并忽略缩放和灰度"""
+        monkeypatch.setattr(screenshot_encoder, "Image", None)
+        screenshot_settings("webp", max_width=640, grayscale=True)
+        page = FakePage(b"\xff\xd8\xff\xe0")
+
+        screenshot = ScreenshotEncoder.capture(page)
+
+        assert page.calls[0]["type"] == "jpeg"
+        assert screenshot.format == "jpeg"
+
+
+class TestPillowEncoding:
+    """Pillow 后处理测试"""
+
+    @pytest.fixture
+    def png_screenshot(self):
+        image_module = pytest.importorskip("PIL.Image")
+        image = image_module.new("RGBA", (1920, 1080), (30, 120, 200, 255))
+        output = io.BytesIO()
+        image.save(output, "PNG")
+        return output.getvalue()
+
+    def test_webp_downscaled_off_thread(self, screenshot_settings, png_screenshot):
+        """测试 webp 编码和等比缩小在后台编码线程中完成"""
+        screenshot_settings("webp", max_width=960)
+        page = FakePage(png_screenshot)
+
+        screenshot = ScreenshotEncoder.capture(page)
+
+        assert page.calls == [{"full_page": False, "type": "png"}]
+        assert screenshot.data[:4] == b"RIFF" and screenshot.data[8:12] == b"WEBP"
+        assert (screenshot.width, screenshot.height) == (960, 540)
+        assert len(screenshot.data) < len(png_screenshot)
+
+    def test_grayscale_jpeg(self, screenshot_settings, png_screenshot):
+        """测试灰度 jpeg"""
+        from PIL import Image
+
+        screenshot_settings("jpeg", grayscale=True)
+
+        screenshot = ScreenshotEncoder.encode(png_screenshot)
+
+        assert screenshot.format == "jpeg"
+        assert Image.open(io.BytesIO(screenshot.data)).mode == "L"
@@ -0,0 +1,105 @@
+"""
+截图后台写入测试
+
+验证未启用时同步写入、启用后截图文件在后台线程中写入并在 flush 后全部落盘、
+队列满时截图阻塞等待，以及 BasePage.take_screenshot 通过后台写入器保存截图
+"""
+
+import threading
+from pathlib import Path
+
+import pytest
+
+from base.ui.pages.base_page import BasePage
+from base.ui.screenshot_writer import ScreenshotWriter
+from config.settings import Settings
+
+
+class FakePage:
+    """返回固定 PNG 数据的页面替身"""
+
+    def set_default_timeout(self, timeout):
+        pass
+
+    def screenshot(self, full_page=False, **options):
+        return b"\x89PNG\r\n\x1a\nfake"
+
+
+@pytest.fixture
+def async_write(monkeypatch):
+    monkeypatch.setattr(Settings, "SCREENSHOT_ASYNC_WRITE", True)
+    monkeypatch.setattr(Settings, "SCREENSHOT_WRITE_QUEUE_SIZE", 2)
+    yield
+    ScreenshotWriter.shutdown()
+
+
+class TestScreenshotWriter:
+    """截图后台写入测试"""
+
+    def test_sync_mode_writes_immediately(self, monkeypatch, tmp_path):
+        """测试未启用时在调用线程中写入，目录不存在时自动创建"""
+        monkeypatch.setattr(Settings, "SCREENSHOT_ASYNC_WRITE", False)
+        path = tmp_path / "nested" / "sync.png"
+
+        ScreenshotWriter.write(path, b"sync")
+
+        assert path.read_bytes() == b"sync"
+
+    def test_async_mode_writes_off_thread(self, async_write, monkeypatch, tmp_path):
+        """测试启用后在后台线程中写入，flush 后全部落盘"""
+        writer_threads = []
+        original_write = Path.write_bytes
+
+        def record_thread(path, data):
+            writer_threads.append(threading.current_thread().name)
+            return original_write(path, data)
+
+        monkeypatch.setattr(Path, "write_bytes", record_thread)
+
+        for i in range(5):
+            ScreenshotWriter.write(tmp_path / f"shot_{i}.png", b"data %d" % i)
+        assert ScreenshotWriter.flush(timeout=10)
+
+        assert set(writer_threads) == {"ScreenshotWriter"}
+        assert [(tmp_path / f"shot_{i}.png").read_bytes() for i in range(5)] == [b"data %d" % i for i in range(5)]
+
+    def test_bounded_queue_blocks(self, async_write, monkeypatch, tmp_path):
+        """测试写入阻塞时队列最多保留 SCREENSHOT_WRITE_QUEUE_SIZE 张截图，之后的截图等待"""
+        release = threading.Event()
+        original_write = Path.write_bytes
+        monkeypatch.setattr(Path, "write_bytes", lambda path, data: release.wait(10) and original_write(path, data))
+        # 第一张截图被后台线程取出后阻塞，队列中还能放入 2 张
+        for i in range(3):
+            ScreenshotWriter.write(tmp_path / f"shot_{i}.png", b"x")
+
+        blocked = threading.Thread(target=ScreenshotWriter.write, args=(tmp_path / "shot_3.png", b"x"))
+        blocked.start()
+        blocked.join(0.2)
+        assert blocked.is_alive()
+
+        release.set()
+        blocked.join(10)
+        assert ScreenshotWriter.flush(timeout=10)
+        assert len(list(tmp_path.glob("shot_*.png"))) == 4
+
+    def test_write_failure_counted(self, async_write, tmp_path):
+        """测试写入失败时记录警告和失败数量，不影响后续截图"""
+        failed_before = ScreenshotWriter.get_stats()["failed"]
+        (tmp_path / "file").write_text("not a directory")
+
+        ScreenshotWriter.write(tmp_path / "file" / "shot.png", b"x")
+        ScreenshotWriter.write(tmp_path / "ok.png", b"x")
+        assert ScreenshotWriter.flush(timeout=10)
+
+        assert ScreenshotWriter.get_stats()["failed"] == failed_before + 1
+        assert (tmp_path / "ok.png").exists()
+
+    def test_take_screenshot_uses_writer(self, async_write, monkeypatch, tmp_path):
+        """测试 take_screenshot 返回截图数据，文件由后台写入"""
+        monkeypatch.setattr(Settings, "SCREENSHOT_DIR", str(tmp_path))
+        monkeypatch.setattr(Settings, "SCREENSHOT_FORMAT", "png")
+
+        data = BasePage(FakePage()).take_screenshot("login", attach_to_allure=False)
+        assert ScreenshotWriter.flush(timeout=10)
+
+        assert (tmp_path / "login.png").read_bytes() == data
@@ -0,0 +1,156 @@
+"""
+定位器缓存和选择器性能分析测试
+
+验证 BasePage 按页面缓存定位器、选择器结构检查、启用分析时记录解析耗时，以及慢选择器报告
+"""
+
+import gc
+import weakref
+
+import pytest
+
+from base.ui.locator_cache import LocatorCache
+from base.ui.pages.base_page import BasePage
+from base.ui.selector_profiler import SelectorProfiler, analyze_selector
+from config.settings import Settings
+
+
+class FakeLocator:
+    """记录解析次数的定位器替身"""
+
+    def __init__(self, page, selector):
+        self.page = page
+        self.selector = selector
+
+    def count(self):
+        self.page.resolved.append(self.selector)
+        return 1
+
+    def wait_for(self, state, timeout):
+        pass
+
+    def click(self, force, timeout):
+        pass
+
+    def fill(self, text, timeout):
+        pass
+
+
+class FakePage:
+    """记录 locator 调用次数的页面替身"""
+
+    def __init__(self):
+        self.created = []
+        self.resolved = []
+
+    def set_default_timeout(self, timeout):
+        pass
+
+    def locator(self, selector):
+        self.created.append(selector)
+        return FakeLocator(self, selector)
+
+
+@pytest.fixture(autouse=True)
+def reset_profiler(monkeypatch):
+    monkeypatch.setattr(Settings, "SELECTOR_PROFILE_ENABLED", False)
+    monkeypatch.setattr(Settings, "SELECTOR_SLOW_THRESHOLD_MS", 0)
+    monkeypatch.setattr(Settings, "WAIT_EXPLICIT_BEFORE_ACTION", False)
+    LocatorCache.reset_stats()
+    SelectorProfiler.reset()
+    yield
+    LocatorCache.reset_stats()
+    SelectorProfiler.reset()
+
+
+class TestLocatorCache:
+    """定位器缓存测试"""
+
+    def test_locator_created_once_per_page(self):
+        """测试同一页面上的多个页面对象共享定位器，不同页面各自创建"""
+        page, other_page = FakePage(), FakePage()
+
+        BasePage(page).click("#submit")
+        BasePage(page).fill("#submit", "x")
+        BasePage(other_page).click("#submit")
+
+        assert page.created == ["#submit"] and other_page.created == ["#submit"]
+        assert LocatorCache.get_stats() == {"hits": 1, "misses": 2}
+
+    def test_cache_released_with_page(self):
+        """测试页面被回收后缓存随之释放"""
+        page = FakePage()
+        LocatorCache.get(page, "#submit")
+        page_ref = weakref.ref(page)
+
+        del page
+        gc.collect()
+
+        assert page_ref() is None
+
+
+class TestSelectorProfiler:
+    """选择器性能分析测试"""
+
+    @pytest.mark.parametrize("selector, issue", [
+        ("#app > div > div > div.login-content > div.login-right > div.title > p:nth-child(2)", "deep CSS chain"),
+        ("ul > li:nth-child(3) > a:nth-of-type(2)", "nth-child chain"),
+        ("/html/body/div[2]/div/div[3]/span", "absolute XPath"),
+        ("xpath=//div/div/div/div/div/span", "deep XPath"),
+    ])
+    def test_flags_fragile_selectors(self, selector, issue):
+        """测试标出深层 CSS、nth-child 链和深层/绝对 XPath"""
+        assert any(found.startswith(issue) for found in analyze_selector(selector))
+
+    @pytest.mark.parametrize("selector", [
+        "#username",
+        "input[name='user name']",
+        "button:has-text('Sign in to your account now')",
+        "text=Welcome back to the dashboard page",
+        "//button[@id='submit']",
+    ])
+    def test_simple_selectors_not_flagged(self, selector):
+        """测试简单选择器和 Playwright 选择器引擎不被标出"""
+        assert analyze_selector(selector) == []
+
+    def test_disabled_by_default(self):
+        """测试默认不额外解析选择器"""
+        page = FakePage()
+
+        BasePage(page).click("#submit")
+
+        assert page.resolved == [] and SelectorProfiler.get_slowest() == []
+
+    def test_profile_records_each_use(self, monkeypatch):
+        """测试启用后每次使用选择器时解析并记录"""
+        monkeypatch.setattr(Settings, "SELECTOR_PROFILE_ENABLED", True)
+        page = FakePage()
+        base_page = BasePage(page)
+
+        base_page.click("#submit")
+        base_page.click("#submit")
+
+        record = SelectorProfiler.get_slowest()[0]
+        assert page.resolved == ["#submit", "#submit"]
+        assert record.selector == "#submit" and record.count == 2 and record.matches == 1
+
+    def test_report_orders_by_average_and_lists_flagged(self):
+        """测试报告按平均耗时排列，结构有问题的选择器即使不在最慢列表中也列出"""
+        SelectorProfiler.record("#slow", 0.2)
+        SelectorProfiler.record("#fast", 0.001)
+        SelectorProfiler.record("/html/body/div[1]", 0.0005)
+
+        lines = SelectorProfiler.format_report(top=1).splitlines()
+
+        assert lines[0].endswith("#slow")
+        assert lines[1].endswith("/html/body/div[1]  [absolute XPath]")
+        assert len(lines) == 2
+
+    def test_report_size_independent_of_wait_report(self, monkeypatch):
+        """测试默认列出的数量由 SELECTOR_PROFILE_TOP 决定，不受 WAIT_REPORT_TOP 影响"""
+        monkeypatch.setattr(Settings, "SELECTOR_PROFILE_TOP", 2)
+        monkeypatch.setattr(Settings, "WAIT_REPORT_TOP", 1)
+        for i in range(3):
+            SelectorProfiler.record(f"#item{i}", 0.01 * (i + 1))
+
+        assert [record.selector for record in SelectorProfiler.get_slowest()] == ["#item2", "#item1"]
@@ -0,0 +1,140 @@
+"""
+结构化日志测试
+
+验证日志上下文（worker、测试、请求）、JSON Lines 格式化器和日志查询工具
+"""
+
+import json
+import logging
+import sys
+
+from core.log.json_formatter import JsonLogFormatter
+from core.log.log_context import LogContextFilter, request_context, get_worker_id
+from core.log.log_query import group_entries, iter_entries, matches
+
+
+def _make_record(msg: str = "hello", level: int = logging.INFO) -> logging.LogRecord:
+    return logging.LogRecord("Structured", level, __file__, 1, msg, None, None)
+
+
+class TestLogContext:
+    """日志上下文测试"""
+
+    def test_record_carries_current_test(self, request):
+        """测试日志记录带有当前测试的 nodeid 和 worker ID"""
+        record = _make_record()
+        LogContextFilter().filter(record)
+
+        assert record.test_nodeid == request.node.nodeid
+        assert record.worker_id == get_worker_id()
+        assert record.request_id is None
+        assert record.elapsed_ms >= 0
+
+    def test_request_context_scope(self):
+        """测试请求上下文只作用于 with 语句块内"""
+        context_filter = LogContextFilter()
+
+        with request_context("GET /users/1") as request_id:
+            inside = _make_record()
+            context_filter.filter(inside)
+        outside = _make_record()
+        context_filter.filter(outside)
+
+        assert inside.request_id == request_id
+        assert inside.endpoint == "GET /users/1"
+        assert outside.request_id is None
+        assert outside.endpoint is None
+
+    def test_existing_context_not_overwritten(self):
+        """测试已补充过上下文的记录不会被覆盖"""
+        context_filter = LogContextFilter()
+        with request_context("POST /login"):
+            record = _make_record()
+            context_filter.filter(record)
+        context_filter.filter(record)
+
+        assert record.endpoint == "POST /login"
+
+
+class TestJsonLogFormatter:
+    """JSON 日志格式化器测试"""
+
+    def test_format_single_json_line(self, request):
+        """测试输出包含上下文字段的单行 JSON"""
+        record = _make_record('quote " and\nnewline')
+        with request_context("GET /posts"):
+            LogContextFilter().filter(record)
+
+        line = JsonLogFormatter().format(record)
+        data = json.loads(line)
+
+        assert "\n" not in line
+        assert data["msg"] == 'quote " and\nnewline'
+        assert data["level"] == "INFO"
+        assert data["test"] == request.node.nodeid
+        assert data["endpoint"] == "GET /posts"
+        assert data["request_id"]
+
+    def test_format_exception(self):
+        """测试异常信息写入 exc 字段"""
+        try:
+            raise ValueError("boom")
+        except ValueError:
+            record = logging.LogRecord("Structured", logging.ERROR, __file__, 1, "failed", None, sys.exc_info())
+
+        data = json.loads(JsonLogFormatter().format(record))
+        assert "ValueError: boom" in data["exc"]
+        assert data["test"] is None
+
+
+class TestLogQuery:
+    """日志查询工具测试"""
+
+    ENTRIES = [
+        {"ts": "2024-01-01T10:00:00.010", "level": "INFO", "test": "tests/a.py::test_a", "worker": "gw0",
+         "endpoint": "GET /users", "request_id": "r1", "elapsed_ms": 10.0},
+        {"ts": "2024-01-01T10:00:00.035", "level": "ERROR", "test": "tests/a.py::test_a", "worker": "gw0",
+         "endpoint": "GET /users", "request_id": "r1", "elapsed_ms": 35.0},
+        {"ts": "2024-01-01T10:00:01.505", "level": "INFO", "test": "tests/b.py::test_b", "worker": "gw1",
+         "endpoint": "POST /posts", "request_id": "r2", "elapsed_ms": 5.0},
+    ]
+
+    def test_iter_entries_skips_invalid_lines(self, tmp_path):
+        """测试读取日志文件时跳过非 JSON 行"""
+        log_file = tmp_path / "test.jsonl"
+        log_file.write_text(
+            "\n".join(json.dumps(entry) for entry in self.ENTRIES) + "\nnot json\n\n",
+            encoding="utf-8"
+        )
+
+        assert list(iter_entries([str(log_file)])) == self.ENTRIES
+
+    def test_filters(self):
+        """测试按测试、端点、级别、worker 过滤"""
+        assert [e["request_id"] for e in self.ENTRIES if matches(e, test="test_b")] == ["r2"]
+        assert len([e for e in self.ENTRIES if matches(e, endpoint="/users")]) == 2
+        assert len([e for e in self.ENTRIES if matches(e, level="error", worker="gw0")]) == 1
+        assert not [e for e in self.ENTRIES if matches(e, request_id="missing")]
+
+    def test_group_by_test(self):
+        """测试按测试聚合统计"""
+        groups = group_entries(self.ENTRIES, "test")
+
+        stats = groups["tests/a.py::test_a"]
+        assert stats.count == 2
+        assert stats.errors == 1
+        assert stats.requests == {"r1"}
+        assert stats.span_ms == 25.0
+
+    def test_group_span_across_tests_uses_timestamps(self):
+        """测试跨测试聚合时耗时按记录的绝对时间计算，而不是各测试内的相对耗时"""
+        entries = self.ENTRIES + [
+            {"ts": "2024-01-01T10:00:02.000", "level": "INFO", "test": "tests/c.py::test_c", "worker": "gw1",
+             "endpoint": "GET /users", "request_id": "r3", "elapsed_ms": 1.0},
+            {"ts": "not a timestamp", "endpoint": "GET /users"},
+        ]
+
+        stats = group_entries(entries, "endpoint")["GET /users"]
+
+        assert stats.count == 4
+        assert stats.span_ms == 1990.0
@@ -0,0 +1,117 @@
+"""
+Trace 录制测试
+
+验证每个上下文只开始一次 tracing、测试通过时丢弃分块、测试失败时保存分块、
+环形缓冲区保留之前的分块，以及 TRACE_MODE=on 时保存所有分块
+"""
+
+import pytest
+
+from base.ui.trace_recorder import TraceRecorder
+from config.settings import Settings
+
+
+class FakeTracing:
+    """记录调用的 tracing 替身，stop_chunk 指定 path 时写入文件"""
+
+    def __init__(self):
+        self.calls = []
+        self.chunk = None
+
+    def start(self, screenshots, snapshots, sources):
+        self.calls.append("start")
+
+    def start_chunk(self, title):
+        self.calls.append("start_chunk")
+        self.chunk = title
+
+    def stop_chunk(self, path=None):
+        self.calls.append("stop_chunk" if path is None else "save_chunk")
+        if path is not None:
+            path.write_text(self.chunk)
+
+    def stop(self):
+        self.calls.append("stop")
+
+
+class FakeContext:
+    """浏览器上下文替身"""
+
+    def __init__(self):
+        self.tracing = FakeTracing()
+
+
+@pytest.fixture(autouse=True)
+def trace_settings(monkeypatch, tmp_path):
+    monkeypatch.setattr(Settings, "TRACE_MODE", "retain-on-failure")
+    monkeypatch.setattr(Settings, "TRACE_DIR", str(tmp_path))
+    monkeypatch.setattr(Settings, "TRACE_RING_SIZE", 1)
+    TraceRecorder.reset_stats()
+    yield
+    TraceRecorder.reset_stats()
+
+
+class TestTraceRecorder:
+    """Trace 录制测试"""
+
+    def test_passed_chunk_is_discarded(self, tmp_path):
+        """测试只开始一次 tracing，测试通过时分块不写入磁盘"""
+        context = FakeContext()
+        recorder = TraceRecorder(context)
+
+        for name in ("test_a", "test_b"):
+            recorder.start_chunk(name)
+            assert recorder.stop_chunk(failed=False) == []
+
+        assert context.tracing.calls == ["start", "start_chunk", "stop_chunk", "start_chunk", "stop_chunk"]
+        assert list(tmp_path.glob("*.zip")) == []
+        assert TraceRecorder.get_stats()["chunks"] == 2
+
+    def test_failed_chunk_is_saved(self, tmp_path):
+        """测试失败时保存分块，文件名来自测试名称"""
+        recorder = TraceRecorder(FakeContext())
+
+        recorder.start_chunk("tests/ui/test_login.py::test_login[admin]")
+        saved = recorder.stop_chunk(failed=True)
+
+        assert saved == [tmp_path / "tests_ui_test_login.py_test_login_admin_.zip"]
+        assert saved[0].read_text() == "tests/ui/test_login.py::test_login[admin]"
+        assert TraceRecorder.get_stats()["saved"] == 1
+
+    def test_ring_keeps_previous_chunks(self, tmp_path):
+        """测试环形缓冲区只保留最近的分块，失败时连同之前的分块一起保存"""
+        recorder = TraceRecorder(FakeContext(), ring_size=3)
+
+        for name in ("test_1", "test_2", "test_3"):
+            recorder.start_chunk(name)
+            recorder.stop_chunk(failed=False)
+        recorder.start_chunk("test_4")
+        saved = recorder.stop_chunk(failed=True)
+
+        assert [path.read_text() for path in saved] == ["test_2", "test_3", "test_4"]
+        assert saved[-1] == tmp_path / "test_4.zip"
+
+        recorder.close()
+        assert not (tmp_path / ".ring").exists() or not any((tmp_path / ".ring").rglob("*.zip"))
+
+    def test_mode_on_saves_every_chunk(self, monkeypatch):
+        """测试 TRACE_MODE=on 时测试通过也保存分块"""
+        monkeypatch.setattr(Settings, "TRACE_MODE", "on")
+        recorder = TraceRecorder(FakeContext())
+
+        recorder.start_chunk("test_passed")
+
+        assert [path.name for path in recorder.stop_chunk(failed=False)] == ["test_passed.zip"]
+
+    def test_for_context_shares_recorder(self):
+        """测试同一上下文（上下文池中重用）共享录制实例，关闭后停止 tracing 并移除"""
+        context = FakeContext()
+
+        recorder = TraceRecorder.for_context(context)
+        assert TraceRecorder.for_context(context) is recorder
+
+        recorder.start_chunk("test_a")
+        recorder.close()
+
+        assert context.tracing.calls[-1] == "stop"
+        assert TraceRecorder.for_context(context) is not recorder
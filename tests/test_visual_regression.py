@@ -0,0 +1,148 @@
+"""
+视觉回归测试
+
+验证基线的创建和更新、字节相同时直接通过、像素比较（NumPy 和 Pillow 两种实现）的容差和忽略区域，
+以及只有不匹配时才写入差异图
+"""
+
+import io
+
+import pytest
+
+from base.ui import visual_regression
+from base.ui.visual_regression import baseline_path_for, check_screenshot, compare_screenshots
+from config.settings import Settings
+
+
+def make_png(size=(40, 30), color=(255, 255, 255), box=None, box_color=(0, 0, 0)):
+    """生成纯色 PNG，box 为 (x, y, width, height) 时在该区域填充 box_color"""
+    image_module = pytest.importorskip("PIL.Image")
+    image = image_module.new("RGB", size, color)
+    if box is not None:
+        x, y, width, height = box
+        image.paste(box_color, (x, y, x + width, y + height))
+    buffer = io.BytesIO()
+    image.save(buffer, format="PNG")
+    return buffer.getvalue()
+
+
+def write_baseline(name, data):
+    """直接写入基线截图"""
+    path = baseline_path_for(name)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_bytes(data)
+
+
+@pytest.fixture(autouse=True)
+def visual_settings(monkeypatch, tmp_path):
+    monkeypatch.setattr(Settings, "VISUAL_BASELINE_DIR", str(tmp_path / "baselines"))
+    monkeypatch.setattr(Settings, "VISUAL_OUTPUT_DIR", str(tmp_path / "diffs"))
+    monkeypatch.setattr(Settings, "VISUAL_THRESHOLD", 0.1)
+    monkeypatch.setattr(Settings, "VISUAL_MAX_DIFF_RATIO", 0.0)
+    monkeypatch.setattr(Settings, "VISUAL_UPDATE_BASELINE", False)
+    monkeypatch.setattr(Settings, "BROWSER_TYPE", "chromium")
+
+
+@pytest.fixture(params=["numpy", "pillow"])
+def pixel_backend(request, monkeypatch):
+    """分别使用 NumPy 和 Pillow 实现比较"""
+    pytest.importorskip("PIL.Image")
+    if request.param == "numpy":
+        pytest.importorskip("numpy")
+    else:
+        monkeypatch.setattr(visual_regression, "np", None)
+    return request.param
+
+
+class TestBaseline:
+    """基线测试"""
+
+    def test_missing_baseline_fails(self, tmp_path):
+        """测试基线不存在时不匹配，不写入基线，实际截图写入输出目录"""
+        result = check_screenshot("login page/empty", b"png-bytes")
+
+        assert not result.matched and not result.created
+        assert "baseline is missing" in result.reason
+        assert not result.baseline_path.exists()
+        assert (tmp_path / "diffs" / "chromium" / "login_page" / "empty.actual.png").read_bytes() == b"png-bytes"
+
+    def test_missing_baseline_is_created(self, monkeypatch):
+        """测试 VISUAL_UPDATE_BASELINE=true 时写入当前截图并通过，路径按浏览器类型和名称分目录"""
+        monkeypatch.setattr(Settings, "VISUAL_UPDATE_BASELINE", True)
+        result = check_screenshot("login page/empty", b"png-bytes")
+
+        assert result.matched and result.created
+        assert result.baseline_path == baseline_path_for("login page/empty")
+        assert result.baseline_path.parts[-3:] == ("chromium", "login_page", "empty.png")
+        assert result.baseline_path.read_bytes() == b"png-bytes"
+
+    def test_identical_bytes_match_without_decoding(self, monkeypatch):
+        """测试字节相同时直接通过，不需要 Pillow"""
+        monkeypatch.setattr(visual_regression, "Image", None)
+        write_baseline("home", b"png-bytes")
+
+        result = check_screenshot("home", b"png-bytes")
+
+        assert result.matched and not result.created and result.diff_pixels == 0
+
+    def test_update_baseline(self, monkeypatch):
+        """测试 VISUAL_UPDATE_BASELINE=true 时覆盖基线"""
+        write_baseline("home", b"old")
+        monkeypatch.setattr(Settings, "VISUAL_UPDATE_BASELINE", True)
+
+        result = check_screenshot("home", b"new")
+
+        assert result.created and result.baseline_path.read_bytes() == b"new"
+
+    def test_without_pillow_different_bytes_mismatch(self, monkeypatch, tmp_path):
+        """测试未安装 Pillow 时字节不同视为不匹配，并说明原因"""
+        monkeypatch.setattr(visual_regression, "Image", None)
+        write_baseline("home", b"old")
+
+        result = check_screenshot("home", b"new")
+
+        assert not result.matched and "Pillow" in result.reason
+        assert (tmp_path / "diffs" / "chromium" / "home.actual.png").read_bytes() == b"new"
+
+
+class TestPixelCompare:
+    """像素比较测试"""
+
+    def test_counts_changed_pixels(self, pixel_backend):
+        """测试统计不同的像素并生成差异图"""
+        comparison = compare_screenshots(make_png(), make_png(box=(0, 0, 10, 5)))
+
+        assert comparison.diff_pixels == 50 and comparison.total_pixels == 1200
+        assert comparison.diff_png is not None
+
+    def test_threshold_ignores_small_color_changes(self, pixel_backend):
+        """测试单个像素容差内的颜色变化不计为不同"""
+        comparison = compare_screenshots(make_png(), make_png(box=(0, 0, 10, 5), box_color=(250, 250, 250)))
+
+        assert comparison.diff_pixels == 0 and comparison.diff_png is None
+
+    def test_mask_regions(self, pixel_backend):
+        """测试忽略区域内的变化不计为不同"""
+        comparison = compare_screenshots(
+            make_png(), make_png(box=(0, 0, 10, 5)), mask_regions=[(0, 0, 5, 5)]
+        )
+
+        assert comparison.diff_pixels == 25
+
+    def test_size_change_is_mismatch(self, pixel_backend):
+        """测试尺寸不同时视为不匹配"""
+        comparison = compare_screenshots(make_png(), make_png(size=(40, 31)))
+
+        assert "size changed" in comparison.reason
+
+    def test_diff_written_only_on_mismatch(self, pixel_backend, tmp_path):
+        """测试只有不匹配时写入实际截图和差异图，差异比例在容差内时通过"""
+        write_baseline("form", make_png())
+
+        assert check_screenshot("form", make_png(box=(0, 0, 2, 2)), max_diff_ratio=0.01).matched
+        assert not (tmp_path / "diffs").exists()
+
+        result = check_screenshot("form", make_png(box=(0, 0, 10, 5)), max_diff_ratio=0.01)
+        assert not result.matched and "50 of 1200 pixels differ" in result.reason
+        assert result.diff_path == tmp_path / "diffs" / "chromium" / "form.diff.png"
+        assert result.diff_path.exists()
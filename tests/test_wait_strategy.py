@@ -0,0 +1,206 @@
+"""
+等待策略测试
+
+验证网络安静等待（进行中的请求、忽略的请求、长连接、超时）、等待耗时统计，
+以及 BasePage 的点击和填充默认依赖 Playwright 的自动等待
+"""
+
+import time
+from dataclasses import dataclass
+
+import pytest
+from playwright.sync_api import TimeoutError as PlaywrightTimeoutError
+
+from base.ui.pages.base_page import BasePage
+from base.ui.wait_strategy import NetworkQuietWaiter, WaitStats, wait_for_network_quiet
+from config.settings import Settings
+
+
+@dataclass(frozen=True)
+class FakeRequest:
+    """请求替身"""
+
+    url: str
+    resource_type: str = "xhr"
+
+
+class FakePage:
+    """按时间表触发请求事件的页面替身，事件在 wait_for_timeout 期间分发（与 Playwright 相同）"""
+
+    def __init__(self, schedule=()):
+        self.url = "https://example.com/"
+        self.listeners = {}
+        self.start = time.perf_counter()
+        # (相对开始时间的秒数, 事件名, 请求)
+        self.schedule = sorted(schedule, key=lambda item: item[0])
+
+    def on(self, event, handler):
+        self.listeners.setdefault(event, []).append(handler)
+
+    def remove_listener(self, event, handler):
+        self.listeners[event].remove(handler)
+
+    def wait_for_timeout(self, timeout):
+        time.sleep(timeout / 1000)
+        elapsed = time.perf_counter() - self.start
+        while self.schedule and self.schedule[0][0] <= elapsed:
+            _, event, request = self.schedule.pop(0)
+            for handler in list(self.listeners.get(event, [])):
+                handler(request)
+
+
+@pytest.fixture(autouse=True)
+def reset_wait_stats(monkeypatch):
+    monkeypatch.setattr(Settings, "WAIT_NETWORK_IGNORE_PATTERNS", [])
+    monkeypatch.setattr(Settings, "WAIT_SLOW_THRESHOLD_MS", 0)
+    WaitStats.reset()
+    yield
+    WaitStats.reset()
+
+
+class TestNetworkQuiet:
+    """网络安静等待测试"""
+
+    def test_returns_after_quiet_period(self):
+        """测试没有请求时等待 quiet_ms 后返回"""
+        page = FakePage()
+
+        start = time.perf_counter()
+        wait_for_network_quiet(page, quiet_ms=50)
+
+        assert 0.05 <= time.perf_counter() - start < 0.5
+
+    def test_waits_for_in_flight_request(self):
+        """测试等待进行中的请求结束后再等待 quiet_ms"""
+        api = FakeRequest("https://example.com/api/data")
+        page = FakePage([(0.01, "request", api), (0.15, "requestfinished", api)])
+
+        with NetworkQuietWaiter(page) as waiter:
+            start = time.perf_counter()
+            waiter.wait(quiet_ms=50)
+            elapsed = time.perf_counter() - start
+
+        assert elapsed >= 0.2
+
+    def test_ignored_requests_do_not_block(self):
+        """测试忽略的请求（长轮询）和长连接不阻止等待结束"""
+        poll = FakeRequest("https://example.com/api/poll?id=1")
+        socket = FakeRequest("wss://example.com/ws", resource_type="websocket")
+        page = FakePage([(0.01, "request", poll), (0.01, "request", socket)])
+
+        start = time.perf_counter()
+        wait_for_network_quiet(page, quiet_ms=50, ignore_patterns=["*/api/poll*"], timeout=1000)
+
+        assert time.perf_counter() - start < 0.5
+
+    def test_ignore_patterns_from_settings(self, monkeypatch):
+        """测试未指定忽略模式时使用 WAIT_NETWORK_IGNORE_PATTERNS"""
+        monkeypatch.setattr(Settings, "WAIT_NETWORK_IGNORE_PATTERNS", ["*heartbeat*"])
+        page = FakePage([(0.01, "request", FakeRequest("https://example.com/heartbeat"))])
+
+        wait_for_network_quiet(page, quiet_ms=50, timeout=1000)
+
+    def test_timeout_reports_pending_requests(self):
+        """测试超时时抛出 Playwright 超时异常，包含未结束的请求，并记录为超时"""
+        page = FakePage([(0.01, "request", FakeRequest("https://example.com/api/slow"))])
+
+        with pytest.raises(PlaywrightTimeoutError, match="api/slow"):
+            wait_for_network_quiet(page, quiet_ms=50, timeout=200)
+
+        record = WaitStats.get_slowest()[0]
+        assert record.kind == "network_quiet" and record.timeouts == 1
+
+    def test_listeners_removed(self):
+        """测试等待结束后移除事件监听"""
+        page = FakePage()
+
+        wait_for_network_quiet(page, quiet_ms=10)
+
+        assert all(not handlers for handlers in page.listeners.values())
+
+
+class TestWaitStats:
+    """等待耗时统计测试"""
+
+    def test_aggregates_and_orders_by_total(self):
+        """测试按等待类型和目标聚合，按总耗时降序排列"""
+        WaitStats.record("element", "#fast", 0.1)
+        WaitStats.record("element", "#slow", 1.0)
+        WaitStats.record("element", "#slow", 2.0)
+        WaitStats.record("click", "#fast", 0.2)
+
+        slowest = WaitStats.get_slowest(top=2)
+
+        assert [(record.kind, record.target) for record in slowest] == [("element", "#slow"), ("click", "#fast")]
+        assert slowest[0].count == 2 and slowest[0].max == 2.0 and slowest[0].average == 1.5
+        assert "element: #slow" in WaitStats.format_report()
+
+    def test_timed_records_timeouts(self):
+        """测试 timed 记录耗时，Playwright 超时异常记为超时并继续抛出"""
+        with pytest.raises(PlaywrightTimeoutError):
+            with WaitStats.timed("url", "**/dashboard"):
+                raise PlaywrightTimeoutError("timeout")
+        with WaitStats.timed("url", "**/dashboard"):
+            pass
+
+        record = WaitStats.get_slowest()[0]
+        assert record.count == 2 and record.timeouts == 1
+
+
+class FakeLocator:
+    """记录调用的定位器替身"""
+
+    def __init__(self, calls, selector):
+        self.calls = calls
+        self.selector = selector
+
+    def wait_for(self, state, timeout):
+        self.calls.append(("wait_for", self.selector))
+
+    def click(self, force, timeout):
+        self.calls.append(("click", self.selector))
+
+    def clear(self, timeout):
+        self.calls.append(("clear", self.selector))
+
+    def fill(self, text, timeout):
+        self.calls.append(("fill", self.selector))
+
+
+class FakeActionPage:
+    """BasePage 使用的页面替身"""
+
+    def __init__(self):
+        self.calls = []
+
+    def set_default_timeout(self, timeout):
+        pass
+
+    def locator(self, selector):
+        return FakeLocator(self.calls, selector)
+
+
+class TestActionWaits:
+    """点击和填充的等待测试"""
+
+    def test_actions_rely_on_auto_wait_by_default(self, monkeypatch):
+        """测试默认不显式等待元素，填充不单独清空"""
+        monkeypatch.setattr(Settings, "WAIT_EXPLICIT_BEFORE_ACTION", False)
+        page = FakeActionPage()
+        base_page = BasePage(page)
+
+        base_page.click("#submit")
+        base_page.fill("#username", "user")
+
+        assert page.calls == [("click", "#submit"), ("fill", "#username")]
+        kinds = {record.kind for record in WaitStats.get_slowest()}
+        assert kinds == {"click", "fill"}
+
+    def test_explicit_wait_setting(self, monkeypatch):
+        """测试 WAIT_EXPLICIT_BEFORE_ACTION=true 时恢复显式等待"""
+        monkeypatch.setattr(Settings, "WAIT_EXPLICIT_BEFORE_ACTION", True)
+        page = FakeActionPage()
+
+        BasePage(page).click("#submit")
+
+        assert page.calls == [("wait_for", "#submit"), ("click", "#submit")]
@@ -0,0 +1,43 @@
+"""
+AsyncBasePage 并发示例
+
+在同一个 worker 中使用 Playwright 异步 API 同时驱动多个页面
+"""
+
+import pytest
+from playwright.async_api import BrowserContext, Page as AsyncPage
+from playwright.sync_api import Page
+
+from base.ui.async_runner import AsyncRunner
+from base.ui.pages.async_base_page import AsyncBasePage, gather_pages
+
+
+@pytest.mark.ui
+class TestAsyncBasePage:
+    """AsyncBasePage 并发示例"""
+
+    def test_check_titles_concurrently(self, async_context: BrowserContext, async_runner: AsyncRunner):
+        """测试并发检查 50 个页面的标题"""
+        async def check_title(index: int) -> str:
+            page = AsyncBasePage(await async_context.new_page())
+            try:
+                await page.page.set_content(f"<title>Page {index}</title><h1 id='heading'>Heading {index}</h1>")
+                assert await page.get_text("#heading") == f"Heading {index}"
+                return await page.get_title()
+            finally:
+                await page.page.close()
+
+        titles = async_runner.run(gather_pages(check_title(i) for i in range(50)))
+
+        assert titles == [f"Page {i}" for i in range(50)]
+
+    def test_after_sync_page(self, page: Page, async_page: AsyncPage, async_runner: AsyncRunner):
+        """测试同一会话中同步页面之后仍可使用异步页面"""
+        page.set_content("<title>Sync</title>")
+        assert page.title() == "Sync"
+
+        async def check_title() -> str:
+            await async_page.set_content("<title>Async</title>")
+            return await AsyncBasePage(async_page).get_title()
+
+        assert async_runner.run(check_title()) == "Async"
@@ -0,0 +1,36 @@
+"""
+多页面检查示例
+
+在同步 API 下使用 multi_pages 和 run_on_pages 检查多个页面
+"""
+
+import pytest
+
+from base.ui.multi_page import run_on_pages
+from base.ui.pages.base_page import BasePage
+
+
+@pytest.mark.ui
+class TestMultiPage:
+    """多页面检查示例"""
+
+    def test_check_pages(self, multi_pages):
+        """测试在 10 个页面上执行页面对象操作"""
+        pages = [BasePage(page) for page in multi_pages(10)]
+
+        def check(base_page: BasePage) -> str:
+            index = pages.index(base_page)
+            base_page.page.set_content(f"<title>Page {index}</title><button id='ok'>OK</button>")
+            base_page.click("#ok")
+            return base_page.get_title()
+
+        results = run_on_pages(pages, check)
+
+        assert all(result.ok for result in results), [result.error for result in results if not result.ok]
+        assert [result.value for result in results] == [f"Page {i}" for i in range(10)]
+
+    def test_isolated_contexts(self, multi_pages):
+        """测试 isolated=True 时每个页面使用独立的上下文"""
+        pages = multi_pages(3, isolated=True)
+
+        assert len({id(page.context) for page in pages}) == 3
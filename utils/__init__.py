@@ -5,6 +5,7 @@
 """
 
 from utils.file_helper import FileHelper, read_file, write_file, read_json, write_json
+from utils.file_lock import file_lock
 from utils.data_helper import (
     DataHelper,
     parse_json,
@@ -21,6 +22,7 @@ __all__ = [
     'write_file',
     'read_json',
     'write_json',
+    'file_lock',
     
     # Data operations
     'DataHelper',
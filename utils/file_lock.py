@@ -0,0 +1,59 @@
+"""
+文件锁工具模块
+
+该模块提供基于锁文件的跨进程锁，用于并行执行（pytest-xdist）时
+多个 worker 进程对同一文件的互斥访问，例如登录状态文件和数据缓存快照。
+"""
+
+import os
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Generator, Union
+
+
+@contextmanager
+def file_lock(lock_path: Union[str, Path], timeout: float, poll_interval: float = 0.05) -> Generator[None, None, None]:
+    """
+    基于锁文件的跨进程锁
+    
+    锁文件通过 O_CREAT | O_EXCL 原子创建；持有者异常退出留下的锁文件超过 timeout 后视为失效。
+    
+    Args:
+        lock_path: 锁文件路径
+        timeout: 等待锁的最长时间（秒）
+        poll_interval: 锁被占用时的重试间隔（秒）
+        
+    Raises:
+        TimeoutError: 超时仍未获取到锁
+        
+    使用示例:
+        with file_lock(path.with_name(f"{path.name}.lock"), timeout=30):
+            path.write_text(content)
+    """
+    lock_path = Path(lock_path)
+    deadline = time.monotonic() + timeout
+    while True:
+        try:
+            fd = os.open(str(lock_path), os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+            os.write(fd, str(os.getpid()).encode())
+            os.close(fd)
+            break
+        except FileExistsError:
+            try:
+                if time.time() - lock_path.stat().st_mtime > timeout:
+                    lock_path.unlink()
+                    continue
+            except FileNotFoundError:
+                continue
+            if time.monotonic() > deadline:
+                raise TimeoutError(f"Timed out waiting for lock: {lock_path}")
+            time.sleep(poll_interval)
+    
+    try:
+        yield
+    finally:
+        try:
+            lock_path.unlink()
+        except FileNotFoundError:
+            pass